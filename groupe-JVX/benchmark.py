@@ -0,0 +1,99 @@
+"""
+Module Benchmark (Point d'Entrée).
+Ce script lance la suite de benchmarks de performance (voir src/benchmarks.py), hors ligne,
+écrit le rapport JSON et le compare à un rapport de référence.
+
+Le code de sortie vaut 1 si une mesure régresse au-delà du seuil ou manque son objectif
+absolu (ex: temps de démarrage), ce qui permet d'utiliser le script comme contrôle
+avant d'intégrer une modification.
+
+Usage :
+    python benchmark.py [--profile quick|full] [--only single_eval generation ...]
+    python benchmark.py --save-baseline
+    python benchmark.py --baseline results/benchmarks/baseline.json --threshold 0.10
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from src.config import Config
+from src.benchmarks import (BENCHMARKS, ENGINES, PROFILES, BenchmarkContext, compare_reports,
+                            load_report, misses_target, print_comparison, run_benchmarks, save_report)
+
+
+def setup_argparse():
+    """
+    Configure et analyse les arguments passés en ligne de commande.
+
+    Returns:
+        argparse.Namespace: Objet contenant les arguments analysés.
+    """
+    parser = argparse.ArgumentParser(description='GA Trading System - benchmarks')
+    parser.add_argument('--profile', type=str, choices=list(PROFILES), default='quick',
+                        help='Benchmark sizes (quick check or full run)')
+    parser.add_argument('--only', type=str, nargs='+', choices=list(BENCHMARKS), default=None,
+                        help='Benchmarks to run (default: all)')
+    parser.add_argument('--engines', type=str, nargs='+', choices=list(ENGINES), default=None,
+                        help='Backtest engines to measure (default: all)')
+    parser.add_argument('--repeat', type=int, default=None,
+                        help='Repetitions of the unit measurements (median kept)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='JSON report path (default: timestamped file in Config.BENCH_RESULTS_DIR)')
+    parser.add_argument('--baseline', type=str, default=Config.BENCH_BASELINE_FILE,
+                        help='Reference report to compare against')
+    parser.add_argument('--threshold', type=float, default=Config.BENCH_THRESHOLD,
+                        help='Relative degradation reported as a regression (0.15 = 15%%)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Also store this report as the reference report')
+    return parser.parse_args()
+
+
+def main():
+    """
+    Exécute les benchmarks, enregistre le rapport et le compare à la référence.
+
+    Returns:
+        int: Code de sortie (1 si une régression est détectée, 0 sinon).
+    """
+    args = setup_argparse()
+    print("\n" + "="*70)
+    print(f"BENCHMARKS DE PERFORMANCE - profil '{args.profile}'")
+    print("="*70)
+
+    ctx = BenchmarkContext(profile=args.profile, repeat=args.repeat, engines=args.engines)
+    report = run_benchmarks(args.only, ctx)
+    output = args.output or str(Path(Config.BENCH_RESULTS_DIR) /
+                                f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    save_report(report, output)
+    print(f"\nRapport enregistré : {output}")
+
+    status = 0
+    baseline = Path(args.baseline)
+    if baseline.exists() and baseline.resolve() != Path(output).resolve():
+        rows = compare_reports(report, load_report(baseline), args.threshold)
+        print_comparison(rows)
+        regressions = [r for r in rows if r['status'] == 'regression']
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) au-delà de {args.threshold:.0%} "
+                  f"par rapport à {baseline}.")
+            status = 1
+        else:
+            print(f"\nAucune régression au-delà de {args.threshold:.0%} par rapport à {baseline}.")
+    else:
+        print(f"\nPas de référence ({baseline}) : comparaison ignorée.")
+
+    # Objectifs absolus (ex: temps de démarrage), vérifiés avec ou sans référence
+    missed = [f"{name}.{key}" for name, entry in report['benchmarks'].items()
+              for key, m in entry.get('metrics', {}).items() if misses_target(m)]
+    if missed:
+        print(f"Objectif(s) manqué(s) : {', '.join(missed)}")
+        status = 1
+
+    if args.save_baseline:
+        save_report(report, args.baseline)
+        print(f"Référence mise à jour : {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,16 +7,22 @@ Fonctionnalités principales :
 1. Visualisation des données de marché (Bougies, Volumes).
 2. Lancement et suivi en temps réel de l'optimisation génétique.
 3. Exécution et analyse des résultats de la validation Walk-Forward (WFA).
+
+Les optimisations (AG et WFA) tournent en arrière-plan (voir src/job_runner.py) :
+la page se rafraîchit tant qu'un job est en cours et retrouve les jobs après un rechargement.
 """
+import time
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from src.config import Config
+from src.chart_sampling import downsample_line, downsample_ohlc
+from src.config import AssetConfig, Config
 from src.data_manager import DataManager
-from src.ga_core import GAEcosystem
-from src.walk_forward import WalkForwardAnalyzer
-from src.strategy_genes import decode_chromosome
+from src.job_runner import get_job_runner
+from src.result_cache import get_result_cache
+# L'AG (DEAP, backtrader) et le WFA ne sont importés que dans les processus des jobs :
+# l'affichage des données n'en paie pas le coût de chargement.
 
 # --- CONFIGURATION DE LA PAGE ---
 # Définit le titre de l'onglet du navigateur et le mode "wide" pour utiliser tout l'écran.
@@ -157,6 +163,16 @@ st.sidebar.markdown("### WFA PARAMETERS")
 wfa_train = st.sidebar.number_input("TRAIN WINDOW (MONTHS)", value=Config.WFA_TRAIN_MONTHS)
 wfa_test = st.sidebar.number_input("TEST WINDOW (MONTHS)", value=Config.WFA_TEST_MONTHS)
 
+st.sidebar.markdown("---")
+st.sidebar.markdown("### RESULT CACHE")
+# Résultats partagés par toutes les sessions et conservés sur disque (voir src/result_cache.py)
+cache_stats = get_result_cache().stats()
+st.sidebar.markdown(f"<div class='metric-label'>{cache_stats['size']} RESULTS · "
+                    f"HIT RATE {cache_stats['hit_rate']*100:.0f}%</div>", unsafe_allow_html=True)
+if st.sidebar.button("CLEAR CACHE"):
+    get_result_cache().clear()
+    st.rerun()
+
 st.sidebar.markdown("---")
 st.sidebar.info("GENETIC TRADING STRATEGY")
 
@@ -171,23 +187,37 @@ with col_head1:
 # Main Tabs
 tab1, tab2, tab3 = st.tabs(["MARKET_DATA", "OPTIMIZATION_CORE", "WFA_ROBUSTNESS"])
 
-def get_candlestick_chart(df, title):
+def get_candlestick_chart(df, title, start=None, end=None, overlays=None):
     """
     Génère un graphique en chandeliers japonais (Candlestick) avec Plotly.
 
+    Seules les barres de la plage [start, end] sont envoyées au navigateur, regroupées
+    en au plus Config.CHART_MAX_BARS bougies (pleine résolution si la plage est assez
+    courte) ; les courbes superposées sont réduites par LTTB (voir src/chart_sampling.py).
+
     Args:
         df (pd.DataFrame): Données historiques (Open, High, Low, Close).
         title (str): Titre du graphique (Ticker).
+        start, end (optional): Plage affichée. Par défaut tout l'historique.
+        overlays (Dict[str, pd.Series], optional): Courbes superposées (ex: moyennes mobiles).
 
     Returns:
-        go.Figure: Objet Figure Plotly prêt à être affiché.
+        tuple: (Objet Figure Plotly prêt à être affiché, nombre de barres par bougie affichée)
     """
-    fig = go.Figure(data=[go.Candlestick(x=df.index,
-                    open=df['Open'],
-                    high=df['High'],
-                    low=df['Low'],
-                    close=df['Close'])])
+    bars, bars_per_candle = downsample_ohlc(df, start, end, Config.CHART_MAX_BARS)
+    fig = go.Figure(data=[go.Candlestick(x=bars.index,
+                    open=bars['Open'],
+                    high=bars['High'],
+                    low=bars['Low'],
+                    close=bars['Close'],
+                    name=title)])
+    for (name, series), color in zip((overlays or {}).items(), ('#4CAF50', '#888')):
+        line = downsample_line(series, start, end, Config.CHART_MAX_LINE_POINTS)
+        fig.add_trace(go.Scatter(x=line.index, y=line.values, mode='lines', name=name,
+                                 line=dict(color=color, width=1)))
     fig.update_layout(
+        # Le zoom Plotly est conservé entre les rafraîchissements de la page pour une même plage
+        uirevision=f"{title}-{start}-{end}",
         title=None,
         template="plotly_dark",
         height=500,
@@ -200,7 +230,68 @@ def get_candlestick_chart(df, title):
     # Grille subtile pour l'analyse technique
     fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#222')
     fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#222')
-    return fig
+    return fig, bars_per_candle
+
+
+def load_job_result(job):
+    """
+    Copie le résultat d'un job terminé dans la session (affiché par les onglets).
+
+    Args:
+        job (Job): Job 'ga' ou 'wfa' à l'état 'done'.
+    """
+    if job.kind == 'ga':
+        st.session_state['best_params'] = job.result['best_params']
+        st.session_state['best_fitness'] = job.result['best_fitness']
+        st.session_state['ga_log'] = job.result['convergence'] # Sauvegarde pour les stats
+        st.session_state['ga_telemetry'] = job.result['telemetry_log'] # Mesures par génération
+        st.session_state['ga_run_telemetry'] = job.result['run_telemetry']
+        st.session_state['ga_ticker'] = job.asset.ticker
+    else:
+        st.session_state['wfa_results'] = job.result
+        st.session_state['wfa_ticker'] = job.asset.ticker
+
+
+def render_jobs(kind):
+    """
+    Affiche les jobs d'un type (progression, annulation, chargement du résultat).
+
+    Le résultat du dernier job terminé est chargé automatiquement une fois par session,
+    y compris après un rechargement de la page.
+
+    Args:
+        kind (str): 'ga' ou 'wfa'.
+    """
+    runner = get_job_runner()
+    jobs = runner.jobs(kind=kind)
+    loaded = st.session_state.setdefault('auto_loaded_jobs', set())
+    latest = next((job for job in jobs if job.status == 'done'), None)
+    if latest is not None and latest.id not in loaded:
+        loaded.add(latest.id)
+        load_job_result(latest)
+
+    for job in jobs:
+        done, total, unit = job.progress['done'], job.progress['total'], job.progress['unit']
+        c_info, c_action = st.columns([4, 1])
+        with c_info:
+            status = f"{job.status.upper()} (CACHED)" if job.cached else job.status.upper()
+            st.markdown(f"<span class='metric-label'>{job.asset.ticker} · {status} · "
+                        f"{job.elapsed:.0f}s</span>", unsafe_allow_html=True)
+            if job.active:
+                st.progress(job.fraction, text=f"{unit.upper()} {done}/{total or '?'}")
+            elif job.status == 'failed':
+                st.code((job.error or '').strip().splitlines()[-1] if job.error else 'UNKNOWN ERROR')
+        with c_action:
+            if job.active:
+                if st.button("CANCEL", key=f"cancel_{job.id}"):
+                    runner.cancel(job.id)
+                    st.rerun()
+            else:
+                if job.status == 'done' and st.button("LOAD", key=f"load_{job.id}"):
+                    load_job_result(job)
+                if st.button("DISMISS", key=f"dismiss_{job.id}"):
+                    runner.remove(job.id)
+                    st.rerun()
 
 # --- TAB 1: DONNÉES DE MARCHÉ (MARKET DATA) ---
 with tab1:
@@ -212,7 +303,8 @@ with tab1:
         if st.button("INITIALIZE DATA STREAM"):
             with st.spinner('ESTABLISHING CONNECTION...'):
                 try:
-                    dm = DataManager()
+                    # Données résidentes partagées par les sessions (voir DataManager)
+                    dm = DataManager(ticker)
                     df = dm.get_full_data()
                     # Stockage des données en session pour persistance entre les rechargements
                     st.session_state['data'] = df
@@ -236,8 +328,24 @@ with tab1:
     
     # Affichage du graphique si les données sont chargées
     if 'data' in st.session_state:
+        df = st.session_state['data']
+        # Plage affichée : seules ses barres sont envoyées au navigateur, en pleine résolution
+        # si elle est assez courte (voir src/chart_sampling.py)
+        first, last = df.index[0].to_pydatetime(), df.index[-1].to_pydatetime()
+        view_start, view_end = st.slider("VIEW RANGE", min_value=first, max_value=last, value=(first, last),
+                                         step=max((last - first) / 1000, pd.Timedelta(minutes=1).to_pytimedelta()),
+                                         key=f"view_{ticker}_{len(df)}", label_visibility="collapsed")
+        # Moyennes mobiles du meilleur génome de l'actif, superposées aux bougies
+        overlays = {}
+        params = st.session_state.get('best_params')
+        if params and st.session_state.get('ga_ticker') == ticker:
+            overlays = {f"SMA {params['SMA_F']}": df['Close'].rolling(int(params['SMA_F'])).mean(),
+                        f"SMA {params['SMA_S']}": df['Close'].rolling(int(params['SMA_S'])).mean()}
+        fig_market, bars_per_candle = get_candlestick_chart(df, ticker, view_start, view_end, overlays)
+        st.markdown(f"<span class='metric-label'>RESOLUTION: {bars_per_candle} BAR(S) PER CANDLE</span>",
+                    unsafe_allow_html=True)
         # Correction warning: utilisation de use_container_width=True (standard moderne)
-        st.plotly_chart(get_candlestick_chart(st.session_state['data'], ticker), use_container_width=True)
+        st.plotly_chart(fig_market, use_container_width=True)
         
         with st.expander("VIEW RAW DATA MATRIX"):
             # Correction warning: si votre version le demande spécifiquement
@@ -264,35 +372,15 @@ with tab2:
         </div>
         """, unsafe_allow_html=True)
         
-        # Bouton de lancement de l'AG
+        # Bouton de lancement de l'AG (job en arrière-plan, voir src/job_runner.py)
         if st.button("INITIATE SEQUENCE"):
-            dm = DataManager()
-            full_data = dm.get_full_data()
-            train_len = int(len(full_data) * 0.7)
-            train_data = full_data.iloc[:train_len]
-            
-            # Hack config (pour session actuelle)
-            Config.GA_POPULATION = pop_size
-            Config.GA_GENERATIONS = generations
-            
-            status_container = st.empty()
-            status_container.markdown("<div style='color: #FDD835; font-family: Roboto Mono;'>PROCESSING...</div>", unsafe_allow_html=True)
-            
             try:
-                ga = GAEcosystem(train_data)
-                pop, log = ga.run_evolution(verbose=True)
-                
-                status_container.markdown("<div style='color: #4CAF50; font-family: Roboto Mono;'>SEQUENCE COMPLETED</div>", unsafe_allow_html=True)
-                
-                best_ind = max(pop, key=lambda ind: ind.fitness.values[0])
-                st.session_state['best_params'] = decode_chromosome(best_ind)
-                st.session_state['best_fitness'] = best_ind.fitness.values[0]
-                st.session_state['ga_log'] = log # Sauvegarde pour les stats
-                
-            except Exception as e:
-                status_container.error(f"RUNTIME ERROR: {e}")
-                import traceback
-                st.code(traceback.format_exc())
+                get_job_runner().submit('ga', AssetConfig(ticker, population=int(pop_size),
+                                                          generations=int(generations), train_ratio=0.7))
+            except RuntimeError as e:
+                st.warning(f"SEQUENCE REFUSED: {e}")
+
+        render_jobs('ga')
                 
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -300,7 +388,7 @@ with tab2:
     with col_opt_right:
         if 'best_params' in st.session_state:
             st.markdown("<div class='projetstyle-box'>", unsafe_allow_html=True)
-            st.markdown("### OPTIMIZED GENOME")
+            st.markdown(f"### OPTIMIZED GENOME · {st.session_state.get('ga_ticker', ticker)}")
             
             p = st.session_state['best_params']
             
@@ -315,9 +403,7 @@ with tab2:
             # --- Graphique de Convergence ---
             if 'ga_log' in st.session_state:
                 log = st.session_state['ga_log']
-                gen = log.select("gen")
-                avg = log.select("avg")
-                max_ = log.select("max")
+                gen, avg, max_ = log['gen'], log['avg'], log['max']
                 
                 fig_ga = go.Figure()
                 fig_ga.add_trace(go.Scatter(x=gen, y=max_, mode='lines', name='Max Profit', line=dict(color='#4CAF50', width=2)))
@@ -333,6 +419,51 @@ with tab2:
                     margin=dict(l=0, r=0, t=30, b=0)
                 )
                 st.plotly_chart(fig_ga, use_container_width=True)
+
+            # --- Instrumentation de l'exécution (voir src/telemetry.py) ---
+            if st.session_state.get('ga_run_telemetry'):
+                run = st.session_state['ga_run_telemetry']
+                records = st.session_state['ga_telemetry']
+
+                t1, t2, t3, t4 = st.columns(4)
+                t1.metric("EVALS/SEC", f"{run['evals_per_sec']:.0f}")
+                t2.metric("CACHE HIT", f"{run['hit_rate']*100:.1f}%")
+                t3.metric("FAILED", f"{run['failed_fallback']} / {run['failed_error']}",
+                          help="Fallback (-100, 100) / errors (-inf, inf)")
+                t4.metric("PEAK RSS", f"{run['peak_rss_mb']:.0f} MB" if run['peak_rss_mb'] else "N/A")
+
+                gens = [r['gen'] for r in records]
+                fig_perf = make_subplots(specs=[[{"secondary_y": True}]])
+                fig_perf.add_trace(go.Bar(x=gens, y=[r['evaluated'] for r in records], name='Backtests',
+                                          marker_color='#333'), secondary_y=False)
+                fig_perf.add_trace(go.Scatter(x=gens, y=[r['evals_per_sec'] for r in records], mode='lines+markers',
+                                              name='Evals/s', line=dict(color='#FDD835', width=2)), secondary_y=True)
+                fig_perf.update_layout(
+                    title="EVALUATION THROUGHPUT (PER GENERATION)",
+                    template="plotly_dark",
+                    height=250,
+                    plot_bgcolor='#0a0a0a',
+                    paper_bgcolor='#0a0a0a',
+                    font=dict(family="Roboto Mono", color="#aaa"),
+                    margin=dict(l=0, r=0, t=30, b=0)
+                )
+                st.plotly_chart(fig_perf, use_container_width=True)
+
+                # Répartition du temps par phase (les phases du backtest sont incluses dans 'evaluation')
+                phases = sorted(run['phases'].items(), key=lambda item: item[1]['total_s'])
+                fig_phase = go.Figure(go.Bar(
+                    x=[t['total_s'] for _, t in phases], y=[p.upper() for p, _ in phases], orientation='h',
+                    marker_color='#4CAF50', text=[f"{t['calls']} calls" for _, t in phases], textposition='auto'))
+                fig_phase.update_layout(
+                    title="TIME PER PHASE (S)",
+                    template="plotly_dark",
+                    height=250,
+                    plot_bgcolor='#0a0a0a',
+                    paper_bgcolor='#0a0a0a',
+                    font=dict(family="Roboto Mono", color="#aaa"),
+                    margin=dict(l=0, r=0, t=30, b=0)
+                )
+                st.plotly_chart(fig_phase, use_container_width=True)
             
             st.markdown("</div>", unsafe_allow_html=True)
         else:
@@ -349,24 +480,13 @@ with tab3:
     """, unsafe_allow_html=True)
     
     if st.button("EXECUTE WFA PROTOCOL"):
-        with st.spinner("EXECUTING ROLLING ANALYSIS... THIS MAY TAKE TIME."):
-            try:
-                dm = DataManager()
-                
-                # Mise à jour config temporaire
-                Config.WFA_TRAIN_MONTHS = wfa_train
-                Config.WFA_TEST_MONTHS = wfa_test
-                
-                wfa = WalkForwardAnalyzer(dm)
-                results = wfa.run_analysis()
-                
-                st.session_state['wfa_results'] = results
-                st.success("PROTOCOL COMPLETE")
-                
-            except Exception as e:
-                st.error(f"WFA ERROR: {e}")
-                import traceback
-                st.code(traceback.format_exc())
+        try:
+            get_job_runner().submit('wfa', AssetConfig(ticker), train_months=int(wfa_train),
+                                    test_months=int(wfa_test))
+        except RuntimeError as e:
+            st.warning(f"PROTOCOL REFUSED: {e}")
+
+    render_jobs('wfa')
     
     # --- Visualisation des Résultats WFA ---
     if 'wfa_results' in st.session_state and st.session_state['wfa_results']:
@@ -429,4 +549,11 @@ with tab3:
     elif 'wfa_results' in st.session_state and not st.session_state['wfa_results']:
         st.warning("NO RESULTS GENERATED. CHECK DATA RANGE.")
         
-    st.markdown("</div>", unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+# --- SUIVI DES JOBS ---
+# Tant qu'un job tourne, la page est réexécutée pour afficher sa progression
+if get_job_runner().poll():
+    time.sleep(Config.JOBS_POLL_S)
+    st.rerun()
@@ -7,17 +7,46 @@ Il orchestre l'exécution du système selon différents modes définis par l'uti
 2. Simple : Lancement d'une optimisation génétique unique sur une période donnée.
 3. WFA : Exécution complète de l'analyse Walk-Forward pour valider la robustesse.
 4. All : Exécution séquentielle de tous les modes.
+5. Refresh : Mise à jour incrémentale du cache de données (nouvelles barres uniquement),
+   pour l'actif configuré ou, en parallèle, pour une liste d'actifs (--tickers).
+6. Universe : Optimisation (simple ou WFA) de chaque actif d'un univers (--tickers ou
+   --universe-dir) et tableau de résultats consolidé.
+7. Portfolio : Optimisation d'un génome commun à plusieurs actifs partageant la même
+   trésorerie, puis test Out-Of-Sample avec contribution de chaque actif.
+8. Imports : Coût des imports de chaque mode (diagnostic du temps de démarrage).
+9. Evals : Contenu de la base des évaluations (--eval-store) : meilleurs génomes
+   évalués et derniers backtests détaillés de l'actif.
+
+Avec --checkpoint, les modes Simple et WFA enregistrent des points de reprise dans
+Config.CHECKPOINT_DIR (supprimés en fin d'exécution) : une exécution interrompue est
+reprise avec --resume.
+
+Les sous-systèmes lourds (AG et backtrader, WFA, yfinance...) sont importés par les
+fonctions des modes qui les utilisent : chaque mode ne paie que ses propres imports.
 
 Usage :
-    python main.py --mode [test|simple|wfa|all]
+    python main.py --mode [test|simple|wfa|all|refresh|universe|portfolio|imports|evals] [--tickers BTC-USD ETH-USD ...]
+    python main.py --mode universe --universe-dir data --universe-run wfa
+    python main.py --mode portfolio --tickers BTC-USD ETH-USD SOL-USD --allocation equal
+    python main.py --mode simple --eval-store results/evaluations.sqlite
+    python main.py --mode wfa --checkpoint
+    python main.py --mode wfa --resume
 """
 import argparse
 import sys
-from src.config import Config
-from src.data_manager import DataManager
-from src.ga_core import GAEcosystem
-from src.walk_forward import WalkForwardAnalyzer
-from src.strategy_genes import decode_chromosome
+from src.config import AssetConfig, Config
+
+# Modules importés par chaque mode (imports locaux des fonctions ci-dessous), mesurés par le mode 'imports'
+MODE_MODULES = {
+    'test': ['src.data_manager'],
+    'simple': ['src.data_manager', 'src.checkpoint', 'src.ga_core', 'src.strategy_genes', 'src.backtest_runner'],
+    'wfa': ['src.data_manager', 'src.checkpoint', 'src.walk_forward'],
+    'refresh': ['src.data_manager', 'src.bulk_loader'],
+    'universe': ['src.universe'],
+    'portfolio': ['src.portfolio_backtest', 'src.universe', 'src.ga_core', 'src.strategy_genes'],
+    'dashboard': ['streamlit', 'plotly.graph_objects', 'plotly.subplots', 'src.data_manager', 'src.chart_sampling'],
+    'evals': ['src.eval_store'],
+}
 
 def setup_argparse():
     """
@@ -30,8 +59,55 @@ def setup_argparse():
 
     # Argument 'mode' : détermine quelle partie du programme exécuter.
     # Par défaut, le mode 'simple' est sélectionné.
-    parser.add_argument('--mode', type=str, choices=['test', 'simple', 'wfa', 'all'], 
+    parser.add_argument('--mode', type=str, choices=['test', 'simple', 'wfa', 'all', 'refresh', 'universe',
+                                                        'portfolio', 'imports', 'evals'],
                         default='simple', help='Execution mode')
+    # Argument 'tickers' : liste d'actifs rafraîchis en parallèle (mode 'refresh')
+    parser.add_argument('--tickers', type=str, nargs='+', default=None,
+                        help='Tickers to refresh concurrently (refresh mode), to optimize (universe mode) '
+                             'or forming the portfolio (portfolio mode)')
+    # Options des modes 'universe' et 'portfolio'
+    parser.add_argument('--universe-dir', type=str, default=None,
+                        help='Directory of cached data files defining the universe (universe and portfolio modes)')
+    parser.add_argument('--universe-run', type=str, choices=['simple', 'wfa'], default='simple',
+                        help='Optimization run for each asset (universe mode)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Assets optimized in parallel (universe mode) or GA evaluation processes '
+                             '(portfolio mode), 0 = all cores')
+    parser.add_argument('--memory-mb', type=int, default=None,
+                        help='Memory budget of the universe workers in MB (universe mode)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Consolidated results CSV (universe mode)')
+    # Option du mode 'portfolio'
+    parser.add_argument('--allocation', type=str, choices=['equal', 'cash', 'unit'], default=None,
+                        help='Capital allocation rule of the shared cash (portfolio mode)')
+    # Instrumentation (voir src/telemetry.py)
+    parser.add_argument('--telemetry', type=str, default=None,
+                        help='Append per-generation and per-window metrics to this JSON lines file')
+    parser.add_argument('--prometheus', type=str, default=None,
+                        help='Write run metrics to this Prometheus text file')
+    # Mode longue durée (voir src/memory_guard.py)
+    parser.add_argument('--long-run', action='store_true',
+                        help='Bounded-memory mode: logbooks spilled to disk, Pareto archive, RSS watchdog')
+    parser.add_argument('--memory-limit', type=int, default=None,
+                        help='RSS ceiling in MB enforced by the long-run watchdog')
+    # Base des évaluations (voir src/eval_store.py)
+    parser.add_argument('--eval-store', type=str, default=None,
+                        help='SQLite file recording every evaluated genome and detailed backtest, '
+                             'reused by later runs (read by evals mode)')
+    # Représentation de la population (voir src/array_population.py)
+    parser.add_argument('--ga-backend', type=str, choices=['deap', 'array'], default=None,
+                        help='GA population backend: DEAP individuals or NumPy structured array '
+                             '(vectorized crossover and mutation)')
+    parser.add_argument('--ga-selection', type=str, choices=['deap', 'fast'], default=None,
+                        help='NSGA-II selection: DEAP selNSGA2 or vectorized O(N log N) sort (same selection)')
+    # Points de reprise (voir src/checkpoint.py)
+    parser.add_argument('--checkpoint', action='store_true',
+                        help='Write simple/wfa checkpoints to Config.CHECKPOINT_DIR '
+                             '(removed once the run completes)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume an interrupted simple/wfa run from its last checkpoint '
+                             '(implies --checkpoint)')
     
     return parser.parse_args()
 
@@ -42,6 +118,8 @@ def test_data_download():
     Ce mode est utile pour s'assurer que l'API Yahoo Finance répond correctement
     et que les données sont bien mises en cache avant de lancer des calculs lourds.
     """
+    from src.data_manager import DataManager
+
     print("\n" + "="*70)
     print("TEST DE TÉLÉCHARGEMENT DES DONNÉES")
     print("="*70)
@@ -60,7 +138,116 @@ def test_data_download():
     else:
         print("Erreur : Aucune donnée trouvée.")
 
-def run_simple_ga(dm):
+def refresh_data(dm, tickers=None):
+    """
+    Mode 'Refresh' : Ajoute au cache local les barres publiées depuis le dernier téléchargement.
+
+    Seules les barres récentes (et quelques barres de recouvrement, contrôlées) sont
+    demandées à la source de données.
+
+    Args:
+        dm (DataManager): Le gestionnaire de données initialisé.
+        tickers (list, optional): Actifs à rafraîchir en parallèle (voir BulkLoader)
+            au lieu de l'actif configuré.
+    """
+    print("\n" + "="*70)
+    print("MISE À JOUR INCRÉMENTALE DES DONNÉES")
+    print("="*70)
+    if tickers:
+        from src.bulk_loader import BulkLoader
+        report = BulkLoader().load(tickers, refresh=True)
+        for ticker, result in report.items():
+            print(f"{ticker:<10} : {result['status']:<10} {result['rows']} nouvelle(s) barre(s)")
+        return
+    added = dm.refresh()
+    data = dm.get_full_data()
+    print(f"Nouvelles barres : {added}")
+    if not data.empty:
+        print(f"Plage       : {data.index[0]} à {data.index[-1]}")
+
+def run_universe(args):
+    """
+    Mode 'Universe' : Optimise chaque actif d'un univers et consolide les résultats.
+
+    L'univers est la liste --tickers (caches de Config.DATA_DIR) ou l'ensemble des
+    actifs en cache dans --universe-dir. Chaque actif reçoit sa propre configuration
+    (AssetConfig) : la configuration globale n'est pas modifiée.
+
+    Args:
+        args (argparse.Namespace): Arguments de la ligne de commande.
+    """
+    from src.universe import UniverseRunner, universe_tickers
+
+    print("\n" + "="*70)
+    print("OPTIMISATION D'UN UNIVERS D'ACTIFS")
+    print("="*70)
+    data_dir = args.universe_dir or Config.DATA_DIR
+    tickers = args.tickers or universe_tickers(data_dir)
+    if not tickers:
+        print(f"Erreur : Aucun actif trouvé dans {data_dir}.")
+        return
+    assets = [AssetConfig(ticker, data_dir=data_dir, 
+                          seed=None if Config.WFA_SEED is None else Config.WFA_SEED + i)
+              for i, ticker in enumerate(tickers)]
+    runner = UniverseRunner(assets, mode=args.universe_run, workers=args.workers,
+                            memory_mb=args.memory_mb)
+    table = runner.run(output=args.output)
+    ok = table[table['status'] == 'ok']
+    if not ok.empty:
+        print("\nMeilleurs actifs (profit Out-Of-Sample) :")
+        print(ok.sort_values('profit_pct', ascending=False)
+                .head(10)[['ticker', 'bars', 'profit_pct', 'max_drawdown', 'trades']]
+                .to_string(index=False))
+
+def run_portfolio(args):
+    """
+    Mode 'Portfolio' : Optimise un génome commun sur un portefeuille à trésorerie partagée.
+
+    Les actifs (--tickers, ou tout --universe-dir) sont alignés sur leurs dates communes ;
+    l'AG est entraîné sur la première partie du portefeuille, le meilleur génome est
+    ensuite testé sur la seconde avec le détail de la contribution de chaque actif.
+
+    Args:
+        args (argparse.Namespace): Arguments de la ligne de commande.
+    """
+    from src.ga_core import GAEcosystem
+    from src.portfolio_backtest import PortfolioData, run_portfolio_backtest
+    from src.strategy_genes import decode_chromosome
+    from src.universe import universe_tickers
+
+    print("\n" + "="*70)
+    print("OPTIMISATION D'UN PORTEFEUILLE MULTI-ACTIFS")
+    print("="*70)
+    data_dir = args.universe_dir or Config.DATA_DIR
+    tickers = args.tickers or universe_tickers(data_dir)
+    if not tickers:
+        print(f"Erreur : Aucun actif trouvé dans {data_dir}.")
+        return
+    portfolio = PortfolioData.from_tickers(tickers, data_dir=data_dir, allocation=args.allocation)
+    train, test = portfolio.split(Config.TRAIN_RATIO)
+    print(f"Portefeuille : {portfolio} - allocation '{portfolio.allocation}'")
+    print(f"Train : {len(train)} barres, Test : {len(test)} barres")
+
+    ga = GAEcosystem(train, engine='vector', workers=args.workers)
+    pop, _ = ga.run_evolution(verbose=True)
+    best_ind = max(pop, key=lambda ind: ind.fitness.values[0])
+    best_params = decode_chromosome(best_ind)
+    print(f"\nMeilleurs paramètres : {best_params}")
+    print(f"Fitness In-Sample : {best_ind.fitness.values}")
+
+    result = run_portfolio_backtest(best_params, test)
+    print("\n" + "="*70)
+    print("RÉSULTATS DU TEST OUT-OF-SAMPLE (PORTEFEUILLE)")
+    print("="*70)
+    print(f"Valeur finale : {result['final_value']:.2f} ({result['profit_pct']:.2f}%)")
+    print(f"Drawdown max  : {result['max_drawdown']:.2f}%")
+    print(f"Trades        : {result['total_trades']} clôturés, {result['open_trades']} ouverts")
+    print("\nContribution par actif :")
+    for ticker, c in sorted(result['contribution'].items(), key=lambda kv: -kv[1]['pnl']):
+        print(f"  {ticker:<12} {c['pnl']:>10.2f} ({c['contribution_pct']:+.2f}%)  "
+              f"{c['trades']} trades, exposition {c['exposure_pct']:.1f}%")
+
+def run_simple_ga(dm, checkpoint=False, resume=False):
     """
     Mode 'Simple' : Lance une optimisation génétique classique.
     
@@ -70,7 +257,15 @@ def run_simple_ga(dm):
 
     Args:
         dm (DataManager): Le gestionnaire de données initialisé.
+        checkpoint (bool): Enregistre des points de reprise pendant l'évolution.
+        resume (bool): Reprend l'évolution depuis son dernier point de reprise
+            (implique `checkpoint`).
     """
+    from src.checkpoint import checkpoint_path
+    from src.ga_core import GAEcosystem
+    from src.strategy_genes import decode_chromosome
+    from src.backtest_runner import run_simple_backtest
+
     print("\n" + "="*70)
     print("LANCEMENT DE L'ALGORITHME GÉNÉTIQUE (MODE SIMPLE)")
     print("="*70)
@@ -90,7 +285,8 @@ def run_simple_ga(dm):
     
     # Utilisation de l'écosystème génétique
     ga = GAEcosystem(train_data)
-    pop, log = ga.run_evolution(verbose=True)
+    path = checkpoint_path(f"ga_{dm.ticker}_{dm.interval}") if checkpoint or resume else None
+    pop, log = ga.run_evolution(verbose=True, checkpoint=path, resume=resume)
     
     print("\nÉvolution terminée !")
     
@@ -108,14 +304,12 @@ def run_simple_ga(dm):
     
     # 4. Validation (Test Out-Of-Sample)
     # On applique les paramètres trouvés sur les données "inconnues" (Test)
-    from src.backtest_runner import run_simple_backtest
-    
     print("\n" + "="*70)
     print("RÉSULTATS DU TEST OUT-OF-SAMPLE")
     print("="*70)
     run_simple_backtest(best_params, test_data, verbose=True)
 
-def run_walk_forward(dm):
+def run_walk_forward(dm, checkpoint=False, resume=False):
     """
     Mode 'WFA' : Lance l'analyse de robustesse complète (Walk-Forward Analysis).
     
@@ -124,10 +318,69 @@ def run_walk_forward(dm):
 
     Args:
         dm (DataManager): Le gestionnaire de données initialisé.
+        checkpoint (bool): Enregistre un point de reprise après chaque fenêtre.
+        resume (bool): Reprend l'analyse depuis son dernier point de reprise
+            (implique `checkpoint`).
     """
+    from src.checkpoint import checkpoint_path
+    from src.walk_forward import WalkForwardAnalyzer
+
     # Utilisation de l'analyseur WFA dédié
     wfa = WalkForwardAnalyzer(dm)
-    wfa.run_analysis()
+    path = checkpoint_path(f"wfa_{dm.ticker}_{dm.interval}") if checkpoint or resume else None
+    wfa.run_analysis(checkpoint=path, resume=resume)
+
+def show_import_costs():
+    """
+    Mode 'Imports' : Affiche le coût des imports de chaque mode.
+
+    Chaque mode est mesuré dans un interpréteur neuf (python -X importtime) ; le temps
+    est attribué aux paquets chargés (pandas, backtrader, deap, yfinance...) et aux
+    modules du projet.
+    """
+    from src.import_profile import print_import_breakdown
+
+    print("\n" + "="*70)
+    print("COÛT DES IMPORTS PAR MODE")
+    print("="*70)
+    print_import_breakdown(MODE_MODULES)
+
+def show_eval_store(tickers=None, top=10):
+    """
+    Mode 'Evals' : Affiche le contenu de la base des évaluations.
+
+    Pour chaque actif (--tickers, ou l'actif configuré) : les génomes évalués les plus
+    rentables et les derniers backtests détaillés (run_simple_backtest).
+
+    Args:
+        tickers (list, optional): Actifs à détailler. Par défaut Config.TICKER.
+        top (int): Lignes affichées par tableau.
+    """
+    from src.eval_store import get_eval_store
+
+    print("\n" + "="*70)
+    print("BASE DES ÉVALUATIONS")
+    print("="*70)
+    store = get_eval_store()
+    if store is None:
+        print("Erreur : Aucune base configurée (--eval-store ou Config.EVAL_STORE_PATH).")
+        return
+    stats = store.stats()
+    print(f"Fichier     : {store.path}")
+    print(f"Évaluations : {stats['evaluations']} - Backtests détaillés : {stats['reports']}")
+    for asset, count in stats['assets'].items():
+        print(f"  {asset:<16} {count} évaluations")
+    for ticker in tickers or [Config.TICKER]:
+        evaluations = store.evaluations(ticker=ticker, limit=top)
+        if not evaluations.empty:
+            print(f"\nMeilleurs génomes évalués ({ticker}) :")
+            print(evaluations[['slice_start', 'slice_end', 'engine_version', 'profit', 'drawdown', 'params']]
+                  .to_string(index=False))
+        reports = store.reports(ticker=ticker, limit=top)
+        if not reports.empty:
+            print(f"\nDerniers backtests détaillés ({ticker}) :")
+            print(reports[['created', 'trading_start', 'slice_end', 'profit_pct', 'max_drawdown',
+                           'total_trades', 'win_rate']].to_string(index=False))
 
 def main():
     """
@@ -136,6 +389,20 @@ def main():
     la fonction correspondant au mode choisi.
     """
     args = setup_argparse()
+    if args.telemetry:
+        Config.TELEMETRY_FILE = args.telemetry
+    if args.prometheus:
+        Config.TELEMETRY_PROMETHEUS_FILE = args.prometheus
+    if args.long_run:
+        Config.LONGRUN_MODE = True
+    if args.memory_limit is not None:
+        Config.LONGRUN_MEMORY_MB = args.memory_limit
+    if args.eval_store:
+        Config.EVAL_STORE_PATH = args.eval_store
+    if args.ga_backend:
+        Config.GA_BACKEND = args.ga_backend
+    if args.ga_selection:
+        Config.GA_SELECTION = args.ga_selection
     
     print("\n" + "="*70)
     print("SYSTÈME DE TRADING PAR ALGORITHME GÉNÉTIQUE - GROUPE JVX")
@@ -144,21 +411,35 @@ def main():
     print(f"Mode Choisi : {args.mode}")
     print("="*70)
     
-    dm = DataManager()
+    # Gestionnaire de données des modes mono-actif (importé seulement pour ces modes)
+    dm = None
+    if args.mode in ('simple', 'wfa', 'refresh', 'all'):
+        from src.data_manager import DataManager
+        dm = DataManager()
     
     try:
         # Aiguillage selon le mode
         if args.mode == 'test':
             test_data_download()
         elif args.mode == 'simple':
-            run_simple_ga(dm)
+            run_simple_ga(dm, args.checkpoint, args.resume)
         elif args.mode == 'wfa':
-            run_walk_forward(dm)
+            run_walk_forward(dm, args.checkpoint, args.resume)
+        elif args.mode == 'refresh':
+            refresh_data(dm, args.tickers)
+        elif args.mode == 'universe':
+            run_universe(args)
+        elif args.mode == 'portfolio':
+            run_portfolio(args)
+        elif args.mode == 'imports':
+            show_import_costs()
+        elif args.mode == 'evals':
+            show_eval_store(args.tickers)
         elif args.mode == 'all':
             # Exécute toute la pipeline pour une vérification complète
             test_data_download()
-            run_simple_ga(dm)
-            run_walk_forward(dm)
+            run_simple_ga(dm, args.checkpoint, args.resume)
+            run_walk_forward(dm, args.checkpoint, args.resume)
             
         print("\n" + "="*70)
         print("FIN DE L'EXÉCUTION DU PROGRAMME")
@@ -0,0 +1,174 @@
+"""
+Module Array Population.
+Ce module représente une population de l'AG par un tableau structuré NumPy
+(gènes, objectifs, validité) au lieu d'une liste d'objets creator.Individual.
+Le croisement à deux points et la mutation mixte entiers/flottants de GAEcosystem
+sont appliqués à toute la génération en une fois, sans clone ni allocation par
+individu. Les tirages aléatoires viennent de np.random (graine : np.random.seed).
+"""
+from typing import Dict, List
+import numpy as np
+from src.deap_types import creator
+from src import nsga2
+
+# Ordre des gènes d'un chromosome (voir decode_chromosome)
+GENE_NAMES = ('SMA_F', 'SMA_S', 'RSI_P', 'RSI_UP', 'RSI_LO', 'SL', 'TP')
+# Les premiers gènes sont entiers (périodes et seuils), les suivants flottants (SL, TP)
+N_INT_GENES = 5
+# Objectifs de la fitness : (profit_pct, max_drawdown_pct)
+N_OBJECTIVES = 2
+
+# Une ligne par individu : gènes, fitness et validité de la fitness
+POPULATION_DTYPE = np.dtype([
+    ('genes', np.float64, (len(GENE_NAMES),)),
+    ('fitness', np.float64, (N_OBJECTIVES,)),
+    ('valid', np.bool_),
+])
+
+
+def random_population(n: int, bounds: Dict[str, tuple]) -> np.ndarray:
+    """
+    Tire une population aléatoire dans les bornes des gènes.
+
+    Args:
+        n (int): Nombre d'individus.
+        bounds (Dict[str, tuple]): Bornes (incluses) de chaque gène (Config.GENE_BOUNDS).
+
+    Returns:
+        np.ndarray: Population (POPULATION_DTYPE), fitness invalides.
+    """
+    pop = np.zeros(n, dtype=POPULATION_DTYPE)
+    for j, name in enumerate(GENE_NAMES):
+        low, high = bounds[name]
+        if j < N_INT_GENES:
+            pop['genes'][:, j] = np.random.randint(low, high + 1, size=n)
+        else:
+            pop['genes'][:, j] = np.random.uniform(low, high, size=n)
+    return pop
+
+
+def from_individuals(individuals) -> np.ndarray:
+    """
+    Convertit des individus DEAP (ex: population de seed_population) en tableau.
+
+    Args:
+        individuals: Individus (listes de gènes avec attribut fitness).
+
+    Returns:
+        np.ndarray: Population (POPULATION_DTYPE) ; les fitness valides sont conservées.
+    """
+    pop = np.zeros(len(individuals), dtype=POPULATION_DTYPE)
+    for i, ind in enumerate(individuals):
+        pop['genes'][i] = ind
+        if ind.fitness.valid:
+            pop['fitness'][i] = ind.fitness.values
+            pop['valid'][i] = True
+    return pop
+
+
+def to_individuals(pop: np.ndarray) -> List:
+    """
+    Convertit un tableau en individus DEAP (gènes entiers restitués en int).
+
+    Args:
+        pop (np.ndarray): Population (POPULATION_DTYPE).
+
+    Returns:
+        list: Une liste de creator.Individual, fitness renseignées si valides.
+    """
+    individuals = []
+    for genes, fitness, valid in zip(pop['genes'].tolist(), pop['fitness'].tolist(), pop['valid'].tolist()):
+        ind = creator.Individual([int(g) for g in genes[:N_INT_GENES]] + genes[N_INT_GENES:])
+        if valid:
+            ind.fitness.values = tuple(fitness)
+        individuals.append(ind)
+    return individuals
+
+
+def cx_two_point(genes: np.ndarray, first: np.ndarray):
+    """
+    Croisement à deux points (tools.cxTwoPoint) de paires d'individus, en place.
+
+    Args:
+        genes (np.ndarray): Matrice (N, gènes) de la population.
+        first (np.ndarray): Indices du premier individu de chaque paire (croisé avec le suivant).
+    """
+    size = genes.shape[1]
+    cut1 = np.random.randint(1, size + 1, size=len(first))
+    cut2 = np.random.randint(1, size, size=len(first))
+    cut2 = np.where(cut2 >= cut1, cut2 + 1, cut2)
+    low, high = np.minimum(cut1, cut2), np.maximum(cut1, cut2)
+    columns = np.arange(size)
+    swap = (columns >= low[:, None]) & (columns < high[:, None])
+    a, b = genes[first], genes[first + 1]
+    genes[first] = np.where(swap, b, a)
+    genes[first + 1] = np.where(swap, a, b)
+
+
+def mutate(genes: np.ndarray, rows: np.ndarray, indpb: float = 0.2):
+    """
+    Mutation mixte de GAEcosystem._custom_mutation, appliquée aux lignes `rows` en place.
+
+    Chaque gène mute avec la probabilité `indpb` : pas entier de -5 à +5 (borné à 5)
+    pour les gènes entiers, bruit gaussien d'écart-type 0.02 (borné à 0.01) pour SL/TP.
+
+    Args:
+        genes (np.ndarray): Matrice (N, gènes) de la population.
+        rows (np.ndarray): Indices des individus à muter.
+        indpb (float): Probabilité de mutation par gène.
+    """
+    current = genes[rows]
+    hit = np.random.random_sample(current.shape) < indpb
+    ints = current[:, :N_INT_GENES]
+    steps = np.random.randint(-5, 6, size=ints.shape)
+    ints = np.where(hit[:, :N_INT_GENES], np.maximum(ints + steps, 5), ints)
+    floats = current[:, N_INT_GENES:]
+    noise = np.random.normal(0.0, 0.02, size=floats.shape)
+    floats = np.where(hit[:, N_INT_GENES:], np.maximum(floats + noise, 0.01), floats)
+    genes[rows] = np.concatenate([ints, floats], axis=1)
+
+
+def var_and(pop: np.ndarray, cxpb: float, mutpb: float, indpb: float = 0.2) -> np.ndarray:
+    """
+    Variation de algorithms.varAnd : croisement des paires (0, 1), (2, 3)... puis mutation.
+
+    Args:
+        pop (np.ndarray): Individus sélectionnés (copiés, non modifiés).
+        cxpb (float): Probabilité de croisement d'une paire.
+        mutpb (float): Probabilité de mutation d'un individu.
+        indpb (float): Probabilité de mutation par gène.
+
+    Returns:
+        np.ndarray: Descendants ; la fitness des individus modifiés est invalidée.
+    """
+    offspring = pop.copy()
+    genes, valid = offspring['genes'], offspring['valid']
+    first = np.arange(0, len(offspring) - 1, 2)
+    first = first[np.random.random_sample(len(first)) < cxpb]
+    if len(first):
+        cx_two_point(genes, first)
+        valid[first] = False
+        valid[first + 1] = False
+    rows = np.flatnonzero(np.random.random_sample(len(offspring)) < mutpb)
+    if len(rows):
+        mutate(genes, rows, indpb)
+        valid[rows] = False
+    return offspring
+
+
+def select_nsga2(fitness: np.ndarray, k: int, fast: bool = False) -> np.ndarray:
+    """
+    Sélection NSGA-II sur la matrice des objectifs.
+
+    Args:
+        fitness (np.ndarray): Matrice (N, 2) des objectifs (profit, drawdown).
+        k (int): Nombre d'individus à sélectionner.
+        fast (bool): Tri non dominé vectorisé (voir src/nsga2.py) au lieu de tools.selNSGA2 ;
+            la sélection est la même.
+
+    Returns:
+        np.ndarray: Indices des individus sélectionnés.
+    """
+    if fast:
+        return nsga2.select_nsga2(fitness, k)
+    return nsga2.deap_select_nsga2(fitness, k)
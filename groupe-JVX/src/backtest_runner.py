@@ -9,8 +9,15 @@ import datetime
 import traceback
 from typing import Tuple, Dict
 from src.strategy_genes import GeneticStrategy
+from src.vector_backtest import vector_fitness
+from src.trade_ledger import find_trade_ledger, get_trade_ledger
+from src.eval_store import get_eval_store
+from src.telemetry import get_telemetry
 from src.config import Config
 
+# Moteurs de backtest disponibles pour l'évaluation de fitness
+ENGINES = ('backtrader', 'vector')
+
 #
 #
 #
@@ -31,47 +38,78 @@ class PandasData(bt.feeds.PandasData):
     )
 
 
-def run_backtest(params: Dict[str, float], data_feed: pd.DataFrame) -> Tuple[float, float]:
+def run_backtest(params: Dict[str, float], data_feed: pd.DataFrame,
+                 engine: str = None, use_ledger: bool = None,
+                 history: pd.DataFrame = None) -> Tuple[float, float]:
     """
     Exécute un backtest simplifié pour l'évaluation de l'algorithme génétique.
 
     Args:
         params (Dict[str, float]): Dictionnaire des paramètres de la stratégie (SMA, RSI, SL, TP).
         data_feed (pd.DataFrame): Données historiques du marché.
+        engine (str, optional): 'backtrader' ou 'vector'. Par défaut Config.get_backtest_engine().
+        use_ledger (bool, optional): Si True et que ce génome a déjà été simulé sur un
+            historique contenant `data_feed` (voir get_trade_ledger), répond depuis son
+            journal de trades sans relancer de backtest. Par défaut Config.TRADE_LEDGER_ENABLED.
+        history (pd.DataFrame, optional): Historique complet contenant `data_feed` : avec
+            les journaux, celui du génome y est construit s'il n'existe pas encore.
 
     Returns:
         Tuple[float, float]: Un couple (profit_pourcentage, drawdown_maximal).
         En cas d'échec ou d'absence de trade, retourne (-100.0, 100.0).
+
+    Raises:
+        ValueError: Si `engine` n'est pas un moteur de ENGINES.
     """
+    engine = engine or Config.get_backtest_engine()
+    use_ledger = Config.TRADE_LEDGER_ENABLED if use_ledger is None else use_ledger
+    # Hors du try : un moteur inconnu est une erreur de configuration, pas une fitness en erreur
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown backtest engine: {engine} (expected one of {ENGINES})")
     try:
         if data_feed.empty or len(data_feed) < 100:
             return (-100.0, 100.0)
+
+        telemetry = get_telemetry()
+        if use_ledger:
+            with telemetry.timer('ledger_eval'):
+                ledger = _trade_ledger(params, data_feed, history, Config.INITIAL_CASH)
+                fitness = ledger.fitness(data_feed) if ledger is not None else None
+            if fitness is not None:
+                return fitness
+
+        if engine == 'vector':
+            with telemetry.timer('vector_eval'):
+                return vector_fitness(params, data_feed)
+
+        with telemetry.timer('feed_construction'):
+            cerebro = bt.Cerebro()
+            cerebro.addstrategy(GeneticStrategy, **params)
+            data = PandasData(dataname=data_feed)
+            cerebro.adddata(data)
+            cerebro.broker.setcash(Config.INITIAL_CASH)
+            cerebro.broker.setcommission(commission=Config.get_commission())
+            cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
+            cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
         
-        cerebro = bt.Cerebro()
-        cerebro.addstrategy(GeneticStrategy, **params)
-        data = PandasData(dataname=data_feed)
-        cerebro.adddata(data)
-        cerebro.broker.setcash(Config.INITIAL_CASH)
-        cerebro.broker.setcommission(commission=Config.get_commission())
-        cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
-        cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
-        
-        results = cerebro.run()
+        with telemetry.timer('cerebro_run'):
+            results = cerebro.run()
         strat = results[0]
         
-        trade_analysis = strat.analyzers.trades.get_analysis()
-        total_trades = trade_analysis.get('total', {}).get('closed', 0)
-        
-        if total_trades == 0:
-            return (-100.0, 100.0)
-        
-        initial_value = cerebro.broker.get_cash() 
-        final_value = cerebro.broker.getvalue()
-        
-        profit_pct = ((final_value - Config.INITIAL_CASH) / Config.INITIAL_CASH) * 100.0
-        
-        dd_analysis = strat.analyzers.drawdown.get_analysis()
-        max_drawdown_pct = dd_analysis.get('max', {}).get('drawdown', 0.0)
+        with telemetry.timer('analyzers'):
+            trade_analysis = strat.analyzers.trades.get_analysis()
+            total_trades = trade_analysis.get('total', {}).get('closed', 0)
+            
+            if total_trades == 0:
+                return (-100.0, 100.0)
+            
+            initial_value = cerebro.broker.get_cash() 
+            final_value = cerebro.broker.getvalue()
+            
+            profit_pct = ((final_value - Config.INITIAL_CASH) / Config.INITIAL_CASH) * 100.0
+            
+            dd_analysis = strat.analyzers.drawdown.get_analysis()
+            max_drawdown_pct = dd_analysis.get('max', {}).get('drawdown', 0.0)
         
         if pd.isna(profit_pct) or pd.isna(max_drawdown_pct):
             return (-100.0, 100.0)
@@ -86,7 +124,9 @@ def run_simple_backtest(params: Dict[str, float],
                        data_feed: pd.DataFrame,
                        initial_cash: float = Config.INITIAL_CASH,
                        verbose: bool = True,
-                       trading_start_date: datetime.date = None) -> Dict: # [CORRECTION] Nouvel argument
+                       trading_start_date: datetime.date = None, # [CORRECTION] Nouvel argument
+                       use_ledger: bool = False,
+                       history: pd.DataFrame = None) -> Dict:
     """
     Exécute un backtest détaillé pour l'analyse finale ou l'affichage sur le dashboard.
 
@@ -99,9 +139,17 @@ def run_simple_backtest(params: Dict[str, float],
         verbose (bool): Si True, affiche les résultats dans la console.
         trading_start_date (datetime.date, optional): Date à laquelle les ordres commencent 
             réellement à être passés (après la période de warm-up).
+        use_ledger (bool): Si True, consulte le journal de trades du génome lorsqu'il couvre
+            `data_feed` (voir run_backtest). Désactivé par défaut : les métriques du journal
+            (drawdown du portefeuille continu, RSI initialisé plus tôt) ne sont pas celles d'un
+            backtest de la tranche, elles ne servent pas à la validation Out-Of-Sample.
+        history (pd.DataFrame, optional): Historique complet contenant `data_feed`, sur
+            lequel le journal du génome est construit au besoin.
 
     Returns:
         Dict: Dictionnaire contenant les métriques de performance (profit, trades, win_rate, etc.).
+        Le résultat est aussi enregistré dans la base des évaluations si Config.EVAL_STORE_PATH
+        est configuré (voir EvaluationStore.reports).
     """
     try:
         # Sécurité : Vérifier si on a assez de données pour les indicateurs
@@ -111,6 +159,15 @@ def run_simple_backtest(params: Dict[str, float],
             if verbose: print(f"Warning: Not enough data ({len(data_feed)}) for SMA_S ({max_period_needed}). Skipping.")
             raise ValueError("Not enough data for indicators")
 
+        if use_ledger:
+            ledger = _trade_ledger(params, data_feed, history, initial_cash)
+            results_dict = ledger.summary(data_feed, trading_start_date) if ledger is not None else None
+            if results_dict is not None:
+                if verbose:
+                    print(f"  > Result (ledger): Profit {results_dict['profit_pct']:.2f}% | Trades: {results_dict['total_trades']}")
+                _record_report(params, data_feed, results_dict, trading_start_date, initial_cash, 'ledger')
+                return results_dict
+
         cerebro = bt.Cerebro()
         
         strategy_params = params.copy()
@@ -161,6 +218,7 @@ def run_simple_backtest(params: Dict[str, float],
         if verbose:
             print(f"  > Result: Profit {results_dict['profit_pct']:.2f}% | Trades: {total_trades}")
         
+        _record_report(params, data_feed, results_dict, trading_start_date, initial_cash, 'backtrader')
         return results_dict
         
     except Exception as e:
@@ -175,4 +233,36 @@ def run_simple_backtest(params: Dict[str, float],
             'win_rate': 0.0,
             'initial_value': initial_cash,
             'final_value': initial_cash
-        }
\ No newline at end of file
+        }
+
+
+def _trade_ledger(params: Dict[str, float], data_feed: pd.DataFrame, history: pd.DataFrame,
+                  initial_cash: float):
+    """
+    Journal de trades du génome couvrant `data_feed` : construit sur `history` si
+    l'historique est fourni, sinon cherché parmi les journaux existants.
+
+    Returns:
+        TradeLedger: Le journal, ou None (aucun journal, ou simulation de l'historique
+            complet en échec : le backtest de la tranche est alors lancé normalement).
+    """
+    if history is None:
+        return find_trade_ledger(params, data_feed, initial_cash)
+    try:
+        return get_trade_ledger(params, history, initial_cash)
+    except Exception:
+        # Ex: RSI indéfini sur une portion de l'historique hors de la tranche
+        return None
+
+
+def _record_report(params: Dict[str, float], data_feed: pd.DataFrame, results: Dict,
+                   trading_start_date: datetime.date, initial_cash: float, engine: str):
+    """Enregistre un backtest détaillé dans la base des évaluations (si elle est configurée)."""
+    store = get_eval_store()
+    if store is None:
+        return
+    try:
+        store.record_report(params, data_feed, results, trading_start_date, initial_cash, engine)
+    except Exception as e:
+        # L'enregistrement sert au reporting : un échec n'invalide pas le backtest
+        print(f"Warning: backtest not recorded in the evaluation store ({e})")
@@ -0,0 +1,519 @@
+"""
+Module Benchmarks.
+Ce module mesure les performances du système hors ligne : latence d'une évaluation,
+débit de l'AG par génération, fenêtre WFA, mode simple complet, chargement des données,
+montée en charge (nombre de barres x taille de population), sélection NSGA-II selon la
+taille de population, graphique du dashboard (pleine résolution et réduit) et temps de démarrage. Les mesures s'appuient
+sur les caches CSV fournis dans data/ et sur le générateur de données synthétiques.
+Les résultats sont écrits en JSON et comparés à une référence avec un seuil de régression.
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+import numpy as np
+import pandas as pd
+from src.config import AssetConfig, Config
+from src.data_manager import DataManager
+
+# Racine du projet (répertoire de main.py)
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Tailles des mesures selon le profil : 'quick' pour une vérification rapide, 'full' sinon
+PROFILES = {
+    'quick': {'population': 16, 'generations': 2, 'wfa_population': 8, 'wfa_generations': 2,
+              'sweep_bars': (1000, 4000), 'sweep_population': (32, 128),
+              'selection_population': (100, 1000, 10000), 'chart_bars': (1_000_000,)},
+    'full': {'population': Config.GA_POPULATION, 'generations': Config.GA_GENERATIONS,
+             'wfa_population': 30, 'wfa_generations': 5,
+             'sweep_bars': (1000, 4000, 16000), 'sweep_population': (32, 128, 512),
+             'selection_population': (100, 1000, 2000, 10000, 100000),
+             'chart_bars': (1_000_000, 3_000_000)},
+}
+
+# Population au-delà de laquelle tools.selNSGA2 (O(N²)) n'est plus mesuré
+SELECTION_DEAP_MAX = 2000
+
+# Moteurs mesurés par défaut
+ENGINES = ('vector', 'backtrader')
+
+
+def metric(value: float, unit: str, better: str = 'lower', target: float = None) -> Dict:
+    """
+    Construit une mesure du rapport.
+
+    Args:
+        value (float): Valeur mesurée.
+        unit (str): Unité affichée (ex: 'ms', 'evals/s').
+        better (str): 'lower' si une valeur plus faible est meilleure, 'higher' sinon.
+        target (float, optional): Objectif absolu (à ne pas dépasser dans le sens de `better`).
+
+    Returns:
+        Dict: {'value', 'unit', 'better'} et 'target' si un objectif est fixé.
+    """
+    result = {'value': float(value), 'unit': unit, 'better': better}
+    if target is not None:
+        result['target'] = float(target)
+    return result
+
+
+def misses_target(m: Dict) -> bool:
+    """Indique si une mesure manque son objectif absolu (False si elle n'en a pas)."""
+    if m.get('target') is None:
+        return False
+    return m['value'] > m['target'] if m['better'] == 'lower' else m['value'] < m['target']
+
+
+def _timings(func: Callable, repeat: int, warmup: int = 1) -> List[float]:
+    """Durées (s) de `repeat` appels de `func`, après `warmup` appels non mesurés."""
+    for _ in range(warmup):
+        func()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _random_genomes(count: int, seed: int) -> List[list]:
+    """Génomes tirés uniformément dans Config.GENE_BOUNDS (même graine = mêmes génomes)."""
+    rng = random.Random(seed)
+    genomes = []
+    for _ in range(count):
+        genome = []
+        for name in ('SMA_F', 'SMA_S', 'RSI_P', 'RSI_UP', 'RSI_LO', 'SL', 'TP'):
+            low, high = Config.GENE_BOUNDS[name]
+            draw = rng.randint if isinstance(low, int) else rng.uniform
+            genome.append(draw(low, high))
+        genomes.append(genome)
+    return genomes
+
+
+class BenchmarkContext:
+    """
+    Paramètres partagés par les benchmarks : données, répétitions, profil, graine.
+
+    Les données de référence sont celles du cache de Config.TICKER dans Config.DATA_DIR
+    (fichiers fournis avec le projet) : aucun accès réseau n'est nécessaire.
+    """
+
+    def __init__(self, profile: str = 'quick', repeat: int = None, seed: int = None,
+                 engines: List[str] = None, ticker: str = None, data_dir: str = None):
+        """
+        Args:
+            profile (str): 'quick' ou 'full' (voir PROFILES).
+            repeat (int, optional): Répétitions des mesures unitaires. Par défaut Config.BENCH_REPEAT.
+            seed (int, optional): Graine des génomes et de l'AG. Par défaut Config.BENCH_SEED.
+            engines (List[str], optional): Moteurs de backtest mesurés. Par défaut ENGINES.
+            ticker (str, optional): Actif de référence. Par défaut Config.TICKER.
+            data_dir (str, optional): Répertoire des caches. Par défaut Config.DATA_DIR.
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown benchmark profile: {profile}")
+        self.profile = profile
+        self.sizes = PROFILES[profile]
+        self.repeat = repeat or Config.BENCH_REPEAT
+        self.seed = Config.BENCH_SEED if seed is None else seed
+        self.engines = list(engines or ENGINES)
+        self.ticker = ticker or Config.TICKER
+        self.data_dir = data_dir or Config.DATA_DIR
+        self._data = None
+
+    @property
+    def data_manager(self) -> DataManager:
+        """Gestionnaire de données de l'actif de référence."""
+        return DataManager(self.ticker, Config.INTERVAL, data_dir=self.data_dir)
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """Historique complet de l'actif de référence."""
+        if self._data is None:
+            self._data = self.data_manager.get_full_data()
+            if self._data.empty:
+                raise ValueError(f"No cached data for {self.ticker} in {self.data_dir}")
+        return self._data
+
+    @property
+    def train_data(self) -> pd.DataFrame:
+        """Part d'entraînement (Config.TRAIN_RATIO), comme en mode simple."""
+        return self.data.iloc[:int(len(self.data) * Config.TRAIN_RATIO)]
+
+    def genomes(self, count: int) -> List[list]:
+        """Génomes aléatoires reproductibles."""
+        return _random_genomes(count, self.seed)
+
+    def seed_all(self):
+        """Fixe les générateurs aléatoires utilisés par DEAP et NumPy."""
+        random.seed(self.seed)
+        np.random.seed(self.seed % 2**32)
+
+
+def bench_data_load(ctx: BenchmarkContext) -> Dict:
+    """Chargement des données : CSV (avec migration vers le cache binaire), cache binaire, tranche."""
+    source = Path(ctx.data_dir) / f"{ctx.ticker}_{Config.INTERVAL}.csv"
+    with tempfile.TemporaryDirectory(prefix='bench-data-') as tmp:
+        def csv_load():
+            shutil.rmtree(Path(tmp) / f"{ctx.ticker}_{Config.INTERVAL}", ignore_errors=True)
+            dm = DataManager(ctx.ticker, Config.INTERVAL, data_dir=tmp)
+            dm.invalidate()
+            dm.get_full_data()
+
+        def columnar_load():
+            dm = DataManager(ctx.ticker, Config.INTERVAL, data_dir=tmp)
+            dm.invalidate()
+            dm.get_full_data()
+
+        shutil.copy(source, tmp)
+        csv_times = _timings(csv_load, ctx.repeat)
+        columnar_times = _timings(columnar_load, ctx.repeat)
+        dm = DataManager(ctx.ticker, Config.INTERVAL, data_dir=tmp)
+        data = dm.get_full_data()
+        start, end = str(data.index[len(data) // 4].date()), str(data.index[len(data) // 2].date())
+        slice_times = _timings(lambda: dm.get_data_slice(start, end), ctx.repeat * 20)
+        dm.invalidate()
+    return {
+        'bars': metric(len(data), 'bars', 'higher'),
+        'csv_load_ms': metric(statistics.median(csv_times) * 1000, 'ms'),
+        'columnar_load_ms': metric(statistics.median(columnar_times) * 1000, 'ms'),
+        'slice_ms': metric(statistics.median(slice_times) * 1000, 'ms'),
+    }
+
+
+def bench_single_eval(ctx: BenchmarkContext) -> Dict:
+    """Latence d'une évaluation : run_backtest et eval_genome, par moteur."""
+    from src.backtest_runner import run_backtest
+    from src.ga_core import eval_genome
+    from src.strategy_genes import decode_chromosome
+
+    data = ctx.train_data
+    genomes = ctx.genomes(ctx.repeat)
+    results = {}
+    for engine in ctx.engines:
+        params = iter([decode_chromosome(g) for g in genomes] * 2)
+        backtest = _timings(lambda: run_backtest(next(params), data, engine=engine), ctx.repeat)
+        chromosomes = iter(genomes * 2)
+        evaluation = _timings(lambda: eval_genome(next(chromosomes), data, engine=engine), ctx.repeat)
+        results[f'run_backtest_{engine}_ms'] = metric(statistics.median(backtest) * 1000, 'ms')
+        results[f'eval_genome_{engine}_ms'] = metric(statistics.median(evaluation) * 1000, 'ms')
+    return results
+
+
+def bench_generation(ctx: BenchmarkContext) -> Dict:
+    """Débit de l'AG (évaluations par seconde, durée d'une génération), cache de fitness désactivé."""
+    from src.ga_core import GAEcosystem
+
+    population, generations = ctx.sizes['population'], ctx.sizes['generations']
+    results = {}
+    for engine in ctx.engines:
+        ctx.seed_all()
+        ga = GAEcosystem(ctx.train_data, engine=engine, use_cache=False, workers=1)
+        start = time.perf_counter()
+        ga.run_evolution(population_size=population, generations=generations, verbose=False)
+        elapsed = time.perf_counter() - start
+        results[f'evals_per_sec_{engine}'] = metric(ga.evals_per_sec, 'evals/s', 'higher')
+        results[f'generation_{engine}_s'] = metric(elapsed / (generations + 1), 's')
+    return results
+
+
+def bench_wfa_window(ctx: BenchmarkContext) -> Dict:
+    """Optimisation et validation de la première fenêtre WFA, par moteur."""
+    from src.walk_forward import WalkForwardAnalyzer, _run_window
+
+    dm = ctx.data_manager
+    windows = WalkForwardAnalyzer(dm).plan_windows(dm.get_full_data())
+    window = next((w for w in windows if w['skip_reason'] is None), None)
+    if window is None:
+        raise ValueError("No runnable WFA window in the reference data")
+    results = {'train_bars': metric(len(window['train_data']), 'bars', 'higher')}
+    for engine in ctx.engines:
+        asset = AssetConfig(ctx.ticker, data_dir=ctx.data_dir, engine=engine)
+        task = (window, ctx.sizes['wfa_population'], ctx.sizes['wfa_generations'], ctx.seed,
+                None, 0.0, asset, None, None)
+        start = time.perf_counter()
+        _run_window(task)
+        results[f'window_{engine}_s'] = metric(time.perf_counter() - start, 's')
+    return results
+
+
+def bench_mode_simple(ctx: BenchmarkContext) -> Dict:
+    """Durée totale de `python main.py --mode simple` (processus séparé, démarrage inclus)."""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, 'main.py', '--mode', 'simple'], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0 or 'ERREUR CRITIQUE' in completed.stdout:
+        tail = (completed.stdout + completed.stderr).strip().splitlines()[-5:]
+        raise RuntimeError("main.py --mode simple failed: " + " | ".join(tail))
+    return {'wall_s': metric(elapsed, 's')}
+
+
+def bench_startup(ctx: BenchmarkContext) -> Dict:
+    """
+    Démarrage : durée de `python main.py --mode test` (données en cache, objectif
+    Config.BENCH_STARTUP_TARGET_S) et coût des imports de chaque mode (voir main.MODE_MODULES).
+    """
+    from main import MODE_MODULES
+    from src.import_profile import profile_imports
+
+    durations = []
+    for _ in range(ctx.repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, 'main.py', '--mode', 'test'], cwd=PROJECT_ROOT,
+                                   capture_output=True, text=True)
+        durations.append(time.perf_counter() - start)
+        if completed.returncode != 0 or 'ERREUR CRITIQUE' in completed.stdout:
+            tail = (completed.stdout + completed.stderr).strip().splitlines()[-5:]
+            raise RuntimeError("main.py --mode test failed: " + " | ".join(tail))
+    results = {'mode_test_s': metric(statistics.median(durations), 's',
+                                     target=Config.BENCH_STARTUP_TARGET_S)}
+    for mode, modules in MODE_MODULES.items():
+        try:
+            results[f'import_{mode}_s'] = metric(profile_imports(modules)['total_s'], 's')
+        except ImportError:
+            continue  # Dépendance optionnelle absente (ex: streamlit pour le dashboard)
+    return results
+
+
+def bench_scaling(ctx: BenchmarkContext) -> Dict:
+    """Montée en charge du moteur vectorisé : débit selon le nombre de barres et la population."""
+    from src.ga_core import eval_population
+    from src.indicator_bank import clear_indicator_banks
+    from src.synthetic_data import synthetic_ohlcv
+
+    results = {}
+    for bars in ctx.sizes['sweep_bars']:
+        data = synthetic_ohlcv(bars, seed=ctx.seed)
+        clear_indicator_banks()
+        start = time.perf_counter()
+        eval_population(ctx.genomes(1), data, engine='vector')
+        results[f'bars{bars}_first_eval_ms'] = metric((time.perf_counter() - start) * 1000, 'ms')
+        for population in ctx.sizes['sweep_population']:
+            genomes = ctx.genomes(population)
+            elapsed = min(_timings(lambda: eval_population(genomes, data, engine='vector'),
+                                   max(1, ctx.repeat // 2), warmup=0))
+            results[f'bars{bars}_pop{population}_evals_per_sec'] = metric(
+                population / elapsed, 'evals/s', 'higher')
+        clear_indicator_banks()
+    return results
+
+
+def bench_selection(ctx: BenchmarkContext) -> Dict:
+    """Sélection NSGA-II selon la taille de population : tools.selNSGA2 et tri vectorisé."""
+    from deap import tools
+    from src.deap_types import creator  # types DEAP (FitnessMulti, Individual)
+    from src.nsga2 import sel_nsga2
+
+    rng = np.random.default_rng(ctx.seed)
+    results = {}
+    for population in ctx.sizes['selection_population']:
+        # Fitness discrétisées (profit, drawdown) : ex aequo et doublons comme dans une vraie population
+        values = np.round(rng.normal([0.0, 20.0], [30.0, 10.0], size=(population, 2)), 1)
+        individuals = []
+        for row in values.tolist():
+            ind = creator.Individual()
+            ind.fitness.values = row
+            individuals.append(ind)
+        repeat = max(1, ctx.repeat // 2)
+        fast = min(_timings(lambda: sel_nsga2(individuals, population), repeat, warmup=0))
+        results[f'pop{population}_fast_ms'] = metric(fast * 1000, 'ms')
+        if population <= SELECTION_DEAP_MAX:
+            deap = min(_timings(lambda: tools.selNSGA2(individuals, population), 1, warmup=0))
+            results[f'pop{population}_deap_ms'] = metric(deap * 1000, 'ms')
+    return results
+
+
+def bench_chart(ctx: BenchmarkContext) -> Dict:
+    """Graphique du dashboard sur une série minute synthétique : pleine résolution et réduite."""
+    import plotly.graph_objects as go
+    from src.chart_sampling import downsample_line, downsample_ohlc
+    from src.synthetic_data import synthetic_ohlcv
+
+    def figure(bars, line):
+        fig = go.Figure([go.Candlestick(x=bars.index, open=bars['Open'], high=bars['High'],
+                                        low=bars['Low'], close=bars['Close']),
+                         go.Scatter(x=line.index, y=line.values, mode='lines')])
+        return fig.to_json()
+
+    results = {}
+    for bars in ctx.sizes['chart_bars']:
+        # Sans dérive et peu volatile : les prix restent finis sur plusieurs millions de barres
+        data = synthetic_ohlcv(bars, seed=ctx.seed, freq='min', drift=0.0, volatility=0.001)
+        sma = data['Close'].rolling(50).mean()
+        start = time.perf_counter()
+        payload = figure(data, sma)
+        results[f'bars{bars}_full_build_s'] = metric(time.perf_counter() - start, 's')
+        results[f'bars{bars}_full_payload_mb'] = metric(len(payload) / 1e6, 'MB')
+        del payload
+        start = time.perf_counter()
+        candles, _ = downsample_ohlc(data, max_bars=Config.CHART_MAX_BARS)
+        payload = figure(candles, downsample_line(sma, max_points=Config.CHART_MAX_LINE_POINTS))
+        results[f'bars{bars}_sampled_build_ms'] = metric((time.perf_counter() - start) * 1000, 'ms')
+        results[f'bars{bars}_sampled_payload_kb'] = metric(len(payload) / 1e3, 'KB')
+    return results
+
+
+# Benchmarks disponibles, dans l'ordre d'exécution
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], Dict]] = {
+    'data_load': bench_data_load,
+    'single_eval': bench_single_eval,
+    'generation': bench_generation,
+    'wfa_window': bench_wfa_window,
+    'mode_simple': bench_mode_simple,
+    'scaling': bench_scaling,
+    'selection': bench_selection,
+    'chart': bench_chart,
+    'startup': bench_startup,
+}
+
+
+def _git_commit() -> str:
+    """Commit courant du dépôt, ou None hors dépôt git."""
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                   capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def run_benchmarks(names: List[str] = None, ctx: BenchmarkContext = None,
+                   verbose: bool = True) -> Dict:
+    """
+    Exécute les benchmarks demandés.
+
+    La sortie standard des fonctions mesurées est masquée. L'échec d'un benchmark
+    est consigné dans le rapport sans interrompre les suivants.
+
+    Args:
+        names (List[str], optional): Benchmarks à lancer. Par défaut tous (voir BENCHMARKS).
+        ctx (BenchmarkContext, optional): Paramètres des mesures. Par défaut profil 'quick'.
+        verbose (bool): Affiche les mesures au fil de l'eau.
+
+    Returns:
+        Dict: Rapport {'meta': ..., 'benchmarks': {nom: {'elapsed_s', 'metrics' ou 'error'}}}.
+
+    Raises:
+        ValueError: Si un benchmark demandé n'existe pas.
+    """
+    ctx = ctx or BenchmarkContext()
+    names = list(names or BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+    report = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'profile': ctx.profile,
+            'repeat': ctx.repeat,
+            'seed': ctx.seed,
+            'engines': ctx.engines,
+            'ticker': ctx.ticker,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'benchmarks': {},
+    }
+    for name in names:
+        if verbose:
+            print(f"[{name}] ...", flush=True)
+        start = time.perf_counter()
+        entry = {}
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                entry['metrics'] = BENCHMARKS[name](ctx)
+        except Exception as e:
+            entry['error'] = f"{type(e).__name__}: {e}"
+        entry['elapsed_s'] = time.perf_counter() - start
+        report['benchmarks'][name] = entry
+        if verbose:
+            if 'error' in entry:
+                print(f"  ÉCHEC : {entry['error']}")
+            for key, m in entry.get('metrics', {}).items():
+                target = f" (objectif {m['target']:g} {m['unit']})" if 'target' in m else ""
+                print(f"  {key:<36} {m['value']:>12.3f} {m['unit']}{target}")
+    return report
+
+
+def save_report(report: Dict, path: str):
+    """Écrit un rapport JSON (répertoires créés au besoin)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+
+
+def load_report(path: str) -> Dict:
+    """Relit un rapport JSON écrit par save_report."""
+    return json.loads(Path(path).read_text())
+
+
+def compare_reports(current: Dict, baseline: Dict, threshold: float = None) -> List[Dict]:
+    """
+    Compare deux rapports mesure par mesure.
+
+    Une mesure régresse lorsqu'elle se dégrade (dans le sens de son champ `better`)
+    de plus de `threshold` en relatif par rapport à la référence.
+
+    Args:
+        current (Dict): Rapport de l'exécution courante.
+        baseline (Dict): Rapport de référence.
+        threshold (float, optional): Dégradation relative tolérée. Par défaut Config.BENCH_THRESHOLD.
+
+    Returns:
+        List[Dict]: Une ligne par mesure courante : benchmark, metric, unit, baseline,
+        current, change_pct (positif = amélioration) et status ('ok', 'regression',
+        'improvement', 'new', 'failed', ou 'over_target' si la mesure manque son
+        objectif absolu, quelle que soit la référence).
+    """
+    threshold = Config.BENCH_THRESHOLD if threshold is None else threshold
+    rows = []
+    for name, entry in current['benchmarks'].items():
+        reference = baseline.get('benchmarks', {}).get(name, {}).get('metrics', {})
+        if 'error' in entry:
+            rows.append({'benchmark': name, 'metric': None, 'unit': None, 'baseline': None,
+                         'current': None, 'change_pct': None, 'status': 'failed'})
+            continue
+        for key, m in entry['metrics'].items():
+            row = {'benchmark': name, 'metric': key, 'unit': m['unit'], 'current': m['value'],
+                   'baseline': None, 'change_pct': None, 'status': 'new'}
+            ref = reference.get(key)
+            if ref is not None and ref['value']:
+                change = (m['value'] - ref['value']) / abs(ref['value'])
+                if m['better'] == 'lower':
+                    change = -change
+                row.update(baseline=ref['value'], change_pct=change * 100.0,
+                           status='regression' if change < -threshold
+                           else 'improvement' if change > threshold else 'ok')
+            if misses_target(m):
+                row['status'] = 'over_target'
+            rows.append(row)
+    return rows
+
+
+def print_comparison(rows: List[Dict]):
+    """Affiche le tableau de comparaison produit par compare_reports."""
+    print(f"\n{'Benchmark':<14} {'Mesure':<36} {'Référence':>12} {'Actuel':>12} {'Écart':>9}  Statut")
+    for row in rows:
+        if row['status'] == 'failed':
+            print(f"{row['benchmark']:<14} {'-':<36} {'-':>12} {'-':>12} {'-':>9}  failed")
+            continue
+        baseline = f"{row['baseline']:.3f}" if row['baseline'] is not None else '-'
+        change = f"{row['change_pct']:+.1f}%" if row['change_pct'] is not None else '-'
+        print(f"{row['benchmark']:<14} {row['metric']:<36} {baseline:>12} "
+              f"{row['current']:>12.3f} {change:>9}  {row['status']}")
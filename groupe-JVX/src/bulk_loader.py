@@ -0,0 +1,129 @@
+"""
+Module Bulk Loader.
+Ce module télécharge ou rafraîchit les données de plusieurs actifs simultanément.
+Le travail étant dominé par l'attente des réponses réseau, un pool de threads borné
+suffit ; chaque actif bénéficie de nouvelles tentatives espacées exponentiellement
+et d'un délai maximal par requête. Les écritures passent par DataManager
+(fichier temporaire renommé, sous verrou fichier par actif).
+"""
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List
+from src.config import Config
+from src.data_fetchers import DataFetcher, TimeoutFetcher, YFinanceFetcher
+from src.data_manager import DataConsistencyError, DataManager
+
+
+class BulkLoader:
+    """
+    Chargement concurrent des données d'une liste d'actifs.
+
+    Chaque actif est traité indépendamment : l'échec de l'un (après épuisement des
+    nouvelles tentatives) n'interrompt pas les autres et figure dans le rapport.
+    """
+
+    def __init__(self, fetcher: DataFetcher = None, interval: str = Config.INTERVAL,
+                 max_workers: int = None, retries: int = None, backoff: float = None,
+                 timeout: float = None, seed: int = None):
+        """
+        Args:
+            fetcher (DataFetcher, optional): Source partagée par tous les actifs. Par défaut Yahoo Finance.
+            interval (str): Intervalle des bougies.
+            max_workers (int, optional): Téléchargements simultanés. Par défaut Config.DATA_FETCH_WORKERS.
+            retries (int, optional): Nouvelles tentatives par actif. Par défaut Config.DATA_FETCH_RETRIES.
+            backoff (float, optional): Délai (s) avant la première nouvelle tentative, doublé
+                ensuite. Par défaut Config.DATA_FETCH_BACKOFF.
+            timeout (float, optional): Délai maximal (s) d'une requête. Par défaut Config.DATA_FETCH_TIMEOUT.
+            seed (int, optional): Graine de la gigue appliquée aux délais d'attente.
+        """
+        self.source = fetcher or YFinanceFetcher()
+        self.interval = interval
+        self.max_workers = max(1, max_workers or Config.DATA_FETCH_WORKERS)
+        self.retries = Config.DATA_FETCH_RETRIES if retries is None else retries
+        self.backoff = Config.DATA_FETCH_BACKOFF if backoff is None else backoff
+        self.timeout = Config.DATA_FETCH_TIMEOUT if timeout is None else timeout
+        self.fetcher = TimeoutFetcher(self.source, self.timeout)
+        self._rng = random.Random(seed)
+
+    def _delay(self, attempt: int) -> float:
+        """Attente avant la tentative `attempt + 1` : exponentielle, avec gigue (50-100 %)."""
+        return self.backoff * 2 ** (attempt - 1) * self._rng.uniform(0.5, 1.0)
+
+    def _load_one(self, ticker: str, refresh: bool, force: bool) -> Dict:
+        """
+        Charge un actif, avec nouvelles tentatives.
+
+        Returns:
+            Dict: ticker, status ('cached', 'downloaded', 'refreshed', 'failed'),
+                rows (barres téléchargées ou ajoutées), attempts, elapsed (s), error.
+        """
+        dm = DataManager(ticker, self.interval, fetcher=self.fetcher)
+        result = {'ticker': ticker, 'status': 'failed', 'rows': 0, 'attempts': 0,
+                  'elapsed': 0.0, 'error': None}
+        start = time.perf_counter()
+
+        if not refresh and not force:
+            rows = dm.cached_rows()
+            if rows is not None:
+                result.update(status='cached', rows=rows)
+                return result
+
+        for attempt in range(1, self.retries + 2):
+            result['attempts'] = attempt
+            try:
+                if refresh:
+                    result.update(status='refreshed', rows=dm.refresh(), error=None)
+                else:
+                    df = dm.download(Config.START_DATE, Config.END_DATE)
+                    dm.invalidate()
+                    result.update(status='downloaded', rows=len(df), error=None)
+                break
+            except DataConsistencyError as e:
+                # Incohérence des données : une nouvelle tentative donnerait le même résultat
+                result['error'] = f"{type(e).__name__}: {e}"
+                break
+            except Exception as e:
+                result['error'] = f"{type(e).__name__}: {e}"
+                if attempt <= self.retries:
+                    time.sleep(self._delay(attempt))
+
+        result['elapsed'] = time.perf_counter() - start
+        return result
+
+    def load(self, tickers: List[str], refresh: bool = False, force: bool = False,
+             verbose: bool = True) -> Dict[str, Dict]:
+        """
+        Charge (ou rafraîchit) les données d'une liste d'actifs en parallèle.
+
+        Args:
+            tickers (List[str]): Symboles des actifs (les doublons sont ignorés).
+            refresh (bool): Si True, rafraîchissement incrémental (voir DataManager.refresh).
+            force (bool): Si True, re-télécharge même les actifs déjà en cache.
+            verbose (bool): Affiche la progression.
+
+        Returns:
+            Dict[str, Dict]: Rapport par actif (voir _load_one), dans l'ordre de `tickers`.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        results = {}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tickers) or 1),
+                                thread_name_prefix='bulk-loader') as executor:
+            futures = {executor.submit(self._load_one, ticker, refresh, force): ticker
+                       for ticker in tickers}
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                results[result['ticker']] = result
+                if verbose:
+                    detail = result['error'] if result['status'] == 'failed' else f"{result['rows']} bars"
+                    print(f"[{done}/{len(tickers)}] {result['ticker']}: {result['status']} "
+                          f"({detail}, {result['attempts']} attempt(s), {result['elapsed']:.2f}s)")
+
+        if verbose:
+            failed = [t for t in tickers if results[t]['status'] == 'failed']
+            print(f"Loaded {len(tickers) - len(failed)}/{len(tickers)} tickers in "
+                  f"{time.perf_counter() - start:.2f}s ({self.fetcher.requests} requests, "
+                  f"{self.fetcher.errors} errors)"
+                  + (f" - failed: {', '.join(failed)}" if failed else ""))
+        return {ticker: results[ticker] for ticker in tickers}
@@ -0,0 +1,137 @@
+"""
+Module Chart Sampling.
+Ce module réduit les séries affichées par le dashboard avant leur envoi à Plotly :
+seules les barres de la plage visible sont gardées, regroupées en au plus quelques
+milliers de bougies (ouverture, plus haut, plus bas, clôture et volume de chaque
+paquet de barres), et les courbes superposées (moyennes mobiles, equity) sont
+réduites par LTTB (Largest-Triangle-Three-Buckets), qui conserve leur forme visuelle.
+Une plage assez courte est affichée en pleine résolution.
+"""
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+
+def visible_slice(index: pd.DatetimeIndex, start=None, end=None) -> slice:
+    """
+    Positions des barres de la plage [start, end] (index trié).
+
+    Args:
+        index (pd.DatetimeIndex): Dates des barres.
+        start, end (optional): Bornes incluses de la plage (None = début / fin des données).
+
+    Returns:
+        slice: Tranche des positions visibles.
+    """
+    low = 0 if start is None else index.searchsorted(pd.Timestamp(start), side='left')
+    high = len(index) if end is None else index.searchsorted(pd.Timestamp(end), side='right')
+    return slice(int(low), int(high))
+
+
+def ohlc_buckets(df: pd.DataFrame, max_bars: int) -> pd.DataFrame:
+    """
+    Regroupe des bougies consécutives en au plus `max_bars` bougies.
+
+    Chaque paquet garde l'ouverture de sa première barre, le plus haut, le plus bas,
+    la clôture de sa dernière barre et la somme des volumes ; il est daté par sa
+    première barre. Les paquets ont tous le même nombre de barres (au plus une près).
+
+    Args:
+        df (pd.DataFrame): Bougies (Open, High, Low, Close, Volume optionnel).
+        max_bars (int): Nombre maximal de bougies produites.
+
+    Returns:
+        pd.DataFrame: Bougies regroupées (df lui-même s'il est assez court).
+    """
+    n = len(df)
+    if n <= max_bars:
+        return df
+    starts = (np.arange(max_bars) * n) // max_bars
+    ends = np.append(starts[1:], n) - 1
+    columns = {
+        'Open': df['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(df['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(df['Low'].to_numpy(), starts),
+        'Close': df['Close'].to_numpy()[ends],
+    }
+    if 'Volume' in df:
+        columns['Volume'] = np.add.reduceat(df['Volume'].to_numpy(), starts)
+    return pd.DataFrame(columns, index=df.index[starts])
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Sélectionne `threshold` points d'une courbe par LTTB.
+
+    Les extrémités sont conservées ; dans chaque paquet intermédiaire, le point retenu
+    est celui qui forme le plus grand triangle avec le point retenu précédemment et la
+    moyenne du paquet suivant.
+
+    Args:
+        x (np.ndarray): Abscisses croissantes.
+        y (np.ndarray): Ordonnées (sans NaN).
+        threshold (int): Nombre de points à conserver.
+
+    Returns:
+        np.ndarray: Positions des points retenus (croissantes).
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Paquets des points intermédiaires (le premier et le dernier point sont gardés)
+    edges = (np.arange(threshold - 1) * (n - 2)) // (threshold - 2) + 1
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    # Le dernier paquet est comparé au dernier point
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        low, high = edges[i], edges[i + 1]
+        area = np.abs((x[a] - mean_x[i]) * (y[low:high] - y[a])
+                      - (x[a] - x[low:high]) * (mean_y[i] - y[a]))
+        a = low + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_ohlc(df: pd.DataFrame, start=None, end=None, max_bars: int = 1000) -> Tuple[pd.DataFrame, int]:
+    """
+    Bougies de la plage visible, regroupées si elles dépassent `max_bars`.
+
+    Args:
+        df (pd.DataFrame): Historique complet (index de dates trié).
+        start, end (optional): Plage visible (None = tout l'historique).
+        max_bars (int): Bougies affichées au plus.
+
+    Returns:
+        tuple: (Bougies à afficher, nombre de barres par bougie affichée ; 1 = pleine résolution)
+    """
+    visible = df.iloc[visible_slice(df.index, start, end)]
+    bars = ohlc_buckets(visible, max_bars)
+    return bars, -(-len(visible) // max(len(bars), 1))
+
+
+def downsample_line(series: pd.Series, start=None, end=None, max_points: int = 2000) -> pd.Series:
+    """
+    Courbe de la plage visible réduite par LTTB (les valeurs manquantes sont ignorées).
+
+    Args:
+        series (pd.Series): Courbe complète (index de dates trié), ex: moyenne mobile.
+        start, end (optional): Plage visible (None = tout l'historique).
+        max_points (int): Points affichés au plus.
+
+    Returns:
+        pd.Series: Points retenus.
+    """
+    visible = series.iloc[visible_slice(series.index, start, end)].dropna()
+    if len(visible) <= max_points:
+        return visible
+    x = visible.index.asi8 if isinstance(visible.index, pd.DatetimeIndex) else visible.index.to_numpy()
+    return visible.iloc[lttb(x, visible.to_numpy(), max_points)]
@@ -0,0 +1,83 @@
+"""
+Module Checkpoint.
+Ce module enregistre sur disque l'état d'une exécution de l'AG (population et fitness,
+archive de Pareto, logbook, état des générateurs aléatoires) ou du WFA (résultats des
+fenêtres terminées), pour la reprendre après une interruption exactement là où elle
+s'est arrêtée. Chaque point de reprise est écrit dans un fichier temporaire puis
+renommé : un arrêt brutal pendant l'écriture laisse intact le point précédent.
+"""
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Optional
+from src.config import Config
+
+# Version du format des points de reprise (un point d'une autre version est ignoré)
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(name: str) -> Optional[Path]:
+    """
+    Chemin du point de reprise `name` dans Config.CHECKPOINT_DIR.
+
+    Returns:
+        Path: Fichier du point de reprise, ou None si les points de reprise sont désactivés.
+    """
+    if not Config.CHECKPOINT_DIR:
+        return None
+    return Path(Config.CHECKPOINT_DIR) / f"{name}.pkl"
+
+
+def save_checkpoint(path, state: Dict):
+    """
+    Écrit un point de reprise de manière atomique.
+
+    Args:
+        path: Fichier du point de reprise.
+        state (Dict): État à enregistrer (sérialisable par pickle).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        pickle.dump({'version': CHECKPOINT_VERSION, **state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path, signature: Dict) -> Optional[Dict]:
+    """
+    Relit un point de reprise s'il correspond à l'exécution demandée.
+
+    Args:
+        path: Fichier du point de reprise.
+        signature (Dict): Réglages de l'exécution (données, population, graine...) ;
+            un point enregistré avec d'autres réglages est ignoré.
+
+    Returns:
+        Dict: L'état enregistré, ou None (absent, illisible ou d'une autre exécution).
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        print(f"Point de reprise illisible ignoré ({path}) : {e}")
+        return None
+    if state.get('version') != CHECKPOINT_VERSION or state.get('signature') != signature:
+        print(f"Point de reprise d'une autre exécution ignoré ({path})")
+        return None
+    return state
+
+
+def remove_checkpoint(path):
+    """Supprime un point de reprise (sans effet s'il n'existe pas)."""
+    if path is None:
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -0,0 +1,312 @@
+"""
+Module Columnar Cache.
+Ce module stocke les données de marché dans un cache binaire par colonnes :
+des fichiers .npy et un en-tête de métadonnées (meta.json).
+Le chargement se fait par projection mémoire (mmap) : seules les pages lues sont
+chargées et aucune analyse de texte (CSV) n'est nécessaire.
+
+Chaque écriture crée une nouvelle version (sous-répertoire) du cache, publiée en
+remplaçant le fichier CURRENT qui la désigne : aucun fichier encore projeté en
+mémoire par un lecteur n'est renommé ni écrasé (ce que Windows refuse), et les
+anciennes versions sont supprimées quand plus rien ne les projette.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+# Version du format : toute évolution incompatible doit l'incrémenter
+SCHEMA_VERSION = 1
+
+META_FILE = 'meta.json'
+FLOAT_BLOCK_FILE = 'float_block.npy'
+INDEX_FILE = 'index.npy'
+# Fichier désignant la version courante du cache (nom de son sous-répertoire)
+CURRENT_FILE = 'CURRENT'
+# Préfixe des sous-répertoires de version
+VERSION_PREFIX = 'v'
+# Version des fichiers .npy : les en-têtes 1.0 et 2.0 (np.save) passent par un filtre
+# tokenize dont la compilation coûte ~10 ms au premier chargement du processus
+NPY_FORMAT_VERSION = (3, 0)
+# Tentatives de remplacement de CURRENT (Windows refuse le remplacement d'un fichier ouvert)
+REPLACE_ATTEMPTS = 10
+
+
+class ColumnarCacheError(Exception):
+    """Cache binaire absent, corrompu ou d'une version incompatible."""
+
+
+def _checksum(arrays) -> str:
+    """Empreinte blake2b du contenu binaire d'une suite de tableaux."""
+    h = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        h.update(np.ascontiguousarray(array).view(np.uint8))
+    return h.hexdigest()
+
+
+def _column_file(position: int) -> str:
+    """Nom du fichier d'une colonne non flottante."""
+    return f'col_{position}.npy'
+
+
+def _save(path: Path, array: np.ndarray):
+    """Écrit un tableau au format .npy (version NPY_FORMAT_VERSION)."""
+    with open(path, 'wb') as f:
+        np.lib.format.write_array(f, array, version=NPY_FORMAT_VERSION, allow_pickle=False)
+
+
+def _data_files(meta: Dict):
+    """Fichiers de données d'une version : index, bloc flottant, puis autres colonnes."""
+    return [INDEX_FILE, FLOAT_BLOCK_FILE] + [c['file'] for c in meta['columns'] if 'file' in c]
+
+
+def _current_version(path: Path) -> Path:
+    """
+    Répertoire de la version courante du cache.
+
+    Un cache sans fichier CURRENT (format d'origine, fichiers à la racine) est lu tel quel.
+
+    Raises:
+        ColumnarCacheError: Si le cache est absent.
+    """
+    try:
+        name = (path / CURRENT_FILE).read_text().strip()
+    except OSError:
+        if (path / META_FILE).exists():
+            return path
+        raise ColumnarCacheError(f"Missing columnar cache {path}")
+    return path / name
+
+
+def version_file(path: Path) -> Path:
+    """
+    Fichier remplacé à chaque nouvelle version du cache (CURRENT, ou l'en-tête du
+    format d'origine) : sa date de modification signale une réécriture.
+    """
+    path = Path(path)
+    current = path / CURRENT_FILE
+    return current if current.exists() else path / META_FILE
+
+
+def _replace(source: Path, target: Path):
+    """os.replace, répété brièvement si la cible est ouverte par un lecteur (Windows)."""
+    for attempt in range(REPLACE_ATTEMPTS):
+        try:
+            os.replace(source, target)
+            return
+        except PermissionError:
+            if attempt == REPLACE_ATTEMPTS - 1:
+                raise
+            time.sleep(0.01 * (attempt + 1))
+
+
+def _verify_version(directory: Path, meta: Dict):
+    """
+    Relit les fichiers d'une version et contrôle leur somme de contrôle.
+
+    Raises:
+        ColumnarCacheError: Si le contenu relu ne correspond pas à l'en-tête.
+    """
+    arrays = [np.load(directory / name, mmap_mode='r') for name in _data_files(meta)]
+    checksum = _checksum(arrays)
+    # Projections fermées avant toute suppression (Windows)
+    del arrays
+    if checksum != meta['checksum']:
+        raise ColumnarCacheError(f"Checksum mismatch in columnar cache {directory}")
+
+
+def prune_columnar(path: Path) -> int:
+    """
+    Supprime les versions du cache autres que la courante (et les fichiers du format
+    d'origine). Une version encore projetée en mémoire ne peut pas être supprimée
+    sous Windows : elle est conservée et retentée à la prochaine écriture.
+
+    Args:
+        path (Path): Répertoire du cache.
+
+    Returns:
+        int: Nombre de versions (ou du format d'origine) qui n'ont pas pu être supprimées.
+    """
+    path = Path(path)
+    try:
+        current = _current_version(path)
+    except ColumnarCacheError:
+        return 0
+    if current == path:
+        return 0
+    remaining = 0
+    for child in path.iterdir():
+        if child == current or child.name == CURRENT_FILE:
+            continue
+        try:
+            if child.is_dir():
+                if child.name.startswith(VERSION_PREFIX):
+                    shutil.rmtree(child)
+            elif child.name == META_FILE or child.suffix == '.npy':
+                child.unlink()
+        except OSError:
+            remaining += 1
+    return remaining
+
+
+def write_columnar(df: pd.DataFrame, path: Path, ticker: str, interval: str,
+                   source: Dict = None) -> Dict:
+    """
+    Écrit un DataFrame OHLCV dans un cache binaire par colonnes.
+
+    Les colonnes float64 sont regroupées dans un seul bloc 2D (colonnes x barres,
+    disposition interne de pandas) pour être relues sans copie, chaque colonne étant
+    contiguë ; les autres colonnes ont chacune leur fichier.
+    L'écriture se fait dans un nouveau sous-répertoire de version, relu et contrôlé
+    (somme de contrôle) avant d'être publié par le remplacement de CURRENT ; les
+    versions précédentes sont ensuite supprimées (voir prune_columnar).
+
+    Args:
+        df (pd.DataFrame): Données nettoyées, indexées par date.
+        path (Path): Répertoire du cache.
+        ticker (str): Symbole de l'actif.
+        interval (str): Intervalle des bougies.
+        source (Dict, optional): Description du fichier source (nom, date, taille).
+
+    Returns:
+        Dict: Les métadonnées écrites.
+
+    Raises:
+        ColumnarCacheError: Si les fichiers relus ne correspondent pas aux données
+            (la version courante reste alors inchangée).
+    """
+    path = Path(path)
+    index = np.ascontiguousarray(df.index.values.astype('datetime64[ns]').view(np.int64))
+    float_cols = [c for c in df.columns if df[c].dtype == np.float64]
+    other_cols = [c for c in df.columns if c not in float_cols]
+    float_block = np.ascontiguousarray(df[float_cols].to_numpy(dtype=np.float64).T).reshape(len(float_cols), len(df))
+    others = [np.ascontiguousarray(df[c].to_numpy()) for c in other_cols]
+
+    columns = []
+    for position, name in enumerate(df.columns):
+        column = {'name': str(name), 'dtype': str(df[name].dtype)}
+        if name in float_cols:
+            column['block'] = float_cols.index(name)
+        else:
+            column['file'] = _column_file(position)
+        columns.append(column)
+
+    meta = {
+        'schema_version': SCHEMA_VERSION,
+        'ticker': ticker,
+        'interval': interval,
+        'rows': len(df),
+        'start': str(df.index[0]) if len(df) else None,
+        'end': str(df.index[-1]) if len(df) else None,
+        'index_name': df.index.name,
+        'columns': columns,
+        'source': source,
+        'checksum': _checksum([index, float_block] + others),
+    }
+
+    suffix = f'{time.time_ns()}-{os.getpid()}-{threading.get_ident()}'
+    version = path / f'{VERSION_PREFIX}{suffix}'
+    version.mkdir(parents=True)
+    try:
+        _save(version / INDEX_FILE, index)
+        _save(version / FLOAT_BLOCK_FILE, float_block)
+        for name, array in zip(other_cols, others):
+            _save(version / _column_file(list(df.columns).index(name)), array)
+        with open(version / META_FILE, 'w') as f:
+            json.dump(meta, f, indent=2)
+        _verify_version(version, meta)
+
+        pointer = path / f'.{CURRENT_FILE}.tmp{suffix}'
+        pointer.write_text(version.name)
+        _replace(pointer, path / CURRENT_FILE)
+    except BaseException:
+        shutil.rmtree(version, ignore_errors=True)
+        raise
+    prune_columnar(path)
+    return meta
+
+
+def read_meta(path: Path) -> Dict:
+    """
+    Lit l'en-tête d'un cache binaire.
+
+    Raises:
+        ColumnarCacheError: Si l'en-tête est absent, illisible ou d'une autre version.
+    """
+    return _version_meta(_current_version(Path(path)))
+
+
+def _version_meta(directory: Path) -> Dict:
+    """En-tête d'une version du cache (voir read_meta)."""
+    try:
+        with open(directory / META_FILE) as f:
+            meta = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ColumnarCacheError(f"Unreadable columnar cache {directory}: {e}")
+    if meta.get('schema_version') != SCHEMA_VERSION:
+        raise ColumnarCacheError(f"Unsupported columnar cache version {meta.get('schema_version')}")
+    return meta
+
+
+def read_columnar(path: Path, verify: bool = False) -> pd.DataFrame:
+    """
+    Charge un cache binaire par projection mémoire.
+
+    Les tableaux sont ouverts en copie sur écriture (mmap_mode='c') : le DataFrame
+    reste modifiable sans jamais altérer les fichiers.
+
+    Args:
+        path (Path): Répertoire du cache.
+        verify (bool): Contrôle la somme de contrôle (lit alors toutes les pages ; elle
+            est déjà contrôlée à l'écriture).
+
+    Returns:
+        pd.DataFrame: Données indexées par date, colonnes dans l'ordre d'origine.
+
+    Raises:
+        ColumnarCacheError: Si le cache est absent, incomplet, corrompu ou d'une autre version.
+    """
+    path = Path(path)
+    directory = _current_version(path)
+    try:
+        return _read_version(directory, verify)
+    except ColumnarCacheError:
+        # Version remplacée (et supprimée) par un autre processus pendant la lecture
+        latest = _current_version(path)
+        if latest == directory:
+            raise
+        return _read_version(latest, verify)
+
+
+def _read_version(directory: Path, verify: bool) -> pd.DataFrame:
+    """Charge une version du cache (voir read_columnar)."""
+    meta = _version_meta(directory)
+    try:
+        index = np.load(directory / INDEX_FILE, mmap_mode='c')
+        float_block = np.load(directory / FLOAT_BLOCK_FILE, mmap_mode='c')
+        others = {c['name']: np.load(directory / c['file'], mmap_mode='c')
+                  for c in meta['columns'] if 'file' in c}
+    except (OSError, ValueError) as e:
+        raise ColumnarCacheError(f"Incomplete columnar cache {directory}: {e}")
+
+    rows = meta['rows']
+    if len(index) != rows or float_block.shape[1] != rows or any(len(a) != rows for a in others.values()):
+        raise ColumnarCacheError(f"Inconsistent columnar cache {directory}")
+    if verify and _checksum([index, float_block] + list(others.values())) != meta['checksum']:
+        raise ColumnarCacheError(f"Checksum mismatch in columnar cache {directory}")
+
+    dates = pd.DatetimeIndex(index.view('datetime64[ns]'), name=meta['index_name'])
+    float_names = [c['name'] for c in sorted((c for c in meta['columns'] if 'block' in c),
+                                              key=lambda c: c['block'])]
+    df = pd.DataFrame(float_block.T, index=dates, columns=float_names, copy=False)
+    # Les autres colonnes sont insérées à leur position d'origine (sans recopier le bloc)
+    for position, column in enumerate(meta['columns']):
+        if 'file' in column:
+            df.insert(position, column['name'], others[column['name']].astype(column['dtype'], copy=False))
+    return df
@@ -3,8 +3,13 @@ Module de configuration centrale.
 Ce fichier regroupe tous les paramètres globaux du système : 
 données de marché, backtesting, algorithme génétique et chemins de fichiers.
 """
+import contextlib
+import contextvars
 from typing import Dict
 
+# Actif en cours de traitement (voir AssetConfig.activate) ; None = actif global Config.TICKER
+_ACTIVE_ASSET = contextvars.ContextVar('active_asset', default=None)
+
 class Config:
     """
     Classe statique contenant la configuration du système de trading.
@@ -33,16 +38,78 @@ class Config:
     COMMISSION_CRYPTO: float = 0.001 
     # Commission par trade pour les actions (0.01%)
     COMMISSION_STOCK: float = 0.0001
+    # Moteur de backtest utilisé par l'AG : "backtrader" (Cerebro) ou "vector" (NumPy)
+    BACKTEST_ENGINE: str = "backtrader"
+    # Nombre de banques d'indicateurs (une par jeu de données / tranche WFA) gardées en mémoire
+    INDICATOR_BANK_CACHE_SIZE: int = 8
+    # Évaluation de l'AG du WFA depuis les journaux de trades des génomes sur l'historique complet
+    # (voir src/trade_ledger.py), sans resimulation ; la validation Out-Of-Sample reste un backtest
+    TRADE_LEDGER_ENABLED: bool = False
+    # Nombre de journaux de trades (un par génome simulé sur l'historique complet) gardés en mémoire
+    TRADE_LEDGER_CACHE_SIZE: int = 256
+    # Cache des fitness de l'AG : nombre maximal d'entrées (0 = désactivé)
+    FITNESS_CACHE_SIZE: int = 100000
+    # Pas d'arrondi des gènes SL/TP dans la clé du cache (0 = valeurs exactes)
+    FITNESS_CACHE_TICK: float = 0.0
+    # Évaluation parallèle de l'AG : nombre de processus (1 = séquentiel, 0 = tous les cœurs)
+    GA_WORKERS: int = 1
+    # Individus envoyés par tâche au pool (0 = deux paquets par processus et par génération)
+    GA_CHUNK_SIZE: int = 0
+    # Méthode de démarrage des processus ("fork", "spawn", "forkserver" ; None = défaut de la plateforme)
+    GA_START_METHOD: str = None
     
     @classmethod
     def get_commission(cls) -> float:
         """
         Détermine automatiquement le taux de commission en fonction du ticker.
 
+        Si un actif est actif (voir AssetConfig.activate), c'est sa commission qui
+        est renvoyée, sinon celle de Config.TICKER.
+
         Returns:
             float: Le taux de commission (crypto ou action).
         """
-        if "BTC" in cls.TICKER or "ETH" in cls.TICKER:
+        asset = _ACTIVE_ASSET.get()
+        if asset is not None:
+            return asset.commission
+        return cls.commission_for(cls.TICKER)
+
+    @classmethod
+    def get_backtest_engine(cls) -> str:
+        """
+        Moteur de backtest par défaut : celui de l'actif courant s'il y en a un,
+        sinon Config.BACKTEST_ENGINE.
+
+        Returns:
+            str: 'backtrader' ou 'vector'.
+        """
+        asset = _ACTIVE_ASSET.get()
+        if asset is not None:
+            return asset.engine
+        return cls.BACKTEST_ENGINE
+
+    @staticmethod
+    def active_asset():
+        """
+        Renvoie l'actif courant (voir AssetConfig.activate).
+
+        Returns:
+            AssetConfig: L'actif, ou None hors du mode univers.
+        """
+        return _ACTIVE_ASSET.get()
+
+    @classmethod
+    def commission_for(cls, ticker: str) -> float:
+        """
+        Taux de commission d'un ticker donné (crypto ou action).
+
+        Args:
+            ticker (str): Symbole de l'actif.
+
+        Returns:
+            float: Le taux de commission.
+        """
+        if "BTC" in ticker or "ETH" in ticker:
             return cls.COMMISSION_CRYPTO
         return cls.COMMISSION_STOCK
     
@@ -55,6 +122,10 @@ class Config:
     GA_CXPB: float = 0.7
     # Probabilité de mutation d'un gène
     GA_MUTPB: float = 0.2
+    # Représentation de la population : "deap" (individus DEAP) ou "array" (tableau NumPy, variation vectorisée)
+    GA_BACKEND: str = "deap"
+    # Sélection NSGA-II : "deap" (tools.selNSGA2, O(N²)) ou "fast" (tri vectorisé O(N log N), même sélection)
+    GA_SELECTION: str = "deap"
     
     # === Walk-Forward Analysis (WFA) ===
     # Nombre de mois pour la fenêtre d'entraînement
@@ -63,6 +134,115 @@ class Config:
     WFA_TEST_MONTHS: int = 6    
     # Pas de glissement de la fenêtre à chaque itération
     WFA_STEP_MONTHS: int = 3
+    # Fenêtres WFA optimisées en parallèle (1 = séquentiel, 0 = tous les cœurs)
+    WFA_WORKERS: int = 1
+    # Graine de base du WFA (chaque fenêtre utilise graine + numéro ; None = tirée au hasard)
+    WFA_SEED: int = None
+    # Population initiale de chaque fenêtre issue de la population finale de la précédente
+    WFA_WARM_START: bool = False
+    # Part d'immigrants aléatoires ajoutés à une population réutilisée
+    WFA_IMMIGRANT_RATE: float = 0.2
+    # En démarrage à chaud, relance aussi chaque fenêtre à froid pour mesurer le gain (double le coût de l'AG)
+    WFA_COLD_BASELINE: bool = False
+
+    # === Univers (optimisation multi-actifs) ===
+    # Actifs traités en parallèle (0 = tous les cœurs, borné par le budget mémoire)
+    UNIVERSE_WORKERS: int = 0
+    # Budget mémoire total (Mo) des processus de l'univers
+    UNIVERSE_MEMORY_MB: int = 4096
+    # Mémoire (Mo) d'un processus de travail avant chargement d'un actif (bibliothèques importées)
+    UNIVERSE_WORKER_BASE_MB: int = 200
+    # Actifs traités par processus avant son remplacement (libère la mémoire fragmentée)
+    UNIVERSE_TASKS_PER_WORKER: int = 50
+    # Fichier du tableau de résultats consolidé
+    UNIVERSE_RESULTS_FILE: str = "results/universe_results.csv"
+
+    # === Portefeuille (backtest multi-actifs à trésorerie commune) ===
+    # Règle d'allocation des entrées : "equal" (valeur du portefeuille / nombre de lignes),
+    # "cash" (fraction de la trésorerie disponible) ou "unit" (1 unité, sizer de Backtrader)
+    PORTFOLIO_ALLOCATION: str = "equal"
+    # Nombre maximal de positions simultanées (0 = une par actif)
+    PORTFOLIO_MAX_POSITIONS: int = 0
+    # Fraction de la trésorerie engagée par entrée avec la règle "cash"
+    PORTFOLIO_CASH_FRACTION: float = 0.2
+    # Alignement des dates : "inner" (dates communes) ou "outer" (union, prix prolongés)
+    PORTFOLIO_ALIGN: str = "inner"
+
+    # === Benchmarks (voir benchmark.py) ===
+    # Répertoire des rapports de benchmark (un fichier JSON par exécution)
+    BENCH_RESULTS_DIR: str = "results/benchmarks"
+    # Rapport de référence utilisé pour la détection des régressions
+    BENCH_BASELINE_FILE: str = "results/benchmarks/baseline.json"
+    # Dégradation relative tolérée avant de signaler une régression (0.15 = 15 %)
+    BENCH_THRESHOLD: float = 0.15
+    # Répétitions des mesures unitaires (la médiane est retenue)
+    BENCH_REPEAT: int = 5
+    # Graine des génomes, de l'AG et des données synthétiques mesurés
+    BENCH_SEED: int = 42
+    # Objectif de démarrage : durée maximale de `main.py --mode test` sur données en cache (s)
+    BENCH_STARTUP_TARGET_S: float = 1.0
+
+    # === Instrumentation (voir src/telemetry.py) ===
+    # Fichier JSON Lines des événements (générations, fenêtres WFA, exécutions ; None = désactivé)
+    TELEMETRY_FILE: str = None
+    # Fichier texte Prometheus réécrit en fin d'exécution de l'AG ou du WFA (None = désactivé)
+    TELEMETRY_PROMETHEUS_FILE: str = None
+
+    # === Jobs d'optimisation en arrière-plan (voir src/job_runner.py) ===
+    # Nombre maximal de jobs exécutés simultanément
+    JOBS_MAX_ACTIVE: int = 4
+    # Méthode de démarrage des processus des jobs ("spawn" : sûr depuis le serveur Streamlit multi-thread)
+    JOBS_START_METHOD: str = "spawn"
+    # Délai (s) laissé à un job annulé pour s'arrêter à la fin de sa génération avant d'être interrompu
+    JOBS_CANCEL_GRACE_S: float = 10.0
+    # Événements de progression gardés en mémoire par job
+    JOBS_EVENT_HISTORY: int = 200
+    # Intervalle de rafraîchissement du dashboard pendant l'exécution de jobs (s)
+    JOBS_POLL_S: float = 1.0
+
+    # === Points de reprise (voir src/checkpoint.py) ===
+    # Répertoire des points de reprise de l'AG et du WFA, écrits avec --checkpoint / --resume
+    # et supprimés en fin d'exécution (None = désactivés)
+    CHECKPOINT_DIR: str = "results/checkpoints"
+    # Générations de l'AG entre deux points de reprise
+    CHECKPOINT_EVERY: int = 1
+
+    # === Base des évaluations (voir src/eval_store.py) ===
+    # Fichier SQLite des génomes évalués et des backtests détaillés, relu d'une exécution à l'autre (None = désactivé)
+    EVAL_STORE_PATH: str = None
+    # Évaluations écrites par transaction (écriture en tâche de fond)
+    EVAL_STORE_BATCH: int = 500
+    # Attente maximale (s) du verrou d'écriture de la base partagée par plusieurs processus
+    EVAL_STORE_TIMEOUT: float = 30.0
+
+    # === Cache des résultats du dashboard (voir src/result_cache.py) ===
+    # Répertoire des résultats mémorisés (un fichier JSON par résultat ; None = mémoire seule)
+    RESULT_CACHE_DIR: str = "results/dashboard_cache"
+    # Durée de vie d'un résultat mémorisé (s, 0 = illimitée)
+    RESULT_CACHE_TTL_S: float = 7 * 24 * 3600
+    # Nombre maximal de résultats mémorisés (0 = cache désactivé)
+    RESULT_CACHE_MAX_ENTRIES: int = 64
+
+    # === Graphiques du dashboard (voir src/chart_sampling.py) ===
+    # Bougies envoyées au plus par graphique (de l'ordre de sa largeur en pixels) ; au-delà, les barres sont regroupées
+    CHART_MAX_BARS: int = 1000
+    # Points envoyés au plus par courbe superposée (moyennes mobiles), réduits par LTTB
+    CHART_MAX_LINE_POINTS: int = 2000
+
+    # === Mode longue durée (voir src/memory_guard.py) ===
+    # Mémoire bornée pour les longues exécutions : logbooks déversés sur disque, archive de Pareto,
+    # ramasse-miettes après chaque génération et surveillance de la mémoire résidente
+    LONGRUN_MODE: bool = False
+    # Plafond de mémoire résidente (Mo) : au-delà, les caches sont vidés puis l'exécution est interrompue
+    LONGRUN_MEMORY_MB: int = 2048
+    # Suivi des allocations par tracemalloc (sites d'allocation dans le rapport ; ralentit l'exécution)
+    LONGRUN_TRACEMALLOC: bool = False
+    # Taille maximale du cache de fitness en mode longue durée (environ 1 Ko par entrée)
+    LONGRUN_FITNESS_CACHE_SIZE: int = 5000
+    # Générations gardées en mémoire par logbook (l'historique complet est sur disque)
+    LONGRUN_LOGBOOK_KEEP: int = 20
+    # Répertoire des logbooks déversés
+    LONGRUN_DIR: str = "results/longrun"
     
     # === Bornes des Gènes (Gene Bounds) ===
     # Définit les intervalles de recherche pour l'optimisation génétique.
@@ -79,5 +259,75 @@ class Config:
     # === Paths ===
     # Répertoire de stockage des données CSV (cache)
     DATA_DIR: str = "data"
+    # Format du cache local : "npy" (binaire par colonnes, chargé par mmap) ou "csv"
+    DATA_CACHE_FORMAT: str = "npy"
+    # Contrôle de la somme de contrôle du cache binaire à chaque chargement (lit toutes les
+    # pages et annule le chargement paresseux ; elle est toujours contrôlée à l'écriture)
+    DATA_CACHE_VERIFY: bool = False
+    # Rafraîchissement incrémental : barres déjà en cache re-téléchargées pour contrôler la cohérence
+    DATA_REFRESH_OVERLAP: int = 5
+    # Écart relatif toléré entre les prix en cache et ceux re-téléchargés
+    DATA_REFRESH_RTOL: float = 1e-6
+    # Chargement multi-actifs : nombre de téléchargements simultanés
+    DATA_FETCH_WORKERS: int = 4
+    # Nouvelles tentatives après l'échec du téléchargement d'un actif
+    DATA_FETCH_RETRIES: int = 3
+    # Délai (s) avant la première nouvelle tentative, doublé à chaque échec
+    DATA_FETCH_BACKOFF: float = 1.0
+    # Délai maximal (s) d'une requête de téléchargement d'un actif
+    DATA_FETCH_TIMEOUT: float = 60.0
+    # Attente maximale (s) du verrou d'écriture d'un fichier de cache
+    DATA_LOCK_TIMEOUT: float = 120.0
+    # Âge (s) au-delà duquel un verrou de cache est considéré abandonné (le détenteur
+    # rafraîchit la date du fichier : seul un processus interrompu laisse son verrou vieillir)
+    DATA_LOCK_STALE: float = 600.0
     # Répertoire de stockage des fichiers de logs
-    LOGS_DIR: str = "logs"
\ No newline at end of file
+    LOGS_DIR: str = "logs"
+
+
+class AssetConfig:
+    """
+    Configuration propre à un actif (mode univers).
+
+    Remplace, pour un actif, les réglages globaux de Config sans les modifier :
+    les valeurs non précisées reprennent celles de Config. Pendant `activate()`,
+    Config.get_commission() renvoie la commission de cet actif.
+    """
+
+    def __init__(self, ticker: str, interval: str = None, data_dir: str = None,
+                 commission: float = None, engine: str = None, population: int = None,
+                 generations: int = None, train_ratio: float = None, seed: int = None):
+        """
+        Args:
+            ticker (str): Symbole de l'actif.
+            interval (str, optional): Intervalle des bougies. Par défaut Config.INTERVAL.
+            data_dir (str, optional): Répertoire des caches de données. Par défaut Config.DATA_DIR.
+            commission (float, optional): Taux de commission. Par défaut déduit du ticker.
+            engine (str, optional): Moteur de backtest. Par défaut Config.BACKTEST_ENGINE.
+            population (int, optional): Taille de population de l'AG. Par défaut Config.GA_POPULATION.
+            generations (int, optional): Générations de l'AG. Par défaut Config.GA_GENERATIONS.
+            train_ratio (float, optional): Part d'entraînement (mode simple). Par défaut Config.TRAIN_RATIO.
+            seed (int, optional): Graine aléatoire de l'optimisation de cet actif.
+        """
+        self.ticker = ticker
+        self.interval = interval or Config.INTERVAL
+        self.data_dir = data_dir or Config.DATA_DIR
+        self.commission = Config.commission_for(ticker) if commission is None else commission
+        self.engine = engine or Config.BACKTEST_ENGINE
+        self.population = population or Config.GA_POPULATION
+        self.generations = generations or Config.GA_GENERATIONS
+        self.train_ratio = train_ratio or Config.TRAIN_RATIO
+        self.seed = seed
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Rend cet actif courant (commission) pour le contexte d'exécution en cours."""
+        token = _ACTIVE_ASSET.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_ASSET.reset(token)
+
+    def __repr__(self):
+        return (f"AssetConfig({self.ticker!r}, interval={self.interval!r}, "
+                f"commission={self.commission}, engine={self.engine!r})")
@@ -0,0 +1,192 @@
+"""
+Module Data Fetchers.
+Ce module définit les sources de données de marché utilisées par le DataManager.
+Une source (fetcher) renvoie les bougies OHLCV d'un actif sur un intervalle de dates :
+Yahoo Finance par défaut, ou un répertoire de fichiers CSV locaux (tests, hors ligne).
+Les sources sont utilisables depuis plusieurs threads (chargement concurrent).
+"""
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+import pandas as pd
+
+
+class FetchError(IOError):
+    """Échec (possiblement transitoire) d'une requête auprès d'une source de données."""
+
+
+class FetchTimeout(FetchError):
+    """Requête abandonnée après avoir dépassé son délai maximal."""
+
+
+class DataFetcher:
+    """
+    Interface d'une source de données de marché.
+
+    Les sous-classes implémentent `_fetch` ; `fetch` tient à jour le nombre de
+    requêtes, de requêtes en échec et de barres récupérées.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.rows_fetched = 0
+        self.errors = 0
+        self._counters_lock = threading.Lock()
+
+    def fetch(self, ticker: str, interval: str, start: str = None, end: str = None) -> pd.DataFrame:
+        """
+        Récupère les bougies d'un actif.
+
+        Args:
+            ticker (str): Symbole de l'actif.
+            interval (str): Intervalle des bougies (ex: '1d').
+            start (str, optional): Date de début (incluse). None = tout l'historique disponible.
+            end (str, optional): Date de fin (exclue). None = jusqu'à aujourd'hui.
+
+        Returns:
+            pd.DataFrame: Données brutes (colonnes OHLCV, index de dates), éventuellement vides.
+        """
+        try:
+            df = self._fetch(ticker, interval, start, end)
+        except Exception:
+            with self._counters_lock:
+                self.requests += 1
+                self.errors += 1
+            raise
+        with self._counters_lock:
+            self.requests += 1
+            self.rows_fetched += len(df)
+        return df
+
+    def _fetch(self, ticker: str, interval: str, start: str, end: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class YFinanceFetcher(DataFetcher):
+    """Source Yahoo Finance (via yfinance)."""
+
+    def __init__(self, fallback_period: str = "5y", timeout: float = 10):
+        """
+        Args:
+            fallback_period (str): Période demandée lorsque aucune date de début n'est donnée.
+            timeout (float): Délai réseau d'une requête, en secondes.
+        """
+        super().__init__()
+        self.fallback_period = fallback_period
+        self.timeout = timeout
+
+    def _fetch(self, ticker: str, interval: str, start: str, end: str) -> pd.DataFrame:
+        # Import différé : yfinance (et ses dépendances réseau) n'est chargé qu'au premier téléchargement
+        import yfinance as yf
+        # Un actif par appel : la concurrence est gérée par l'appelant (voir bulk_loader)
+        options = dict(interval=interval, progress=False, multi_level_index=False,
+                       threads=False, timeout=self.timeout)
+        if start is None:
+            return yf.download(ticker, period=self.fallback_period, **options)
+        return yf.download(ticker, start=start, end=end, **options)
+
+
+class FileFetcher(DataFetcher):
+    """
+    Source locale : lit `{ticker}_{interval}.csv` dans un répertoire.
+
+    Utile hors ligne et pour tester le rafraîchissement incrémental.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Répertoire contenant les fichiers CSV sources.
+        """
+        super().__init__()
+        self.directory = Path(directory)
+
+    def _fetch(self, ticker: str, interval: str, start: str, end: str) -> pd.DataFrame:
+        path = self.directory / f"{ticker}_{interval}.csv"
+        if not path.exists():
+            return pd.DataFrame()
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df.index < pd.Timestamp(end)]
+        return df
+
+
+class TimeoutFetcher(DataFetcher):
+    """
+    Impose un délai maximal aux requêtes d'une autre source.
+
+    La requête s'exécute dans un thread démon : au-delà du délai, son résultat
+    est abandonné (le thread se termine en arrière-plan) et FetchTimeout est levée.
+    """
+
+    def __init__(self, source: DataFetcher, timeout: float = None):
+        """
+        Args:
+            source (DataFetcher): Source réelle des données.
+            timeout (float, optional): Délai maximal en secondes (None = illimité).
+        """
+        super().__init__()
+        self.source = source
+        self.timeout = timeout
+
+    def _fetch(self, ticker: str, interval: str, start: str, end: str) -> pd.DataFrame:
+        if self.timeout is None:
+            return self.source.fetch(ticker, interval, start, end)
+        outcome = {}
+
+        def target():
+            try:
+                outcome['data'] = self.source.fetch(ticker, interval, start, end)
+            except Exception as e:
+                outcome['error'] = e
+
+        worker = threading.Thread(target=target, name=f"fetch-{ticker}", daemon=True)
+        worker.start()
+        worker.join(self.timeout)
+        if worker.is_alive():
+            raise FetchTimeout(f"Fetching {ticker} timed out after {self.timeout}s")
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['data']
+
+
+class SimulatedFetcher(DataFetcher):
+    """
+    Source simulée pour les tests hors ligne : délègue à une autre source
+    (typiquement FileFetcher) en ajoutant de la latence et des échecs.
+    """
+
+    def __init__(self, source: DataFetcher, latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, failures: Dict[str, int] = None, seed: int = None):
+        """
+        Args:
+            source (DataFetcher): Source réelle des données.
+            latency (float): Latence fixe de chaque requête, en secondes.
+            jitter (float): Latence aléatoire supplémentaire maximale, en secondes.
+            failure_rate (float): Probabilité qu'une requête échoue (FetchError).
+            failures (Dict[str, int], optional): Nombre de premières requêtes en échec par actif.
+            seed (int, optional): Graine du générateur aléatoire (reproductibilité).
+        """
+        super().__init__()
+        self.source = source
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failures = dict(failures or {})
+        self.attempts = {}
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _fetch(self, ticker: str, interval: str, start: str, end: str) -> pd.DataFrame:
+        with self._rng_lock:
+            self.attempts[ticker] = attempt = self.attempts.get(ticker, 0) + 1
+            delay = self.latency + self._rng.uniform(0.0, self.jitter)
+            failed = self._rng.random() < self.failure_rate
+        time.sleep(delay)
+        if failed or attempt <= self.failures.get(ticker, 0):
+            raise FetchError(f"Simulated failure for {ticker} (attempt {attempt})")
+        return self.source.fetch(ticker, interval, start, end)
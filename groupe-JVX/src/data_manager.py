@@ -2,34 +2,78 @@
 Module Data Manager.
 Ce module est responsable du téléchargement, de la mise en cache et du nettoyage
 des données de marché provenant de Yahoo Finance.
+Une fois chargées, les données nettoyées restent en mémoire (partagées entre
+instances) et les tranches sont des vues obtenues par recherche dichotomique.
+Les écritures de cache sont protégées par un verrou fichier par actif : plusieurs
+processus peuvent télécharger ou rafraîchir le même actif sans se corrompre.
 """
 import os
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Tuple
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from src.config import Config
+from src.data_fetchers import DataFetcher, YFinanceFetcher
+from src.file_lock import FileLock
+from src.columnar_cache import ColumnarCacheError, read_columnar, read_meta, version_file, write_columnar
+from src.telemetry import get_telemetry
+
+# Données nettoyées résidentes en mémoire, indexées par fichier de cache
+_RESIDENT = {}
+
+
+class DataConsistencyError(ValueError):
+    """Les barres re-téléchargées ne correspondent pas à celles du cache."""
+
+
+def _file_signature(path: Path) -> Tuple[float, int]:
+    """Date de modification et taille d'un fichier (None s'il n'existe pas)."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _tmp_path(path: Path) -> Path:
+    """Fichier temporaire propre au processus et au thread, à côté de `path`."""
+    return path.with_name(path.name + f".tmp{os.getpid()}-{threading.get_ident()}")
+
 
 class DataManager:
     """
     Gère le cycle de vie des données de marché (téléchargement, stockage local et prétraitement).
     
     Cette classe permet d'éviter les téléchargements redondants en utilisant un système
-    de cache local au format CSV.
+    de cache local : le CSV téléchargé, doublé d'un cache binaire par colonnes
+    (voir columnar_cache) migré automatiquement depuis le CSV.
     """
     
-    def __init__(self, ticker: str = Config.TICKER, interval: str = Config.INTERVAL):
+    def __init__(self, ticker: str = Config.TICKER, interval: str = Config.INTERVAL,
+                 fetcher: DataFetcher = None, data_dir: str = None):
         """
         Initialise le gestionnaire de données.
 
         Args:
             ticker (str): Le symbole boursier à récupérer (ex: 'ETH-USD').
             interval (str): L'intervalle de temps entre chaque bougie (ex: '1d').
+            fetcher (DataFetcher, optional): Source des données. Par défaut Yahoo Finance.
+            data_dir (str, optional): Répertoire des caches. Par défaut Config.DATA_DIR.
         """
         self.ticker = ticker
         self.interval = interval
-        self.data_dir = Path(Config.DATA_DIR)
+        self.fetcher = fetcher or YFinanceFetcher()
+        self.data_dir = Path(data_dir or Config.DATA_DIR)
         self.data_dir.mkdir(exist_ok=True)
         self.cache_file = self.data_dir / f"{ticker}_{interval}.csv"
+        self.columnar_dir = self.data_dir / f"{ticker}_{interval}"
+        # Verrou des écritures de cache (CSV et binaire) de cet actif
+        self.lock = FileLock(self.data_dir / f"{ticker}_{interval}.lock",
+                             timeout=Config.DATA_LOCK_TIMEOUT, stale_after=Config.DATA_LOCK_STALE)
+        # Mesures de temps (chargements depuis le disque/réseau et extractions de tranches)
+        self._timings = {'loads': 0, 'load_time': 0.0, 'slices': 0, 'slice_time': 0.0}
         
     def download_data(self, start_date: str, end_date: str, force_download: bool = False) -> pd.DataFrame:
         """
@@ -43,42 +87,244 @@ class DataManager:
         Returns:
             pd.DataFrame: Un DataFrame nettoyé contenant les données OHLCV.
         """
+        if not force_download and Config.DATA_CACHE_FORMAT == "npy":
+            df = self._read_columnar()
+            if df is not None:
+                return df
+
         if self.cache_file.exists() and not force_download:
             print(f"Loading cached data from {self.cache_file}")
             try:
                 df = pd.read_csv(self.cache_file, index_col=0, parse_dates=True)
-                return self._sanitize_data(df)
+                df = self._sanitize_data(df)
+                # Migration automatique vers le cache binaire
+                self._write_columnar(df)
+                return df
             except Exception:
                 print("Cache corrupted, re-downloading...")
         
         print(f"Downloading {self.ticker} data from {start_date} to {end_date}...")
         try:
-            # Récupération via l'API yfinance
-            df = yf.download(
-                self.ticker, start=start_date, end=end_date, 
-                interval=self.interval, progress=False, multi_level_index=False
-            )
-            
-            # Gestion des cas où aucune donnée n'est renvoyée
-            if df.empty:
-                # Tentative fallback (parfois nécessaire pour les cryptos)
-                df = yf.download(
-                    self.ticker, period="5y", interval=self.interval, 
-                    progress=False, multi_level_index=False
-                )
-
-            if df.empty:
-                raise ValueError(f"No data for {self.ticker}")
-            
-            # Sauvegarde dans le répertoire de données local
-            df.to_csv(self.cache_file)
-            return self._sanitize_data(df)
-            
+            return self.download(start_date, end_date)
         except Exception as e:
             print(f"Error downloading data: {e}")
             # Retourner un DataFrame vide sécurisé pour éviter le crash total
             return pd.DataFrame()
-    
+
+    def download(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Télécharge les données via la source et réécrit les caches, sous verrou.
+
+        Contrairement à download_data, les erreurs sont propagées (nouvelle tentative
+        possible par l'appelant, voir bulk_loader).
+
+        Args:
+            start_date (str): Date de début du téléchargement.
+            end_date (str): Date de fin du téléchargement.
+
+        Returns:
+            pd.DataFrame: Le DataFrame nettoyé.
+
+        Raises:
+            ValueError: Si la source ne renvoie aucune donnée.
+            LockTimeout: Si le verrou du cache reste détenu par un autre processus.
+        """
+        # Récupération via la source de données (yfinance par défaut)
+        df = self.fetcher.fetch(self.ticker, self.interval, start=start_date, end=end_date)
+
+        # Gestion des cas où aucune donnée n'est renvoyée
+        if df.empty:
+            # Tentative fallback (parfois nécessaire pour les cryptos)
+            df = self.fetcher.fetch(self.ticker, self.interval)
+
+        if df.empty:
+            raise ValueError(f"No data for {self.ticker}")
+
+        # Sauvegarde dans le répertoire de données local
+        with self.lock:
+            self._write_csv(df)
+            df = self._sanitize_data(df)
+            self._write_columnar(df)
+        return df
+
+    def refresh(self, overlap_bars: int = None) -> int:
+        """
+        Met à jour le cache en ne téléchargeant que les barres récentes.
+
+        Les `overlap_bars` dernières barres du cache sont re-téléchargées avec les
+        nouvelles et doivent concorder (prix OHLC) avec celles du cache. La toute
+        dernière barre en cache, possiblement incomplète (séance en cours), est
+        remplacée sans contrôle. Les lignes plus anciennes du CSV sont conservées
+        octet pour octet et le fichier de cache est remplacé atomiquement.
+
+        Args:
+            overlap_bars (int, optional): Barres de recouvrement contrôlées.
+                Par défaut Config.DATA_REFRESH_OVERLAP.
+
+        Returns:
+            int: Nombre de nouvelles barres ajoutées.
+
+        Raises:
+            DataConsistencyError: Si les barres re-téléchargées ne recouvrent pas le
+                cache ou diffèrent des valeurs en cache.
+            LockTimeout: Si le verrou du cache reste détenu par un autre processus.
+        """
+        overlap_bars = Config.DATA_REFRESH_OVERLAP if overlap_bars is None else overlap_bars
+        # Lecture, contrôle et ajout sous verrou : un autre processus a pu rafraîchir
+        # le cache entre-temps (le rechargement est détecté par signature de fichier)
+        with self.lock:
+            return self._refresh(overlap_bars)
+
+    def _refresh(self, overlap_bars: int) -> int:
+        """Corps de refresh, appelé sous verrou."""
+        cached = self.get_full_data()
+        if cached.empty:
+            # Aucun cache : téléchargement complet
+            df = self.download(Config.START_DATE, Config.END_DATE)
+            self.invalidate()
+            return len(df)
+
+        last = cached.index[-1]
+        start = cached.index[-min(len(cached), overlap_bars + 1)]
+        print(f"Refreshing {self.ticker} from {start.date()}...")
+        fetched = self.fetcher.fetch(self.ticker, self.interval, start=str(start.date()))
+        if fetched.empty:
+            return 0
+        fetched = self._sanitize_data(fetched)
+
+        # Contrôle du recouvrement (hors dernière barre en cache)
+        checked = cached.index[:-1][cached.index[:-1] >= start].intersection(fetched.index)
+        if fetched.index[0] > last or (overlap_bars > 0 and len(cached) > 1 and checked.empty):
+            raise DataConsistencyError(
+                f"Refreshed data for {self.ticker} does not overlap the cache (last cached bar {last})")
+        prices = ['Open', 'High', 'Low', 'Close']
+        mismatch = ~np.isclose(fetched.loc[checked, prices].to_numpy(dtype=np.float64),
+                               cached.loc[checked, prices].to_numpy(dtype=np.float64),
+                               rtol=Config.DATA_REFRESH_RTOL, atol=0.0).all(axis=1)
+        if mismatch.any():
+            raise DataConsistencyError(
+                f"Refreshed data for {self.ticker} differs from the cache on {checked[mismatch][0]}")
+
+        new_rows = fetched[fetched.index >= last].reindex(columns=cached.columns)
+        if new_rows.isna().any().any():
+            raise DataConsistencyError(f"Refreshed data for {self.ticker} misses columns {list(cached.columns)}")
+        added = int((new_rows.index > last).sum())
+        if added == 0 and new_rows.iloc[:1].equals(cached.iloc[-1:].astype(new_rows.dtypes)):
+            return 0
+
+        self._append_csv(new_rows.astype(cached.dtypes), since=last)
+        # Le cache binaire sera migré depuis le nouveau CSV au prochain chargement
+        self.invalidate()
+        print(f"{added} new bar(s) appended to {self.cache_file}")
+        return added
+
+    def _write_csv(self, df: pd.DataFrame):
+        """Écrit le cache CSV via un fichier temporaire renommé (remplacement atomique)."""
+        tmp = _tmp_path(self.cache_file)
+        try:
+            df.to_csv(tmp)
+            os.replace(tmp, self.cache_file)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def _append_csv(self, rows: pd.DataFrame, since: pd.Timestamp):
+        """
+        Ajoute des lignes au cache CSV en remplaçant celles datées de `since` ou après.
+
+        Le nouveau contenu est écrit dans un fichier temporaire puis renommé
+        (remplacement atomique) : un lecteur voit l'ancien ou le nouveau fichier.
+
+        Args:
+            rows (pd.DataFrame): Lignes à ajouter (mêmes colonnes que le cache).
+            since (pd.Timestamp): Date à partir de laquelle les lignes existantes sont remplacées.
+        """
+        with open(self.cache_file, 'rb') as f:
+            lines = f.read().splitlines(keepends=True)
+        keep = len(lines)
+        while keep > 1:
+            field = lines[keep - 1].split(b',', 1)[0].decode(errors='replace').strip()
+            try:
+                date = pd.Timestamp(field)
+            except ValueError:
+                break
+            if date < since:
+                break
+            keep -= 1
+        body = b''.join(lines[:keep])
+        if body and not body.endswith(b'\n'):
+            body += b'\n'
+        body += rows.to_csv(header=False).encode()
+
+        tmp = _tmp_path(self.cache_file)
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.cache_file)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def cached_rows(self) -> int:
+        """
+        Nombre de barres en cache, sans charger les données.
+
+        Returns:
+            int: Barres du cache binaire (en-tête) ou, à défaut, lignes du CSV ;
+                None s'il n'y a aucun cache.
+        """
+        try:
+            return read_meta(self.columnar_dir)['rows']
+        except ColumnarCacheError:
+            pass
+        if not self.cache_file.exists():
+            return None
+        # Pas encore migré : lignes du CSV, en-tête exclu
+        with open(self.cache_file, 'rb') as f:
+            return max(0, sum(1 for _ in f) - 1)
+
+    def _csv_source(self) -> Dict:
+        """Description du CSV source (nom, date de modification, taille) ou None."""
+        signature = _file_signature(self.cache_file)
+        if signature is None:
+            return None
+        return {'file': self.cache_file.name, 'mtime_ns': signature[0], 'size': signature[1]}
+
+    def _read_columnar(self) -> pd.DataFrame:
+        """
+        Charge le cache binaire s'il est valide et à jour vis-à-vis du CSV.
+
+        Returns:
+            pd.DataFrame: Les données, ou None s'il faut (re)lire le CSV.
+        """
+        if not self.columnar_dir.exists():
+            return None
+        try:
+            meta = read_meta(self.columnar_dir)
+            source = self._csv_source()
+            # Un CSV modifié depuis la migration rend le cache binaire obsolète
+            if source is not None and meta.get('source') != source:
+                return None
+            print(f"Loading binary cache from {self.columnar_dir}")
+            return read_columnar(self.columnar_dir, verify=Config.DATA_CACHE_VERIFY)
+        except ColumnarCacheError as e:
+            print(f"Binary cache ignored ({e})")
+            return None
+
+    def _write_columnar(self, df: pd.DataFrame):
+        """Écrit le cache binaire sous verrou (un échec n'empêche pas d'utiliser les données)."""
+        if Config.DATA_CACHE_FORMAT != "npy" or df.empty:
+            return
+        try:
+            with self.lock:
+                # Projections de la version précédente relâchées avant sa suppression (Windows)
+                self.invalidate()
+                write_columnar(df, self.columnar_dir, self.ticker, self.interval, source=self._csv_source())
+        except Exception as e:
+            print(f"Could not write binary cache: {e}")
+
     def _sanitize_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Nettoie et standardise le DataFrame pour assurer la compatibilité avec Backtrader.
@@ -115,19 +361,93 @@ class DataManager:
         
         return df
     
+    def _resident_key(self) -> str:
+        """Clé des données résidentes de ce gestionnaire."""
+        return str(self.cache_file.resolve())
+
+    def _signature(self) -> Tuple:
+        """Signature des fichiers de cache (CSV et version du cache binaire) pour détecter leur modification."""
+        return (_file_signature(self.cache_file), _file_signature(version_file(self.columnar_dir)))
+
+    def _load(self) -> Dict:
+        """
+        Renvoie les données résidentes, en les (re)chargeant si nécessaire.
+
+        Les données sont rechargées dès que la date de modification ou la taille
+        d'un fichier de cache change.
+
+        Returns:
+            Dict: frame (DataFrame nettoyé), arrays (colonnes NumPy), signature du fichier.
+        """
+        key = self._resident_key()
+        entry = _RESIDENT.get(key)
+        if entry is not None and entry['signature'] == self._signature():
+            return entry
+
+        start = time.perf_counter()
+        frame = self.download_data(Config.START_DATE, Config.END_DATE)
+        elapsed = time.perf_counter() - start
+        self._timings['loads'] += 1
+        self._timings['load_time'] += elapsed
+        get_telemetry().add_time('data_load', elapsed)
+
+        entry = {
+            'frame': frame,
+            'arrays': {col: np.ascontiguousarray(frame[col].to_numpy()) for col in frame.columns},
+            'signature': self._signature(),
+        }
+        # Un échec de téléchargement (DataFrame vide) n'est pas conservé
+        if not frame.empty:
+            _RESIDENT[key] = entry
+        return entry
+
+    def invalidate(self):
+        """Oublie les données résidentes : le prochain accès relit le fichier de cache."""
+        _RESIDENT.pop(self._resident_key(), None)
+
     def get_full_data(self) -> pd.DataFrame:
         """
         Récupère l'intégralité des données configurées dans Config.
 
+        Le DataFrame renvoyé est partagé (résident en mémoire) : il ne doit pas être modifié.
+
         Returns:
             pd.DataFrame: Données historiques complètes.
         """
-        return self.download_data(Config.START_DATE, Config.END_DATE)
+        return self._load()['frame']
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Renvoie les colonnes des données complètes sous forme de tableaux NumPy résidents.
+
+        Returns:
+            Dict[str, np.ndarray]: Un tableau par colonne (à ne pas modifier).
+        """
+        return self._load()['arrays']
+
+    def slice_bounds(self, start_date: str, end_date: str) -> Tuple[int, int]:
+        """
+        Convertit un intervalle de dates (bornes incluses) en indices [début, fin[.
+
+        Args:
+            start_date (str): Date de début de la tranche.
+            end_date (str): Date de fin de la tranche.
+
+        Returns:
+            Tuple[int, int]: Indices de position dans les données complètes.
+        """
+        index = self.get_full_data().index
+        start = int(index.searchsorted(pd.Timestamp(start_date), side='left'))
+        end = int(index.searchsorted(pd.Timestamp(end_date), side='right'))
+        return start, max(start, end)
         
     def get_data_slice(self, start_date: str, end_date: str) -> pd.DataFrame:
         """
         Extrait une tranche temporelle spécifique des données complètes.
 
+        La tranche est une vue sur les données résidentes (aucune copie) : elle ne
+        doit pas être modifiée.
+
         Args:
             start_date (str): Date de début de la tranche.
             end_date (str): Date de fin de la tranche.
@@ -135,8 +455,25 @@ class DataManager:
         Returns:
             pd.DataFrame: Sous-ensemble des données.
         """
+        start_time = time.perf_counter()
         full_data = self.get_full_data()
         if full_data.empty:
             return full_data
-        mask = (full_data.index >= start_date) & (full_data.index <= end_date)
-        return full_data[mask].copy()
\ No newline at end of file
+        start, end = self.slice_bounds(start_date, end_date)
+        data_slice = full_data.iloc[start:end]
+        self._timings['slices'] += 1
+        self._timings['slice_time'] += time.perf_counter() - start_time
+        return data_slice
+
+    def timing_stats(self) -> Dict[str, float]:
+        """
+        Renvoie les mesures de temps de ce gestionnaire.
+
+        Returns:
+            Dict[str, float]: Nombre et durée totale des chargements et des extractions
+                de tranches, et durées moyennes en millisecondes.
+        """
+        stats = dict(self._timings)
+        stats['avg_load_ms'] = 1000 * stats['load_time'] / stats['loads'] if stats['loads'] else 0.0
+        stats['avg_slice_ms'] = 1000 * stats['slice_time'] / stats['slices'] if stats['slices'] else 0.0
+        return stats
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""
+Module DEAP Types.
+Ce module crée les types DEAP de l'AG (creator.FitnessMulti et creator.Individual).
+Les modules qui les utilisent (ga_core, nsga2, array_population) importent `creator`
+d'ici : les types existent quel que soit le module importé en premier.
+"""
+from deap import base, creator
+
+# Création de l'objectif de fitness : 
+# weights=(1.0, -1.0) signifie qu'on maximise le premier critère (Profit) 
+# et qu'on minimise le second (Drawdown).
+if not hasattr(creator, "FitnessMulti"):
+    creator.create("FitnessMulti", base.Fitness, weights=(1.0, -1.0))
+
+# Définition d'un individu comme une liste de gènes associée à sa fitness.
+if not hasattr(creator, "Individual"):
+    creator.create("Individual", list, fitness=creator.FitnessMulti)
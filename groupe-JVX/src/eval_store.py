@@ -0,0 +1,396 @@
+"""
+Module Eval Store.
+Ce module conserve d'une exécution à l'autre chaque génome évalué et chaque backtest
+détaillé, dans une base SQLite locale (journal WAL : lectures concurrentes, plusieurs
+processus écrivains). Une évaluation est identifiée par l'empreinte des données, la
+version du moteur, la commission, le capital de départ et les paramètres canoniques :
+l'AG la relit au lieu de relancer le backtest. Les insertions sont regroupées en
+transactions par un fil d'écriture, hors du chemin critique de l'évaluation.
+"""
+import atexit
+import datetime
+import json
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from src.config import Config
+from src.indicator_bank import data_fingerprint
+from src.telemetry import is_error_fitness
+
+# Version des moteurs de backtest : à incrémenter lorsqu'une modification d'un moteur
+# (ou de la stratégie) change les fitness, les évaluations enregistrées sont alors ignorées
+ENGINE_VERSIONS = {'backtrader': 1, 'vector': 1, 'ledger': 1}
+
+# Paramètres par requête de consultation (limite des variables SQLite)
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    id INTEGER PRIMARY KEY,
+    ticker TEXT,
+    interval TEXT,
+    fingerprint TEXT NOT NULL,
+    slice_start TEXT,
+    slice_end TEXT,
+    bars INTEGER,
+    engine_version TEXT NOT NULL,
+    commission REAL NOT NULL,
+    initial_cash REAL NOT NULL,
+    params TEXT NOT NULL,
+    profit REAL,
+    drawdown REAL,
+    trades INTEGER,
+    runtime_s REAL,
+    created TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS evaluations_lookup
+    ON evaluations (fingerprint, engine_version, commission, initial_cash, params);
+CREATE INDEX IF NOT EXISTS evaluations_asset ON evaluations (ticker, interval);
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    ticker TEXT,
+    interval TEXT,
+    fingerprint TEXT NOT NULL,
+    slice_start TEXT,
+    slice_end TEXT,
+    trading_start TEXT,
+    engine_version TEXT,
+    commission REAL,
+    initial_cash REAL,
+    params TEXT NOT NULL,
+    profit_pct REAL,
+    max_drawdown REAL,
+    total_trades INTEGER,
+    win_rate REAL,
+    sharpe_ratio REAL,
+    metrics TEXT,
+    created TEXT
+);
+CREATE INDEX IF NOT EXISTS reports_asset ON reports (ticker, interval);
+"""
+
+_INSERT_EVALUATION = """
+INSERT OR REPLACE INTO evaluations (ticker, interval, fingerprint, slice_start, slice_end, bars,
+    engine_version, commission, initial_cash, params, profit, drawdown, trades, runtime_s, created)
+VALUES (:ticker, :interval, :fingerprint, :slice_start, :slice_end, :bars, :engine_version,
+    :commission, :initial_cash, :params, :profit, :drawdown, :trades, :runtime_s, :created)
+"""
+
+
+def engine_version(engine: str) -> str:
+    """Identifiant versionné d'un moteur de backtest (ex: 'vector-1')."""
+    return f"{engine}-{ENGINE_VERSIONS.get(engine, 0)}"
+
+
+def params_key(params: Dict[str, float]) -> str:
+    """Forme textuelle canonique d'un jeu de paramètres (clé de consultation)."""
+    return json.dumps(params, sort_keys=True)
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+
+class EvaluationStore:
+    """
+    Base des évaluations de génomes et des backtests détaillés.
+
+    Les consultations utilisent la connexion du fil appelant ; les insertions
+    d'évaluations passent par une file vidée par un fil d'écriture (voir flush).
+    Les compteurs hits, misses et written décrivent l'activité depuis l'ouverture.
+    """
+
+    def __init__(self, path: str, batch_size: int = None, timeout: float = None):
+        """
+        Args:
+            path (str): Fichier SQLite (créé si nécessaire).
+            batch_size (int, optional): Évaluations par transaction d'écriture.
+                Par défaut Config.EVAL_STORE_BATCH.
+            timeout (float, optional): Attente maximale (s) du verrou d'écriture.
+                Par défaut Config.EVAL_STORE_TIMEOUT.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, Config.EVAL_STORE_BATCH if batch_size is None else batch_size)
+        self.timeout = Config.EVAL_STORE_TIMEOUT if timeout is None else timeout
+        self.hits = 0
+        self.misses = 0
+        self.written = 0
+        self._local = threading.local()
+        self._contexts = {}  # id(données) -> (données, moteur, contexte)
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._error = None
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion propre au fil appelant (sqlite3 ne partage pas les connexions entre fils)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def context(self, data: pd.DataFrame, engine: str) -> Dict:
+        """
+        Décrit le cadre d'une évaluation : actif, tranche de données, moteur et frais.
+
+        L'empreinte d'un même DataFrame n'est calculée qu'une fois.
+
+        Args:
+            data (pd.DataFrame): Données évaluées.
+            engine (str): Moteur de backtest.
+
+        Returns:
+            Dict: Champs communs aux évaluations sur ces données.
+        """
+        cached = self._contexts.get(id(data))
+        if (cached is not None and cached[0] is data and cached[1] == engine
+                and cached[2]['commission'] == Config.get_commission()):
+            return cached[2]
+        asset = Config.active_asset()
+        context = {
+            'ticker': asset.ticker if asset is not None else Config.TICKER,
+            'interval': asset.interval if asset is not None else Config.INTERVAL,
+            'fingerprint': data_fingerprint(data),
+            'slice_start': str(data.index[0]) if len(data) else None,
+            'slice_end': str(data.index[-1]) if len(data) else None,
+            'bars': len(data),
+            'engine_version': engine_version(engine),
+            'commission': Config.get_commission(),
+            'initial_cash': Config.INITIAL_CASH,
+        }
+        if len(self._contexts) >= 64:
+            self._contexts.clear()
+        self._contexts[id(data)] = (data, engine, context)
+        return context
+
+    def lookup(self, context: Dict, params_list: List[Dict[str, float]]) -> Dict[int, Tuple[float, float]]:
+        """
+        Consulte les évaluations enregistrées pour un lot de paramètres.
+
+        Args:
+            context (Dict): Cadre des évaluations (voir context).
+            params_list (List[Dict[str, float]]): Paramètres canoniques.
+
+        Returns:
+            Dict[int, Tuple[float, float]]: Fitness (profit, drawdown) trouvées, par position.
+        """
+        keys = [params_key(p) for p in params_list]
+        positions = {}
+        for i, key in enumerate(keys):
+            positions.setdefault(key, []).append(i)
+        found = {}
+        conn = self._connection()
+        unique = list(positions)
+        for start in range(0, len(unique), _LOOKUP_CHUNK):
+            chunk = unique[start:start + _LOOKUP_CHUNK]
+            rows = conn.execute(
+                f"SELECT params, profit, drawdown FROM evaluations WHERE fingerprint = ? "
+                f"AND engine_version = ? AND commission = ? AND initial_cash = ? "
+                f"AND params IN ({','.join('?' * len(chunk))})",
+                (context['fingerprint'], context['engine_version'], context['commission'],
+                 context['initial_cash'], *chunk)).fetchall()
+            for key, profit, drawdown in rows:
+                for i in positions[key]:
+                    found[i] = (profit, drawdown)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def record(self, context: Dict, evaluations: List[Tuple]):
+        """
+        Met en file des évaluations pour écriture en tâche de fond.
+
+        Les évaluations en erreur (ERROR_FITNESS, renvoyée par toute exception de
+        l'évaluation) ne sont pas conservées : l'erreur peut être passagère (mémoire,
+        interruption) et ne doit pas survivre à l'exécution.
+
+        Args:
+            context (Dict): Cadre des évaluations (voir context).
+            evaluations (List[Tuple]): (paramètres, (profit, drawdown), durée (s)) ou
+                (paramètres, fitness, durée, nombre de trades).
+        """
+        created = _now()
+        rows = []
+        for evaluation in evaluations:
+            params, fitness, runtime_s = evaluation[:3]
+            if is_error_fitness(fitness):
+                continue
+            trades = evaluation[3] if len(evaluation) > 3 else None
+            rows.append({**context, 'params': params_key(params), 'profit': float(fitness[0]),
+                         'drawdown': float(fitness[1]), 'trades': trades,
+                         'runtime_s': runtime_s, 'created': created})
+        if not rows:
+            return
+        self._start_writer()
+        self._queue.put(rows)
+
+    def _start_writer(self):
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="eval-store-writer",
+                                                daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        """Fil d'écriture : regroupe les lots en file en transactions d'au plus batch_size lignes."""
+        conn = self._connection()
+        while True:
+            batches = [self._queue.get()]
+            rows = list(batches[0] or [])
+            while len(rows) < self.batch_size:
+                try:
+                    batch = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batches.append(batch)
+                rows.extend(batch or [])
+            try:
+                if rows:
+                    with conn:
+                        conn.executemany(_INSERT_EVALUATION, rows)
+                    self.written += len(rows)
+            except sqlite3.Error as e:
+                # Une écriture perdue ne fait que retarder une réutilisation : l'AG continue
+                self._error = e
+                print(f"Evaluation store write failed ({len(rows)} rows): {e}")
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+            if None in batches:
+                return
+
+    def flush(self):
+        """Attend l'écriture de toutes les évaluations en file."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Écrit les évaluations en file puis arrête le fil d'écriture."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._writer = None
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def record_report(self, params: Dict[str, float], data: pd.DataFrame, results: Dict,
+                      trading_start_date: datetime.date = None, initial_cash: float = None,
+                      engine: str = 'backtrader'):
+        """
+        Enregistre le résultat d'un backtest détaillé (voir run_simple_backtest).
+
+        Args:
+            params (Dict[str, float]): Paramètres testés.
+            data (pd.DataFrame): Données du backtest (warm-up compris).
+            results (Dict): Métriques renvoyées par run_simple_backtest.
+            trading_start_date (datetime.date, optional): Début effectif du trading.
+            initial_cash (float, optional): Capital de départ. Par défaut Config.INITIAL_CASH.
+            engine (str): Moteur du backtest.
+        """
+        context = self.context(data, engine)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO reports (ticker, interval, fingerprint, slice_start, slice_end, trading_start, "
+                "engine_version, commission, initial_cash, params, profit_pct, max_drawdown, total_trades, "
+                "win_rate, sharpe_ratio, metrics, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (context['ticker'], context['interval'], context['fingerprint'], context['slice_start'],
+                 context['slice_end'], str(trading_start_date) if trading_start_date else None,
+                 context['engine_version'], context['commission'],
+                 Config.INITIAL_CASH if initial_cash is None else initial_cash, params_key(params),
+                 results.get('profit_pct'), results.get('max_drawdown'), results.get('total_trades'),
+                 results.get('win_rate'), results.get('sharpe_ratio'),
+                 json.dumps(results, default=float), _now()))
+
+    def _query(self, table: str, ticker: str = None, interval: str = None, order_by: str = 'id DESC',
+               limit: int = None) -> pd.DataFrame:
+        self.flush()
+        clauses, args = [], []
+        if ticker is not None:
+            clauses.append("ticker = ?")
+            args.append(ticker)
+        if interval is not None:
+            clauses.append("interval = ?")
+            args.append(interval)
+        sql = f"SELECT * FROM {table}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        frame = pd.read_sql_query(sql, self._connection(), params=args)
+        if 'params' in frame:
+            frame['params'] = frame['params'].map(json.loads)
+        return frame
+
+    def evaluations(self, ticker: str = None, interval: str = None, limit: int = None) -> pd.DataFrame:
+        """
+        Évaluations enregistrées, des plus rentables aux moins rentables.
+
+        Returns:
+            pd.DataFrame: Une ligne par évaluation (paramètres décodés en dictionnaire).
+        """
+        return self._query('evaluations', ticker, interval, order_by='profit DESC', limit=limit)
+
+    def reports(self, ticker: str = None, interval: str = None, limit: int = None) -> pd.DataFrame:
+        """
+        Backtests détaillés enregistrés, des plus récents aux plus anciens.
+
+        Returns:
+            pd.DataFrame: Une ligne par backtest (métriques principales, paramètres et
+            colonne 'metrics' contenant le résultat complet en JSON).
+        """
+        return self._query('reports', ticker, interval, limit=limit)
+
+    def stats(self) -> Dict:
+        """Renvoie le contenu de la base et les compteurs de cette connexion."""
+        self.flush()
+        conn = self._connection()
+        assets = conn.execute("SELECT ticker, interval, COUNT(*) FROM evaluations "
+                              "GROUP BY ticker, interval ORDER BY COUNT(*) DESC").fetchall()
+        total = self.hits + self.misses
+        return {
+            'evaluations': conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0],
+            'reports': conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0],
+            'assets': {f"{ticker} {interval}": count for ticker, interval, count in assets},
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'written': self.written,
+        }
+
+
+_STORES = {}
+
+
+def get_eval_store() -> Optional[EvaluationStore]:
+    """
+    Renvoie la base des évaluations du processus pour Config.EVAL_STORE_PATH.
+
+    Returns:
+        EvaluationStore: La base, ou None si aucun chemin n'est configuré.
+    """
+    path = Config.EVAL_STORE_PATH
+    if not path:
+        return None
+    store = _STORES.get(path)
+    if store is None:
+        store = _STORES[path] = EvaluationStore(path)
+    return store
+
+
+@atexit.register
+def _close_stores():
+    for store in _STORES.values():
+        store.close()
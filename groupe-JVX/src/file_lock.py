@@ -0,0 +1,203 @@
+"""
+Module File Lock.
+Ce module fournit un verrou inter-processus basé sur un fichier créé de manière
+exclusive (O_CREAT | O_EXCL), portable sous Windows, Linux et macOS.
+Il protège les écritures des fichiers de cache partagés par plusieurs processus
+(ou threads) qui téléchargent ou rafraîchissent le même actif.
+Chaque détenteur écrit un jeton unique dans le fichier : seul le détenteur du jeton
+supprime le verrou, et un verrou abandonné n'est supprimé qu'après avoir été
+renommé atomiquement puis revérifié (deux processus ne le cassent pas ensemble).
+"""
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Rafraîchissements de la date du fichier de verrou par période `stale_after` tant
+# qu'il est détenu : une écriture longue n'est jamais prise pour un verrou abandonné
+HEARTBEATS_PER_STALE_PERIOD = 3
+
+
+class LockTimeout(TimeoutError):
+    """Le verrou n'a pas pu être obtenu dans le délai imparti."""
+
+
+class FileLock:
+    """
+    Verrou exclusif matérialisé par un fichier.
+
+    Le verrou est réentrant pour un même objet et un même thread : une méthode
+    qui le détient peut en appeler une autre qui le demande à nouveau.
+    Un fichier de verrou plus ancien que `stale_after` secondes (processus
+    interrompu sans libérer le verrou) est considéré abandonné et supprimé ;
+    tant que le verrou est détenu, un thread rafraîchit la date du fichier
+    plusieurs fois par période `stale_after`. Le fichier contient le pid et un
+    jeton propre à chaque acquisition (`token`).
+    """
+
+    def __init__(self, path: str, timeout: float = None, poll: float = 0.05,
+                 stale_after: float = None):
+        """
+        Args:
+            path (str): Chemin du fichier de verrou.
+            timeout (float, optional): Attente maximale en secondes (None = illimitée).
+            poll (float): Intervalle entre deux tentatives, en secondes.
+            stale_after (float, optional): Âge (s) au-delà duquel un verrou est abandonné.
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll = poll
+        self.stale_after = stale_after
+        self.token = None
+        self._owner = None
+        self._depth = 0
+        self._guard = threading.Lock()
+        self._heartbeat_stop = None
+
+    def _read_token(self, path: Path) -> str:
+        """Contenu du fichier de verrou `path` ('' s'il est illisible ou absent)."""
+        try:
+            return path.read_text().strip()
+        except OSError:
+            return ''
+
+    def _break_stale(self) -> bool:
+        """
+        Supprime le fichier de verrou s'il est abandonné.
+
+        Le fichier est d'abord renommé sous un nom unique : un seul processus peut
+        l'obtenir. Son identité (inode), son âge et son jeton sont revérifiés sur la
+        copie renommée ; si un autre processus avait entre-temps cassé le verrou
+        abandonné et pris un nouveau verrou, celui-ci est remis en place.
+
+        Returns:
+            bool: True si le verrou a disparu (nouvelle tentative immédiate).
+        """
+        if self.stale_after is None:
+            return False
+        try:
+            seen = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+        if time.time() - seen.st_mtime <= self.stale_after:
+            return False
+        owner = self._read_token(self.path)
+        claimed = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.stale")
+        try:
+            os.rename(self.path, claimed)
+        except FileNotFoundError:
+            return True  # cassé par un autre processus
+        except OSError:
+            return False
+        try:
+            stat = os.stat(claimed)
+            age = time.time() - stat.st_mtime
+            if ((stat.st_ino, stat.st_dev) == (seen.st_ino, seen.st_dev) and age > self.stale_after
+                    and self._read_token(claimed) == owner):
+                print(f"Stale lock removed: {self.path} ({age:.0f}s old)")
+                return True
+            # Verrou actif d'un autre détenteur : remis en place s'il n'a pas été repris
+            try:
+                os.link(claimed, self.path)
+            except OSError:
+                pass
+            return False
+        finally:
+            try:
+                os.unlink(claimed)
+            except OSError:
+                pass
+
+    def acquire(self):
+        """
+        Obtient le verrou, en attendant au besoin.
+
+        Raises:
+            LockTimeout: Si le verrou est toujours détenu après `timeout` secondes.
+        """
+        me = threading.get_ident()
+        with self._guard:
+            if self._owner == me:
+                self._depth += 1
+                return
+
+        token = f"{os.getpid()} {uuid.uuid4().hex}"
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._break_stale():
+                    continue
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise LockTimeout(f"Could not acquire {self.path} within {self.timeout}s")
+                time.sleep(self.poll)
+                continue
+            try:
+                os.write(fd, f"{token}\n".encode())
+            finally:
+                os.close(fd)
+            break
+
+        with self._guard:
+            self.token = token
+            self._owner = me
+            self._depth = 1
+        if self.stale_after is not None:
+            self._heartbeat_stop = threading.Event()
+            threading.Thread(target=self._heartbeat, args=(self._heartbeat_stop,),
+                             name=f"lock-heartbeat-{self.path.name}", daemon=True).start()
+
+    def _heartbeat(self, stop: threading.Event):
+        """Rafraîchit la date de modification du fichier de verrou jusqu'à sa libération."""
+        token = self.token
+        while not stop.wait(self.stale_after / HEARTBEATS_PER_STALE_PERIOD):
+            if self._read_token(self.path) != token:
+                print(f"Lock {self.path} was taken over by another process")
+                return
+            try:
+                os.utime(self.path)
+            except OSError:
+                return
+
+    def release(self):
+        """
+        Libère le verrou (le fichier est supprimé au dernier niveau de réentrance,
+        uniquement s'il porte encore le jeton de ce détenteur).
+        """
+        with self._guard:
+            if self._owner != threading.get_ident():
+                raise RuntimeError(f"Lock {self.path} is not held by this thread")
+            self._depth -= 1
+            if self._depth > 0:
+                return
+            self._owner = None
+            token, self.token = self.token, None
+        if self._heartbeat_stop is not None:
+            self._heartbeat_stop.set()
+            self._heartbeat_stop = None
+        if self._read_token(self.path) != token:
+            print(f"Lock {self.path} is no longer ours, left in place")
+            return
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    @property
+    def locked(self) -> bool:
+        """True si ce verrou est détenu par cet objet."""
+        return self._owner is not None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def __repr__(self):
+        return f"FileLock({str(self.path)!r}, locked={self.locked})"
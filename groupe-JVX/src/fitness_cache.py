@@ -0,0 +1,165 @@
+"""
+Module Fitness Cache.
+Ce module mémorise les scores de fitness déjà calculés afin d'éviter de relancer un
+backtest pour un génome identique (après décodage) sur les mêmes données.
+Le cache est partagé entre les générations et entre les appels à run_evolution.
+"""
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+from src.config import Config
+from src.telemetry import is_error_fitness
+
+
+def canonical_params(params: Dict[str, float], tick: float = None) -> Dict[str, float]:
+    """
+    Renvoie la forme canonique d'un jeu de paramètres décodés.
+
+    Les gènes SL et TP sont arrondis au pas `tick` : deux génomes dont les SL/TP
+    ne diffèrent que d'une fraction de pas partagent ainsi la même évaluation.
+
+    Args:
+        params (Dict[str, float]): Paramètres issus de decode_chromosome.
+        tick (float, optional): Pas de quantification. Par défaut Config.FITNESS_CACHE_TICK
+            (0 = aucune quantification).
+
+    Returns:
+        Dict[str, float]: Paramètres canoniques (copie).
+    """
+    tick = Config.FITNESS_CACHE_TICK if tick is None else tick
+    canonical = dict(params)
+    if tick and tick > 0:
+        for name in ('SL', 'TP'):
+            canonical[name] = round(canonical[name] / tick) * tick
+    return canonical
+
+
+class FitnessCache:
+    """
+    Cache LRU de taille bornée des fitness (profit, drawdown).
+
+    Tient à jour les compteurs de succès (hits), d'échecs (misses) et d'évictions.
+    """
+
+    def __init__(self, maxsize: int = None):
+        """
+        Args:
+            maxsize (int, optional): Nombre maximal d'entrées. Par défaut Config.FITNESS_CACHE_SIZE.
+        """
+        self.maxsize = Config.FITNESS_CACHE_SIZE if maxsize is None else maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(params: Dict[str, float], fingerprint: str, engine: str) -> Tuple:
+        """
+        Construit la clé d'un génome canonique sur un jeu de données.
+
+        La commission et le capital de départ font partie de la clé car ils
+        changent le résultat du backtest à données égales.
+
+        Args:
+            params (Dict[str, float]): Paramètres canoniques.
+            fingerprint (str): Empreinte des données (voir data_fingerprint).
+            engine (str): Moteur de backtest.
+
+        Returns:
+            Tuple: Clé hashable.
+        """
+        return (fingerprint, engine, Config.get_commission(), Config.INITIAL_CASH,
+                tuple(params.items()))
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, float]]:
+        """Renvoie la fitness mémorisée (ou None) et met à jour les compteurs."""
+        fitness = self._entries.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return fitness
+
+    def lookup(self, keys: List[Hashable]) -> Tuple[Dict[int, Tuple[float, float]], Dict[Hashable, List[int]]]:
+        """
+        Consulte le cache pour un lot de clés (une génération).
+
+        Une clé répétée dans le lot n'est évaluée qu'une fois : ses occurrences
+        suivantes sont comptées comme des succès.
+
+        Args:
+            keys (List[Hashable]): Clés dans l'ordre des individus.
+
+        Returns:
+            Tuple: (fitness trouvées par indice, indices à évaluer par clé manquante).
+        """
+        found = {}
+        missing = OrderedDict()
+        for i, key in enumerate(keys):
+            if key in missing:
+                missing[key].append(i)
+                self.hits += 1
+                continue
+            fitness = self.get(key)
+            if fitness is None:
+                missing[key] = [i]
+            else:
+                found[i] = fitness
+        return found, missing
+
+    def put(self, key: Hashable, fitness: Tuple[float, float]):
+        """
+        Mémorise une fitness en évinçant les entrées les plus anciennes si besoin.
+        Une évaluation en erreur (ERROR_FITNESS) n'est pas mémorisée : elle sera relancée.
+        """
+        if self.maxsize <= 0 or is_error_fitness(fitness):
+            return
+        self._entries[key] = tuple(fitness)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: int):
+        """Change la taille maximale en évinçant les entrées les plus anciennes si besoin."""
+        self.maxsize = maxsize
+        while len(self._entries) > max(maxsize, 0):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Proportion des consultations servies par le cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Renvoie un résumé des compteurs du cache."""
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Cache partagé par tous les écosystèmes génétiques du processus
+_SHARED_CACHE = None
+
+
+def get_fitness_cache() -> FitnessCache:
+    """Renvoie le cache de fitness partagé (créé au premier appel)."""
+    global _SHARED_CACHE
+    if _SHARED_CACHE is None:
+        _SHARED_CACHE = FitnessCache()
+    return _SHARED_CACHE
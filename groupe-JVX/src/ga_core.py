@@ -4,53 +4,129 @@ Ce module orchestre l'évolution génétique en utilisant la bibliothèque DEAP.
 Il gère la création de la population, les mutations, les croisements et la sélection
 des meilleures stratégies de trading basées sur deux objectifs : Profit et Drawdown.
 """
+import os
 import random
+import time
+import uuid
 import numpy as np
 import warnings
-from deap import base, creator, tools, algorithms
-from src.strategy_genes import decode_chromosome
-from src.backtest_runner import run_backtest
+from pathlib import Path
+from deap import base, tools, algorithms
+from src.strategy_genes import decode_chromosome, decode_population
+from src.backtest_runner import run_backtest, ENGINES
+from src.vector_backtest import batch_fitness
+from src.indicator_bank import data_fingerprint
+from src.fitness_cache import canonical_params, get_fitness_cache
+from src.eval_store import get_eval_store
+from src.parallel_eval import ParallelEvaluator
+from src.portfolio_backtest import PortfolioData, portfolio_fitness
+from src.telemetry import ERROR_FITNESS, classify_failures, get_telemetry, peak_rss_mb, timed
+from src.memory_guard import MemoryWatchdog, SpilledLogbook
+from src.checkpoint import load_checkpoint, remove_checkpoint, save_checkpoint
+from src.deap_types import creator  # types DEAP (FitnessMulti, Individual)
+from src import array_population
+from src.nsga2 import sel_nsga2
 from src.config import Config
 
 # Désactivation des avertissements liés aux calculs sur des valeurs infinies (cas de backtests échoués)
 warnings.filterwarnings("ignore")
 
-# --- Configuration des Types DEAP ---
+# Représentations de la population : liste d'individus DEAP ou tableau NumPy (voir src/array_population.py)
+GA_BACKENDS = ('deap', 'array')
+# Implémentations de la sélection NSGA-II : tools.selNSGA2 ou tri vectorisé (voir src/nsga2.py)
+GA_SELECTIONS = ('deap', 'fast')
 
-# Création de l'objectif de fitness : 
-# weights=(1.0, -1.0) signifie qu'on maximise le premier critère (Profit) 
-# et qu'on minimise le second (Drawdown).
-if not hasattr(creator, "FitnessMulti"):
-    creator.create("FitnessMulti", base.Fitness, weights=(1.0, -1.0))
-
-# Définition d'un individu comme une liste de gènes associée à sa fitness.
-if not hasattr(creator, "Individual"):
-    creator.create("Individual", list, fitness=creator.FitnessMulti)
-
-def eval_genome(individual, data):
+def eval_genome(individual, data, engine=None, store=None):
     """
     Fonction d'évaluation d'un individu (génome).
     
     Cette fonction décode les gènes en paramètres réels, lance un backtest
     et retourne les scores de performance.
+    Avec une base des évaluations, le génome (sous forme canonique, voir
+    canonical_params) y est d'abord cherché, et le résultat d'un nouveau backtest y est enregistré.
 
     Note : Placée au niveau supérieur du module pour permettre le multiprocessing 
     sous Windows (nécessaire pour la sérialisation 'pickle').
 
     Args:
         individual: L'individu (liste de gènes) à évaluer.
-        data: Les données de marché pour le test.
+        data: Les données de marché pour le test (DataFrame, ou PortfolioData
+            pour évaluer le génome sur tout un portefeuille).
+        engine (str, optional): Moteur de backtest ('backtrader' ou 'vector').
+        store (EvaluationStore, optional): Base des évaluations consultée avant le backtest
+            (ignorée pour un portefeuille).
 
     Returns:
-        tuple: (profit_pct, max_drawdown_pct)
+        tuple: (profit_pct, max_drawdown_pct), ou ERROR_FITNESS si l'évaluation échoue.
     """
     try:
         params = decode_chromosome(individual)
+        if isinstance(data, PortfolioData):
+            return portfolio_fitness(params, data)
+        if store is not None:
+            engine = engine or Config.get_backtest_engine()
+            params = canonical_params(params)
+            context = store.context(data, engine)
+            stored = store.lookup(context, [params]).get(0)
+            if stored is not None:
+                return stored
         # Run backtest
-        profit, drawdown = run_backtest(params, data)
+        start = time.perf_counter()
+        profit, drawdown = run_backtest(params, data, engine=engine)
+        if store is not None:
+            store.record(context, [(params, (profit, drawdown), time.perf_counter() - start)])
         return (profit, drawdown)
     except Exception:
-        return (-100.0, 100.0)
+        return ERROR_FITNESS
+
+def eval_ledger_population(individuals, data, history, engine=None):
+    """
+    Évalue une génération depuis les journaux de trades de ses génomes (voir src/trade_ledger.py).
+
+    Le journal d'un génome est construit une fois sur l'historique complet puis
+    interrogé pour chaque tranche : un génome déjà simulé (fenêtre WFA précédente,
+    population réutilisée) n'est pas resimulé.
+
+    Args:
+        individuals: Liste des individus (listes de gènes) à évaluer.
+        data (pd.DataFrame): Tranche évaluée.
+        history (pd.DataFrame): Historique complet contenant la tranche.
+        engine (str, optional): Moteur du backtest de repli (journal impossible à construire).
+
+    Returns:
+        list: Un tuple (profit_pct, max_drawdown_pct) par individu.
+    """
+    return [run_backtest(decode_chromosome(ind), data, engine=engine, use_ledger=True, history=history)
+            for ind in individuals]
+
+def eval_population(individuals, data, engine=None):
+    """
+    Évalue une génération complète en un seul appel.
+
+    Avec le moteur 'vector', les individus sont décodés en une matrice de paramètres
+    et simulés ensemble sur les tableaux OHLC partagés (voir `batch_fitness`).
+    Avec Backtrader, ou sur un portefeuille (PortfolioData), chaque individu est
+    évalué via `eval_genome`. Si la simulation groupée échoue, la génération est
+    réévaluée individu par individu : seuls les génomes en cause rendent ERROR_FITNESS.
+
+    Args:
+        individuals: Liste des individus (listes de gènes) à évaluer.
+        data: Les données de marché pour le test.
+        engine (str, optional): Moteur de backtest ('backtrader' ou 'vector').
+
+    Returns:
+        list: Un tuple (profit_pct, max_drawdown_pct) par individu.
+    """
+    engine = engine or Config.get_backtest_engine()
+    if engine != 'vector' or isinstance(data, PortfolioData):
+        return [eval_genome(ind, data, engine=engine) for ind in individuals]
+    try:
+        with get_telemetry().timer('vector_eval'):
+            fitness = batch_fitness(decode_population(individuals), data)
+        return [tuple(f) for f in fitness.tolist()]
+    except Exception:
+        get_telemetry().incr('batch_error')
+        return [eval_genome(ind, data, engine=engine) for ind in individuals]
 
 # --- Fonctions de Statistiques ---
 # Ces fonctions traitent les valeurs de fitness de la population pour le suivi.
@@ -83,14 +159,80 @@ class GAEcosystem:
     exécute la boucle d'évolution.
     """
     
-    def __init__(self, data):
+    def __init__(self, data, engine=None, use_cache=True, workers=None, chunk_size=None,
+                 start_method=None, long_run=None, backend=None, selection=None, history=None):
         """
         Initialise la boîte à outils (toolbox) de DEAP.
 
         Args:
-            data: Les données d'entraînement pour l'évaluation.
+            data: Les données d'entraînement pour l'évaluation (DataFrame ou PortfolioData).
+            engine (str, optional): Moteur de backtest ('backtrader' ou 'vector').
+                Par défaut Config.get_backtest_engine().
+            use_cache (bool): Réutilise les fitness déjà calculées (cache partagé
+                entre générations et entre appels à run_evolution, puis base des
+                évaluations si Config.EVAL_STORE_PATH est configuré).
+            workers (int, optional): Processus d'évaluation (1 = séquentiel, 0 = tous les cœurs).
+                Par défaut Config.GA_WORKERS.
+            chunk_size (int, optional): Individus par tâche envoyée au pool.
+                Par défaut Config.GA_CHUNK_SIZE.
+            start_method (str, optional): Méthode de démarrage des processus.
+                Par défaut Config.GA_START_METHOD.
+            long_run (bool, optional): Mode à mémoire bornée (voir src/memory_guard.py).
+                Par défaut Config.LONGRUN_MODE.
+            backend (str, optional): Représentation de la population ('deap' ou 'array').
+                Par défaut Config.GA_BACKEND.
+            selection (str, optional): Implémentation de la sélection NSGA-II ('deap' ou 'fast',
+                mêmes individus sélectionnés). Par défaut Config.GA_SELECTION.
+            history (pd.DataFrame, optional): Historique complet contenant `data`. Avec
+                Config.TRADE_LEDGER_ENABLED, les génomes sont évalués depuis leurs journaux
+                de trades sur cet historique (dans ce processus, sans pool).
         """
         self.data = data
+        self.engine = engine or Config.get_backtest_engine()
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown backtest engine: {self.engine}")
+        self.backend = backend or Config.GA_BACKEND
+        if self.backend not in GA_BACKENDS:
+            raise ValueError(f"Unknown GA backend: {self.backend}")
+        self.selection = selection or Config.GA_SELECTION
+        if self.selection not in GA_SELECTIONS:
+            raise ValueError(f"Unknown NSGA-II selection: {self.selection}")
+        # Journaux de trades : réponses distinctes des backtests dans le cache et la base
+        self.history = (history if Config.TRADE_LEDGER_ENABLED and not isinstance(data, PortfolioData)
+                        else None)
+        self.fitness_engine = 'ledger' if self.history is not None else self.engine
+        self.cache = get_fitness_cache() if use_cache and Config.FITNESS_CACHE_SIZE > 0 else None
+        self.data_fingerprint = None
+        if self.cache is not None:
+            self.data_fingerprint = (data.fingerprint if isinstance(data, PortfolioData)
+                                     else data_fingerprint(data))
+        # Base des évaluations des exécutions précédentes (consultée après le cache en mémoire)
+        self.store = (get_eval_store() if self.cache is not None and not isinstance(data, PortfolioData)
+                      else None)
+        self._store_context = None
+        # Succès / échecs du cache lors de la dernière évaluation (une génération)
+        self.last_cache_stats = {'hits': 0, 'misses': 0}
+
+        workers = Config.GA_WORKERS if workers is None else workers
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.chunk_size = Config.GA_CHUNK_SIZE if chunk_size is None else chunk_size
+        self.start_method = start_method or Config.GA_START_METHOD
+        self._evaluator = None
+        # Débit des backtests réellement lancés (hors succès du cache)
+        self.evaluations = 0
+        self.eval_time = 0.0
+        # Instrumentation de la dernière exécution (voir run_evolution et src/telemetry.py)
+        self.run_id = None
+        self.telemetry_log = []
+        self.run_telemetry = None
+        self._generation = 0
+        self._gen_snapshot = None
+        self._gen_start = None
+        # Mode longue durée : archive de Pareto, logbook sur disque et chien de garde mémoire
+        self.long_run = Config.LONGRUN_MODE if long_run is None else long_run
+        self.archive = None
+        self.memory_report = None
+        self._watchdog = None
         self.toolbox = base.Toolbox()
         self._setup_toolbox()
         
@@ -118,11 +260,169 @@ class GAEcosystem:
         self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
         
         # Opérateurs d'évolution
-        self.toolbox.register("evaluate", eval_genome, data=self.data)
-        self.toolbox.register("mate", tools.cxTwoPoint)
-        self.toolbox.register("mutate", self._custom_mutation)
-        self.toolbox.register("select", tools.selNSGA2)
+        self.toolbox.register("evaluate", eval_genome, data=self.data, engine=self.engine)
+        self.toolbox.register("evaluate_population", self._evaluate_population)
+        # eaSimple évalue via toolbox.map : on regroupe les individus d'une génération
+        self.toolbox.register("map", self._map)
+        # Opérateurs chronométrés (phases 'variation' et 'selection' de la télémétrie)
+        self.toolbox.register("mate", timed(tools.cxTwoPoint, 'variation'))
+        self.toolbox.register("mutate", timed(self._custom_mutation, 'variation'))
+        # Sélection NSGA-II : tri vectorisé pour les grandes populations (même résultat)
+        select = sel_nsga2 if self.selection == 'fast' else tools.selNSGA2
+        self.toolbox.register("select", timed(select, 'selection'))
         
+    def _map(self, func, individuals):
+        """
+        Remplace le `map` de DEAP pour évaluer une génération par lots.
+
+        Args:
+            func: Fonction à appliquer (toolbox.evaluate lors de l'évaluation).
+            individuals: Individus à traiter.
+
+        Returns:
+            list: Résultats dans l'ordre des individus.
+        """
+        if func is self.toolbox.evaluate:
+            fitnesses = self._evaluate_cached(list(individuals))
+            self._record_generation(len(fitnesses))
+            return fitnesses
+        return list(map(func, individuals))
+
+    def _evaluate_population(self, individuals):
+        """
+        Évalue des individus, sur le pool de processus s'il est démarré.
+
+        Args:
+            individuals: Individus à évaluer.
+
+        Returns:
+            list: Un tuple (profit_pct, max_drawdown_pct) par individu.
+        """
+        start = time.perf_counter()
+        if self.history is not None:
+            fitnesses = eval_ledger_population(individuals, self.data, self.history, engine=self.engine)
+        elif self._evaluator is not None:
+            fitnesses = self._evaluator.map(individuals)
+        else:
+            fitnesses = eval_population(individuals, self.data, engine=self.engine)
+        elapsed = time.perf_counter() - start
+        self.eval_time += elapsed
+        self.evaluations += len(individuals)
+
+        telemetry = get_telemetry()
+        telemetry.add_time('evaluation', elapsed)
+        telemetry.incr('evaluations', len(individuals))
+        fallback, errors = classify_failures(fitnesses)
+        telemetry.incr('eval_fallback', fallback)
+        telemetry.incr('eval_error', errors)
+        return fitnesses
+
+    @property
+    def evals_per_sec(self):
+        """Débit moyen des évaluations (backtests par seconde)."""
+        return self.evaluations / self.eval_time if self.eval_time > 0 else 0.0
+
+    def _evaluate_cached(self, individuals):
+        """
+        Évalue une génération en ne lançant des backtests que pour les génomes inconnus du cache.
+
+        Chaque individu est décodé puis mis sous forme canonique (SL/TP arrondis
+        au pas Config.FITNESS_CACHE_TICK) : c'est ce génome canonique qui est évalué
+        et mémorisé, la fitness ne dépend donc pas de l'ordre des évaluations.
+        Les génomes absents du cache sont ensuite cherchés dans la base des évaluations ;
+        les nouveaux backtests y sont enregistrés en tâche de fond.
+
+        Args:
+            individuals: Individus à évaluer.
+
+        Returns:
+            list: Un tuple (profit_pct, max_drawdown_pct) par individu.
+        """
+        if self.cache is None:
+            self.last_cache_stats = {'hits': 0, 'misses': len(individuals)}
+            return self.toolbox.evaluate_population(individuals)
+
+        canonical = [canonical_params(decode_chromosome(ind)) for ind in individuals]
+        keys = [self.cache.make_key(p, self.data_fingerprint, self.fitness_engine) for p in canonical]
+        hits, misses = self.cache.hits, self.cache.misses
+        results, missing = self.cache.lookup(keys)
+
+        if missing and self.store is not None:
+            with get_telemetry().timer('store_lookup'):
+                if self._store_context is None:
+                    self._store_context = self.store.context(self.data, self.fitness_engine)
+                pending = list(missing.items())
+                stored = self.store.lookup(self._store_context,
+                                           [canonical[indices[0]] for _, indices in pending])
+            for position, fitness in stored.items():
+                key, indices = pending[position]
+                self.cache.put(key, fitness)
+                for i in indices:
+                    results[i] = fitness
+                del missing[key]
+            get_telemetry().incr('store_hits', len(stored))
+
+        if missing:
+            chromosomes = [list(canonical[indices[0]].values()) for indices in missing.values()]
+            start = time.perf_counter()
+            fitnesses = self.toolbox.evaluate_population(chromosomes)
+            runtime = (time.perf_counter() - start) / len(chromosomes)
+            for (key, indices), fitness in zip(missing.items(), fitnesses):
+                self.cache.put(key, fitness)
+                for i in indices:
+                    results[i] = tuple(fitness)
+            if self.store is not None:
+                self.store.record(self._store_context, [(canonical[indices[0]], fitness, runtime)
+                                                        for indices, fitness in zip(missing.values(), fitnesses)])
+
+        self.last_cache_stats = {'hits': self.cache.hits - hits, 'misses': self.cache.misses - misses}
+        get_telemetry().incr('cache_hits', self.last_cache_stats['hits'])
+        get_telemetry().incr('cache_misses', self.last_cache_stats['misses'])
+        return [results[i] for i in range(len(individuals))]
+
+    def _record_generation(self, nevals):
+        """
+        Enregistre les mesures d'une génération (appelé après chaque évaluation de génération).
+
+        L'événement couvre tout ce qui s'est passé depuis la génération précédente :
+        sélection, variation, évaluation (et ses phases : Cerebro, analyseurs...).
+
+        Args:
+            nevals (int): Individus évalués lors de cette génération (cache compris).
+        """
+        telemetry = get_telemetry()
+        now = time.perf_counter()
+        delta = telemetry.delta(self._gen_snapshot)
+        counters, timers = delta['counters'], delta['timers']
+        evaluated = counters.get('evaluations', 0)
+        eval_time = timers.get('evaluation', {}).get('total_s', 0.0)
+        hits, misses = counters.get('cache_hits', 0), counters.get('cache_misses', 0)
+        record = {
+            'run': self.run_id,
+            'gen': self._generation,
+            'nevals': nevals,
+            'evaluated': evaluated,
+            'eval_time': eval_time,
+            'evals_per_sec': evaluated / eval_time if eval_time > 0 else 0.0,
+            'failed_fallback': counters.get('eval_fallback', 0),
+            'failed_error': counters.get('eval_error', 0),
+            'cache_hits': hits,
+            'cache_misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'elapsed': now - self._gen_start,
+            'phases': {phase: t['total_s'] for phase, t in timers.items()},
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        if self._watchdog is not None:
+            record['rss_mb'] = self._watchdog.check(self.evaluations)
+            # Seules les dernières générations restent en mémoire (le flux JSON garde tout)
+            del self.telemetry_log[:max(0, len(self.telemetry_log) - Config.LONGRUN_LOGBOOK_KEEP + 1)]
+        self.telemetry_log.append(record)
+        telemetry.emit('generation', **record)
+        self._generation += 1
+        self._gen_snapshot = telemetry.snapshot()
+        self._gen_start = now
+
     def _custom_mutation(self, individual, indpb=0.2):
         """
         Mutation personnalisée gérant le mélange de gènes entiers et flottants.
@@ -144,7 +444,41 @@ class GAEcosystem:
                     if individual[i] < 0.01: individual[i] = 0.01
         return individual,
 
-    def run_evolution(self, population_size=Config.GA_POPULATION, generations=Config.GA_GENERATIONS, verbose=True):
+    def _last_hit_rate(self, _):
+        """Taux de succès du cache lors de la dernière évaluation."""
+        total = self.last_cache_stats['hits'] + self.last_cache_stats['misses']
+        return round(self.last_cache_stats['hits'] / total, 3) if total else 0.0
+
+    def seed_population(self, previous, population_size, immigrant_rate=None):
+        """
+        Construit une population initiale à partir d'une population déjà évoluée.
+
+        Les meilleurs individus de `previous` (front de Pareto d'abord, via NSGA-II)
+        sont clonés et leur fitness invalidée pour être réévaluée sur les données
+        de cet écosystème. Le reste est complété par des immigrants aléatoires.
+
+        Args:
+            previous: Population finale d'une évolution précédente.
+            population_size (int): Taille de la population à produire.
+            immigrant_rate (float, optional): Part d'immigrants aléatoires.
+                Par défaut Config.WFA_IMMIGRANT_RATE.
+
+        Returns:
+            list: Nouvelle population de `population_size` individus.
+        """
+        immigrant_rate = Config.WFA_IMMIGRANT_RATE if immigrant_rate is None else immigrant_rate
+        n_immigrants = min(population_size, int(round(population_size * immigrant_rate)))
+        candidates = [ind for ind in previous
+                      if ind.fitness.valid and np.all(np.isfinite(ind.fitness.values))]
+        n_seeded = min(population_size - n_immigrants, len(candidates))
+
+        seeded = [self.toolbox.clone(ind) for ind in tools.selNSGA2(candidates, n_seeded)]
+        for ind in seeded:
+            del ind.fitness.values
+        return seeded + self.toolbox.population(n=population_size - len(seeded))
+
+    def run_evolution(self, population_size=Config.GA_POPULATION, generations=Config.GA_GENERATIONS, verbose=True,
+                      initial_population=None, checkpoint=None, resume=False):
         """
         Lance la boucle d'évolution génétique.
 
@@ -152,27 +486,298 @@ class GAEcosystem:
             population_size (int): Taille de la population.
             generations (int): Nombre de générations.
             verbose (bool): Affichage des logs d'évolution.
+            initial_population (list, optional): Population de départ (voir seed_population).
+                Par défaut, une population aléatoire de `population_size` individus.
+            checkpoint (str, optional): Fichier du point de reprise, réécrit toutes les
+                Config.CHECKPOINT_EVERY générations et supprimé en fin d'exécution
+                (voir src/checkpoint.py).
+            resume (bool): Reprend depuis `checkpoint` s'il correspond à cette exécution
+                (mêmes données et réglages) : la suite est identique à une exécution
+                ininterrompue. `generations` peut dépasser celui de l'exécution reprise.
 
         Returns:
             tuple: (Dernière population, Logbook des statistiques)
         """
         
-        pop = self.toolbox.population(n=population_size)
+        if self.backend == 'array':
+            # Population en tableau, convertie en individus DEAP en fin d'exécution
+            pop = (array_population.from_individuals(initial_population) if initial_population is not None
+                   else array_population.random_population(population_size, Config.GENE_BOUNDS))
+        elif initial_population is not None:
+            pop = list(initial_population)
+        else:
+            pop = self.toolbox.population(n=population_size)
         
         # Configuration du suivi statistique (basé sur le Profit).
-        stats = tools.Statistics(lambda ind: ind.fitness.values[0])
+        # Le backend 'array' passe directement la colonne des profits.
+        stats = tools.Statistics() if self.backend == 'array' else tools.Statistics(lambda ind: ind.fitness.values[0])
         
         stats.register("avg", stats_mean)
         stats.register("std", stats_std)
         stats.register("min", stats_min)
         stats.register("max", stats_max)
+        # Efficacité du cache de fitness sur la génération (lue après l'évaluation)
+        stats.register("hits", lambda _: self.last_cache_stats['hits'])
+        stats.register("misses", lambda _: self.last_cache_stats['misses'])
+        stats.register("hit_rate", self._last_hit_rate)
         
-        # Exécution de l'algorithme évolutionnaire simple
-        pop, logbook = algorithms.eaSimple(pop, self.toolbox, 
-                                         cxpb=Config.GA_CXPB, 
-                                         mutpb=Config.GA_MUTPB, 
-                                         ngen=generations, 
-                                         stats=stats, 
-                                         verbose=verbose)
+        telemetry = get_telemetry()
+        self.run_id = uuid.uuid4().hex[:12]
+        self.telemetry_log = []
+        self.memory_report = None
+        self._generation = 0
+        state = signature = None
+        if checkpoint is not None:
+            signature = self._checkpoint_signature(len(pop))
+            state = load_checkpoint(checkpoint, signature) if resume else None
+            if state is not None:
+                pop = state['population']
+                self.run_id = state['run_id']
+                self.telemetry_log = state['telemetry_log']
+                self._generation = state['gen'] + 1
+                random.setstate(state['random'])
+                np.random.set_state(state['numpy'])
+                if verbose:
+                    print(f"Reprise après la génération {state['gen']} ({checkpoint})")
+        run_snapshot = self._gen_snapshot = telemetry.snapshot()
+        run_start = self._gen_start = time.perf_counter()
+        telemetry.emit('ga_start', run=self.run_id, engine=self.engine, workers=self.workers,
+                       population=len(pop), generations=generations, start_gen=self._generation)
+
+        if self.workers > 1 and self.history is None:
+            self._evaluator = ParallelEvaluator(self.data, self.engine, workers=self.workers,
+                                                chunk_size=self.chunk_size,
+                                                start_method=self.start_method)
+            self._evaluator.start()
+        # Mode longue durée : cache partagé réduit le temps de l'exécution seulement
+        # (les exécutions suivantes du processus retrouvent sa capacité)
+        cache_capacity = None
+        if self.long_run and self.cache is not None:
+            cache_capacity = self.cache.maxsize
+            self.cache.resize(min(cache_capacity, Config.LONGRUN_FITNESS_CACHE_SIZE))
+        try:
+            if self.long_run:
+                self._watchdog = MemoryWatchdog()
+                self._watchdog.start()
+            if self.backend == 'array':
+                pop, logbook = self._evolve_array(pop, stats, generations, verbose, state, checkpoint, signature)
+                pop = array_population.to_individuals(pop)
+            elif self.long_run or checkpoint is not None:
+                pop, logbook = self._evolve(pop, stats, generations, verbose, state, checkpoint, signature)
+            else:
+                # Exécution de l'algorithme évolutionnaire simple
+                pop, logbook = algorithms.eaSimple(pop, self.toolbox, 
+                                                 cxpb=Config.GA_CXPB, 
+                                                 mutpb=Config.GA_MUTPB, 
+                                                 ngen=generations, 
+                                                 stats=stats, 
+                                                 verbose=verbose)
+        finally:
+            if self._evaluator is not None:
+                self._evaluator.close()
+                self._evaluator = None
+            if cache_capacity is not None:
+                self.cache.resize(cache_capacity)
+            if self._watchdog is not None:
+                self._watchdog.stop()
+                self.memory_report = self._watchdog.report()
+                self._watchdog = None
+            if self.store is not None:
+                # Les processus de travail (WFA) ne passent pas par atexit : écriture immédiate
+                self.store.flush()
+        # Exécution terminée : son point de reprise n'a plus d'usage
+        remove_checkpoint(checkpoint)
+
+        self._record_run(telemetry.delta(run_snapshot), time.perf_counter() - run_start,
+                         len(pop), generations)
+        if verbose:
+            print(f"Évaluations : {self.evaluations} backtests en {self.eval_time:.2f}s "
+                  f"({self.evals_per_sec:.0f} evals/s, {self.workers} processus)")
+            if self.store is not None:
+                print(f"Base des évaluations : {self.run_telemetry['store_hits']} génomes relus "
+                      f"({self.store.path})")
+            if self.long_run:
+                report = self.memory_report
+                print(f"Mémoire : {report['baseline_mb']:.0f} -> {report['last_mb']:.0f} Mo "
+                      f"(max {report['max_mb']:.0f} Mo, {report['growth_mb_per_1k_evals']:+.2f} Mo / 1000 évaluations), "
+                      f"logbook : {logbook.path}")
                                          
-        return pop, logbook
\ No newline at end of file
+        return pop, logbook
+
+    def _evolve(self, pop, stats, generations, verbose, state=None, checkpoint=None, signature=None):
+        """
+        Boucle d'évolution du mode longue durée et des exécutions avec points de reprise.
+
+        Même algorithme (et même suite de tirages aléatoires) que algorithms.eaSimple.
+        En mode longue durée, le logbook est déversé sur disque (SpilledLogbook) et les
+        meilleurs individus rencontrés sont gardés dans une archive de Pareto (self.archive).
+
+        Args:
+            pop (list): Population initiale (ou reprise).
+            stats (tools.Statistics): Statistiques enregistrées à chaque génération.
+            generations (int): Nombre de générations.
+            verbose (bool): Affichage des logs d'évolution.
+            state (Dict, optional): Point de reprise relu (logbook, archive, génération).
+            checkpoint (str, optional): Fichier du point de reprise à réécrire.
+            signature (Dict, optional): Réglages de l'exécution enregistrés avec le point.
+
+        Returns:
+            tuple: (Dernière population, Logbook ou SpilledLogbook)
+        """
+        if state is not None:
+            logbook, self.archive, start = state['logbook'], state['archive'], state['gen'] + 1
+            if isinstance(logbook, SpilledLogbook):
+                logbook.truncate()
+        else:
+            if self.long_run:
+                logbook = SpilledLogbook(Path(Config.LONGRUN_DIR) / f"logbook_{self.run_id}.jsonl")
+                self.archive = tools.ParetoFront()
+            else:
+                logbook = tools.Logbook()
+                self.archive = None
+            logbook.header = ['gen', 'nevals'] + stats.fields
+            start = 0
+
+        for gen in range(start, generations + 1):
+            if gen > 0:
+                offspring = self.toolbox.select(pop, len(pop))
+                pop[:] = algorithms.varAnd(offspring, self.toolbox, Config.GA_CXPB, Config.GA_MUTPB)
+            invalid_ind = [ind for ind in pop if not ind.fitness.valid]
+            fitnesses = self.toolbox.map(self.toolbox.evaluate, invalid_ind)
+            for ind, fit in zip(invalid_ind, fitnesses):
+                ind.fitness.values = fit
+            if self.archive is not None:
+                self.archive.update(pop)
+
+            logbook.record(gen=gen, nevals=len(invalid_ind), **stats.compile(pop))
+            if verbose:
+                print(logbook.stream)
+            if checkpoint is not None and gen % max(1, Config.CHECKPOINT_EVERY) == 0:
+                with get_telemetry().timer('checkpoint'):
+                    save_checkpoint(checkpoint, {
+                        'signature': signature, 'gen': gen, 'population': pop, 'logbook': logbook,
+                        'archive': self.archive, 'random': random.getstate(),
+                        'numpy': np.random.get_state(), 'run_id': self.run_id,
+                        'telemetry_log': self.telemetry_log,
+                    })
+        return pop, logbook
+
+    def _evolve_array(self, pop, stats, generations, verbose, state=None, checkpoint=None, signature=None):
+        """
+        Boucle d'évolution du backend 'array' (voir src/array_population.py).
+
+        Même enchaînement que _evolve (sélection NSGA-II, croisement à deux points puis
+        mutation, évaluation des seuls individus modifiés), appliqué à un tableau
+        structuré : ni clone ni objet par individu d'une génération à l'autre. Les
+        tirages viennent de np.random : la suite des populations diffère de celle du
+        backend 'deap' pour une même graine.
+
+        Args:
+            pop (np.ndarray): Population initiale (ou reprise).
+            stats (tools.Statistics): Statistiques, calculées sur la colonne des profits.
+            generations (int): Nombre de générations.
+            verbose (bool): Affichage des logs d'évolution.
+            state (Dict, optional): Point de reprise relu.
+            checkpoint (str, optional): Fichier du point de reprise à réécrire.
+            signature (Dict, optional): Réglages de l'exécution enregistrés avec le point.
+
+        Returns:
+            tuple: (Dernière population en tableau, Logbook ou SpilledLogbook)
+        """
+        telemetry = get_telemetry()
+        if state is not None:
+            logbook, self.archive, start = state['logbook'], state['archive'], state['gen'] + 1
+            if isinstance(logbook, SpilledLogbook):
+                logbook.truncate()
+        else:
+            if self.long_run:
+                logbook = SpilledLogbook(Path(Config.LONGRUN_DIR) / f"logbook_{self.run_id}.jsonl")
+                self.archive = tools.ParetoFront()
+            else:
+                logbook = tools.Logbook()
+                self.archive = None
+            logbook.header = ['gen', 'nevals'] + stats.fields
+            start = 0
+
+        for gen in range(start, generations + 1):
+            if gen > 0:
+                with telemetry.timer('selection'):
+                    chosen = array_population.select_nsga2(pop['fitness'], len(pop),
+                                                           fast=self.selection == 'fast')
+                with telemetry.timer('variation'):
+                    pop = array_population.var_and(pop[chosen], Config.GA_CXPB, Config.GA_MUTPB)
+            invalid = np.flatnonzero(~pop['valid'])
+            fitnesses = self.toolbox.map(self.toolbox.evaluate, pop['genes'][invalid].tolist())
+            if len(invalid):
+                pop['fitness'][invalid] = fitnesses
+                pop['valid'][invalid] = True
+            if self.archive is not None:
+                self.archive.update(array_population.to_individuals(pop))
+
+            logbook.record(gen=gen, nevals=len(invalid), **stats.compile(pop['fitness'][:, 0]))
+            if verbose:
+                print(logbook.stream)
+            if checkpoint is not None and gen % max(1, Config.CHECKPOINT_EVERY) == 0:
+                with telemetry.timer('checkpoint'):
+                    save_checkpoint(checkpoint, {
+                        'signature': signature, 'gen': gen, 'population': pop, 'logbook': logbook,
+                        'archive': self.archive, 'random': random.getstate(),
+                        'numpy': np.random.get_state(), 'run_id': self.run_id,
+                        'telemetry_log': self.telemetry_log,
+                    })
+        return pop, logbook
+
+    def _checkpoint_signature(self, population_size):
+        """Réglages qu'un point de reprise doit partager avec l'exécution qui le relit."""
+        fingerprint = (self.data.fingerprint if isinstance(self.data, PortfolioData)
+                       else self.data_fingerprint or data_fingerprint(self.data))
+        return {
+            'data': fingerprint,
+            'engine': self.fitness_engine,
+            'population': population_size,
+            'cxpb': Config.GA_CXPB,
+            'mutpb': Config.GA_MUTPB,
+            'long_run': self.long_run,
+            'backend': self.backend,
+            'commission': Config.get_commission(),
+            'initial_cash': Config.INITIAL_CASH,
+            'gene_bounds': Config.GENE_BOUNDS,
+        }
+
+    def _record_run(self, delta, elapsed, population_size, generations):
+        """
+        Résume une exécution de run_evolution (événement 'ga_run', fichier Prometheus).
+
+        Args:
+            delta (Dict): Mesures accumulées pendant l'exécution (Telemetry.delta).
+            elapsed (float): Durée totale (s).
+            population_size (int): Taille de la population finale.
+            generations (int): Générations demandées.
+        """
+        counters, timers = delta['counters'], delta['timers']
+        hits, misses = counters.get('cache_hits', 0), counters.get('cache_misses', 0)
+        evaluated = counters.get('evaluations', 0)
+        eval_time = timers.get('evaluation', {}).get('total_s', 0.0)
+        self.run_telemetry = {
+            'run': self.run_id,
+            'engine': self.fitness_engine,
+            'workers': self.workers,
+            'population': population_size,
+            'generations': generations,
+            'elapsed': elapsed,
+            'evaluated': evaluated,
+            'evals_per_sec': evaluated / eval_time if eval_time > 0 else 0.0,
+            'failed_fallback': counters.get('eval_fallback', 0),
+            'failed_error': counters.get('eval_error', 0),
+            'cache_hits': hits,
+            'cache_misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'store_hits': counters.get('store_hits', 0),
+            'phases': timers,
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        if self.memory_report is not None:
+            self.run_telemetry['memory'] = self.memory_report
+        telemetry = get_telemetry()
+        telemetry.emit('ga_run', **self.run_telemetry)
+        telemetry.write_prometheus()
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Module Import Profile.
+Ce module mesure le coût des imports au démarrage : chaque mesure importe des modules
+dans un interpréteur neuf lancé avec `python -X importtime`, puis attribue le temps
+à chaque paquet de premier niveau (pandas, backtrader, deap...) et à chaque module du projet.
+Il sert au mode 'imports' de main.py et au benchmark de démarrage.
+"""
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# Racine du projet (répertoire de main.py)
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Ligne produite par -X importtime : "import time: <self us> | <cumulé us> | <indentation><module>"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Modules chargés par l'interpréteur avant le code mesuré (calculés une fois)
+_STARTUP_MODULES = None
+
+
+def _run_importtime(statement: str) -> List[Dict]:
+    """
+    Exécute une instruction dans un interpréteur neuf et relit le journal -X importtime.
+
+    Returns:
+        List[Dict]: Un enregistrement par module importé, dans l'ordre de fin de chargement :
+        {'module', 'self_s', 'cumulative_s', 'depth'}.
+
+    Raises:
+        ImportError: Si l'instruction échoue (module absent, erreur à l'import).
+    """
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                               cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        last = completed.stderr.strip().splitlines()[-1:] or ['unknown error']
+        raise ImportError(f"{statement}: {last[0]}")
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append({'module': module, 'self_s': int(self_us) / 1e6,
+                            'cumulative_s': int(cumulative_us) / 1e6, 'depth': (len(indent) - 1) // 2})
+    return entries
+
+
+def _startup_modules() -> set:
+    """Modules importés par l'interpréteur lui-même (site, encodings...)."""
+    global _STARTUP_MODULES
+    if _STARTUP_MODULES is None:
+        _STARTUP_MODULES = {entry['module'] for entry in _run_importtime('pass')}
+    return _STARTUP_MODULES
+
+
+def owner(module: str) -> str:
+    """Paquet auquel le temps d'un module est attribué ('src.ga_core', 'pandas', 'deap'...)."""
+    parts = module.split('.')
+    return '.'.join(parts[:2]) if parts[0] == 'src' else parts[0]
+
+
+def profile_imports(modules: List[str]) -> Dict:
+    """
+    Mesure l'import d'une liste de modules dans un interpréteur neuf.
+
+    Args:
+        modules (List[str]): Modules importés (ex: ['src.data_manager']).
+
+    Returns:
+        Dict: {'total_s': durée totale, 'owners': {paquet: durée propre cumulée (s)},
+        'modules': nombre de modules chargés}, paquets triés du plus coûteux au moins coûteux.
+
+    Raises:
+        ImportError: Si l'un des modules ne peut pas être importé.
+    """
+    if not modules:
+        return {'total_s': 0.0, 'owners': {}, 'modules': 0}
+    startup = _startup_modules()
+    entries = [e for e in _run_importtime(f"import {', '.join(modules)}") if e['module'] not in startup]
+    owners = {}
+    for entry in entries:
+        name = owner(entry['module'])
+        owners[name] = owners.get(name, 0.0) + entry['self_s']
+    return {
+        'total_s': sum(e['self_s'] for e in entries),
+        'owners': dict(sorted(owners.items(), key=lambda item: -item[1])),
+        'modules': len(entries),
+    }
+
+
+def print_import_breakdown(mode_modules: Dict[str, List[str]], top: int = 6):
+    """
+    Affiche, pour chaque mode, le coût total des imports et les paquets les plus coûteux.
+
+    Args:
+        mode_modules (Dict[str, List[str]]): Modules importés par chaque mode.
+        top (int): Paquets détaillés par mode.
+    """
+    print(f"\n{'Mode':<12} {'Imports':>9} {'Modules':>8}  Paquets les plus coûteux")
+    for mode, modules in mode_modules.items():
+        try:
+            profile = profile_imports(modules)
+        except ImportError as e:
+            print(f"{mode:<12} {'-':>9} {'-':>8}  indisponible ({e})")
+            continue
+        detail = ", ".join(f"{name} {seconds * 1000:.0f} ms"
+                           for name, seconds in list(profile['owners'].items())[:top])
+        print(f"{mode:<12} {profile['total_s'] * 1000:>6.0f} ms {profile['modules']:>8}  {detail}")
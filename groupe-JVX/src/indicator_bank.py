@@ -0,0 +1,276 @@
+"""
+Module Indicator Bank.
+Ce module précalcule, une seule fois par jeu de données (ou par tranche WFA), toutes
+les séries SMA et RSI de l'espace de recherche défini par Config.GENE_BOUNDS.
+Le moteur vectorisé y lit directement les indicateurs au lieu de les recalculer
+pour chaque individu.
+"""
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable
+import numpy as np
+import pandas as pd
+from src.config import Config
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """
+    Calcule l'empreinte (hash) d'un DataFrame OHLCV : index et valeurs.
+
+    Deux tranches identiques donnent la même empreinte, toute modification
+    des prix ou des dates en change la valeur.
+
+    Args:
+        data (pd.DataFrame): Données de marché.
+
+    Returns:
+        str: Empreinte hexadécimale.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(data.index.values).view(np.uint8))
+    cols = [c for c in ('Open', 'High', 'Low', 'Close', 'Volume') if c in data.columns]
+    h.update(','.join(cols).encode())
+    if cols:
+        h.update(np.ascontiguousarray(data[cols].to_numpy(dtype=np.float64)).view(np.uint8))
+    return h.hexdigest()
+
+
+def compute_sma(close: np.ndarray, period: int, csum: np.ndarray = None) -> np.ndarray:
+    """
+    Calcule une moyenne mobile simple par différence de sommes cumulées.
+
+    Args:
+        close (np.ndarray): Série des prix de clôture.
+        period (int): Période de la moyenne.
+        csum (np.ndarray, optional): Somme cumulée [0, c0, c0+c1, ...] déjà calculée.
+
+    Returns:
+        np.ndarray: Moyenne mobile (NaN tant que la période n'est pas remplie).
+    """
+    out = np.full(len(close), np.nan)
+    if period < 1 or len(close) < period:
+        return out
+    if csum is None:
+        csum = np.concatenate(([0.0], np.cumsum(close, dtype=np.float64)))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def compute_rsi(close: np.ndarray, period: int, moves: tuple = None) -> np.ndarray:
+    """
+    Calcule le RSI de Wilder exactement comme bt.indicators.RSI.
+
+    Les hausses/baisses sont lissées par une moyenne de Wilder (SMMA) initialisée
+    par la moyenne arithmétique des `period` premières valeurs.
+
+    Args:
+        close (np.ndarray): Série des prix de clôture.
+        period (int): Période du RSI.
+        moves (tuple, optional): Listes (hausses, baisses) déjà calculées.
+
+    Returns:
+        np.ndarray: RSI (NaN pendant les `period` premières barres).
+
+    Raises:
+        ZeroDivisionError: Si la moyenne des baisses est nulle, comme Backtrader
+            (safediv=False) qui interrompt alors le backtest.
+    """
+    n = len(close)
+    out = np.full(n, np.nan)
+    if period < 1 or n < period + 1:
+        return out
+    if moves is None:
+        diff = np.diff(close)
+        moves = (np.maximum(diff, 0.0).tolist(), np.maximum(-diff, 0.0).tolist())
+    up, down = moves
+
+    alpha = 1.0 / period
+    alpha1 = 1.0 - alpha
+    maup = math.fsum(up[:period]) / period
+    madown = math.fsum(down[:period]) / period
+
+    rsi = out.tolist()
+    for i in range(period, n):
+        if i > period:
+            maup = maup * alpha1 + up[i - 1] * alpha
+            madown = madown * alpha1 + down[i - 1] * alpha
+        rs = maup / madown
+        rsi[i] = 100.0 - 100.0 / (1.0 + rs)
+    return np.asarray(rsi)
+
+
+def _bounded_periods(name: str, bounds: Dict[str, tuple]) -> range:
+    """Renvoie l'intervalle entier (bornes incluses) d'un gène de période."""
+    low, high = bounds[name]
+    return range(int(low), int(high) + 1)
+
+
+class IndicatorBank:
+    """
+    Banque d'indicateurs précalculés pour une série de prix donnée.
+
+    Les séries sont stockées dans des tableaux contigus (une ligne par période).
+    Les périodes hors bornes (possibles après mutation) sont calculées à la demande
+    puis conservées.
+    """
+
+    def __init__(self, close: np.ndarray, sma_periods: Iterable[int], rsi_periods: Iterable[int],
+                 fingerprint: str = None):
+        """
+        Construit toutes les séries en un passage par famille d'indicateurs.
+
+        Args:
+            close (np.ndarray): Prix de clôture.
+            sma_periods (Iterable[int]): Périodes de SMA à précalculer.
+            rsi_periods (Iterable[int]): Périodes de RSI à précalculer.
+            fingerprint (str, optional): Empreinte des données sources.
+        """
+        start = time.perf_counter()
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.fingerprint = fingerprint
+        n = len(self.close)
+
+        # SMA : une seule somme cumulée partagée par toutes les périodes
+        self.sma_periods = sorted(set(int(p) for p in sma_periods))
+        self._csum = np.concatenate(([0.0], np.cumsum(self.close)))
+        self.sma_table = np.full((len(self.sma_periods), n), np.nan)
+        for row, period in enumerate(self.sma_periods):
+            self.sma_table[row] = compute_sma(self.close, period, csum=self._csum)
+        self._sma_rows = {p: r for r, p in enumerate(self.sma_periods)}
+
+        # RSI : hausses/baisses calculées une fois, lissage de Wilder récursif par période
+        self.rsi_periods = sorted(set(int(p) for p in rsi_periods))
+        diff = np.diff(self.close)
+        self._moves = (np.maximum(diff, 0.0).tolist(), np.maximum(-diff, 0.0).tolist())
+        self.rsi_table = np.full((len(self.rsi_periods), n), np.nan)
+        self._rsi_failed = set()
+        for row, period in enumerate(self.rsi_periods):
+            try:
+                self.rsi_table[row] = compute_rsi(self.close, period, moves=self._moves)
+            except ZeroDivisionError:
+                self._rsi_failed.add(period)
+        self._rsi_rows = {p: r for r, p in enumerate(self.rsi_periods)}
+
+        self._extra_sma = {}
+        self._extra_rsi = {}
+        self.build_time = time.perf_counter() - start
+
+    @classmethod
+    def from_data(cls, data: pd.DataFrame, bounds: Dict[str, tuple] = None,
+                  fingerprint: str = None) -> 'IndicatorBank':
+        """
+        Construit la banque couvrant l'espace des gènes pour un DataFrame.
+
+        Args:
+            data (pd.DataFrame): Données de marché (colonne 'Close' requise).
+            bounds (Dict[str, tuple], optional): Bornes des gènes. Par défaut Config.GENE_BOUNDS.
+            fingerprint (str, optional): Empreinte déjà calculée par l'appelant.
+
+        Returns:
+            IndicatorBank: Banque prête à l'emploi.
+        """
+        bounds = bounds or Config.GENE_BOUNDS
+        sma_periods = list(_bounded_periods('SMA_F', bounds)) + list(_bounded_periods('SMA_S', bounds))
+        return cls(data['Close'].to_numpy(dtype=np.float64), sma_periods,
+                   _bounded_periods('RSI_P', bounds),
+                   fingerprint=fingerprint or data_fingerprint(data))
+
+    def sma(self, period: int) -> np.ndarray:
+        """
+        Renvoie la SMA d'une période (vue sur la banque, calculée à la demande si absente).
+
+        Args:
+            period (int): Période de la moyenne.
+
+        Returns:
+            np.ndarray: Série alignée sur les prix (à ne pas modifier).
+        """
+        period = int(period)
+        row = self._sma_rows.get(period)
+        if row is not None:
+            return self.sma_table[row]
+        if period not in self._extra_sma:
+            self._extra_sma[period] = compute_sma(self.close, period, csum=self._csum)
+        return self._extra_sma[period]
+
+    def rsi(self, period: int) -> np.ndarray:
+        """
+        Renvoie le RSI d'une période (vue sur la banque, calculé à la demande si absent).
+
+        Args:
+            period (int): Période du RSI.
+
+        Returns:
+            np.ndarray: Série alignée sur les prix (à ne pas modifier).
+
+        Raises:
+            ZeroDivisionError: Si Backtrader échouerait sur cette période (voir compute_rsi).
+        """
+        period = int(period)
+        if period in self._rsi_failed:
+            raise ZeroDivisionError("float division by zero")
+        row = self._rsi_rows.get(period)
+        if row is not None:
+            return self.rsi_table[row]
+        if period not in self._extra_rsi:
+            try:
+                self._extra_rsi[period] = compute_rsi(self.close, period, moves=self._moves)
+            except ZeroDivisionError:
+                self._rsi_failed.add(period)
+                raise
+        return self._extra_rsi[period]
+
+    def matches(self, data: pd.DataFrame) -> bool:
+        """Indique si la banque correspond toujours aux données fournies."""
+        return self.fingerprint == data_fingerprint(data)
+
+    @property
+    def nbytes(self) -> int:
+        """Empreinte mémoire des séries stockées (en octets)."""
+        extra = sum(a.nbytes for a in self._extra_sma.values())
+        extra += sum(a.nbytes for a in self._extra_rsi.values())
+        return self.sma_table.nbytes + self.rsi_table.nbytes + self._csum.nbytes + extra
+
+    def __repr__(self):
+        return (f"IndicatorBank(bars={len(self.close)}, sma={len(self.sma_periods)}, "
+                f"rsi={len(self.rsi_periods)}, {self.nbytes / 1024:.0f} KiB, "
+                f"built in {self.build_time * 1000:.1f} ms)")
+
+
+# Banques récemment construites, indexées par empreinte des données (LRU)
+_BANKS = OrderedDict()
+
+
+def get_indicator_bank(data: pd.DataFrame, fingerprint: str = None) -> IndicatorBank:
+    """
+    Renvoie la banque d'indicateurs d'un jeu de données, en la construisant au besoin.
+
+    Les banques sont partagées via un petit cache LRU indexé par l'empreinte des
+    données : une tranche modifiée produit une nouvelle empreinte et donc une
+    nouvelle banque.
+
+    Args:
+        data (pd.DataFrame): Données de marché.
+        fingerprint (str, optional): Empreinte déjà calculée par l'appelant.
+
+    Returns:
+        IndicatorBank: Banque correspondant exactement à `data`.
+    """
+    fingerprint = fingerprint or data_fingerprint(data)
+    bank = _BANKS.get(fingerprint)
+    if bank is not None:
+        _BANKS.move_to_end(fingerprint)
+        return bank
+
+    bank = IndicatorBank.from_data(data, fingerprint=fingerprint)
+    _BANKS[fingerprint] = bank
+    while len(_BANKS) > Config.INDICATOR_BANK_CACHE_SIZE:
+        _BANKS.popitem(last=False)
+    return bank
+
+
+def clear_indicator_banks():
+    """Vide le cache des banques d'indicateurs."""
+    _BANKS.clear()
@@ -0,0 +1,403 @@
+"""
+Module Job Runner.
+Ce module exécute les optimisations lancées depuis le dashboard (AG simple ou WFA) en
+arrière-plan, chacune dans son propre processus : l'interface reste réactive, plusieurs
+jobs peuvent tourner en même temps (un par actif) et un job survit au rechargement de la
+page. La progression remonte par les événements de télémétrie (génération, fenêtre WFA) ;
+l'annulation est coopérative et prend effet au prochain événement, le processus étant
+interrompu de force si elle tarde au-delà de Config.JOBS_CANCEL_GRACE_S.
+Une demande déjà calculée est servie par le cache de résultats (voir result_cache) sans
+lancer de processus, et une demande identique à un job en cours rejoint ce job.
+"""
+import contextlib
+import io
+import multiprocessing as mp
+import os
+import queue
+import random
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from typing import Dict, List
+from src.config import AssetConfig, Config
+from src.result_cache import ResultCache, config_snapshot, get_result_cache, make_key
+
+# Types de jobs pris en charge
+JOB_KINDS = ('ga', 'wfa')
+
+# États d'un job (les trois derniers sont définitifs)
+JOB_STATUSES = ('running', 'done', 'failed', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """Levée dans le processus d'un job lorsque son annulation a été demandée."""
+
+
+def _run_ga(asset: AssetConfig, dm, options: Dict) -> Dict:
+    """AG simple sur la part d'entraînement de l'actif (comme le mode 'simple')."""
+    from src.ga_core import GAEcosystem
+    from src.strategy_genes import decode_chromosome
+
+    full_data = dm.get_full_data()
+    if full_data.empty or len(full_data) < 200:
+        raise ValueError(f"Not enough data ({len(full_data)} bars)")
+    train_data = full_data.iloc[:int(len(full_data) * asset.train_ratio)]
+    ga = GAEcosystem(train_data, engine=asset.engine)
+    pop, log = ga.run_evolution(population_size=asset.population,
+                                generations=asset.generations, verbose=False)
+    best_ind = max(pop, key=lambda ind: ind.fitness.values[0])
+    gen, avg, max_ = log.select("gen", "avg", "max")
+    return {
+        'best_params': decode_chromosome(best_ind),
+        'best_fitness': best_ind.fitness.values[0],
+        'convergence': {'gen': gen, 'avg': avg, 'max': max_},
+        'telemetry_log': ga.telemetry_log,
+        'run_telemetry': ga.run_telemetry,
+    }
+
+
+def _run_wfa(asset: AssetConfig, dm, options: Dict) -> List[Dict]:
+    """Analyse Walk-Forward de l'actif (fenêtres fixées par les options du job)."""
+    from src.walk_forward import WalkForwardAnalyzer
+
+    # Le processus du job a sa propre Config : le serveur du dashboard n'est pas modifié
+    Config.WFA_TRAIN_MONTHS = options.get('train_months', Config.WFA_TRAIN_MONTHS)
+    Config.WFA_TEST_MONTHS = options.get('test_months', Config.WFA_TEST_MONTHS)
+    kwargs = {key: options[key] for key in ('population_size', 'generations', 'workers', 'seed')
+              if key in options}
+    if kwargs.get('seed') is None:
+        kwargs['seed'] = asset.seed
+    return WalkForwardAnalyzer(dm).run_analysis(**kwargs)
+
+
+def _job_main(kind: str, asset: AssetConfig, options: Dict, messages, cancel):
+    """
+    Point d'entrée du processus d'un job (fonction de niveau module pour le pickling).
+
+    Chaque événement de télémétrie est relayé au dashboard ; c'est aussi à ce moment que
+    l'annulation est vérifiée. Le dernier message est ('result', ...), ('cancelled', None)
+    ou ('error', trace).
+    """
+    import numpy as np
+    from src.data_manager import DataManager
+    from src.memory_guard import release_caches
+    from src.telemetry import get_telemetry
+
+    pid = os.getpid()
+
+    def relay(event, record):
+        if os.getpid() != pid:
+            # Processus de travail hérité par fork (pool du WFA) : seul le job relaie
+            return
+        if cancel.is_set():
+            raise JobCancelled()
+        messages.put(('event', record))
+
+    telemetry = get_telemetry()
+    telemetry.subscribe(relay)
+    dm = DataManager(asset.ticker, asset.interval, data_dir=asset.data_dir)
+    try:
+        # Les journaux de l'AG et du WFA n'encombrent pas la console du serveur
+        with asset.activate(), contextlib.redirect_stdout(io.StringIO()):
+            # La graine fait partie de la clé du résultat (voir config_snapshot) : même tirage
+            if asset.seed is not None:
+                random.seed(asset.seed)
+                np.random.seed(asset.seed % 2**32)
+            result = _run_ga(asset, dm, options) if kind == 'ga' else _run_wfa(asset, dm, options)
+        messages.put(('result', result))
+    except JobCancelled:
+        messages.put(('cancelled', None))
+    except Exception:
+        messages.put(('error', traceback.format_exc()))
+    finally:
+        telemetry.unsubscribe(relay)
+        dm.invalidate()
+        release_caches()
+
+
+class Job:
+    """
+    Optimisation exécutée en arrière-plan, vue depuis le dashboard.
+
+    Attributs publics : id, kind ('ga' ou 'wfa'), asset, options, status, progress
+    ({'done', 'total', 'unit'}), events (derniers événements de télémétrie), result,
+    error (trace de l'exception), created et finished (horodatages time.time()),
+    cache_key (clé du résultat, None si les données sont indisponibles) et cached
+    (résultat servi par le cache).
+    """
+
+    def __init__(self, kind: str, asset: AssetConfig, options: Dict, cache_key: str = None):
+        self.id = uuid.uuid4().hex[:8]
+        self.kind = kind
+        self.asset = asset
+        self.options = options
+        self.status = 'running'
+        unit, total = ('generation', asset.generations) if kind == 'ga' else ('window', None)
+        self.progress = {'done': 0, 'total': total, 'unit': unit}
+        self.events = deque(maxlen=Config.JOBS_EVENT_HISTORY)
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.cache_key = cache_key
+        self.cached = False
+        self._process = None
+        self._messages = None
+        self._cancel = None
+        self._cancel_requested = None
+
+    @property
+    def active(self) -> bool:
+        """Vrai tant que le job n'a pas atteint un état définitif."""
+        return self.status == 'running'
+
+    @property
+    def elapsed(self) -> float:
+        """Durée du job (s), jusqu'à maintenant s'il est en cours."""
+        return (self.finished or time.time()) - self.created
+
+    @property
+    def fraction(self) -> float:
+        """Avancement entre 0 et 1 (0 tant que le total n'est pas connu)."""
+        total = self.progress['total']
+        return min(1.0, self.progress['done'] / total) if total else 0.0
+
+    def _on_event(self, record: Dict):
+        """Met à jour la progression à partir d'un événement de télémétrie."""
+        self.events.append(record)
+        event = record['event']
+        if self.kind == 'ga':
+            if event == 'ga_start':
+                self.progress['total'] = record['generations']
+            elif event == 'generation':
+                self.progress['done'] = record['gen']
+        elif event == 'wfa_start':
+            self.progress['total'] = record['runnable']
+        elif event == 'wfa_window':
+            self.progress['done'] += 1
+
+    def _finish(self, status: str, result=None, error: str = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished = time.time()
+
+    def __repr__(self):
+        return (f"Job({self.id!r}, kind={self.kind!r}, ticker={self.asset.ticker!r}, "
+                f"status={self.status!r}, progress={self.progress['done']}/{self.progress['total']})")
+
+
+class JobRunner:
+    """
+    Registre des jobs d'optimisation d'un serveur de dashboard.
+
+    Les jobs sont lancés par submit puis suivis par poll, que le dashboard appelle à
+    chaque affichage : poll relève les messages des processus, met à jour la progression
+    et l'état des jobs, et interrompt les jobs annulés qui ne se sont pas arrêtés à temps.
+    """
+
+    def __init__(self, max_jobs: int = None, start_method: str = None, cache: ResultCache = None):
+        """
+        Args:
+            max_jobs (int, optional): Jobs simultanés au plus. Par défaut Config.JOBS_MAX_ACTIVE.
+            start_method (str, optional): Méthode de démarrage des processus. Par défaut
+                Config.JOBS_START_METHOD.
+            cache (ResultCache, optional): Cache des résultats. Par défaut celui du processus.
+        """
+        self.max_jobs = Config.JOBS_MAX_ACTIVE if max_jobs is None else max_jobs
+        self.cache = cache or get_result_cache()
+        self._context = mp.get_context(start_method or Config.JOBS_START_METHOD)
+        self._jobs = {}  # id -> Job, dans l'ordre de soumission
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def result_key(kind: str, asset: AssetConfig, options: Dict) -> str:
+        """
+        Clé du résultat d'une demande (voir result_cache.make_key).
+
+        Les données sont chargées dans ce processus : elles restent résidentes (voir
+        DataManager) et leur empreinte distingue deux versions du même historique.
+
+        Returns:
+            str: Clé, ou None si aucune donnée n'est disponible pour l'actif.
+        """
+        from src.data_manager import DataManager
+        from src.indicator_bank import data_fingerprint
+
+        data = DataManager(asset.ticker, asset.interval, data_dir=asset.data_dir).get_full_data()
+        if data.empty:
+            return None
+        return make_key(kind, asset.ticker, asset.interval, config_snapshot(kind, asset, options),
+                        data_fingerprint(data))
+
+    def submit(self, kind: str, asset: AssetConfig, use_cache: bool = True, **options) -> Job:
+        """
+        Lance un job dans un nouveau processus.
+
+        Si le résultat de la même demande (actif, réglages, données) est en cache, le job
+        est renvoyé déjà terminé ; si un job identique est en cours, c'est lui qui est renvoyé.
+
+        Args:
+            kind (str): 'ga' (AG sur la part d'entraînement) ou 'wfa' (Walk-Forward).
+            asset (AssetConfig): Actif et réglages de l'optimisation (population, générations...).
+            use_cache (bool): Si False, le résultat est recalculé (puis remplace celui du cache).
+            **options: Options propres au type de job ('wfa' : train_months, test_months,
+                population_size, generations, workers, seed).
+
+        Returns:
+            Job: Le job lancé, terminé (servi par le cache) ou rejoint.
+
+        Raises:
+            ValueError: Si le type de job est inconnu.
+            RuntimeError: Si Config.JOBS_MAX_ACTIVE jobs sont déjà en cours.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind} (expected one of {JOB_KINDS})")
+        self.poll()
+        key = self.result_key(kind, asset, options)
+        with self._lock:
+            active = [job for job in self._jobs.values() if job.active]
+            for job in active:
+                if key is not None and job.cache_key == key:
+                    return job
+            result = self.cache.get(key) if key is not None and use_cache else None
+            if result is not None:
+                job = Job(kind, asset, options, cache_key=key)
+                job.cached = True
+                job._finish('done', result=result)
+                self._jobs[job.id] = job
+                return job
+            if len(active) >= self.max_jobs:
+                raise RuntimeError(f"{len(active)} jobs already running (limit {self.max_jobs})")
+            job = Job(kind, asset, options, cache_key=key)
+            job._messages = self._context.Queue()
+            job._cancel = self._context.Event()
+            # Processus non démoniaque : le WFA peut y ouvrir son propre pool
+            job._process = self._context.Process(
+                target=_job_main, args=(kind, asset, options, job._messages, job._cancel),
+                name=f"jvx-job-{job.id}")
+            job._process.start()
+            self._jobs[job.id] = job
+        return job
+
+    def poll(self) -> List[Job]:
+        """
+        Relève les messages des jobs en cours et met à jour leur état.
+
+        Returns:
+            List[Job]: Jobs encore en cours.
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job.active:
+                    self._poll_job(job)
+            return [job for job in self._jobs.values() if job.active]
+
+    def _poll_job(self, job: Job):
+        # État relevé avant la lecture : les messages d'un processus terminé sont tous lus
+        alive = job._process.is_alive()
+        while True:
+            try:
+                kind, payload = job._messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'event':
+                job._on_event(payload)
+            elif kind == 'result':
+                job._finish('done', result=payload)
+                if job.cache_key is not None:
+                    self.cache.put(job.cache_key, payload, kind=job.kind, ticker=job.asset.ticker)
+            elif kind == 'cancelled':
+                job._finish('cancelled')
+            else:
+                job._finish('failed', error=payload)
+        if not job.active:
+            self._reap(job)
+        elif not alive:
+            # Processus terminé sans message final (tué, plus de mémoire...)
+            job._finish('cancelled' if job._cancel.is_set() else 'failed',
+                        error=f"Job process exited with code {job._process.exitcode}")
+            self._reap(job)
+        elif (job._cancel_requested is not None
+              and time.time() - job._cancel_requested > Config.JOBS_CANCEL_GRACE_S):
+            job._process.terminate()
+            job._process.join()
+            job._finish('cancelled')
+            self._reap(job)
+
+    @staticmethod
+    def _reap(job: Job):
+        """Attend la fin du processus d'un job terminé et libère sa file."""
+        job._process.join(timeout=Config.JOBS_CANCEL_GRACE_S)
+        if job._process.is_alive():
+            job._process.terminate()
+            job._process.join()
+        job._messages.close()
+        job._messages.join_thread()
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Demande l'annulation d'un job (effective à la prochaine génération ou fenêtre).
+
+        Returns:
+            bool: True si le job était en cours.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or not job.active:
+            return False
+        job._cancel.set()
+        if job._cancel_requested is None:
+            job._cancel_requested = time.time()
+        return True
+
+    def get(self, job_id: str) -> Job:
+        """Renvoie un job par son identifiant (None s'il est inconnu)."""
+        return self._jobs.get(job_id)
+
+    def jobs(self, kind: str = None, ticker: str = None) -> List[Job]:
+        """Jobs connus, du plus récent au plus ancien, éventuellement filtrés."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job for job in reversed(jobs)
+                if (kind is None or job.kind == kind) and (ticker is None or job.asset.ticker == ticker)]
+
+    def remove(self, job_id: str):
+        """Oublie un job terminé (un job en cours doit d'abord être annulé)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and not job.active:
+                del self._jobs[job_id]
+
+    def clear_finished(self):
+        """Oublie tous les jobs terminés."""
+        with self._lock:
+            self._jobs = {job_id: job for job_id, job in self._jobs.items() if job.active}
+
+    def shutdown(self):
+        """Annule les jobs en cours et interrompt leurs processus."""
+        with self._lock:
+            for job in self._jobs.values():
+                if job.active:
+                    job._cancel.set()
+                    job._process.terminate()
+                    job._process.join()
+                    job._finish('cancelled')
+                    job._messages.close()
+
+
+_JOB_RUNNER = None
+
+
+def get_job_runner() -> JobRunner:
+    """
+    Renvoie le registre des jobs du processus.
+
+    Le module reste chargé d'une exécution à l'autre du script Streamlit : les jobs
+    survivent donc au rechargement de la page et sont partagés par les sessions du serveur.
+    """
+    global _JOB_RUNNER
+    if _JOB_RUNNER is None:
+        _JOB_RUNNER = JobRunner()
+    return _JOB_RUNNER
@@ -0,0 +1,220 @@
+"""
+Module Memory Guard.
+Ce module fournit les outils du mode longue durée (Config.LONGRUN_MODE), qui borne la
+mémoire des longues optimisations : un logbook dont l'historique est déversé sur disque,
+la libération des caches et un chien de garde qui mesure la mémoire résidente après
+chaque génération, signale sa croissance et interrompt l'exécution au-delà du plafond.
+"""
+import gc
+import json
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+from deap import tools
+from src.config import Config
+from src.fitness_cache import get_fitness_cache
+from src.indicator_bank import clear_indicator_banks
+from src.telemetry import current_rss_mb, get_telemetry
+from src.trade_ledger import clear_trade_ledgers
+
+# Mesures gardées par le chien de garde pour estimer la croissance de la mémoire
+WATCHDOG_SAMPLES = 256
+
+
+class MemoryLimitExceeded(MemoryError):
+    """Mémoire résidente au-delà du plafond malgré la libération des caches."""
+
+    def __init__(self, message: str, report: Dict):
+        super().__init__(message)
+        self.report = report
+
+
+def release_caches():
+    """Libère les caches du processus (indicateurs, fitness, journaux de trades)."""
+    clear_indicator_banks()
+    clear_trade_ledgers()
+    get_fitness_cache().clear()
+    gc.collect()
+
+
+class SpilledLogbook(tools.Logbook):
+    """
+    Logbook DEAP dont l'historique est écrit sur disque au fil des générations.
+
+    Seules les `keep` dernières entrées restent en mémoire (affichage de `stream`) ;
+    `select` relit l'historique complet depuis le fichier JSON Lines.
+    """
+
+    def __init__(self, path: str, keep: int = None):
+        """
+        Args:
+            path (str): Fichier JSON Lines de l'historique (écrasé).
+            keep (int, optional): Entrées gardées en mémoire. Par défaut Config.LONGRUN_LOGBOOK_KEEP.
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.keep = max(1, Config.LONGRUN_LOGBOOK_KEEP if keep is None else keep)
+        self.total = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("", encoding='utf-8')
+
+    def record(self, **infos):
+        """Enregistre une entrée, l'ajoute au fichier et oublie les plus anciennes."""
+        super().record(**infos)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self[-1], default=float) + "\n")
+        self.total += 1
+        excess = len(self) - self.keep
+        if excess > 0:
+            # Logbook.pop / __delitem__ ne supportent pas les sous-classes (super(self.__class__))
+            del self[:excess]
+            for chapter in self.chapters.values():
+                list.__delitem__(chapter, slice(0, excess))
+            self.buffindex = max(0, self.buffindex - excess)
+
+    def __delitem__(self, key):
+        list.__delitem__(self, key)
+
+    def truncate(self):
+        """
+        Ramène le fichier aux `total` premières entrées.
+
+        Utilisé à la reprise d'une exécution (voir src/checkpoint.py) : les générations
+        écrites après le point de reprise sont oubliées avant d'être recalculées.
+        """
+        with open(self.path, encoding='utf-8') as f:
+            lines = [line for line in f if line.strip()][:self.total]
+        self.path.write_text("".join(lines), encoding='utf-8')
+
+    def history(self) -> List[Dict]:
+        """Relit l'historique complet depuis le disque."""
+        with open(self.path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def select(self, *names):
+        """Comme Logbook.select, sur l'historique complet."""
+        history = self.history()
+        if len(names) == 1:
+            return [entry.get(names[0], None) for entry in history]
+        return tuple([entry.get(name, None) for entry in history] for name in names)
+
+
+class MemoryWatchdog:
+    """
+    Surveillance de la mémoire résidente d'une exécution.
+
+    À chaque contrôle, le ramasse-miettes est lancé (les objets Cerebro, stratégies et
+    analyseurs forment des cycles de références) puis la mémoire résidente est mesurée.
+    Au-delà du plafond, les caches sont vidés ; si cela ne suffit pas, MemoryLimitExceeded
+    est levée avec le rapport (et les principaux sites d'allocation si tracemalloc est actif).
+    """
+
+    def __init__(self, limit_mb: float = None, use_tracemalloc: bool = None, top: int = 10):
+        """
+        Args:
+            limit_mb (float, optional): Plafond (Mo, 0 = aucun). Par défaut Config.LONGRUN_MEMORY_MB.
+            use_tracemalloc (bool, optional): Suivi des allocations. Par défaut Config.LONGRUN_TRACEMALLOC.
+            top (int): Sites d'allocation listés dans le rapport.
+        """
+        self.limit_mb = Config.LONGRUN_MEMORY_MB if limit_mb is None else limit_mb
+        self.use_tracemalloc = Config.LONGRUN_TRACEMALLOC if use_tracemalloc is None else use_tracemalloc
+        self.top = top
+        self.samples = deque(maxlen=WATCHDOG_SAMPLES)  # (évaluations, Mo)
+        self.baseline_mb = None
+        self.max_mb = 0.0
+        self.checks = 0
+        self.releases = 0
+        self._owns_tracemalloc = False
+
+    def start(self):
+        """Mesure la mémoire de départ et démarre tracemalloc si demandé."""
+        gc.collect()
+        self.baseline_mb = current_rss_mb()
+        if self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def stop(self):
+        """Arrête tracemalloc s'il a été démarré par ce chien de garde."""
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def check(self, evaluations: int) -> float:
+        """
+        Libère les objets inaccessibles, mesure la mémoire et applique le plafond.
+
+        Args:
+            evaluations (int): Évaluations effectuées depuis le début (abscisse de la croissance).
+
+        Returns:
+            float: Mémoire résidente (Mo).
+
+        Raises:
+            MemoryLimitExceeded: Si la mémoire dépasse encore le plafond après libération des caches.
+        """
+        with get_telemetry().timer('memory_check'):
+            gc.collect()
+            rss = current_rss_mb()
+            if self.limit_mb and rss > self.limit_mb:
+                self.releases += 1
+                release_caches()
+                rss = current_rss_mb()
+                print(f"Mémoire : {rss:.0f} Mo après libération des caches (plafond {self.limit_mb} Mo)")
+        self.checks += 1
+        self.max_mb = max(self.max_mb, rss)
+        self.samples.append((evaluations, rss))
+        if self.limit_mb and rss > self.limit_mb:
+            report = self.report()
+            raise MemoryLimitExceeded(
+                f"Mémoire résidente {rss:.0f} Mo au-delà du plafond de {self.limit_mb} Mo", report)
+        return rss
+
+    def growth_per_1k(self) -> float:
+        """
+        Croissance de la mémoire (Mo pour 1000 évaluations) sur la seconde moitié des mesures.
+
+        La première moitié (remplissage des caches bornés) est ignorée.
+        """
+        samples = list(self.samples)[len(self.samples) // 2:]
+        evaluations = np.array([s[0] for s in samples], dtype=float)
+        if len(samples) < 3 or np.ptp(evaluations) == 0:
+            return 0.0
+        slope = np.polyfit(evaluations, [s[1] for s in samples], 1)[0]
+        return float(slope * 1000)
+
+    def top_allocations(self) -> List[Dict]:
+        """Principaux sites d'allocation encore vivants (vide sans tracemalloc)."""
+        if not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().statistics('lineno')[:self.top]
+        return [{'where': str(stat.traceback), 'size_mb': stat.size / 2**20, 'count': stat.count}
+                for stat in stats]
+
+    def report(self) -> Dict:
+        """
+        Résumé de la surveillance.
+
+        Returns:
+            Dict: Mémoire de départ, dernière et maximale (Mo), croissance (Mo / 1000 évaluations),
+            contrôles, libérations de caches et principaux sites d'allocation.
+        """
+        return {
+            'limit_mb': self.limit_mb,
+            'baseline_mb': self.baseline_mb,
+            'last_mb': self.samples[-1][1] if self.samples else self.baseline_mb,
+            'max_mb': self.max_mb,
+            'growth_mb_per_1k_evals': self.growth_per_1k(),
+            'checks': self.checks,
+            'releases': self.releases,
+            'top_allocations': self.top_allocations(),
+        }
@@ -0,0 +1,215 @@
+"""
+Module NSGA-II.
+Ce module implémente la sélection NSGA-II de DEAP (tools.selNSGA2) pour deux objectifs
+avec NumPy : les fronts de Pareto sont extraits par un tri en O(N log N) (au lieu
+des comparaisons deux à deux en O(N²) de tools.sortNondominated) et les distances
+d'encombrement sont calculées par front en une fois. L'ordre des fronts, des
+individus dans chaque front et des ex aequo est celui de DEAP : la sélection est
+identique à celle de tools.selNSGA2.
+"""
+from bisect import bisect_right
+from typing import List
+import numpy as np
+from deap import base, tools
+from src.deap_types import creator
+
+
+def _range_max(values: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """
+    Maximum de values[low:high] pour chaque intervalle (non vide), par table creuse.
+
+    Args:
+        values (np.ndarray): Valeurs entières.
+        low (np.ndarray): Débuts des intervalles (inclus).
+        high (np.ndarray): Fins des intervalles (exclues), high > low.
+
+    Returns:
+        np.ndarray: Un maximum par intervalle.
+    """
+    table = [values]
+    width = 1
+    while 2 * width <= len(values):
+        table.append(np.maximum(table[-1][:-width], table[-1][width:]))
+        width *= 2
+    level = np.frexp(high - low)[1] - 1  # floor(log2(longueur))
+    result = np.empty(len(low), dtype=values.dtype)
+    for lvl in np.unique(level).tolist():
+        mask = level == lvl
+        rows = table[lvl]
+        result[mask] = np.maximum(rows[low[mask]], rows[high[mask] - (1 << lvl)])
+    return result
+
+
+def sort_nondominated(wvalues: np.ndarray, k: int = None) -> List[np.ndarray]:
+    """
+    Fronts de Pareto de tools.sortNondominated, pour deux objectifs à maximiser.
+
+    Les fitness identiques sont regroupées (ordre de première apparition, comme DEAP),
+    le rang de chaque groupe est obtenu en parcourant les points par premier objectif
+    décroissant avec une recherche dichotomique sur le meilleur second objectif de
+    chaque front, puis chaque front est ordonné comme DEAP le construit : par position,
+    dans le front précédent, du dernier individu qui le domine.
+
+    Args:
+        wvalues (np.ndarray): Matrice (N, 2) des objectifs pondérés (fitness.wvalues).
+        k (int, optional): Individus à classer ; les fronts suivants ne sont pas
+            renvoyés (comme DEAP). Par défaut tous.
+
+    Returns:
+        List[np.ndarray]: Indices des individus de chaque front, meilleur front en premier.
+    """
+    n = len(wvalues)
+    k = n if k is None else k
+    if k == 0 or n == 0:
+        return []
+    # + 0.0 : -0.0 et 0.0 forment le même groupe (égalité des tuples de DEAP)
+    unique, first, inverse = np.unique(np.asarray(wvalues, dtype=np.float64) + 0.0, axis=0,
+                                       return_index=True, return_inverse=True)
+    appearance = np.argsort(first, kind='stable')
+    relabel = np.empty_like(appearance)
+    relabel[appearance] = np.arange(len(appearance))
+    group = relabel[inverse.ravel()]
+    a, b = unique[appearance, 0], unique[appearance, 1]
+
+    # Rang de chaque groupe : premier front dont aucun membre n'a un second objectif >= b
+    ranks = np.empty(len(a), dtype=np.intp)
+    neg_best = []  # -(meilleur second objectif) de chaque front, croissant
+    sweep = np.lexsort((-b, -a))
+    for g, bg in zip(sweep.tolist(), b[sweep].tolist()):
+        f = bisect_right(neg_best, -bg)
+        if f == len(neg_best):
+            neg_best.append(-bg)
+        else:
+            neg_best[f] = -bg
+        ranks[g] = f
+
+    # Fronts construits jusqu'à avoir classé min(N, k) individus (comme DEAP)
+    front_sizes = np.bincount(ranks, weights=np.bincount(group, minlength=len(a)))
+    last = int(np.searchsorted(np.cumsum(front_sizes), min(n, k) - 0.5))
+    by_rank = np.argsort(ranks, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(ranks))])
+    position = np.zeros(len(a), dtype=np.intp)
+    previous = by_rank[bounds[0]:bounds[1]]  # premier front : ordre d'apparition
+    position[previous] = np.arange(len(previous))
+    for rank in range(1, last + 1):
+        current = by_rank[bounds[rank]:bounds[rank + 1]]
+        # Front précédent en escalier : premier objectif décroissant, second croissant.
+        # Les membres qui dominent un point forment un intervalle de l'escalier.
+        stair = previous[np.argsort(-a[previous], kind='stable')]
+        high = np.searchsorted(-a[stair], -a[current], side='right')
+        low = np.searchsorted(b[stair], b[current], side='left')
+        last_dominator = _range_max(position[stair], low, high)
+        current = current[np.lexsort((current, last_dominator))]
+        position[current] = np.arange(len(current))
+        previous = current
+
+    ind_rank = ranks[group]
+    selected = np.flatnonzero(ind_rank <= last)
+    order = selected[np.lexsort((selected, position[group[selected]], ind_rank[selected]))]
+    return np.split(order, np.cumsum(front_sizes[:last + 1]).astype(np.intp)[:-1])
+
+
+def crowding_distance(values: np.ndarray) -> np.ndarray:
+    """
+    Distances d'encombrement de tools.assignCrowdingDist pour un front.
+
+    Args:
+        values (np.ndarray): Matrice (N, objectifs) des fitness.values du front, dans l'ordre du front.
+
+    Returns:
+        np.ndarray: Distance de chaque individu (inf aux extrémités).
+    """
+    n, nobj = values.shape
+    distances = np.zeros(n)
+    if n == 0:
+        return distances
+    order = np.arange(n)
+    for i in range(nobj):
+        # Tri stable enchaîné : les ex aequo gardent l'ordre du tri précédent (comme DEAP)
+        order = order[np.argsort(values[order, i], kind='stable')]
+        column = values[order, i]
+        distances[order[0]] = np.inf
+        distances[order[-1]] = np.inf
+        if column[-1] == column[0]:
+            continue
+        norm = nobj * float(column[-1] - column[0])
+        with np.errstate(invalid='ignore'):  # objectifs infinis (évaluations en erreur) : NaN comme DEAP
+            distances[order[1:-1]] += (column[2:] - column[:-2]) / norm
+    return distances
+
+
+def deap_select_nsga2(values: np.ndarray, k: int, weights=None) -> np.ndarray:
+    """
+    Sélection par tools.selNSGA2 elle-même, sur une matrice d'objectifs (référence).
+
+    Args:
+        values (np.ndarray): Matrice (N, objectifs) des fitness.values.
+        k (int): Nombre d'individus à sélectionner.
+        weights (tuple, optional): Poids des objectifs. Par défaut ceux de creator.FitnessMulti.
+
+    Returns:
+        np.ndarray: Indices des individus sélectionnés.
+    """
+    fitness_class = creator.FitnessMulti
+    if weights is not None and tuple(weights) != fitness_class.weights:
+        fitness_class = type('FitnessSelect', (base.Fitness,), {'weights': tuple(weights)})
+    proxies = []
+    for i, row in enumerate(np.asarray(values, dtype=np.float64).tolist()):
+        proxy = creator.Individual()
+        proxy.fitness = fitness_class(row)
+        proxy.index = i
+        proxies.append(proxy)
+    return np.array([p.index for p in tools.selNSGA2(proxies, k)], dtype=np.intp)
+
+
+def select_nsga2(values: np.ndarray, k: int, weights=None) -> np.ndarray:
+    """
+    Sélection NSGA-II vectorisée, identique à tools.selNSGA2.
+
+    Les fitness contenant NaN (dominance non définie) sont confiées à tools.selNSGA2
+    (qui ne termine pas si des NaN touchent les deux objectifs : dominance cyclique).
+
+    Args:
+        values (np.ndarray): Matrice (N, 2) des fitness.values.
+        k (int): Nombre d'individus à sélectionner.
+        weights (tuple, optional): Poids des objectifs. Par défaut ceux de creator.FitnessMulti.
+
+    Returns:
+        np.ndarray: Indices des individus sélectionnés, dans l'ordre de tools.selNSGA2.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    weights = creator.FitnessMulti.weights if weights is None else tuple(weights)
+    if np.isnan(values).any():
+        return deap_select_nsga2(values, k, weights)
+    fronts = sort_nondominated(values * np.asarray(weights), k)
+    if not fronts:
+        return np.empty(0, dtype=np.intp)
+    chosen = np.concatenate(fronts[:-1]) if len(fronts) > 1 else np.empty(0, dtype=np.intp)
+    remaining = k - len(chosen)
+    if remaining > 0:
+        front = fronts[-1]
+        distances = crowding_distance(values[front])
+        if np.isnan(distances).any():
+            # Tri de Python (celui de DEAP) : l'ordre en présence de NaN lui est propre
+            ranked = sorted(range(len(front)), key=distances.tolist().__getitem__, reverse=True)
+        else:
+            ranked = np.argsort(-distances, kind='stable')
+        chosen = np.concatenate([chosen, front[np.asarray(ranked[:remaining], dtype=np.intp)]])
+    return chosen
+
+
+def sel_nsga2(individuals, k):
+    """
+    Opérateur de sélection DEAP (même interface que tools.selNSGA2) vectorisé.
+
+    Args:
+        individuals: Individus à sélectionner (fitness à deux objectifs).
+        k (int): Nombre d'individus à sélectionner.
+
+    Returns:
+        list: Individus sélectionnés (références), dans l'ordre de tools.selNSGA2.
+    """
+    if not individuals or len(individuals[0].fitness.values) != 2:
+        return tools.selNSGA2(individuals, k)
+    values = np.array([ind.fitness.values for ind in individuals], dtype=np.float64)
+    return [individuals[i] for i in select_nsga2(values, k, individuals[0].fitness.weights).tolist()]
@@ -0,0 +1,222 @@
+"""
+Module Parallel Eval.
+Ce module répartit l'évaluation des individus de l'AG sur un pool de processus.
+Les données OHLCV sont publiées une seule fois dans un segment de mémoire partagée :
+les processus de travail s'y rattachent au démarrage au lieu de recevoir un
+DataFrame sérialisé (pickle) à chaque tâche.
+"""
+import contextlib
+import gc
+import math
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from src.config import Config
+from src.telemetry import get_telemetry
+
+# Données de marché du processus de travail (renseignées par _init_worker)
+_WORKER_DATA = None
+_WORKER_ENGINE = None
+_WORKER_SHM = None
+_WORKER_ASSET = None
+
+
+class SharedMarketData:
+    """
+    Publication d'un DataFrame OHLCV dans la mémoire partagée.
+
+    Le segment contient l'index (dates en int64) suivi d'un bloc float64 (barres x colonnes).
+    Le DataFrame reconstruit dans un processus de travail est une vue sur ce segment
+    (aucune copie des prix).
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        Copie les données dans un nouveau segment de mémoire partagée.
+
+        Args:
+            data (pd.DataFrame): Données de marché indexées par date.
+        """
+        n = len(data)
+        columns = list(data.columns)
+        index = np.ascontiguousarray(data.index.values.astype('datetime64[ns]').view(np.int64))
+        values = np.ascontiguousarray(data.to_numpy(dtype=np.float64))
+        size = max(index.nbytes + values.nbytes, 1)
+
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        np.ndarray(index.shape, dtype=np.int64, buffer=self.shm.buf)[:] = index
+        np.ndarray(values.shape, dtype=np.float64, buffer=self.shm.buf, offset=index.nbytes)[:] = values
+
+        self.descriptor = {
+            'name': self.shm.name,
+            'rows': n,
+            'columns': columns,
+            'index_name': data.index.name,
+            'tz': str(data.index.tz) if getattr(data.index, 'tz', None) is not None else None,
+        }
+
+    @staticmethod
+    def attach(descriptor: Dict) -> tuple:
+        """
+        Se rattache à un segment publié et reconstruit le DataFrame (sans copie des prix).
+
+        Args:
+            descriptor (Dict): Description du segment (voir `descriptor`).
+
+        Returns:
+            tuple: (DataFrame, SharedMemory) — le segment doit rester référencé
+                tant que le DataFrame est utilisé.
+        """
+        shm = shared_memory.SharedMemory(name=descriptor['name'])
+        n, columns = descriptor['rows'], descriptor['columns']
+        index = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+        values = np.ndarray((n, len(columns)), dtype=np.float64, buffer=shm.buf, offset=index.nbytes)
+
+        dates = pd.DatetimeIndex(index.view('datetime64[ns]'), name=descriptor['index_name'])
+        if descriptor['tz']:
+            dates = dates.tz_localize('UTC').tz_convert(descriptor['tz'])
+        return pd.DataFrame(values, index=dates, columns=columns, copy=False), shm
+
+    def close(self):
+        """Libère et supprime le segment de mémoire partagée."""
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+def _init_worker(descriptor: Dict, engine: str, asset=None, data=None):
+    """Initialise un processus de travail : rattachement aux données partagées."""
+    global _WORKER_DATA, _WORKER_ENGINE, _WORKER_SHM, _WORKER_ASSET
+    if descriptor is None:
+        # Données hors DataFrame (portefeuille) : transmises une fois par processus
+        _WORKER_DATA, _WORKER_SHM = data, None
+    else:
+        _WORKER_DATA, _WORKER_SHM = SharedMarketData.attach(descriptor)
+    _WORKER_ENGINE = engine
+    _WORKER_ASSET = asset
+
+
+def _evaluate_chunk(chromosomes: List[list]) -> Tuple[List[tuple], Dict]:
+    """
+    Évalue un paquet de chromosomes dans un processus de travail.
+
+    Returns:
+        Tuple[List[tuple], Dict]: Fitness du paquet et mesures de télémétrie du
+        processus de travail pendant l'évaluation (fusionnées par le parent).
+    """
+    from src.ga_core import eval_population
+    telemetry = get_telemetry()
+    before = telemetry.snapshot()
+    # L'actif courant du processus parent (commission) n'est pas hérité avec 'spawn'
+    with _WORKER_ASSET.activate() if _WORKER_ASSET is not None else contextlib.nullcontext():
+        fitnesses = eval_population(chromosomes, _WORKER_DATA, engine=_WORKER_ENGINE)
+    if Config.LONGRUN_MODE:
+        # Mode longue durée : cycles Cerebro / stratégie / analyseurs libérés sans attendre
+        gc.collect()
+    return fitnesses, telemetry.delta(before)
+
+
+class ParallelEvaluator:
+    """
+    Pool de processus évaluant des individus sur des données en mémoire partagée.
+
+    S'utilise comme gestionnaire de contexte : le pool et le segment partagé
+    sont libérés à la sortie du bloc `with`.
+    """
+
+    def __init__(self, data: pd.DataFrame, engine: str, workers: int = None,
+                 chunk_size: int = None, start_method: str = None):
+        """
+        Args:
+            data (pd.DataFrame): Données d'entraînement (ou PortfolioData, sérialisé
+                une fois par processus).
+            engine (str): Moteur de backtest ('backtrader' ou 'vector').
+            workers (int, optional): Nombre de processus. Par défaut os.cpu_count().
+            chunk_size (int, optional): Individus par tâche. Par défaut (0 ou None),
+                chaque processus reçoit deux paquets par génération.
+            start_method (str, optional): 'fork', 'spawn' ou 'forkserver'.
+                Par défaut la méthode de la plateforme.
+        """
+        self.data = data
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or 0
+        self.start_method = start_method
+        self.evaluations = 0
+        self.elapsed = 0.0
+        self._shared = None
+        self._pool = None
+
+    def start(self):
+        """Publie les données et démarre le pool (sans effet s'il tourne déjà)."""
+        if self._pool is not None:
+            return
+        if isinstance(self.data, pd.DataFrame):
+            self._shared = SharedMarketData(self.data)
+            initargs = (self._shared.descriptor, self.engine, Config.active_asset())
+        else:
+            initargs = (None, self.engine, Config.active_asset(), self.data)
+        try:
+            context = mp.get_context(self.start_method)
+            self._pool = context.Pool(processes=self.workers, initializer=_init_worker,
+                                      initargs=initargs)
+        except Exception:
+            if self._shared is not None:
+                self._shared.close()
+                self._shared = None
+            raise
+
+    def close(self):
+        """Arrête le pool puis libère la mémoire partagée."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _chunks(self, chromosomes: List[list]) -> List[List[list]]:
+        """Découpe une génération en paquets de taille chunk_size."""
+        size = self.chunk_size or max(1, math.ceil(len(chromosomes) / (2 * self.workers)))
+        return [chromosomes[i:i + size] for i in range(0, len(chromosomes), size)]
+
+    def map(self, individuals) -> List[tuple]:
+        """
+        Évalue des individus sur le pool, dans l'ordre d'entrée.
+
+        Args:
+            individuals: Individus (listes de gènes) à évaluer.
+
+        Returns:
+            List[tuple]: Un tuple (profit_pct, max_drawdown_pct) par individu.
+        """
+        self.start()
+        chromosomes = [list(ind) for ind in individuals]
+        if not chromosomes:
+            return []
+        start = time.perf_counter()
+        results = self._pool.map(_evaluate_chunk, self._chunks(chromosomes), chunksize=1)
+        self.elapsed += time.perf_counter() - start
+        self.evaluations += len(chromosomes)
+        telemetry = get_telemetry()
+        for _, delta in results:
+            telemetry.merge(delta)
+        return [fitness for chunk, _ in results for fitness in chunk]
+
+    @property
+    def evals_per_sec(self) -> float:
+        """Débit moyen du pool (évaluations par seconde)."""
+        return self.evaluations / self.elapsed if self.elapsed > 0 else 0.0
@@ -0,0 +1,543 @@
+"""
+Module Portfolio Backtest.
+Ce module évalue GeneticStrategy sur plusieurs actifs à la fois, avec une trésorerie
+commune : les dates des actifs sont alignées dans des tableaux NumPy (actifs x barres),
+chaque actif a sa commission et ses paramètres (génome partagé ou propre à l'actif),
+et la taille des entrées suit une règle d'allocation du capital.
+La sortie de chaque position (Stop, Limit ou sortie technique) ne dépend pas de la
+trésorerie : elle est calculée dès l'entrée, seules les entrées sont traitées dans
+l'ordre chronologique. Une évaluation reste ainsi assez rapide pour la boucle de l'AG.
+"""
+import hashlib
+import heapq
+from typing import Dict, List, Mapping, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from src.config import Config
+from src.indicator_bank import IndicatorBank
+from src.vector_backtest import FAST_FORWARD_MIN_BARS, _first_hit, _fitness, strategy_signals
+
+# Règles d'allocation des entrées (voir Config.PORTFOLIO_ALLOCATION)
+ALLOCATIONS = ('equal', 'cash', 'unit')
+
+# Modes d'alignement des dates (voir Config.PORTFOLIO_ALIGN)
+ALIGNMENTS = ('inner', 'outer')
+
+# Valeur minimale d'un ordre, relative au capital de départ (en dessous, l'entrée est ignorée)
+MIN_ORDER_FRACTION = 1e-6
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close')
+
+
+class PortfolioData:
+    """
+    Prix OHLC de plusieurs actifs alignés sur un index de dates commun.
+
+    Les tableaux `open_`, `high`, `low` et `close` ont la forme (actifs, barres).
+    Le portefeuille porte aussi sa règle d'allocation (voir simulate_portfolio) : elle
+    fait partie de son empreinte et suit les données dans les processus de travail.
+    En alignement 'outer', les barres absentes d'un actif reprennent sa dernière
+    clôture (O = H = L = C) et sont marquées non négociables dans `tradable`.
+    Les banques d'indicateurs sont construites à la demande, une par actif, et ne
+    sont pas sérialisées (elles sont reconstruites dans les processus de travail).
+    """
+
+    def __init__(self, datas: Mapping[str, pd.DataFrame], commissions: Mapping[str, float] = None,
+                 align: str = None, allocation: str = None, max_positions: int = None,
+                 cash_fraction: float = None):
+        """
+        Args:
+            datas (Mapping[str, pd.DataFrame]): Données OHLCV par ticker (ordre conservé).
+            commissions (Mapping[str, float], optional): Commission par ticker.
+                Par défaut Config.commission_for(ticker).
+            align (str, optional): 'inner' (dates communes) ou 'outer' (union des dates).
+                Par défaut Config.PORTFOLIO_ALIGN.
+            allocation (str, optional): Règle d'allocation. Par défaut Config.PORTFOLIO_ALLOCATION.
+            max_positions (int, optional): Positions simultanées (0 = une par actif).
+                Par défaut Config.PORTFOLIO_MAX_POSITIONS.
+            cash_fraction (float, optional): Fraction engagée par la règle 'cash'.
+                Par défaut Config.PORTFOLIO_CASH_FRACTION.
+
+        Raises:
+            ValueError: Si aucun actif n'est fourni, si le mode d'alignement ou la
+                règle d'allocation est inconnu, ou si les actifs n'ont aucune date en commun.
+        """
+        align = align or Config.PORTFOLIO_ALIGN
+        if align not in ALIGNMENTS:
+            raise ValueError(f"Unknown portfolio alignment: {align}")
+        self.allocation = allocation or Config.PORTFOLIO_ALLOCATION
+        if self.allocation not in ALLOCATIONS:
+            raise ValueError(f"Unknown portfolio allocation: {self.allocation}")
+        self.max_positions = Config.PORTFOLIO_MAX_POSITIONS if max_positions is None else max_positions
+        self.cash_fraction = Config.PORTFOLIO_CASH_FRACTION if cash_fraction is None else cash_fraction
+        if not datas:
+            raise ValueError("A portfolio needs at least one asset")
+
+        tickers = list(datas)
+        index = datas[tickers[0]].index
+        for ticker in tickers[1:]:
+            other = datas[ticker].index
+            index = index.intersection(other) if align == 'inner' else index.union(other)
+        index = index.sort_values()
+        if len(index) == 0:
+            raise ValueError("The assets have no date in common")
+
+        n_assets, n = len(tickers), len(index)
+        prices = {col: np.empty((n_assets, n)) for col in PRICE_COLUMNS}
+        tradable = np.ones((n_assets, n), dtype=bool)
+        for a, ticker in enumerate(tickers):
+            frame = datas[ticker].loc[:, list(PRICE_COLUMNS)].reindex(index)
+            missing = frame['Close'].isna().to_numpy()
+            if missing.any():
+                tradable[a] = ~missing
+                close = frame['Close'].ffill().bfill()
+                frame = frame.apply(lambda col: col.fillna(close))
+            for col in PRICE_COLUMNS:
+                prices[col][a] = frame[col].to_numpy(dtype=np.float64)
+
+        commissions = commissions or {}
+        self._init_arrays(
+            tickers, index, prices['Open'], prices['High'], prices['Low'], prices['Close'],
+            tradable,
+            np.array([commissions.get(t, Config.commission_for(t)) for t in tickers], dtype=np.float64),
+        )
+
+    def _init_arrays(self, tickers, index, open_, high, low, close, tradable, commission):
+        """Renseigne les attributs à partir de tableaux déjà alignés."""
+        self.tickers = list(tickers)
+        self.index = index
+        self.open_ = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.tradable = tradable
+        self.commission = commission
+        self._fingerprint = None
+        self._banks = {}
+        self._lists = None
+
+    @classmethod
+    def from_tickers(cls, tickers: List[str], interval: str = Config.INTERVAL,
+                     data_dir: str = None, **kwargs) -> 'PortfolioData':
+        """
+        Construit le portefeuille depuis les caches du DataManager.
+
+        Args:
+            tickers (List[str]): Symboles des actifs.
+            interval (str): Intervalle des bougies.
+            data_dir (str, optional): Répertoire des données. Par défaut Config.DATA_DIR.
+            **kwargs: Options transmises au constructeur (commissions, align, allocation...).
+
+        Returns:
+            PortfolioData: Portefeuille aligné.
+        """
+        from src.data_manager import DataManager
+        datas = {}
+        for ticker in dict.fromkeys(tickers):
+            data = DataManager(ticker, interval, data_dir=data_dir).get_full_data()
+            if data.empty:
+                raise ValueError(f"No data available for {ticker}")
+            datas[ticker] = data
+        return cls(datas, **kwargs)
+
+    def slice(self, start: int, stop: int) -> 'PortfolioData':
+        """
+        Renvoie le portefeuille restreint aux barres [start, stop) (vues, sans copie).
+
+        Args:
+            start (int): Première barre incluse.
+            stop (int): Dernière barre exclue.
+
+        Returns:
+            PortfolioData: Sous-portefeuille partageant les tableaux de prix.
+        """
+        part = object.__new__(PortfolioData)
+        part.allocation = self.allocation
+        part.max_positions = self.max_positions
+        part.cash_fraction = self.cash_fraction
+        part._init_arrays(self.tickers, self.index[start:stop], self.open_[:, start:stop],
+                          self.high[:, start:stop], self.low[:, start:stop],
+                          self.close[:, start:stop], self.tradable[:, start:stop], self.commission)
+        return part
+
+    def split(self, ratio: float) -> Tuple['PortfolioData', 'PortfolioData']:
+        """Sépare le portefeuille en parts d'entraînement et de test (ratio de barres)."""
+        split_idx = int(len(self) * ratio)
+        return self.slice(0, split_idx), self.slice(split_idx, len(self))
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def n_assets(self) -> int:
+        """Nombre d'actifs du portefeuille."""
+        return len(self.tickers)
+
+    @property
+    def fingerprint(self) -> str:
+        """Empreinte des actifs, dates, prix, commissions et allocation (clé du cache de fitness)."""
+        if self._fingerprint is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(','.join(self.tickers).encode())
+            h.update(f"{self.allocation}:{self.max_positions}:{self.cash_fraction}".encode())
+            h.update(np.ascontiguousarray(self.index.values).view(np.uint8))
+            for array in (self.open_, self.high, self.low, self.close, self.commission):
+                h.update(np.ascontiguousarray(array).view(np.uint8))
+            h.update(np.ascontiguousarray(self.tradable).view(np.uint8))
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def bank(self, asset: int) -> IndicatorBank:
+        """Banque d'indicateurs d'un actif (construite au premier accès)."""
+        bank = self._banks.get(asset)
+        if bank is None:
+            frame = pd.DataFrame({'Close': self.close[asset]})
+            bank = IndicatorBank.from_data(frame, fingerprint=f"{self.fingerprint}:{asset}")
+            self._banks[asset] = bank
+        return bank
+
+    def lists(self) -> Tuple[list, list, list, list]:
+        """Prix (open, high, low, close) en listes Python par actif, pour la boucle d'entrées."""
+        if self._lists is None:
+            self._lists = tuple(a.tolist() for a in (self.open_, self.high, self.low, self.close))
+        return self._lists
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_banks'] = {}
+        state['_lists'] = None
+        return state
+
+    def __repr__(self):
+        span = f"{self.index[0].date()} -> {self.index[-1].date()}" if len(self) else "empty"
+        return f"PortfolioData({self.n_assets} assets, {len(self)} bars, {span})"
+
+
+def _next_true(flags: np.ndarray) -> np.ndarray:
+    """
+    Pour chaque barre, indice de la prochaine barre (incluse) où `flags` est vrai.
+
+    Args:
+        flags (np.ndarray): Matrice booléenne (actifs, barres).
+
+    Returns:
+        np.ndarray: Matrice (actifs, barres + 1) d'indices, `barres` si aucun.
+    """
+    n = flags.shape[1]
+    idx = np.where(flags, np.arange(n), n)
+    idx = np.concatenate((idx, np.full((flags.shape[0], 1), n)), axis=1)
+    return np.minimum.accumulate(idx[:, ::-1], axis=1)[:, ::-1]
+
+
+def _bracket_exit(arrays: tuple, lists: tuple, a: int, start: int, end: int,
+                  stop: float, limit: float) -> Tuple[int, float]:
+    """
+    Première barre de [start, end) où le Bracket d'une position se déclenche.
+
+    Les premières barres sont parcourues directement (la plupart des positions
+    sont courtes), la suite par `_first_hit`. Le Stop est prioritaire sur le Limit.
+
+    Returns:
+        Tuple[int, float]: (barre, prix d'exécution), ou (end, nan) sans déclenchement.
+    """
+    op, hi, lo = lists[0][a], lists[1][a], lists[2][a]
+    scan_end = min(end, start + FAST_FORWARD_MIN_BARS)
+    for i in range(start, scan_end):
+        if lo[i] <= stop or op[i] <= stop:
+            return i, min(op[i], stop)
+        if hi[i] >= limit or op[i] >= limit:
+            return i, max(op[i], limit)
+    if scan_end >= end:
+        return end, np.nan
+    open_, high, low = arrays[0][a], arrays[1][a], arrays[2][a]
+    stop_bar = _first_hit(low, open_, scan_end, stop, True)
+    limit_bar = _first_hit(high, open_, scan_end, limit, False)
+    if min(stop_bar, limit_bar) >= end:
+        return end, np.nan
+    if stop_bar <= limit_bar:
+        return stop_bar, min(op[stop_bar], stop)
+    return limit_bar, max(op[limit_bar], limit)
+
+
+def _asset_params(params: Union[Dict, Mapping[str, Dict], Sequence[Dict]],
+                  tickers: List[str]) -> List[Dict]:
+    """Normalise un génome partagé, un dict par ticker ou une liste en une liste par actif."""
+    if isinstance(params, Mapping):
+        if 'SMA_F' in params:
+            return [params] * len(tickers)
+        return [params[t] for t in tickers]
+    params = list(params)
+    if len(params) != len(tickers):
+        raise ValueError(f"Expected {len(tickers)} parameter sets, got {len(params)}")
+    return params
+
+
+def portfolio_signals(params, portfolio: PortfolioData,
+                      start_index: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Construit les signaux de GeneticStrategy pour chaque actif du portefeuille.
+
+    Un actif dont le RSI ferait échouer Backtrader (voir compute_rsi) ne produit
+    aucun signal ; les barres non négociables n'ouvrent pas de position.
+
+    Args:
+        params: Génome décodé partagé, dict {ticker: paramètres} ou liste par actif.
+        portfolio (PortfolioData): Prix alignés.
+        start_index (int): Première barre où la stratégie peut passer des ordres.
+
+    Returns:
+        Tuple: (entrées, sorties) booléennes (actifs, barres), SL et TP par actif.
+    """
+    per_asset = _asset_params(params, portfolio.tickers)
+    shape = portfolio.close.shape
+    entries = np.zeros(shape, dtype=bool)
+    exits = np.zeros(shape, dtype=bool)
+    for a, p in enumerate(per_asset):
+        bank = portfolio.bank(a)
+        try:
+            rsi = bank.rsi(p['RSI_P'])
+        except ZeroDivisionError:
+            continue
+        entries[a], exits[a] = strategy_signals(p, bank.sma(p['SMA_F']), bank.sma(p['SMA_S']),
+                                                rsi, start_index)
+    # Un ordre au marché s'exécute à l'ouverture suivante : les deux barres doivent être négociables
+    entries[:, :-1] &= portfolio.tradable[:, :-1] & portfolio.tradable[:, 1:]
+    entries[:, -1] = False
+    sl = np.array([p['SL'] for p in per_asset], dtype=np.float64)
+    tp = np.array([p['TP'] for p in per_asset], dtype=np.float64)
+    return entries, exits, sl, tp
+
+
+def simulate_portfolio(entries: np.ndarray, exits: np.ndarray, sl: np.ndarray, tp: np.ndarray,
+                       open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                       commission: np.ndarray, initial_cash: float = Config.INITIAL_CASH,
+                       allocation: str = None, max_positions: int = None,
+                       cash_fraction: float = None, lists: tuple = None) -> Dict:
+    """
+    Simule les positions de tous les actifs sur une trésorerie commune.
+
+    Règles reprises du moteur vectorisé : entrée au marché à l'ouverture suivant le
+    signal, Bracket actif une barre après l'entrée (Stop prioritaire sur le Limit),
+    sortie technique au marché à l'ouverture suivante. La trésorerie est contrôlée
+    à la soumission de l'ordre (clôture du signal), après les sorties de la barre ;
+    les signaux d'une même barre sont servis dans l'ordre des actifs. Contrairement
+    au `close()` de Backtrader, une sortie technique annule le Bracket.
+
+    Allocation (taille de l'entrée, en unités fractionnaires) :
+    - 'equal' : valeur du portefeuille / nombre de lignes, dans la limite de la trésorerie ;
+    - 'cash' : fraction `cash_fraction` de la trésorerie disponible ;
+    - 'unit' : une unité (sizer par défaut de Backtrader), refusée si la trésorerie manque.
+
+    Args:
+        entries, exits (np.ndarray): Signaux booléens (actifs, barres).
+        sl, tp (np.ndarray): Stop Loss et Take Profit par actif.
+        open_, high, low, close (np.ndarray): Prix alignés (actifs, barres).
+        commission (np.ndarray): Taux de commission par actif.
+        initial_cash (float): Capital de départ.
+        allocation (str, optional): Règle d'allocation. Par défaut Config.PORTFOLIO_ALLOCATION.
+        max_positions (int, optional): Positions simultanées (0 = une par actif).
+            Par défaut Config.PORTFOLIO_MAX_POSITIONS.
+        cash_fraction (float, optional): Fraction engagée par la règle 'cash'.
+            Par défaut Config.PORTFOLIO_CASH_FRACTION.
+        lists (tuple, optional): Prix en listes Python (voir PortfolioData.lists).
+
+    Returns:
+        Dict: final_value, max_drawdown, equity, drawdown, cash (séries par barre),
+        total_trades, won_trades, lost_trades, open_trades, rejected,
+        trades (tuples (actif, barre d'ouverture, barre de clôture, unités, PnL net)),
+        asset_pnl, asset_trades, asset_exposure (par actif).
+    """
+    allocation = allocation or Config.PORTFOLIO_ALLOCATION
+    if allocation not in ALLOCATIONS:
+        raise ValueError(f"Unknown portfolio allocation: {allocation}")
+    max_positions = Config.PORTFOLIO_MAX_POSITIONS if max_positions is None else max_positions
+    cash_fraction = Config.PORTFOLIO_CASH_FRACTION if cash_fraction is None else cash_fraction
+
+    n_assets, n = close.shape
+    slots = min(max_positions, n_assets) if max_positions > 0 else n_assets
+    min_value = initial_cash * MIN_ORDER_FRACTION
+    arrays = (open_, high, low, close)
+    if lists is None:
+        lists = tuple(x.tolist() for x in arrays)
+    op, cl = lists[0], lists[3]
+    rates = commission.tolist()
+    sl, tp = np.asarray(sl).tolist(), np.asarray(tp).tolist()
+    # Valorisation des lignes ('equal') : produit scalaire unités x clôtures de la barre
+    close_by_bar = np.ascontiguousarray(close.T) if allocation == 'equal' else None
+    units_vec = np.zeros(n_assets)
+    next_entry = _next_true(entries)
+    next_exit = _next_true(exits)
+
+    # Prochain signal d'entrée de chaque actif, servi dans l'ordre (barre, actif)
+    candidates = [(int(next_entry[a, 0]), a) for a in range(n_assets) if next_entry[a, 0] < n]
+    heapq.heapify(candidates)
+    positions = []  # tas (barre de sortie, indice du trade)
+    held = {}       # actif -> unités détenues
+    trades = []     # [actif, entrée, sortie, unités, coût, prix de sortie]
+    cash = float(initial_cash)
+    rejected = 0
+
+    while candidates:
+        s, a = heapq.heappop(candidates)
+        # Sorties exécutées jusqu'à la barre du signal incluse
+        while positions and positions[0][0] <= s:
+            _, t = heapq.heappop(positions)
+            b, _, _, units, _, price = trades[t]
+            cash += units * price * (1.0 - rates[b])
+            del held[b]
+            units_vec[b] = 0.0
+
+        rate = rates[a]
+        f = s + 1
+        price = cl[a][s]
+        fill = op[a][f]
+        units = 0.0
+        if len(held) < slots:
+            if allocation == 'unit':
+                units = 1.0 if fill * (1.0 + rate) <= cash else 0.0
+            else:
+                if allocation == 'equal':
+                    value = cash + float(units_vec @ close_by_bar[s]) if held else cash
+                    value = min(value / slots, cash)
+                else:
+                    value = cash * cash_fraction
+                if value > min_value:
+                    units = min(value / price, cash / fill) / (1.0 + rate)
+
+        if units <= 0.0:
+            rejected += 1
+            # Sans ligne ni trésorerie libre, rien ne change avant la prochaine sortie
+            retry = s + 1
+            if allocation != 'unit' and positions:
+                retry = max(retry, positions[0][0])
+            nxt = int(next_entry[a, min(retry, n)])
+            if nxt < n:
+                heapq.heappush(candidates, (nxt, a))
+            continue
+
+        cost = units * fill * (1.0 + rate)
+        cash -= cost
+        # Sortie technique au marché à l'ouverture suivant le signal, sauf Bracket déclenché avant
+        end = min(int(next_exit[a, f]) + 1, n)
+        end_bracket, exit_price = _bracket_exit(arrays, lists, a, f + 1, min(end + 1, n),
+                                                price * (1.0 - sl[a]), price * (1.0 + tp[a]))
+        if end_bracket <= end and end_bracket < n:
+            end = end_bracket
+        elif end < n:
+            exit_price = op[a][end]
+
+        t = len(trades)
+        trades.append((a, f, end, units, cost, exit_price))
+        held[a] = units
+        units_vec[a] = units
+        heapq.heappush(positions, (end, t))
+        nxt = int(next_entry[a, end]) if end < n else n
+        if nxt < n:
+            heapq.heappush(candidates, (nxt, a))
+
+    # Séries : unités détenues (actifs x barres) et flux de trésorerie
+    table = np.array(trades, dtype=np.float64).reshape(-1, 6)
+    asset = table[:, 0].astype(np.int64)
+    entry_bar = table[:, 1].astype(np.int64)
+    exit_bar = table[:, 2].astype(np.int64)
+    units, cost = table[:, 3], table[:, 4]
+    is_open = exit_bar >= n
+    proceeds = np.where(is_open, 0.0, units * np.nan_to_num(table[:, 5]) * (1.0 - commission[asset]))
+    # Les positions encore ouvertes sont valorisées à la dernière clôture
+    pnl = np.where(is_open, units * close[asset, -1] if n else 0.0, proceeds) - cost
+
+    units_held = np.zeros((n_assets, n + 1))
+    np.add.at(units_held, (asset, entry_bar), units)
+    np.add.at(units_held, (asset, exit_bar), -units)
+    flows = np.zeros(n + 1)
+    np.add.at(flows, entry_bar, -cost)
+    np.add.at(flows, exit_bar, proceeds)
+    still_open = int(is_open.sum())
+    closed_pnl = pnl[~is_open]
+
+    units_held = np.cumsum(units_held[:, :n], axis=1)
+    cash_series = initial_cash + np.cumsum(flows[:n])
+    equity = cash_series + (units_held * close).sum(axis=0)
+    if n:
+        peaks = np.maximum.accumulate(np.maximum(equity, initial_cash))
+        drawdown = 100.0 * (peaks - equity) / peaks
+        final_value = float(equity[-1])
+    else:
+        drawdown = np.zeros(0)
+        final_value = float(initial_cash)
+
+    return {
+        'final_value': final_value,
+        'max_drawdown': float(drawdown.max()) if n else 0.0,
+        'equity': equity,
+        'drawdown': drawdown,
+        'cash': cash_series,
+        'total_trades': len(trades) - still_open,
+        'won_trades': int((closed_pnl > 0).sum()),
+        'lost_trades': int((closed_pnl <= 0).sum()),
+        'open_trades': still_open,
+        'rejected': rejected,
+        'trades': list(zip(asset.tolist(), entry_bar.tolist(), exit_bar.tolist(),
+                           units.tolist(), pnl.tolist())),
+        'asset_pnl': np.bincount(asset, weights=pnl, minlength=n_assets),
+        'asset_trades': np.bincount(asset, minlength=n_assets),
+        'asset_exposure': (units_held > 0).mean(axis=1) if n else np.zeros(n_assets),
+    }
+
+
+def run_portfolio_backtest(params, portfolio: PortfolioData,
+                           initial_cash: float = Config.INITIAL_CASH, start_index: int = 0,
+                           **options) -> Dict:
+    """
+    Exécute la stratégie sur tout le portefeuille.
+
+    Args:
+        params: Génome décodé partagé, dict {ticker: paramètres} ou liste par actif.
+        portfolio (PortfolioData): Prix alignés.
+        initial_cash (float): Capital de départ commun.
+        start_index (int): Première barre où la stratégie peut passer des ordres.
+        **options: allocation, max_positions, cash_fraction (voir simulate_portfolio).
+            Par défaut, la règle d'allocation du portefeuille.
+
+    Returns:
+        Dict: Résultat de `simulate_portfolio`, complété par profit_pct et
+        `contribution` (par ticker : pnl, contribution_pct, trades, exposure_pct).
+    """
+    options = {'allocation': portfolio.allocation, 'max_positions': portfolio.max_positions,
+               'cash_fraction': portfolio.cash_fraction, **options}
+    entries, exits, sl, tp = portfolio_signals(params, portfolio, start_index)
+    result = simulate_portfolio(entries, exits, sl, tp, portfolio.open_, portfolio.high,
+                                portfolio.low, portfolio.close, portfolio.commission,
+                                initial_cash=initial_cash, lists=portfolio.lists(), **options)
+    result['profit_pct'] = (result['final_value'] - initial_cash) / initial_cash * 100.0
+    result['contribution'] = {
+        ticker: {
+            'pnl': float(result['asset_pnl'][a]),
+            'contribution_pct': float(result['asset_pnl'][a] / initial_cash * 100.0),
+            'trades': int(result['asset_trades'][a]),
+            'exposure_pct': float(result['asset_exposure'][a] * 100.0),
+        }
+        for a, ticker in enumerate(portfolio.tickers)
+    }
+    return result
+
+
+def portfolio_fitness(params, portfolio: PortfolioData) -> Tuple[float, float]:
+    """
+    Couple (profit, drawdown) du portefeuille, au format de run_backtest.
+
+    Args:
+        params: Génome décodé partagé, dict {ticker: paramètres} ou liste par actif.
+        portfolio (PortfolioData): Prix alignés.
+
+    Returns:
+        Tuple[float, float]: (profit_pourcentage, drawdown_maximal), ou (-100.0, 100.0)
+        si aucun trade n'a été clôturé.
+    """
+    entries, exits, sl, tp = portfolio_signals(params, portfolio)
+    return _fitness(simulate_portfolio(entries, exits, sl, tp, portfolio.open_, portfolio.high,
+                                       portfolio.low, portfolio.close, portfolio.commission,
+                                       allocation=portfolio.allocation,
+                                       max_positions=portfolio.max_positions,
+                                       cash_fraction=portfolio.cash_fraction,
+                                       lists=portfolio.lists()))
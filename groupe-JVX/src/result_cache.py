@@ -0,0 +1,241 @@
+"""
+Module Result Cache.
+Ce module mémorise les résultats des optimisations lancées depuis le dashboard (AG et WFA)
+pour les partager entre les sessions et les onglets : un résultat est indexé par actif,
+intervalle, réglages de l'optimisation et empreinte des données, de sorte qu'une même
+demande n'est calculée qu'une fois. Les entrées expirent après Config.RESULT_CACHE_TTL_S,
+les plus anciennes sont évincées au-delà de Config.RESULT_CACHE_MAX_ENTRIES et chaque
+résultat est écrit sur disque (un fichier JSON par entrée) : le cache survit au
+redémarrage du dashboard.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.config import AssetConfig, Config
+
+# Réglages de Config qui influencent le résultat de chaque type d'optimisation
+_CONFIG_FIELDS = {
+    'ga': ('INITIAL_CASH', 'GA_CXPB', 'GA_MUTPB', 'GA_BACKEND', 'FITNESS_CACHE_TICK', 'GENE_BOUNDS'),
+    'wfa': ('INITIAL_CASH', 'GA_CXPB', 'GA_MUTPB', 'GA_BACKEND', 'FITNESS_CACHE_TICK', 'GENE_BOUNDS',
+            'WFA_TRAIN_MONTHS', 'WFA_TEST_MONTHS', 'WFA_STEP_MONTHS', 'WFA_SEED',
+            'WFA_WARM_START', 'WFA_IMMIGRANT_RATE', 'WFA_COLD_BASELINE',
+            'TRADE_LEDGER_ENABLED'),
+}
+
+
+def config_snapshot(kind: str, asset: AssetConfig, options: Dict = None) -> Dict:
+    """
+    Réglages qui déterminent le résultat d'une optimisation.
+
+    Args:
+        kind (str): 'ga' ou 'wfa'.
+        asset (AssetConfig): Actif et réglages de l'optimisation.
+        options (Dict, optional): Options du job (ex: train_months), prioritaires sur Config.
+
+    Returns:
+        Dict: Réglages sérialisables en JSON.
+    """
+    options = options or {}
+    snapshot = {field: getattr(Config, field, None) for field in _CONFIG_FIELDS[kind]}
+    if kind == 'wfa':
+        snapshot['WFA_TRAIN_MONTHS'] = options.get('train_months', snapshot['WFA_TRAIN_MONTHS'])
+        snapshot['WFA_TEST_MONTHS'] = options.get('test_months', snapshot['WFA_TEST_MONTHS'])
+    snapshot.update({
+        'engine': asset.engine,
+        'commission': asset.commission,
+        'population': asset.population,
+        'generations': asset.generations,
+        'train_ratio': asset.train_ratio,
+        'seed': asset.seed,
+        'options': {k: v for k, v in sorted(options.items()) if k not in ('train_months', 'test_months')},
+    })
+    return snapshot
+
+
+def make_key(kind: str, ticker: str, interval: str, config: Dict, fingerprint: str) -> str:
+    """
+    Clé d'un résultat : type, actif, intervalle, réglages et empreinte des données.
+
+    Returns:
+        str: Empreinte hexadécimale (nom du fichier de l'entrée).
+    """
+    payload = json.dumps([kind, ticker, interval, config, fingerprint], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache des résultats d'optimisation, en mémoire (LRU) et sur disque.
+
+    Une entrée absente de la mémoire est relue depuis son fichier ; une entrée expirée
+    est supprimée des deux niveaux. Les compteurs hits, misses, evictions et expired
+    décrivent l'activité du cache depuis sa création.
+    """
+
+    def __init__(self, directory: str = None, ttl_s: float = None, max_entries: int = None):
+        """
+        Args:
+            directory (str, optional): Répertoire des entrées (None = mémoire seule).
+                Par défaut Config.RESULT_CACHE_DIR.
+            ttl_s (float, optional): Durée de vie d'une entrée (s, 0 = illimitée).
+                Par défaut Config.RESULT_CACHE_TTL_S.
+            max_entries (int, optional): Entrées gardées au plus (0 = cache désactivé).
+                Par défaut Config.RESULT_CACHE_MAX_ENTRIES.
+        """
+        directory = Config.RESULT_CACHE_DIR if directory is None else directory
+        self.directory = Path(directory) if directory else None
+        self.ttl_s = Config.RESULT_CACHE_TTL_S if ttl_s is None else ttl_s
+        self.max_entries = Config.RESULT_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self._entries = OrderedDict()  # clé -> (date de création, résultat)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _is_expired(self, created: float) -> bool:
+        return bool(self.ttl_s) and time.time() - created > self.ttl_s
+
+    def _read(self, key: str) -> Optional[tuple]:
+        """Relit une entrée depuis le disque (None si absente ou illisible)."""
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry['created'], entry['value']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _drop(self, key: str):
+        self._entries.pop(key, None)
+        if self.directory is not None:
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Renvoie le résultat mémorisé sous `key`, ou None s'il est absent ou expiré.
+
+        Le résultat renvoyé est partagé : il ne doit pas être modifié.
+        """
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._read(key)
+            if entry is not None and self._is_expired(entry[0]):
+                self._drop(key)
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any, **meta):
+        """
+        Mémorise un résultat (sérialisable en JSON) et l'écrit sur disque.
+
+        Args:
+            key (str): Clé (voir make_key).
+            value: Résultat à mémoriser.
+            **meta: Informations enregistrées avec l'entrée pour l'inspection du
+                répertoire (ex: ticker, kind).
+        """
+        if self.max_entries <= 0:
+            return
+        created = time.time()
+        # Aller-retour JSON : la valeur en mémoire est identique à celle relue après redémarrage
+        text = json.dumps({'created': created, 'meta': meta, 'value': value}, default=float)
+        entry = json.loads(text)
+        with self._lock:
+            if self.directory is not None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                path = self._path(key)
+                tmp = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+                tmp.write_text(text, encoding='utf-8')
+                os.replace(tmp, path)
+            self._entries[key] = (entry['created'], entry['value'])
+            self._entries.move_to_end(key)
+            self._evict()
+        if self.directory is not None:
+            self.prune()
+
+    def _evict(self):
+        """Évince de la mémoire les entrées les moins récemment utilisées."""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def prune(self) -> int:
+        """
+        Supprime du disque les entrées expirées et les plus anciennes au-delà de max_entries.
+
+        Returns:
+            int: Nombre de fichiers supprimés.
+        """
+        if self.directory is None or not self.directory.exists():
+            return 0
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort(reverse=True)
+        removed = 0
+        with self._lock:
+            for rank, (mtime, path) in enumerate(files):
+                if rank >= self.max_entries or self._is_expired(mtime):
+                    self._drop(path.stem)
+                    removed += 1
+        return removed
+
+    def clear(self):
+        """Vide le cache (mémoire et disque) et remet les compteurs à zéro."""
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+            if self.directory is not None and self.directory.exists():
+                for path in self.directory.glob("*.json"):
+                    self._drop(path.stem)
+            self.hits = self.misses = self.evictions = self.expired = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Renvoie un résumé des compteurs du cache."""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expired': self.expired,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+_RESULT_CACHE = None
+
+
+def get_result_cache() -> ResultCache:
+    """Renvoie le cache de résultats du processus (partagé par les sessions du dashboard)."""
+    global _RESULT_CACHE
+    if _RESULT_CACHE is None:
+        _RESULT_CACHE = ResultCache()
+    return _RESULT_CACHE
@@ -6,7 +6,8 @@ les règles d'entrée/sortie et le décodage des chromosomes.
 """
 import backtrader as bt
 import datetime
-from typing import Dict
+import numpy as np
+from typing import Dict, List
 
 class GeneticStrategy(bt.Strategy):
     """
@@ -147,4 +148,20 @@ def decode_chromosome(chromosome: list) -> Dict[str, float]:
         'RSI_LO': int(chromosome[4]),
         'SL': float(chromosome[5]),
         'TP': float(chromosome[6]),
-    }
\ No newline at end of file
+    }
+
+def decode_population(chromosomes: List[list]) -> np.ndarray:
+    """
+    Décode une liste de chromosomes en une matrice de paramètres.
+
+    Chaque ligne est obtenue via `decode_chromosome`, les colonnes suivent donc
+    l'ordre [SMA_F, SMA_S, RSI_P, RSI_UP, RSI_LO, SL, TP].
+
+    Args:
+        chromosomes (List[list]): Individus à décoder.
+
+    Returns:
+        np.ndarray: Matrice (N, 7) de paramètres en float64.
+    """
+    rows = [list(decode_chromosome(c).values()) for c in chromosomes]
+    return np.array(rows, dtype=np.float64).reshape(-1, 7)
@@ -0,0 +1,72 @@
+"""
+Module Synthetic Data.
+Ce module génère des données de marché synthétiques (marche aléatoire géométrique)
+au format des caches CSV du DataManager. Il permet de tester et de mesurer le
+système hors ligne, sur autant d'actifs et de barres que nécessaire.
+"""
+from pathlib import Path
+from typing import List
+import numpy as np
+import pandas as pd
+
+
+def synthetic_ohlcv(bars: int = 2000, seed: int = 0, start: str = "2018-01-01", freq: str = "D",
+                    start_price: float = 100.0, drift: float = 0.0003,
+                    volatility: float = 0.02) -> pd.DataFrame:
+    """
+    Génère une série OHLCV par marche aléatoire géométrique.
+
+    Args:
+        bars (int): Nombre de bougies.
+        seed (int): Graine du générateur (même graine = mêmes données).
+        start (str): Date de la première bougie.
+        freq (str): Fréquence pandas des bougies (ex: 'D', 'h').
+        start_price (float): Prix d'ouverture initial.
+        drift (float): Rendement moyen par bougie.
+        volatility (float): Écart-type des rendements par bougie.
+
+    Returns:
+        pd.DataFrame: Colonnes Close, High, Low, Open, Volume (ordre de yfinance), index 'Date'.
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(drift, volatility, bars)
+    close = start_price * np.exp(np.cumsum(returns))
+    gaps = rng.normal(0.0, volatility / 4, bars)
+    open_ = np.concatenate(([start_price], close[:-1])) * np.exp(gaps)
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0.0, volatility / 2, bars)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0.0, volatility / 2, bars)))
+    volume = rng.lognormal(15.0, 0.5, bars).round()
+
+    index = pd.date_range(start, periods=bars, freq=freq, name='Date')
+    return pd.DataFrame({'Close': close, 'High': high, 'Low': low, 'Open': open_, 'Volume': volume},
+                        index=index)
+
+
+def write_synthetic_universe(directory: str, n_tickers: int, bars: int = 2000, interval: str = "1d",
+                             seed: int = 0, prefix: str = "SYN") -> List[str]:
+    """
+    Écrit un univers d'actifs synthétiques, un fichier `{ticker}_{interval}.csv` par actif.
+
+    Le répertoire peut servir de répertoire de données (Config.DATA_DIR) ou de
+    source pour FileFetcher.
+
+    Args:
+        directory (str): Répertoire de destination (créé au besoin).
+        n_tickers (int): Nombre d'actifs.
+        bars (int): Nombre de bougies par actif.
+        interval (str): Intervalle inscrit dans le nom des fichiers.
+        seed (int): Graine de base (l'actif i utilise seed + i).
+        prefix (str): Préfixe des symboles générés.
+
+    Returns:
+        List[str]: Les symboles générés.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    width = max(3, len(str(n_tickers - 1)))
+    tickers = []
+    for i in range(n_tickers):
+        ticker = f"{prefix}{i:0{width}d}"
+        synthetic_ohlcv(bars, seed=seed + i).to_csv(directory / f"{ticker}_{interval}.csv")
+        tickers.append(ticker)
+    return tickers
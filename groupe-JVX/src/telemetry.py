@@ -0,0 +1,303 @@
+"""
+Module Telemetry.
+Ce module instrumente les exécutions de l'AG et du WFA : chronomètres par phase
+(chargement des données, construction du flux, exécution de Cerebro, analyseurs,
+sélection, variation...), compteurs (évaluations, fitness de repli, cache) et pic
+de mémoire. Les mesures sont agrégées en mémoire dans chaque processus ; elles
+peuvent être écrites au fil de l'eau en lignes JSON (un événement par génération,
+fenêtre WFA ou exécution) et exportées au format texte de Prometheus.
+"""
+import functools
+import json
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Tuple
+from src.config import Config
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Fitness renvoyée lorsqu'un backtest ne clôture aucun trade (ou donne un résultat invalide)
+FALLBACK_FITNESS = (-100.0, 100.0)
+# Fitness d'une évaluation en erreur (exception) : jamais mise en cache ni conservée
+ERROR_FITNESS = (float('-inf'), float('inf'))
+
+# Préfixe des métriques Prometheus
+PROMETHEUS_PREFIX = "jvx"
+
+
+def peak_rss_mb() -> float:
+    """Pic de mémoire résidente du processus (Mo), ou None si non mesurable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sous macOS, kilo-octets sous Linux
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def current_rss_mb() -> float:
+    """Mémoire résidente actuelle du processus (Mo) ; à défaut (hors Linux), le pic."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_mb()
+
+
+def is_error_fitness(fitness: Tuple[float, float]) -> bool:
+    """True si la fitness est celle d'une évaluation en erreur (ERROR_FITNESS)."""
+    return math.isinf(fitness[0]) and math.isinf(fitness[1])
+
+
+def classify_failures(fitnesses: Iterable[Tuple[float, float]]) -> Tuple[int, int]:
+    """
+    Compte les fitness de repli d'une liste d'évaluations.
+
+    Args:
+        fitnesses: Couples (profit, drawdown).
+
+    Returns:
+        Tuple[int, int]: (replis (-100, 100) : aucun trade ou résultat invalide,
+        erreurs (-inf, inf) : exception pendant le backtest).
+    """
+    fallback = errors = 0
+    for fitness in fitnesses:
+        profit, drawdown = fitness
+        if profit == FALLBACK_FITNESS[0] and drawdown == FALLBACK_FITNESS[1]:
+            fallback += 1
+        elif is_error_fitness(fitness):
+            errors += 1
+    return fallback, errors
+
+
+class Telemetry:
+    """
+    Registre des mesures d'un processus.
+
+    Les chronomètres cumulent, par phase, le nombre d'appels, la durée totale et
+    la durée maximale ; les compteurs sont de simples entiers nommés. Un instantané
+    (snapshot) peut être soustrait d'un autre (delta) ou fusionné dans un autre
+    registre (merge), ce qui permet de remonter les mesures des processus de travail.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timers = {}    # phase -> [appels, durée totale (s), durée max (s)]
+        self.counters = {}  # nom -> valeur
+        self._listeners = []
+
+    def reset(self):
+        """Remet toutes les mesures à zéro."""
+        with self._lock:
+            self.timers = {}
+            self.counters = {}
+
+    @contextmanager
+    def timer(self, phase: str):
+        """Chronomètre le bloc `with` dans la phase donnée."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def add_time(self, phase: str, seconds: float, calls: int = 1, max_seconds: float = None):
+        """Ajoute une durée (ou un cumul de `calls` appels) à une phase."""
+        max_seconds = seconds if max_seconds is None else max_seconds
+        with self._lock:
+            timer = self.timers.get(phase)
+            if timer is None:
+                self.timers[phase] = [calls, seconds, max_seconds]
+            else:
+                timer[0] += calls
+                timer[1] += seconds
+                timer[2] = max(timer[2], max_seconds)
+
+    def incr(self, name: str, value: int = 1):
+        """Incrémente un compteur."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict:
+        """
+        Copie des mesures courantes (sérialisable en JSON et par pickle).
+
+        Returns:
+            Dict: {'timers': {phase: {'calls', 'total_s', 'max_s'}}, 'counters': {nom: valeur}}.
+        """
+        with self._lock:
+            return {
+                'timers': {phase: {'calls': t[0], 'total_s': t[1], 'max_s': t[2]}
+                           for phase, t in self.timers.items()},
+                'counters': dict(self.counters),
+            }
+
+    def delta(self, before: Dict) -> Dict:
+        """
+        Mesures accumulées depuis l'instantané `before`.
+
+        La durée maximale d'une phase est celle du registre (elle ne se soustrait pas).
+
+        Args:
+            before (Dict): Instantané pris auparavant.
+
+        Returns:
+            Dict: Instantané des seules mesures ajoutées depuis `before`.
+        """
+        now = self.snapshot()
+        timers = {}
+        for phase, t in now['timers'].items():
+            old = before['timers'].get(phase, {'calls': 0, 'total_s': 0.0})
+            if t['calls'] > old['calls']:
+                timers[phase] = {'calls': t['calls'] - old['calls'],
+                                 'total_s': t['total_s'] - old['total_s'], 'max_s': t['max_s']}
+        counters = {name: value - before['counters'].get(name, 0)
+                    for name, value in now['counters'].items()
+                    if value != before['counters'].get(name, 0)}
+        return {'timers': timers, 'counters': counters}
+
+    def merge(self, snapshot: Dict):
+        """Ajoute les mesures d'un instantané (ex: renvoyé par un processus de travail)."""
+        for phase, t in snapshot['timers'].items():
+            self.add_time(phase, t['total_s'], calls=t['calls'], max_seconds=t['max_s'])
+        for name, value in snapshot['counters'].items():
+            self.incr(name, value)
+
+    def subscribe(self, listener: Callable[[str, Dict], None]):
+        """
+        Abonne une fonction aux événements émis par ce processus (ex: suivi d'un job).
+
+        L'abonné est appelé par emit avec (événement, enregistrement) ; une exception
+        levée par l'abonné interrompt le code émetteur (annulation d'un job).
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, Dict], None]):
+        """Désabonne une fonction enregistrée par subscribe."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def emit(self, event: str, path: str = None, **fields):
+        """
+        Transmet un événement aux abonnés et l'écrit en une ligne JSON (si un fichier est configuré).
+
+        Chaque ligne est ajoutée en une seule écriture : plusieurs processus
+        peuvent partager le même fichier.
+
+        Args:
+            event (str): Type d'événement ('ga_start', 'generation', 'ga_run', 'wfa_start',
+                'wfa_window', 'wfa_run').
+            path (str, optional): Fichier de destination. Par défaut Config.TELEMETRY_FILE.
+            **fields: Contenu de l'événement.
+        """
+        record = {'ts': datetime.now().isoformat(timespec='milliseconds'), 'event': event,
+                  'pid': os.getpid(), **fields}
+        for listener in list(self._listeners):
+            listener(event, record)
+        path = path or Config.TELEMETRY_FILE
+        if not path:
+            return
+        line = json.dumps(record, default=float) + "\n"
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+    def prometheus_text(self, labels: Dict[str, str] = None) -> str:
+        """
+        Mesures courantes au format d'exposition texte de Prometheus.
+
+        Args:
+            labels (Dict[str, str], optional): Étiquettes ajoutées à chaque série (ex: ticker).
+
+        Returns:
+            str: Texte prêt à être lu par le textfile collector de node_exporter.
+        """
+        snapshot = self.snapshot()
+        base = dict(labels or {})
+
+        def series(metric, value, **extra):
+            items = {**base, **extra}
+            label_text = ",".join(f'{k}="{v}"' for k, v in sorted(items.items()))
+            return f"{PROMETHEUS_PREFIX}_{metric}{{{label_text}}} {float(value)!r}"
+
+        lines = [f"# HELP {PROMETHEUS_PREFIX}_phase_seconds_total Cumulated time per phase.",
+                 f"# TYPE {PROMETHEUS_PREFIX}_phase_seconds_total counter"]
+        lines += [series('phase_seconds_total', t['total_s'], phase=p)
+                  for p, t in sorted(snapshot['timers'].items())]
+        lines += [f"# HELP {PROMETHEUS_PREFIX}_phase_calls_total Timed calls per phase.",
+                  f"# TYPE {PROMETHEUS_PREFIX}_phase_calls_total counter"]
+        lines += [series('phase_calls_total', t['calls'], phase=p)
+                  for p, t in sorted(snapshot['timers'].items())]
+        lines += [f"# HELP {PROMETHEUS_PREFIX}_phase_max_seconds Longest single call per phase.",
+                  f"# TYPE {PROMETHEUS_PREFIX}_phase_max_seconds gauge"]
+        lines += [series('phase_max_seconds', t['max_s'], phase=p)
+                  for p, t in sorted(snapshot['timers'].items())]
+        lines += [f"# HELP {PROMETHEUS_PREFIX}_events_total Counted events (evaluations, failures, cache).",
+                  f"# TYPE {PROMETHEUS_PREFIX}_events_total counter"]
+        lines += [series('events_total', v, name=n) for n, v in sorted(snapshot['counters'].items())]
+        peak = peak_rss_mb()
+        if peak is not None:
+            lines += [f"# HELP {PROMETHEUS_PREFIX}_peak_rss_megabytes Peak resident memory of the process.",
+                      f"# TYPE {PROMETHEUS_PREFIX}_peak_rss_megabytes gauge",
+                      series('peak_rss_megabytes', peak)]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str = None, labels: Dict[str, str] = None):
+        """
+        Réécrit le fichier texte Prometheus (remplacement atomique).
+
+        Args:
+            path (str, optional): Fichier de destination. Par défaut Config.TELEMETRY_PROMETHEUS_FILE
+                (sans effet s'il n'est pas configuré).
+            labels (Dict[str, str], optional): Étiquettes ajoutées à chaque série.
+        """
+        path = path or Config.TELEMETRY_PROMETHEUS_FILE
+        if not path or multiprocessing.parent_process() is not None:
+            # Les processus de travail remontent leurs mesures au parent, qui seul écrit le fichier
+            return
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.prometheus_text(labels), encoding='utf-8')
+        os.replace(tmp, path)
+
+
+_TELEMETRY = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    """Renvoie le registre de mesures du processus."""
+    return _TELEMETRY
+
+
+def timed(func: Callable, phase: str) -> Callable:
+    """
+    Enveloppe une fonction pour chronométrer chacun de ses appels.
+
+    Args:
+        func (Callable): Fonction à chronométrer (ex: opérateur DEAP).
+        phase (str): Phase à laquelle imputer la durée.
+
+    Returns:
+        Callable: Fonction équivalente, instrumentée.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _TELEMETRY.add_time(phase, time.perf_counter() - start)
+    return wrapper
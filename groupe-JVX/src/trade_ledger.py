@@ -0,0 +1,454 @@
+"""
+Module Trade Ledger.
+Ce module simule une fois un génome sur tout l'historique (moteur vectorisé) et
+conserve son journal de trades et sa courbe de valeur barre par barre.
+Des sommes préfixes sur les trades et une table creuse sur la valeur permettent
+ensuite de répondre aux requêtes de profit / drawdown d'une fenêtre [début, fin]
+en temps constant, sans relancer de backtest.
+
+Les journaux sont indexés par (empreinte de l'historique, génome) : une tranche est
+située une fois dans les historiques connus (un par actif / intervalle), puis le
+journal du génome est lu directement.
+
+Les réponses décrivent la stratégie exécutée en continu sur l'historique complet
+(RSI initialisé au début de l'historique, drawdown mesuré sur la valeur du
+portefeuille continu). Quand une position (ou un ordre d'entrée) de la stratégie
+continue chevauche le début du trading de la fenêtre, un backtest lancé à neuf
+n'aurait pas ce trade : le journal ne répond pas et le backtest est relancé.
+"""
+import datetime
+import math
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.config import Config
+from src.indicator_bank import data_fingerprint
+from src.vector_backtest import run_vector_backtest
+
+# Historiques complets connus (un par actif / intervalle), indexés par empreinte
+_HISTORY_CACHE_SIZE = 8
+# Tranches récemment situées dans un historique, indexées par identité (même tranche
+# interrogée pour tous les génomes d'une génération)
+_LOCATION_CACHE_SIZE = 16
+# Les requêtes de drawdown sur moins de 2**_DRAWDOWN_SCAN_BITS barres parcourent
+# directement la courbe (coût borné) ; les plus longues lisent la table creuse
+_DRAWDOWN_SCAN_BITS = 7
+
+
+def _params_key(params: Dict[str, float]) -> Tuple:
+    """Clé hashable d'un jeu de paramètres de stratégie."""
+    return tuple(sorted((k, v) for k, v in params.items() if k != 'trading_start_date'))
+
+
+def _warmup_bars(params: Dict[str, float]) -> int:
+    """Barres nécessaires avant le premier appel à GeneticStrategy.next()."""
+    return max(int(params['SMA_F']) - 1, int(params['SMA_S']) - 1, int(params['RSI_P']))
+
+
+def _yearly_sharpe(values: np.ndarray, dates: pd.DatetimeIndex, initial_value: float,
+                   riskfree: float = 0.01) -> float:
+    """
+    Ratio de Sharpe annuel calculé comme bt.analyzers.SharpeRatio (paramètres par défaut).
+
+    Returns:
+        float: Le ratio, ou None s'il n'est pas défini (moins de deux années, écart-type nul).
+    """
+    if len(values) == 0:
+        return None
+    years = dates.year.to_numpy()
+    last_of_year = np.flatnonzero(np.append(years[1:] != years[:-1], True))
+    closes = values[last_of_year]
+    previous = np.concatenate(([initial_value], closes[:-1]))
+    excess = closes / previous - 1.0 - riskfree
+    avg = excess.mean()
+    dev = math.sqrt(((excess - avg) ** 2).mean())
+    return avg / dev if dev > 0 else None
+
+
+def _locate(history: pd.DataFrame, data_slice: pd.DataFrame) -> Optional[Tuple[int, int]]:
+    """
+    Situe une tranche de données dans un historique.
+
+    Returns:
+        Tuple[int, int]: Indices (première, dernière barre), ou None si la tranche
+            n'est pas une portion contiguë et identique de l'historique.
+    """
+    if data_slice.empty:
+        return None
+    index = history.index
+    start = int(index.searchsorted(data_slice.index[0]))
+    end = start + len(data_slice) - 1
+    if end >= len(index):
+        return None
+    if not index[start:end + 1].equals(data_slice.index):
+        return None
+    close = history['Close'].to_numpy(dtype=np.float64)
+    if not np.array_equal(close[start:end + 1], data_slice['Close'].to_numpy(dtype=np.float64)):
+        return None
+    return start, end
+
+
+def _scan_drawdown(values: np.ndarray) -> float:
+    """Drawdown maximal (fraction) d'une courbe, le premier point servant de pic initial."""
+    peaks = np.maximum.accumulate(values)
+    return float(np.max(1.0 - values / peaks))
+
+
+class _DrawdownTable:
+    """
+    Table creuse disjointe du drawdown d'une courbe de valeur strictement positive.
+
+    Pour chaque niveau h, chaque bloc de 2**(h+1) points est coupé en son milieu :
+    la moitié gauche garde, de chaque point jusqu'au milieu, le maximum et le
+    drawdown ; la moitié droite, du milieu jusqu'à chaque point, le minimum et le
+    drawdown. Le drawdown de [l, r] combine les deux moitiés du niveau où l et r
+    se séparent : max(drawdown gauche, drawdown droit, 1 - minimum droit / maximum gauche).
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+        n = len(values)
+        self.extreme, self.drawdown = [], []
+        h = _DRAWDOWN_SCAN_BITS
+        while (1 << h) < n:
+            half = 1 << h
+            size = -(-n // (2 * half)) * 2 * half
+            padded = np.concatenate((values, np.full(size - n, values[-1]))).reshape(-1, 2, half)
+            left, right = padded[:, 0, :], padded[:, 1, :]
+            # Moitié gauche : de chaque point jusqu'au milieu du bloc (accumulations à rebours)
+            left_max = np.maximum.accumulate(left[:, ::-1], axis=1)[:, ::-1]
+            left_min = np.minimum.accumulate(left[:, ::-1], axis=1)[:, ::-1]
+            left_dd = np.maximum.accumulate((1.0 - left_min / left)[:, ::-1], axis=1)[:, ::-1]
+            # Moitié droite : du milieu du bloc jusqu'à chaque point
+            right_min = np.minimum.accumulate(right, axis=1)
+            right_dd = np.maximum.accumulate(1.0 - right / np.maximum.accumulate(right, axis=1), axis=1)
+            self.extreme.append(np.stack((left_max, right_min), axis=1).ravel()[:n])
+            self.drawdown.append(np.stack((left_dd, right_dd), axis=1).ravel()[:n])
+            h += 1
+
+    def query(self, low: int, high: int) -> float:
+        """Drawdown maximal (fraction) de values[low:high + 1], en temps constant."""
+        if high <= low:
+            return 0.0
+        level = (low ^ high).bit_length() - 1 - _DRAWDOWN_SCAN_BITS
+        if level < 0:
+            # low et high dans le même bloc de 2**_DRAWDOWN_SCAN_BITS points
+            return _scan_drawdown(self.values[low:high + 1])
+        extreme, drawdown = self.extreme[level], self.drawdown[level]
+        return float(max(drawdown[low], drawdown[high], 1.0 - extreme[high] / extreme[low]))
+
+
+class TradeLedger:
+    """
+    Journal de trades et courbe de valeur d'un génome sur l'historique complet.
+
+    Index de requête :
+    - sommes préfixes (par barre de clôture) du nombre de trades, des gains et du PnL ;
+    - courbe de valeur, dont les écarts donnent le profit d'une fenêtre en O(1) ;
+    - table creuse de la courbe de valeur pour le drawdown d'une fenêtre en O(1).
+    """
+
+    def __init__(self, params: Dict[str, float], data: pd.DataFrame,
+                 initial_cash: float = Config.INITIAL_CASH, fingerprint: str = None):
+        """
+        Simule le génome sur `data` et construit les index.
+
+        Args:
+            params (Dict[str, float]): Paramètres décodés de la stratégie.
+            data (pd.DataFrame): Historique complet (OHLCV).
+            initial_cash (float): Capital de départ.
+            fingerprint (str, optional): Empreinte déjà calculée de `data`.
+        """
+        self.params = {k: v for k, v in params.items() if k != 'trading_start_date'}
+        self.initial_cash = float(initial_cash)
+        self.fingerprint = fingerprint or data_fingerprint(data)
+        self.index = data.index
+
+        result = run_vector_backtest(self.params, data, initial_cash=self.initial_cash)
+        n = len(data)
+        self.equity = result['equity']
+
+        trades = np.asarray(result['trades'], dtype=np.float64).reshape(-1, 3)
+        self.trade_open = trades[:, 0].astype(np.int64)
+        self.trade_close = trades[:, 1].astype(np.int64)
+        self.trade_pnl = trades[:, 2]
+        # Position encore ouverte à la fin de l'historique (barre d'ouverture, sinon None)
+        self.open_trade_bar = result['open_trade_bar']
+
+        # Sommes préfixes indexées par barre de clôture : prefix[j + 1] = cumul jusqu'à la barre j
+        self._count = np.zeros(n + 1, dtype=np.int64)
+        self._won = np.zeros(n + 1, dtype=np.int64)
+        self._pnl = np.zeros(n + 1)
+        np.add.at(self._count, self.trade_close + 1, 1)
+        np.add.at(self._won, self.trade_close + 1, (self.trade_pnl >= 0.0).astype(np.int64))
+        np.add.at(self._pnl, self.trade_close + 1, self.trade_pnl)
+        np.cumsum(self._count, out=self._count)
+        np.cumsum(self._won, out=self._won)
+        np.cumsum(self._pnl, out=self._pnl)
+        # Table du drawdown construite à la première requête (inutile sans trade)
+        self._drawdown = None
+
+    def locate(self, data_slice: pd.DataFrame) -> Optional[Tuple[int, int]]:
+        """
+        Situe une tranche de données dans l'historique du journal.
+
+        Args:
+            data_slice (pd.DataFrame): Tranche à situer.
+
+        Returns:
+            Tuple[int, int]: Indices (première, dernière barre), ou None si la tranche
+                n'est pas une portion contiguë et identique de l'historique.
+        """
+        location = locate_slice(data_slice)
+        if location is None or location[0] != self.fingerprint:
+            return None
+        return location[1], location[2]
+
+    def trade_stats(self, start: int, end: int) -> Tuple[int, int, float]:
+        """
+        Trades ouverts et clôturés dans [start, end] (bornes incluses).
+
+        Returns:
+            Tuple[int, int, float]: (nombre de trades, trades gagnants, PnL net cumulé).
+        """
+        count = self._count[end + 1] - self._count[start]
+        won = self._won[end + 1] - self._won[start]
+        pnl = self._pnl[end + 1] - self._pnl[start]
+        # Une position ne couvre jamais qu'un trade : au plus un trade chevauche `start`
+        k = int(np.searchsorted(self.trade_close, start, side='left'))
+        if k < len(self.trade_close) and self.trade_open[k] < start <= self.trade_close[k] <= end:
+            count -= 1
+            won -= int(self.trade_pnl[k] >= 0.0)
+            pnl -= self.trade_pnl[k]
+        return int(count), int(won), float(pnl)
+
+    def straddles(self, start: int) -> bool:
+        """
+        True si la stratégie continue est en position à l'ouverture de la barre `start`
+        (trade ouvert avant `start`, ou à `start` sur un ordre passé la barre précédente) :
+        un backtest commençant à trader à `start` n'aurait pas ce trade.
+        """
+        if self.open_trade_bar is not None and self.open_trade_bar <= start:
+            return True
+        k = int(np.searchsorted(self.trade_close, start, side='left'))
+        return k < len(self.trade_close) and self.trade_open[k] <= start
+
+    def window_values(self, start: int, end: int) -> np.ndarray:
+        """Valeur du portefeuille sur [start, end] pour un capital `initial_cash` à l'ouverture de la fenêtre."""
+        base = self.equity[start - 1] if start > 0 else self.initial_cash
+        return self.initial_cash + (self.equity[start:end + 1] - base)
+
+    def max_drawdown(self, start: int, end: int) -> float:
+        """
+        Drawdown maximal (%) de la fenêtre [start, end] sur la valeur du portefeuille
+        continu, la valeur à l'ouverture de la fenêtre servant de pic initial.
+        """
+        if self._drawdown is None:
+            # Courbe précédée du capital de départ : values[i + 1] = valeur après la barre i
+            values = np.concatenate(([self.initial_cash], self.equity))
+            # Une valeur nulle ou négative ferait changer de signe les rapports : parcours direct
+            self._drawdown = _DrawdownTable(values) if values.min() > 0 else values
+        if isinstance(self._drawdown, np.ndarray):
+            return 100.0 * _scan_drawdown(self._drawdown[start:end + 2]) if end >= start else 0.0
+        return 100.0 * self._drawdown.query(start, end + 1)
+
+    def _trading_start(self, first: int, trading_start_date: datetime.date = None) -> int:
+        """Première barre de trading d'une tranche commençant à `first`."""
+        start = first + _warmup_bars(self.params)
+        if trading_start_date:
+            start = max(start, int(self.index.searchsorted(pd.Timestamp(trading_start_date), side='left')))
+        return start
+
+    def fitness(self, data_slice: pd.DataFrame) -> Tuple[float, float]:
+        """
+        Couple (profit, drawdown) façon run_backtest pour une tranche de l'historique.
+
+        Returns:
+            Tuple[float, float]: (profit_pct, max_drawdown_pct), (-100.0, 100.0) sans trade,
+                ou None si la tranche n'appartient pas à l'historique ou si une position
+                chevauche le début du trading (backtest de la tranche à relancer).
+        """
+        bounds = self.locate(data_slice)
+        if bounds is None:
+            return None
+        start, end = self._trading_start(bounds[0]), bounds[1]
+        if start <= end and self.straddles(start):
+            return None
+        if start > end or self.trade_stats(start, end)[0] == 0:
+            return (-100.0, 100.0)
+        base = self.equity[start - 1] if start > 0 else self.initial_cash
+        profit = self.equity[end] - base
+        return (profit / self.initial_cash * 100.0, self.max_drawdown(start, end))
+
+    def summary(self, data_slice: pd.DataFrame, trading_start_date: datetime.date = None) -> Dict:
+        """
+        Métriques façon run_simple_backtest pour une tranche de l'historique.
+
+        Args:
+            data_slice (pd.DataFrame): Tranche (warm-up éventuel inclus).
+            trading_start_date (datetime.date, optional): Début effectif du trading.
+
+        Returns:
+            Dict: Mêmes clés que run_simple_backtest, ou None si la tranche
+                n'appartient pas à l'historique ou si une position chevauche le début
+                du trading.
+        """
+        bounds = self.locate(data_slice)
+        if bounds is None:
+            return None
+        first, end = bounds
+        start = self._trading_start(first, trading_start_date)
+        if start <= end and self.straddles(start):
+            return None
+        # Avant le début du trading, la valeur reste égale au capital de départ
+        values = np.full(end - first + 1, self.initial_cash)
+        total_trades = won_trades = 0
+        max_drawdown = 0.0
+        if start <= end:
+            values[start - first:] = self.window_values(start, end)
+            total_trades, won_trades, _ = self.trade_stats(start, end)
+            max_drawdown = self.max_drawdown(start, end)
+        final_value = float(values[-1])
+        sharpe_ratio = _yearly_sharpe(values, self.index[first:end + 1], self.initial_cash)
+
+        return {
+            'initial_value': self.initial_cash,
+            'final_value': final_value,
+            'profit': final_value - self.initial_cash,
+            'profit_pct': ((final_value - self.initial_cash) / self.initial_cash) * 100,
+            'total_trades': total_trades,
+            'won_trades': won_trades,
+            'lost_trades': total_trades - won_trades,
+            'win_rate': (won_trades / total_trades * 100) if total_trades > 0 else 0,
+            'max_drawdown': max_drawdown,
+            'sharpe_ratio': sharpe_ratio if sharpe_ratio is not None else 0,
+        }
+
+    def __repr__(self):
+        return (f"TradeLedger(bars={len(self.equity)}, trades={len(self.trade_pnl)}, "
+                f"params={self.params})")
+
+
+# Historiques complets des journaux, indexés par empreinte (LRU)
+_HISTORIES = OrderedDict()
+# Tranches déjà situées : id(tranche) -> (tranche, empreinte de l'historique, première, dernière barre)
+_LOCATIONS = OrderedDict()
+# Journaux récemment construits, indexés par (empreinte, paramètres, capital, commission) (LRU)
+_LEDGERS = OrderedDict()
+
+
+def register_history(history: pd.DataFrame) -> str:
+    """
+    Enregistre un historique complet dans lequel les tranches seront situées.
+
+    Args:
+        history (pd.DataFrame): Historique complet (index de dates trié).
+
+    Returns:
+        str: Empreinte de l'historique (calculée une seule fois par objet).
+    """
+    for fingerprint, known in _HISTORIES.items():
+        if known is history:
+            _HISTORIES.move_to_end(fingerprint)
+            return fingerprint
+    fingerprint = data_fingerprint(history)
+    _HISTORIES[fingerprint] = history
+    _HISTORIES.move_to_end(fingerprint)
+    while len(_HISTORIES) > _HISTORY_CACHE_SIZE:
+        evicted, _ = _HISTORIES.popitem(last=False)
+        for key in [k for k in _LEDGERS if k[0] == evicted]:
+            del _LEDGERS[key]
+        for key in [k for k, loc in _LOCATIONS.items() if loc[1] == evicted]:
+            del _LOCATIONS[key]
+    return fingerprint
+
+
+def locate_slice(data_slice: pd.DataFrame) -> Optional[Tuple[str, int, int]]:
+    """
+    Situe une tranche dans les historiques enregistrés (résultat mémorisé par tranche).
+
+    Args:
+        data_slice (pd.DataFrame): Tranche de données.
+
+    Returns:
+        Tuple[str, int, int]: (empreinte de l'historique, première, dernière barre),
+            ou None si aucun historique enregistré ne contient la tranche.
+    """
+    cached = _LOCATIONS.get(id(data_slice))
+    if cached is not None and cached[0] is data_slice:
+        _LOCATIONS.move_to_end(id(data_slice))
+        return cached[1:]
+    location = None
+    for fingerprint, history in reversed(_HISTORIES.items()):
+        bounds = _locate(history, data_slice)
+        if bounds is not None:
+            location = (fingerprint,) + bounds
+            break
+    if location is not None:
+        _LOCATIONS[id(data_slice)] = (data_slice,) + location
+        while len(_LOCATIONS) > _LOCATION_CACHE_SIZE:
+            _LOCATIONS.popitem(last=False)
+    return location
+
+
+def _ledger_key(fingerprint: str, params: Dict[str, float], initial_cash: float) -> Tuple:
+    """Clé d'un journal : historique, génome, capital et commission."""
+    return (fingerprint, _params_key(params), float(initial_cash), Config.get_commission())
+
+
+def get_trade_ledger(params: Dict[str, float], data: pd.DataFrame,
+                     initial_cash: float = Config.INITIAL_CASH) -> TradeLedger:
+    """
+    Renvoie le journal d'un génome sur un historique, en le simulant au besoin.
+
+    Args:
+        params (Dict[str, float]): Paramètres décodés de la stratégie.
+        data (pd.DataFrame): Historique complet.
+        initial_cash (float): Capital de départ.
+
+    Returns:
+        TradeLedger: Journal partagé (cache LRU de Config.TRADE_LEDGER_CACHE_SIZE entrées).
+    """
+    fingerprint = register_history(data)
+    key = _ledger_key(fingerprint, params, initial_cash)
+    ledger = _LEDGERS.get(key)
+    if ledger is not None:
+        _LEDGERS.move_to_end(key)
+        return ledger
+
+    ledger = TradeLedger(params, data, initial_cash=initial_cash, fingerprint=fingerprint)
+    _LEDGERS[key] = ledger
+    while len(_LEDGERS) > Config.TRADE_LEDGER_CACHE_SIZE:
+        _LEDGERS.popitem(last=False)
+    return ledger
+
+
+def find_trade_ledger(params: Dict[str, float], data_slice: pd.DataFrame,
+                      initial_cash: float = Config.INITIAL_CASH) -> TradeLedger:
+    """
+    Cherche un journal déjà construit couvrant une tranche (sans lancer de simulation).
+
+    Args:
+        params (Dict[str, float]): Paramètres décodés de la stratégie.
+        data_slice (pd.DataFrame): Tranche de l'historique.
+        initial_cash (float): Capital de départ.
+
+    Returns:
+        TradeLedger: Le journal, ou None si ce génome n'a pas été simulé sur un
+            historique contenant la tranche.
+    """
+    location = locate_slice(data_slice)
+    if location is None:
+        return None
+    ledger = _LEDGERS.get(_ledger_key(location[0], params, initial_cash))
+    if ledger is not None:
+        _LEDGERS.move_to_end(_ledger_key(location[0], params, initial_cash))
+    return ledger
+
+
+def clear_trade_ledgers():
+    """Vide le cache des journaux de trades (et des historiques enregistrés)."""
+    _LEDGERS.clear()
+    _LOCATIONS.clear()
+    _HISTORIES.clear()
@@ -0,0 +1,296 @@
+"""
+Module Universe.
+Ce module optimise la stratégie sur un univers d'actifs (jusqu'à plusieurs centaines).
+Chaque actif est décrit par un AssetConfig (aucune variable globale de Config n'est
+modifiée) et traité par un processus du pool : ses données ne sont chargées qu'au
+moment de son traitement puis libérées. Le nombre de processus est borné par le
+budget mémoire, et les résultats sont consolidés dans un tableau unique.
+"""
+import contextlib
+import io
+import multiprocessing as mp
+import os
+import random
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from src.config import AssetConfig, Config
+from src.data_manager import DataManager
+from src.memory_guard import release_caches
+from src.telemetry import peak_rss_mb
+
+# Séries d'indicateurs d'une banque (une par période SMA et RSI des bornes des gènes)
+_BANK_SERIES = sum(high - low + 1 for name, (low, high) in Config.GENE_BOUNDS.items()
+                   if name in ('SMA_F', 'SMA_S', 'RSI_P'))
+# Tableaux float64 de la taille des données par génome simulé simultanément
+# (signaux et indicateurs des blocs de batch_fitness)
+_GENOME_SERIES = 8
+
+
+def universe_tickers(directory: str, interval: str = Config.INTERVAL) -> List[str]:
+    """
+    Liste les actifs disposant d'un cache dans un répertoire de données.
+
+    Args:
+        directory (str): Répertoire contenant des caches `{ticker}_{interval}.csv`
+            ou `{ticker}_{interval}/` (cache binaire).
+        interval (str): Intervalle des bougies.
+
+    Returns:
+        List[str]: Symboles triés.
+    """
+    suffix = f"_{interval}"
+    tickers = set()
+    for path in Path(directory).iterdir():
+        name = path.name[:-len('.csv')] if path.suffix == '.csv' else path.name
+        if name.endswith(suffix) and (path.suffix == '.csv' or path.is_dir()):
+            tickers.add(name[:-len(suffix)])
+    return sorted(tickers)
+
+
+def estimate_asset_mb(rows: int, population: int = Config.GA_POPULATION) -> float:
+    """
+    Estime la mémoire (Mo) nécessaire pour optimiser un actif, hors processus lui-même.
+
+    Compte les données (DataFrame et tableaux résidents), les banques d'indicateurs
+    (données complètes et tranches, au plus Config.INDICATOR_BANK_CACHE_SIZE) et les
+    matrices génomes x barres du moteur vectorisé.
+
+    Args:
+        rows (int): Nombre de barres de l'actif.
+        population (int): Taille de population de l'AG.
+
+    Returns:
+        float: Estimation en mégaoctets.
+    """
+    data = 2 * 6 * rows * 8
+    banks = min(Config.INDICATOR_BANK_CACHE_SIZE, 2) * _BANK_SERIES * rows * 8
+    genomes = min(population, 256) * _GENOME_SERIES * rows * 8
+    return (data + banks + genomes) / 2**20
+
+
+def plan_workers(asset_mb: List[float], workers: int = None, memory_mb: float = None) -> int:
+    """
+    Nombre de processus respectant le budget mémoire.
+
+    Chaque processus coûte Config.UNIVERSE_WORKER_BASE_MB plus la mémoire de l'actif
+    le plus gros de l'univers (il peut lui échoir).
+
+    Args:
+        asset_mb (List[float]): Estimation mémoire de chaque actif.
+        workers (int, optional): Processus souhaités (0 = tous les cœurs). Par défaut
+            Config.UNIVERSE_WORKERS.
+        memory_mb (float, optional): Budget mémoire total. Par défaut Config.UNIVERSE_MEMORY_MB.
+
+    Returns:
+        int: Nombre de processus (au moins 1).
+    """
+    workers = Config.UNIVERSE_WORKERS if workers is None else workers
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    memory_mb = Config.UNIVERSE_MEMORY_MB if memory_mb is None else memory_mb
+    per_worker = Config.UNIVERSE_WORKER_BASE_MB + max(asset_mb, default=0.0)
+    return max(1, min(workers, len(asset_mb) or 1, int(memory_mb // per_worker)))
+
+
+def _optimize_simple(asset: AssetConfig, data: pd.DataFrame) -> Dict:
+    """Optimisation sur la part d'entraînement puis test Out-Of-Sample sur le reste."""
+    from src.ga_core import GAEcosystem
+    from src.backtest_runner import run_simple_backtest
+    from src.strategy_genes import decode_chromosome
+
+    split_idx = int(len(data) * asset.train_ratio)
+    train_data, test_data = data.iloc[:split_idx], data.iloc[split_idx:]
+    ga = GAEcosystem(train_data, engine=asset.engine, workers=1)
+    pop, _ = ga.run_evolution(population_size=asset.population, generations=asset.generations,
+                              verbose=False)
+    best_ind = max(pop, key=lambda ind: ind.fitness.values[0])
+    best_params = decode_chromosome(best_ind)
+    result = run_simple_backtest(best_params, test_data, verbose=False)
+    return {
+        'is_profit_pct': best_ind.fitness.values[0],
+        'is_drawdown': best_ind.fitness.values[1],
+        'profit_pct': result['profit_pct'],
+        'max_drawdown': result['max_drawdown'],
+        'trades': result['total_trades'],
+        'win_rate': result['win_rate'],
+        'sharpe_ratio': result.get('sharpe_ratio', 0),
+        'evals_per_sec': ga.evals_per_sec,
+        **best_params,
+    }
+
+
+def _optimize_wfa(asset: AssetConfig, dm: DataManager) -> Dict:
+    """Analyse Walk-Forward de l'actif, résumée en une ligne."""
+    from src.walk_forward import WalkForwardAnalyzer
+
+    # Processus de travail démon de l'univers : ni pool de fenêtres ni pool de l'AG
+    results = WalkForwardAnalyzer(dm).run_analysis(
+        population_size=asset.population, generations=asset.generations, workers=1,
+        ga_workers=1, seed=asset.seed)
+    if not results:
+        raise ValueError("No WFA window could be evaluated")
+    profits = [r['profit_pct'] for r in results]
+    return {
+        'windows': len(results),
+        'profit_pct': float(np.mean(profits)),
+        'cumulative_profit_pct': float(np.sum(profits)),
+        'winning_windows_pct': 100.0 * sum(p > 0 for p in profits) / len(profits),
+        'max_drawdown': float(np.max([r['drawdown'] for r in results])),
+        'trades': int(sum(r['trades'] for r in results)),
+        'is_best': float(np.mean([r['is_best'] for r in results])),
+    }
+
+
+def run_asset(task) -> Dict:
+    """
+    Optimise un actif (fonction de niveau module pour le pickling).
+
+    Les données sont chargées ici, dans le processus de travail, puis libérées
+    avec les caches construits pour cet actif.
+
+    Args:
+        task (tuple): (AssetConfig, mode 'simple' ou 'wfa', verbose).
+
+    Returns:
+        Dict: Ligne du tableau consolidé (status 'ok' ou 'failed').
+    """
+    asset, mode, verbose = task
+    row = {'ticker': asset.ticker, 'mode': mode, 'status': 'failed', 'bars': 0,
+           'commission': asset.commission, 'engine': asset.engine}
+    start = time.perf_counter()
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    dm = DataManager(asset.ticker, asset.interval, data_dir=asset.data_dir)
+    try:
+        with asset.activate(), output:
+            if asset.seed is not None:
+                random.seed(asset.seed)
+                np.random.seed(asset.seed % 2**32)
+            data = dm.get_full_data()
+            if data.empty or len(data) < 200:
+                raise ValueError(f"Not enough data ({len(data)} bars)")
+            row['bars'] = len(data)
+            row['start'] = str(data.index[0].date())
+            row['end'] = str(data.index[-1].date())
+            row.update(_optimize_simple(asset, data) if mode == 'simple' else _optimize_wfa(asset, dm))
+            row['status'] = 'ok'
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+        if verbose:
+            traceback.print_exc()
+    finally:
+        dm.invalidate()
+        release_caches()
+
+    row['elapsed'] = time.perf_counter() - start
+    row['peak_rss_mb'] = peak_rss_mb()
+    return row
+
+
+class UniverseRunner:
+    """
+    Optimisation de la stratégie sur un univers d'actifs.
+
+    Les actifs sont répartis sur un pool de processus dimensionné selon le budget
+    mémoire ; les plus gros actifs sont lancés en premier pour équilibrer la charge.
+    """
+
+    def __init__(self, assets: List[AssetConfig], mode: str = 'simple', workers: int = None,
+                 memory_mb: float = None, start_method: str = None):
+        """
+        Args:
+            assets (List[AssetConfig]): Configuration de chaque actif.
+            mode (str): 'simple' (entraînement / test) ou 'wfa' (Walk-Forward).
+            workers (int, optional): Processus souhaités. Par défaut Config.UNIVERSE_WORKERS.
+            memory_mb (float, optional): Budget mémoire. Par défaut Config.UNIVERSE_MEMORY_MB.
+            start_method (str, optional): Méthode de démarrage des processus.
+                Par défaut Config.GA_START_METHOD.
+        """
+        if mode not in ('simple', 'wfa'):
+            raise ValueError(f"Unknown universe mode: {mode}")
+        self.assets = list(assets)
+        self.mode = mode
+        self.start_method = start_method or Config.GA_START_METHOD
+
+        # Estimation mémoire à partir de la taille des caches, sans charger les données
+        self.rows = {}
+        for asset in self.assets:
+            dm = DataManager(asset.ticker, asset.interval, data_dir=asset.data_dir)
+            self.rows[asset.ticker] = dm.cached_rows() or 0
+        self.asset_mb = {a.ticker: estimate_asset_mb(self.rows[a.ticker], a.population) for a in self.assets}
+        self.workers = plan_workers(list(self.asset_mb.values()), workers, memory_mb)
+
+    @classmethod
+    def from_tickers(cls, tickers: List[str], mode: str = 'simple', seed: int = None,
+                     **asset_options) -> 'UniverseRunner':
+        """
+        Construit un univers à partir d'une liste de symboles.
+
+        Args:
+            tickers (List[str]): Symboles des actifs.
+            mode (str): 'simple' ou 'wfa'.
+            seed (int, optional): Graine de base (l'actif i utilise seed + i).
+            **asset_options: Options communes des AssetConfig (interval, data_dir, engine...).
+
+        Returns:
+            UniverseRunner: L'univers prêt à être exécuté.
+        """
+        assets = [AssetConfig(ticker, seed=None if seed is None else seed + i, **asset_options)
+                  for i, ticker in enumerate(dict.fromkeys(tickers))]
+        return cls(assets, mode=mode)
+
+    def run(self, output: str = None, verbose: bool = True) -> pd.DataFrame:
+        """
+        Optimise tous les actifs et écrit le tableau consolidé.
+
+        Args:
+            output (str, optional): Fichier CSV des résultats. Par défaut
+                Config.UNIVERSE_RESULTS_FILE (None ou '' pour ne rien écrire).
+            verbose (bool): Affiche la progression (une ligne par actif).
+
+        Returns:
+            pd.DataFrame: Une ligne par actif, dans l'ordre de l'univers.
+        """
+        output = Config.UNIVERSE_RESULTS_FILE if output is None else output
+        # Plus gros actifs d'abord : évite qu'un gros actif tardif allonge la fin du calcul
+        order = sorted(self.assets, key=lambda a: -self.rows[a.ticker])
+        tasks = [(asset, self.mode, False) for asset in order]
+        if verbose:
+            print(f"Univers : {len(self.assets)} actifs, mode {self.mode}, {self.workers} processus "
+                  f"(budget {Config.UNIVERSE_MEMORY_MB} Mo, "
+                  f"~{max(self.asset_mb.values(), default=0):.0f} Mo par actif au plus)")
+
+        start = time.perf_counter()
+        rows = {}
+        pool = None
+        if self.workers > 1:
+            pool = mp.get_context(self.start_method).Pool(
+                processes=self.workers, maxtasksperchild=Config.UNIVERSE_TASKS_PER_WORKER)
+            outcomes = pool.imap_unordered(run_asset, tasks, chunksize=1)
+        else:
+            outcomes = map(run_asset, tasks)
+        try:
+            for done, row in enumerate(outcomes, 1):
+                rows[row['ticker']] = row
+                if verbose:
+                    detail = (f"profit {row['profit_pct']:.2f}% | trades {row['trades']}"
+                              if row['status'] == 'ok' else row.get('error'))
+                    print(f"[{done}/{len(tasks)}] {row['ticker']:<10} {row['status']:<6} "
+                          f"{detail} ({row['elapsed']:.1f}s)")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        table = pd.DataFrame([rows[a.ticker] for a in self.assets])
+        if verbose:
+            ok = int((table['status'] == 'ok').sum()) if len(table) else 0
+            print(f"{ok}/{len(table)} actifs optimisés en {time.perf_counter() - start:.1f}s")
+        if output:
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            table.to_csv(output, index=False)
+            if verbose:
+                print(f"Résultats consolidés : {output}")
+        return table
@@ -0,0 +1,534 @@
+"""
+Module Vector Backtest.
+Ce module fournit un moteur de backtest alternatif travaillant directement sur des
+tableaux NumPy. Il reproduit la sémantique de GeneticStrategy exécutée par Backtrader
+(ordres Bracket, sorties techniques, commissions du broker) sans instancier de Cerebro,
+ce qui rend chaque évaluation de fitness nettement plus rapide.
+"""
+import bisect
+import numpy as np
+import pandas as pd
+import datetime
+from typing import Dict, Tuple
+from src.config import Config
+from src.indicator_bank import compute_sma, compute_rsi, get_indicator_bank
+
+# Types d'ordres gérés par le broker simulé
+MARKET, STOP, LIMIT = 0, 1, 2
+
+# Colonnes de la matrice de paramètres (ordre des gènes du chromosome)
+COL_SMA_F, COL_SMA_S, COL_RSI_P, COL_RSI_UP, COL_RSI_LO, COL_SL, COL_TP = range(7)
+
+# Nombre de génomes traités par bloc dans les matrices génomes x barres
+BATCH_CHUNK_SIZE = 256
+
+# Écart minimal (en barres) entre deux événements pour sauter la boucle barre par barre
+FAST_FORWARD_MIN_BARS = 16
+
+
+class _Order:
+    """Ordre minimal du broker simulé (comparé par identité, comme dans Backtrader)."""
+    __slots__ = ('otype', 'size', 'price', 'group', 'active', 'hit')
+
+    def __init__(self, otype, size, price, group=None, active=True):
+        self.otype = otype
+        self.size = size
+        self.price = price
+        self.group = group
+        self.active = active
+        self.hit = None  # Première barre de déclenchement (ordres Stop/Limit)
+
+
+def _first_hit(prices: np.ndarray, open_: np.ndarray, start: int,
+               level: float, below: bool) -> int:
+    """
+    Cherche la première barre à partir de `start` où un ordre Stop (below=True) ou
+    Limit (below=False) de niveau `level` se déclenche ; renvoie len(prices) sinon.
+    La recherche se fait par fenêtres croissantes pour rester proportionnelle
+    à la distance réelle du déclenchement.
+    """
+    end = len(prices)
+    width = FAST_FORWARD_MIN_BARS
+    lo_bar = start
+    while lo_bar < end:
+        hi_bar = min(end, lo_bar + width)
+        if below:
+            hit = (prices[lo_bar:hi_bar] <= level) | (open_[lo_bar:hi_bar] <= level)
+        else:
+            hit = (prices[lo_bar:hi_bar] >= level) | (open_[lo_bar:hi_bar] >= level)
+        first = int(hit.argmax())
+        if hit[first]:
+            return lo_bar + first
+        lo_bar = hi_bar
+        width *= 4
+    return end
+
+
+def strategy_signals(params: Dict[str, float], sma_fast: np.ndarray, sma_slow: np.ndarray,
+                     rsi: np.ndarray, start_index: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Traduit les règles de GeneticStrategy.next en signaux booléens barre par barre.
+
+    Args:
+        params (Dict[str, float]): Paramètres décodés de la stratégie.
+        sma_fast, sma_slow, rsi (np.ndarray): Indicateurs alignés sur les prix.
+        start_index (int): Première barre où la stratégie peut passer des ordres.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (signal d'entrée, signal de sortie technique).
+    """
+    n = len(rsi)
+    entry = np.zeros(n, dtype=bool)
+    exit_ = np.zeros(n, dtype=bool)
+    if not params['SMA_F'] < params['SMA_S']:
+        return entry, exit_
+
+    # La stratégie n'est appelée (next) qu'une fois tous les indicateurs disponibles
+    first_bar = max(int(params['SMA_F']) - 1, int(params['SMA_S']) - 1, int(params['RSI_P']),
+                    start_index, 0)
+    with np.errstate(invalid='ignore'):
+        entry[first_bar:] = ((sma_fast[first_bar:] > sma_slow[first_bar:]) &
+                             (rsi[first_bar:] < params['RSI_LO']))
+        exit_[first_bar:] = ((rsi[first_bar:] > params['RSI_UP']) |
+                             (sma_fast[first_bar:] < sma_slow[first_bar:]))
+    return entry, exit_
+
+
+def simulate_signals(entry: np.ndarray, exit_: np.ndarray, sl: float, tp: float,
+                     open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     commission: float,
+                     initial_cash: float = Config.INITIAL_CASH) -> Dict:
+    """
+    Simule GeneticStrategy à partir de ses signaux avec les règles du BackBroker.
+
+    Reproduit notamment :
+    - l'exécution des ordres au marché à l'ouverture de la barre suivante ;
+    - le contrôle de trésorerie à la soumission (ordres refusés pour marge) ;
+    - l'activation des ordres Stop/Limit du Bracket une barre après l'entrée,
+      le Stop étant prioritaire sur le Limit dans une même barre ;
+    - la sortie technique par `close()` qui laisse le Bracket actif ;
+    - une taille fixe d'une unité par ordre (sizer par défaut de Backtrader).
+
+    Les périodes sans position ni ordre en attente sont sautées directement
+    jusqu'au prochain signal d'entrée.
+
+    Args:
+        entry, exit_ (np.ndarray): Signaux booléens issus de `strategy_signals`.
+        sl, tp (float): Stop Loss et Take Profit en pourcentage.
+        open_, high, low, close (np.ndarray): Prix OHLC alignés.
+        commission (float): Taux de commission (pourcentage absolu).
+        initial_cash (float): Capital de départ.
+
+    Returns:
+        Dict: final_value, max_drawdown, equity, total_trades, won_trades, lost_trades,
+        trades (liste de tuples (barre d'ouverture, barre de clôture, PnL net de commission)),
+        open_trade_bar (barre d'ouverture de la position encore ouverte, sinon None).
+    """
+    arrays = (open_, high, low, close)
+    return _simulate(entry, exit_, sl, tp, arrays, [a.tolist() for a in arrays],
+                     commission, initial_cash)
+
+
+def _simulate(entry: np.ndarray, exit_: np.ndarray, sl: float, tp: float,
+              arrays: tuple, lists: list, commission: float, initial_cash: float) -> Dict:
+    """Boucle du broker simulé (prix fournis en tableaux NumPy et en listes Python)."""
+    op_a, hi_a, lo_a, cl_a = arrays
+    op, hi, lo, cl = lists
+    n = len(cl)
+    entries, exits = entry.tolist(), exit_.tolist()
+    entry_bars = np.flatnonzero(entry).tolist()
+    exit_bars = np.flatnonzero(exit_).tolist()
+
+    cash = float(initial_cash)
+    pos_size, pos_price = 0, 0.0
+    trade_pnl, trade_comm = 0.0, 0.0
+    total_trades = won_trades = lost_trades = 0
+    trades, trade_open_bar = [], 0
+
+    submitted, pending, to_activate = [], [], []
+    groups = {}
+    next_group = 0
+
+    equity = [0.0] * n
+    max_value = cash
+    max_dd = 0.0
+
+    i = 0
+    while i < n:
+        # 0. Saut direct jusqu'au prochain événement possible : signal de la stratégie
+        #    ou déclenchement d'un ordre Stop/Limit déjà actif
+        if not submitted and not to_activate and all(o.active and o.otype != MARKET for o in pending):
+            bars = exit_bars if pos_size else entry_bars
+            k = bisect.bisect_left(bars, i)
+            j = bars[k] if k < len(bars) else n
+            if j - i >= FAST_FORWARD_MIN_BARS:
+                for order in pending:
+                    # Les prix étant figés, la barre de déclenchement n'est cherchée qu'une fois
+                    if order.hit is None:
+                        if order.otype == STOP:
+                            order.hit = _first_hit(lo_a, op_a, i, order.price, below=True)
+                        else:
+                            order.hit = _first_hit(hi_a, op_a, i, order.price, below=False)
+                    if order.hit < j:
+                        j = order.hit
+            if j - i >= FAST_FORWARD_MIN_BARS:
+                if pos_size > 0:
+                    c = cl_a[i:j]
+                    unrealized = pos_size * (c - pos_price)
+                    values = cash + ((pos_size * c - unrealized) + unrealized)
+                elif pos_size < 0:
+                    values = cash + pos_size * cl_a[i:j]
+                else:
+                    values = np.full(j - i, cash)
+                equity[i:j] = values.tolist()
+                peaks = np.maximum.accumulate(np.maximum(values, max_value))
+                max_dd = max(max_dd, float((100.0 * (peaks - values) / peaks).max()))
+                max_value = float(peaks[-1])
+                i = j
+                if i >= n:
+                    break
+
+        # 1. Activation des ordres enfants dont le parent a été exécuté
+        for order in to_activate:
+            order.active = True
+        to_activate = []
+
+        # 2. Contrôle de trésorerie des ordres soumis à la barre précédente
+        if submitted:
+            check_cash = cash
+            for order in submitted:
+                group = order.group
+                if group is not None and group not in groups:
+                    continue  # Enfant d'un parent refusé : rejeté
+                price = order.price
+                check_cash -= order.size * price + abs(order.size) * price * commission
+                if check_cash >= 0.0:
+                    pending.append(order)
+                elif group is not None:
+                    del groups[group]  # Parent refusé : le Bracket est annulé
+            submitted = []
+
+        # 3. Tentative d'exécution des ordres en attente (ordre FIFO du broker)
+        if pending:
+            queue, pending = pending, []
+            k = 0
+            while k < len(queue):
+                order = queue[k]
+                k += 1
+                if not order.active:
+                    pending.append(order)
+                    continue
+
+                otype, size = order.otype, order.size
+                price = None
+                if otype == MARKET:
+                    price = op[i]
+                elif otype == STOP:
+                    if op[i] <= order.price:
+                        price = op[i]
+                    elif lo[i] <= order.price:
+                        price = order.price
+                else:
+                    if order.price <= op[i]:
+                        price = op[i]
+                    elif order.price <= hi[i]:
+                        price = order.price
+
+                if price is None:
+                    pending.append(order)
+                    continue
+
+                # Décomposition en partie clôturée / partie ouverte (Position.update)
+                old_size = pos_size
+                new_size = old_size + size
+                if new_size == 0:
+                    opened, closed = 0, size
+                elif old_size == 0:
+                    opened, closed = size, 0
+                elif (old_size > 0) == (size > 0):
+                    opened, closed = size, 0
+                elif (new_size > 0) == (old_size > 0):
+                    opened, closed = 0, size
+                else:
+                    opened, closed = new_size, -old_size
+
+                if closed:
+                    pnl = -closed * (price - pos_price)
+                    closed_value = -closed * pos_price
+                    comm = abs(closed) * price * commission
+                    cash += closed_value + pnl
+                    cash -= comm
+                    trade_pnl += pnl
+                    trade_comm += comm
+                    pos_size += closed
+                    if pos_size == 0:
+                        total_trades += 1
+                        trades.append((trade_open_bar, i, trade_pnl - trade_comm))
+                        if trade_pnl - trade_comm >= 0.0:
+                            won_trades += 1
+                        else:
+                            lost_trades += 1
+                        trade_pnl, trade_comm = 0.0, 0.0
+                        pos_price = 0.0
+
+                margin = False
+                if opened:
+                    comm = abs(opened) * price * commission
+                    new_cash = cash - opened * price - comm
+                    if new_cash < 0.0:
+                        margin = True
+                    else:
+                        cash = new_cash
+                        if pos_size == 0:
+                            pos_price = price
+                            trade_open_bar = i
+                        else:
+                            pos_price = (pos_price * pos_size + opened * price) / (pos_size + opened)
+                        pos_size += opened
+                        trade_comm += comm
+
+                group = order.group
+                if margin:
+                    # Ordre refusé pour marge : le Bracket est annulé
+                    if group is not None and group in groups:
+                        children = groups.pop(group)
+                        for child in children:
+                            if child in queue[k:]:
+                                queue.remove(child)
+                            if child in pending:
+                                pending.remove(child)
+                elif group is not None and group in groups:
+                    children = groups[group]
+                    if order in children:
+                        # Un enfant exécuté annule l'autre (OCO)
+                        del groups[group]
+                        for child in children:
+                            if child is order:
+                                continue
+                            if child in queue[k:]:
+                                queue.remove(child)
+                            if child in pending:
+                                pending.remove(child)
+                    else:
+                        # Parent exécuté : activation des enfants à la barre suivante
+                        to_activate.extend(children)
+
+        # 4. Valorisation du portefeuille et suivi du drawdown
+        if pos_size:
+            unrealized = pos_size * (cl[i] - pos_price)
+            if pos_size > 0:
+                value = cash + ((pos_size * cl[i] - unrealized) + unrealized)
+            else:
+                value = cash + pos_size * cl[i]
+        else:
+            value = cash
+        equity[i] = value
+        if value > max_value:
+            max_value = value
+        drawdown = 100.0 * (max_value - value) / max_value
+        if drawdown > max_dd:
+            max_dd = drawdown
+
+        # 5. Logique de décision de la stratégie (GeneticStrategy.next)
+        if pos_size == 0:
+            if entries[i]:
+                price = cl[i]
+                group = next_group
+                next_group += 1
+                stop = _Order(STOP, -1, price * (1.0 - sl), group, active=False)
+                limit = _Order(LIMIT, -1, price * (1.0 + tp), group, active=False)
+                submitted.extend((_Order(MARKET, 1, price, group), stop, limit))
+                groups[group] = [stop, limit]
+        elif exits[i]:
+            submitted.append(_Order(MARKET, -pos_size, cl[i]))
+        i += 1
+
+    return {
+        'final_value': equity[-1] if n else cash,
+        'max_drawdown': max_dd,
+        'equity': np.asarray(equity),
+        'total_trades': total_trades,
+        'won_trades': won_trades,
+        'lost_trades': lost_trades,
+        'trades': trades,
+        'open_trade_bar': trade_open_bar if pos_size else None,
+    }
+
+
+def simulate(params: Dict[str, float],
+             open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+             commission: float,
+             initial_cash: float = Config.INITIAL_CASH,
+             start_index: int = 0,
+             sma_fast: np.ndarray = None,
+             sma_slow: np.ndarray = None,
+             rsi: np.ndarray = None) -> Dict:
+    """
+    Simule GeneticStrategy sur des tableaux OHLC (voir `simulate_signals`).
+
+    Args:
+        params (Dict[str, float]): Paramètres décodés de la stratégie.
+        open_, high, low, close (np.ndarray): Prix OHLC alignés.
+        commission (float): Taux de commission (pourcentage absolu).
+        initial_cash (float): Capital de départ.
+        start_index (int): Première barre où la stratégie peut passer des ordres
+            (équivalent de `trading_start_date`).
+        sma_fast, sma_slow, rsi (np.ndarray, optional): Indicateurs précalculés.
+
+    Returns:
+        Dict: final_value, max_drawdown, equity, total_trades, won_trades, lost_trades,
+        trades (liste de tuples (barre d'ouverture, barre de clôture, PnL net de commission)),
+        open_trade_bar (barre d'ouverture de la position encore ouverte, sinon None).
+    """
+    if sma_fast is None:
+        sma_fast = compute_sma(close, int(params['SMA_F']))
+    if sma_slow is None:
+        sma_slow = compute_sma(close, int(params['SMA_S']))
+    if rsi is None:
+        rsi = compute_rsi(close, int(params['RSI_P']))
+
+    entry, exit_ = strategy_signals(params, sma_fast, sma_slow, rsi, start_index)
+    return simulate_signals(entry, exit_, params['SL'], params['TP'],
+                            open_, high, low, close, commission, initial_cash)
+
+
+def _start_index(data_feed: pd.DataFrame, trading_start_date: datetime.date = None) -> int:
+    """Convertit une date de début de trading en indice de barre."""
+    if not trading_start_date:
+        return 0
+    return int(data_feed.index.searchsorted(pd.Timestamp(trading_start_date), side='left'))
+
+
+def run_vector_backtest(params: Dict[str, float], data_feed: pd.DataFrame,
+                        initial_cash: float = Config.INITIAL_CASH,
+                        trading_start_date: datetime.date = None) -> Dict:
+    """
+    Exécute la simulation vectorisée sur un DataFrame OHLCV.
+
+    Args:
+        params (Dict[str, float]): Paramètres de la stratégie.
+        data_feed (pd.DataFrame): Données historiques du marché.
+        initial_cash (float): Capital de départ.
+        trading_start_date (datetime.date, optional): Date de début effectif du trading.
+
+    Returns:
+        Dict: Résultat brut de `simulate`.
+    """
+    # Les indicateurs sont lus dans la banque partagée du jeu de données
+    bank = get_indicator_bank(data_feed)
+    return simulate(
+        params,
+        data_feed['Open'].to_numpy(dtype=np.float64),
+        data_feed['High'].to_numpy(dtype=np.float64),
+        data_feed['Low'].to_numpy(dtype=np.float64),
+        data_feed['Close'].to_numpy(dtype=np.float64),
+        commission=Config.get_commission(),
+        initial_cash=initial_cash,
+        start_index=_start_index(data_feed, trading_start_date),
+        sma_fast=bank.sma(params['SMA_F']),
+        sma_slow=bank.sma(params['SMA_S']),
+        rsi=bank.rsi(params['RSI_P']),
+    )
+
+
+def _fitness(result: Dict, initial_cash: float = Config.INITIAL_CASH) -> Tuple[float, float]:
+    """Convertit un résultat de simulation en couple (profit, drawdown) façon run_backtest."""
+    if result['total_trades'] == 0:
+        return (-100.0, 100.0)
+
+    profit_pct = ((result['final_value'] - initial_cash) / initial_cash) * 100.0
+    max_drawdown_pct = result['max_drawdown']
+    if pd.isna(profit_pct) or pd.isna(max_drawdown_pct):
+        return (-100.0, 100.0)
+    return (profit_pct, max_drawdown_pct)
+
+
+def vector_fitness(params: Dict[str, float], data_feed: pd.DataFrame) -> Tuple[float, float]:
+    """
+    Équivalent vectorisé du couple (profit, drawdown) renvoyé par run_backtest.
+
+    Args:
+        params (Dict[str, float]): Paramètres de la stratégie.
+        data_feed (pd.DataFrame): Données historiques du marché.
+
+    Returns:
+        Tuple[float, float]: (profit_pourcentage, drawdown_maximal), ou (-100.0, 100.0)
+        si aucun trade n'a été clôturé.
+    """
+    return _fitness(run_vector_backtest(params, data_feed))
+
+
+def batch_fitness(param_matrix: np.ndarray, data_feed: pd.DataFrame,
+                  chunk_size: int = BATCH_CHUNK_SIZE) -> np.ndarray:
+    """
+    Évalue toute une population de paramètres sur les mêmes tableaux OHLC.
+
+    Les indicateurs ne sont calculés qu'une fois par période distincte, puis les
+    signaux d'entrée/sortie sont construits en un seul passage sur des matrices
+    génomes x barres (par blocs de `chunk_size` lignes pour borner la mémoire).
+    Seule la machine à états des ordres reste séquentielle, génome par génome.
+
+    Args:
+        param_matrix (np.ndarray): Matrice (N, 7) dans l'ordre des gènes
+            [SMA_F, SMA_S, RSI_P, RSI_UP, RSI_LO, SL, TP].
+        data_feed (pd.DataFrame): Données historiques partagées par tous les génomes.
+        chunk_size (int): Nombre de génomes par bloc matriciel.
+
+    Returns:
+        np.ndarray: Matrice (N, 2) des couples (profit_pct, max_drawdown_pct).
+    """
+    params = np.asarray(param_matrix, dtype=np.float64).reshape(-1, 7)
+    n_genomes = len(params)
+    fitness = np.empty((n_genomes, 2))
+    if data_feed.empty or len(data_feed) < 100:
+        fitness[:] = (-100.0, 100.0)
+        return fitness
+
+    arrays = tuple(data_feed[col].to_numpy(dtype=np.float64) for col in ('Open', 'High', 'Low', 'Close'))
+    lists = [a.tolist() for a in arrays]
+    close = arrays[3]
+    commission = Config.get_commission()
+    n = len(close)
+
+    sma_f = params[:, COL_SMA_F].astype(np.int64)
+    sma_s = params[:, COL_SMA_S].astype(np.int64)
+    rsi_p = params[:, COL_RSI_P].astype(np.int64)
+
+    # Table des indicateurs : une ligne par période distincte, lue dans la banque
+    bank = get_indicator_bank(data_feed)
+    sma_periods, sma_inv = np.unique(np.concatenate((sma_f, sma_s)), return_inverse=True)
+    sma_table = np.vstack([bank.sma(p) for p in sma_periods])
+    idx_f, idx_s = sma_inv[:n_genomes], sma_inv[n_genomes:]
+
+    rsi_periods, idx_r = np.unique(rsi_p, return_inverse=True)
+    rsi_table = np.full((len(rsi_periods), n), np.nan)
+    rsi_failed = np.zeros(len(rsi_periods), dtype=bool)
+    for k, p in enumerate(rsi_periods):
+        try:
+            rsi_table[k] = bank.rsi(p)
+        except ZeroDivisionError:
+            rsi_failed[k] = True  # Backtrader lève l'exception : backtest échoué
+
+    valid = params[:, COL_SMA_F] < params[:, COL_SMA_S]
+    first_bar = np.maximum(np.maximum(sma_f - 1, sma_s - 1), np.maximum(rsi_p, 0))
+    bars = np.arange(n)
+
+    for lo_row in range(0, n_genomes, chunk_size):
+        rows = slice(lo_row, min(lo_row + chunk_size, n_genomes))
+        fast = sma_table[idx_f[rows]]
+        slow = sma_table[idx_s[rows]]
+        rsi = rsi_table[idx_r[rows]]
+        active = (bars[None, :] >= first_bar[rows, None]) & valid[rows, None]
+        with np.errstate(invalid='ignore'):
+            entry = active & (fast > slow) & (rsi < params[rows, COL_RSI_LO, None])
+            exit_ = active & ((rsi > params[rows, COL_RSI_UP, None]) | (fast < slow))
+
+        for r, g in enumerate(range(rows.start, rows.stop)):
+            if rsi_failed[idx_r[g]]:
+                fitness[g] = (float('-inf'), float('+inf'))
+                continue
+            result = _simulate(entry[r], exit_[r], float(params[g, COL_SL]), float(params[g, COL_TP]),
+                               arrays, lists, commission, Config.INITIAL_CASH)
+            fitness[g] = _fitness(result)
+
+    return fitness
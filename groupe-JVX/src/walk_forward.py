@@ -5,12 +5,160 @@ Il simule le passage du temps en entraînant l'IA sur une période passée (In-S
 puis en la testant sur une période immédiatement suivante (Out-Of-Sample),
 avant de décaler la fenêtre temporelle et de recommencer.
 """
+import multiprocessing as mp
+import os
+import random
+import time
+from pathlib import Path
+import numpy as np
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 from src.ga_core import GAEcosystem
 from src.backtest_runner import run_simple_backtest
 from src.strategy_genes import decode_chromosome
 from src.config import Config
+from src.checkpoint import load_checkpoint, remove_checkpoint, save_checkpoint
+from src.indicator_bank import data_fingerprint
+from src.memory_guard import MemoryWatchdog
+from src.telemetry import get_telemetry, peak_rss_mb
+
+def _run_window(task):
+    """
+    Optimise puis valide une fenêtre WFA (fonction de niveau module pour le pickling).
+
+    Args:
+        task (tuple): (fenêtre planifiée, taille de population, générations, graine,
+            processus d'évaluation de l'AG, part d'immigrants, actif courant
+            (AssetConfig ou None), point de reprise de l'AG ou None,
+            population de la fenêtre précédente ou None).
+
+    Returns:
+        tuple: (meilleurs paramètres, résultats du backtest Out-Of-Sample,
+            convergence In-Sample, population finale, mesures de télémétrie de la fenêtre).
+            En démarrage à chaud avec Config.WFA_COLD_BASELINE, la convergence compare
+            l'AG à un démarrage à froid de la même fenêtre (voir _compare_cold_start).
+    """
+    window, population_size, generations, seed, ga_workers, immigrant_rate, asset, checkpoint, previous = task
+    if asset is not None and Config.active_asset() is not asset:
+        # Processus du pool : l'actif courant du parent n'est pas hérité avec 'spawn'
+        with asset.activate():
+            return _run_window(task)
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    telemetry = get_telemetry()
+    before = telemetry.snapshot()
+    start = time.perf_counter()
+
+    # Historique complet (Config.TRADE_LEDGER_ENABLED) : génomes de l'AG évalués depuis leurs journaux
+    # de trades, partagés par les fenêtres qui se chevauchent
+    history = window.get('history')
+
+    # 3. Optimisation (Phase In-Sample) : mini-AG sur la période d'entraînement
+    ga = GAEcosystem(window['train_data'], workers=ga_workers, history=history)
+    initial_population = None
+    if previous:
+        # Démarrage à chaud : population précédente réévaluée + immigrants aléatoires
+        initial_population = ga.seed_population(previous, population_size, immigrant_rate)
+    # Un point de reprise laissé par une exécution interrompue est repris tel quel
+    pop, log = ga.run_evolution(population_size=population_size, generations=generations, verbose=False,
+                                initial_population=initial_population, checkpoint=checkpoint,
+                                resume=checkpoint is not None)
+    convergence = _convergence(log, generations)
+
+    # Sélection du meilleur individu (basé sur le fitness Profit)
+    best_ind = max(pop, key=lambda ind: ind.fitness.values[0])
+    best_params = decode_chromosome(best_ind)
+    
+    # 4. Validation (Phase Out-Of-Sample)
+    # On lance le backtest sur les données de test (incluant le warm-up)
+    # MAIS on spécifie 'trading_start_date' pour ne commencer à trader qu'au vrai début du test.
+    result = run_simple_backtest(
+        best_params, 
+        window['test_data'], 
+        verbose=False,
+        trading_start_date=window['test_start'].date()  # Paramètre crucial pour ignorer les trades pendant le warm-up
+    )
+    metrics = telemetry.delta(before)
+    metrics['elapsed'] = time.perf_counter() - start
+    metrics['run'] = ga.run_id
+    metrics['evals_per_sec'] = ga.evals_per_sec
+    if previous and Config.WFA_COLD_BASELINE:
+        convergence.update(_compare_cold_start(window, population_size, generations, seed,
+                                               ga_workers, convergence))
+    return best_params, result, convergence, pop, metrics
+
+
+def _convergence(log, generations):
+    """
+    Résume la convergence In-Sample d'un AG à partir de son logbook.
+
+    Args:
+        log: Logbook de run_evolution (colonne 'max' = meilleur profit de la génération).
+        generations (int): Nombre de générations prévues.
+
+    Returns:
+        Dict: Profit In-Sample initial et meilleur, génération où ce meilleur est
+            atteint et générations restantes après l'avoir atteint.
+    """
+    best_per_gen = log.select('max')
+    best = max(best_per_gen)
+    gens_to_best = next(g for g, value in enumerate(best_per_gen) if value >= best)
+    return {
+        'is_start': best_per_gen[0],
+        'is_best': best,
+        'gens_to_best': gens_to_best,
+        'gens_after_best': generations - gens_to_best,
+    }
+
+
+def _compare_cold_start(window, population_size, generations, seed, ga_workers, warm):
+    """
+    Relance l'AG d'une fenêtre démarrée à chaud depuis une population aléatoire
+    (même graine, mêmes réglages) pour mesurer l'apport du démarrage à chaud.
+
+    Args:
+        window (Dict): Fenêtre planifiée.
+        population_size (int): Taille de la population.
+        generations (int): Nombre de générations.
+        seed (int): Graine de la fenêtre.
+        ga_workers (int): Processus d'évaluation de l'AG.
+        warm (Dict): Convergence de l'AG démarré à chaud (voir _convergence).
+
+    Returns:
+        Dict: Meilleur profit In-Sample et génération de ce meilleur à froid, écart de
+            meilleur profit (chaud - froid) et générations gagnées (froid - chaud).
+    """
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    ga = GAEcosystem(window['train_data'], workers=ga_workers, history=window.get('history'))
+    _, log = ga.run_evolution(population_size=population_size, generations=generations, verbose=False)
+    cold = _convergence(log, generations)
+    return {
+        'cold_is_best': cold['is_best'],
+        'cold_gens_to_best': cold['gens_to_best'],
+        'warm_is_gain': warm['is_best'] - cold['is_best'],
+        'warm_gens_saved': cold['gens_to_best'] - warm['gens_to_best'],
+    }
+
+
+def _chain_windows(tasks, previous=None):
+    """
+    Enchaîne les fenêtres en démarrage à chaud : chacune part de la population
+    finale de la précédente.
+
+    Args:
+        tasks (list): Tâches de _run_window, dans l'ordre des fenêtres.
+        previous (list, optional): Population finale de la fenêtre qui précède la
+            première tâche (reprise d'une analyse interrompue).
+
+    Yields:
+        tuple: Résultat de _run_window pour chaque fenêtre.
+    """
+    for task in tasks:
+        outcome = _run_window(task[:-1] + (previous,))
+        previous = outcome[3]
+        yield outcome
+
 
 class WalkForwardAnalyzer:
     """
@@ -35,40 +183,30 @@ class WalkForwardAnalyzer:
         """
         self.dm = data_manager
         
-    def run_analysis(self):
+    def plan_windows(self, full_data):
         """
-        Exécute la boucle principale de l'analyse Walk-Forward.
+        Planifie toutes les fenêtres glissantes avant toute optimisation.
 
-        Logique de la boucle :
-        - Définir une fenêtre d'entraînement (ex: 24 mois).
-        - Définir une fenêtre de test (ex: 6 mois) juste après.
-        - Optimiser l'IA sur l'entraînement.
-        - Tester sur la fenêtre de test (avec préchauffage des données).
-        - Avancer (glisser) les fenêtres d'un pas défini (ex: 3 mois).
+        Chaque fenêtre contient ses bornes temporelles, ses tranches de données
+        (entraînement, test avec warm-up) et, le cas échéant, la raison pour
+        laquelle elle est ignorée.
+
+        Args:
+            full_data (pd.DataFrame): Ensemble des données disponibles.
 
         Returns:
-            List[Dict]: Une liste de résultats par fenêtre (profit, trades, etc.).
+            List[Dict]: Les fenêtres, dans l'ordre chronologique.
         """
-        print("\n" + "="*70)
-        print("DÉMARRAGE DE L'ANALYSE WALK-FORWARD (AVEC WARM-UP)")
-        print("="*70)
-        
-        # Récupération de l'ensemble des données disponibles
-        full_data = self.dm.get_full_data()
-        if full_data.empty:
-            print("Erreur : Aucune données disponible pour le WFA.")
-            return []
-            
         start_date = full_data.index[0]
         end_date = full_data.index[-1]
         
         # Date de début de la première fenêtre d'entraînement
         current_train_start = start_date
         
-        wfa_results = []
+        windows = []
         window_count = 1
         
-        # Boucle Principale de Fenêtre Glissante
+        # Boucle de Fenêtre Glissante
         while True:
             # 1. Calcul des bornes temporelles
             train_end = current_train_start + relativedelta(months=Config.WFA_TRAIN_MONTHS)
@@ -79,10 +217,6 @@ class WalkForwardAnalyzer:
             if test_end > end_date:
                 break
                 
-            print(f"\n--- Fenêtre {window_count} ---")
-            print(f"Entraînement : {current_train_start.date()} -> {train_end.date()}")
-            print(f"Test         : {test_start.date()} -> {test_end.date()}")
-            
             # --- Gestion Critique du Warm-up (Préchauffage) ---
             # Pour tester la stratégie à partir de 'test_start', il nous faut des données AVANT cette date.
             # Sinon, une Moyenne Mobile 200 jours ne donnerait aucune valeur avant le 201ème jour du test.
@@ -96,8 +230,6 @@ class WalkForwardAnalyzer:
             warmup_start_index = max(0, test_data_index - warmup_buffer_days)
             warmup_start = full_data.index[warmup_start_index]
             
-            print(f"Warm-up      : {warmup_start.date()} -> {test_start.date()} ({warmup_buffer_days} bougies)")
-            
             # 2. Extraction des tranches de données
             train_data = self.dm.get_data_slice(
                 str(current_train_start.date()), 
@@ -111,63 +243,253 @@ class WalkForwardAnalyzer:
             )
             
             # Vérifications de sécurité (quantité de données suffisante ?)
+            skip_reason = None
             if len(train_data) < 50:
-                print("Fenêtre ignorée : Pas assez de données d'entraînement.")
-                current_train_start += relativedelta(months=Config.WFA_STEP_MONTHS)
-                window_count += 1
-                continue
-                
-            if len(test_data_with_warmup) < warmup_buffer_days + 10:
-                print("Fenêtre ignorée : Pas assez de données de test (warm-up inclus).")
-                current_train_start += relativedelta(months=Config.WFA_STEP_MONTHS)
-                window_count += 1
-                continue
-
-            # 3. Optimisation (Phase In-Sample)
-            print("  > Optimisation en cours sur données passées...")
-            # On lance un mini-AG sur la période d'entraînement
-            ga = GAEcosystem(train_data)
-            pop, log = ga.run_evolution(population_size=30, generations=5, verbose=False)
-            
-            # Sélection du meilleur individu (basé sur le fitness Profit)
-            best_ind = max(pop, key=lambda ind: ind.fitness.values[0])
-            best_params = decode_chromosome(best_ind)
-            
-            print(f"  > Meilleurs Params : SMA_F={best_params['SMA_F']}, SMA_S={best_params['SMA_S']}, RSI_LO={best_params['RSI_LO']}")
-            
-            # 4. Validation (Phase Out-Of-Sample)
-            print("  > Test sur données inconnues (avec warm-up)...")
-            
-            # On lance le backtest sur les données de test (incluant le warm-up)
-            # MAIS on spécifie 'trading_start_date' pour ne commencer à trader qu'au vrai début du test.
-            result = run_simple_backtest(
-                best_params, 
-                test_data_with_warmup, 
-                verbose=False,
-                trading_start_date=test_start.date()  # Paramètre crucial pour ignorer les trades pendant le warm-up
-            )
-            
-            # Enregistrement des résultats de cette fenêtre
-            window_result = {
+                skip_reason = "Pas assez de données d'entraînement."
+            elif len(test_data_with_warmup) < warmup_buffer_days + 10:
+                skip_reason = "Pas assez de données de test (warm-up inclus)."
+
+            windows.append({
                 'window': window_count,
-                'train_period': f"{current_train_start.date()} à {train_end.date()}",
-                'test_period': f"{test_start.date()} à {test_end.date()}",
-                'profit_pct': result['profit_pct'],
-                'drawdown': result['max_drawdown'],
-                'trades': result['total_trades'],
-                'win_rate': result.get('win_rate', 0)
-            }
-            wfa_results.append(window_result)
-            
-            print(f"  > Résultat : Profit {result['profit_pct']:.2f}% | Trades : {result['total_trades']} | WR : {result.get('win_rate', 0):.1f}%")
+                'train_start': current_train_start,
+                'train_end': train_end,
+                'test_start': test_start,
+                'test_end': test_end,
+                'warmup_start': warmup_start,
+                'warmup_bars': warmup_buffer_days,
+                'train_data': train_data,
+                'test_data': test_data_with_warmup,
+                'skip_reason': skip_reason,
+            })
             
             # Glissement de la fenêtre (Slide)
             current_train_start += relativedelta(months=Config.WFA_STEP_MONTHS)
             window_count += 1
+
+        return windows
+
+    def run_analysis(self, population_size=30, generations=5, workers=None, seed=None,
+                     warm_start=None, immigrant_rate=None, checkpoint=None, resume=False,
+                     ga_workers=None):
+        """
+        Exécute l'analyse Walk-Forward.
+
+        Logique :
+        - Définir une fenêtre d'entraînement (ex: 24 mois).
+        - Définir une fenêtre de test (ex: 6 mois) juste après.
+        - Optimiser l'IA sur l'entraînement.
+        - Tester sur la fenêtre de test (avec préchauffage des données).
+        - Avancer (glisser) les fenêtres d'un pas défini (ex: 3 mois).
+
+        Toutes les fenêtres sont planifiées d'avance puis optimisées, séquentiellement
+        ou sur un pool de processus. Chaque fenêtre utilise sa propre graine
+        (graine de base + numéro de fenêtre) : les résultats ne dépendent donc pas
+        du nombre de processus.
+
+        Args:
+            population_size (int): Taille de la population du mini-AG de chaque fenêtre.
+            generations (int): Nombre de générations du mini-AG de chaque fenêtre.
+            workers (int, optional): Fenêtres traitées en parallèle (1 = séquentiel,
+                0 = tous les cœurs). Par défaut Config.WFA_WORKERS.
+            ga_workers (int, optional): Processus de l'AG de chaque fenêtre (1 dans un
+                processus qui ne peut pas en créer, ex: un processus de travail de l'univers).
+                Par défaut 1 si les fenêtres sont réparties sur un pool, sinon Config.GA_WORKERS.
+            seed (int, optional): Graine de base. Par défaut Config.WFA_SEED,
+                ou tirée au hasard si aucune n'est configurée.
+            warm_start (bool, optional): Démarre chaque fenêtre avec la population finale
+                de la précédente (les fenêtres sont alors enchaînées séquentiellement).
+                Par défaut Config.WFA_WARM_START.
+            immigrant_rate (float, optional): Part d'immigrants aléatoires en démarrage
+                à chaud. Par défaut Config.WFA_IMMIGRANT_RATE.
+            checkpoint (str, optional): Fichier du point de reprise, réécrit après chaque
+                fenêtre et supprimé en fin d'analyse (l'AG de chaque fenêtre a le sien,
+                voir src/checkpoint.py).
+            resume (bool): Reprend depuis `checkpoint` : les fenêtres terminées sont
+                relues, l'AG de celles en cours repart de sa dernière génération, et les
+                résultats sont identiques à ceux d'une analyse ininterrompue.
+
+        Returns:
+            List[Dict]: Une liste de résultats par fenêtre (profit, trades, etc.).
+        """
+        print("\n" + "="*70)
+        print("DÉMARRAGE DE L'ANALYSE WALK-FORWARD (AVEC WARM-UP)")
+        print("="*70)
+        
+        # Récupération de l'ensemble des données disponibles
+        full_data = self.dm.get_full_data()
+        if full_data.empty:
+            print("Erreur : Aucune données disponible pour le WFA.")
+            return []
+
+        workers = Config.WFA_WORKERS if workers is None else workers
+        workers = workers if workers > 0 else (os.cpu_count() or 1)
+        seed = Config.WFA_SEED if seed is None else seed
+        warm_start = Config.WFA_WARM_START if warm_start is None else warm_start
+        if warm_start:
+            # Chaque fenêtre dépend de la précédente : pas de pool
+            workers = 1
+
+        windows = self.plan_windows(full_data)
+        runnable = [w for w in windows if w['skip_reason'] is None]
+        if Config.TRADE_LEDGER_ENABLED:
+            # Journaux de trades construits sur l'historique complet, communs à toutes les fenêtres
+            for w in runnable:
+                w['history'] = full_data
+
+        completed, previous = {}, None
+        if checkpoint is not None:
+            signature = self._checkpoint_signature(full_data, windows, population_size, generations,
+                                                   warm_start, immigrant_rate)
+            state = load_checkpoint(checkpoint, signature) if resume else None
+            if state is not None and seed is not None and state['seed'] != seed:
+                print(f"Point de reprise d'une autre graine ignoré ({checkpoint})")
+                state = None
+            if state is None:
+                # Nouvelle analyse : les points de reprise d'une analyse précédente sont obsolètes
+                remove_checkpoint(checkpoint)
+                for w in runnable:
+                    remove_checkpoint(self._window_checkpoint(checkpoint, w))
+            else:
+                completed, previous, seed = state['completed'], state['previous'], state['seed']
+                print(f"Reprise de l'analyse : {len(completed)} fenêtre(s) déjà terminée(s) ({checkpoint})")
+        if seed is None:
+            seed = random.randrange(2**31)
+
+        # Dans un pool, l'AG de chaque fenêtre reste séquentiel (pas de pool imbriqué)
+        if ga_workers is None and workers > 1:
+            ga_workers = 1
+        tasks = [(w, population_size, generations, seed + w['window'], ga_workers,
+                  immigrant_rate, Config.active_asset(),
+                  self._window_checkpoint(checkpoint, w) if checkpoint is not None else None, None)
+                 for w in runnable if w['window'] not in completed]
+        print(f"{len(windows)} fenêtres planifiées ({len(runnable)} à optimiser, "
+              f"{min(workers, max(len(runnable), 1))} processus, graine {seed}"
+              f"{', démarrage à chaud' if warm_start else ''})")
+
+        telemetry = get_telemetry()
+        run_snapshot = telemetry.snapshot()
+        run_start = time.perf_counter()
+        telemetry.emit('wfa_start', windows=len(windows), runnable=len(runnable), seed=seed,
+                       workers=min(workers, max(len(runnable), 1)), generations=generations)
+        # Mode longue durée : mémoire du processus principal contrôlée après chaque fenêtre
+        watchdog = MemoryWatchdog() if Config.LONGRUN_MODE else None
+        if watchdog is not None:
+            watchdog.start()
+        pool = None
+        if workers > 1 and len(tasks) > 1:
+            # Mode longue durée : un processus neuf par fenêtre (mémoire rendue au système)
+            pool = mp.get_context(Config.GA_START_METHOD).Pool(
+                processes=min(workers, len(tasks)),
+                maxtasksperchild=1 if Config.LONGRUN_MODE else None)
+            outcomes = pool.imap(_run_window, tasks)
+        elif warm_start:
+            outcomes = _chain_windows(tasks, previous)
+        else:
+            outcomes = map(_run_window, tasks)
+
+        wfa_results = []
+        try:
+            # Restitution des résultats dans l'ordre des fenêtres
+            for window in windows:
+                print(f"\n--- Fenêtre {window['window']} ---")
+                print(f"Entraînement : {window['train_start'].date()} -> {window['train_end'].date()}")
+                print(f"Test         : {window['test_start'].date()} -> {window['test_end'].date()}")
+                print(f"Warm-up      : {window['warmup_start'].date()} -> {window['test_start'].date()} ({window['warmup_bars']} bougies)")
+
+                if window['skip_reason'] is not None:
+                    print(f"Fenêtre ignorée : {window['skip_reason']}")
+                    continue
+
+                resumed = window['window'] in completed
+                if resumed:
+                    # Fenêtre terminée avant l'interruption : résultats relus du point de reprise
+                    best_params, result, convergence, metrics = completed[window['window']]
+                else:
+                    best_params, result, convergence, pop, metrics = next(outcomes)
+                    if pool is not None:
+                        # Mesures du processus de travail, rapatriées dans le registre du parent
+                        telemetry.merge(metrics)
+                    if watchdog is not None:
+                        evaluations = telemetry.delta(run_snapshot)['counters'].get('evaluations', 0)
+                        metrics['rss_mb'] = watchdog.check(evaluations)
+                    if checkpoint is not None:
+                        completed[window['window']] = (best_params, result, convergence, metrics)
+                        with telemetry.timer('checkpoint'):
+                            save_checkpoint(checkpoint, {
+                                'signature': signature, 'seed': seed, 'completed': completed,
+                                'previous': pop if warm_start else None,
+                            })
+                        remove_checkpoint(self._window_checkpoint(checkpoint, window))
+                telemetry.emit('wfa_window', window=window['window'], seed=seed + window['window'],
+                               profit_pct=result['profit_pct'], trades=result['total_trades'],
+                               resumed=resumed, **convergence, **metrics)
+                print(f"  > Convergence IS : {convergence['is_start']:.2f}% -> {convergence['is_best']:.2f}% "
+                      f"(génération {convergence['gens_to_best']}/{generations})")
+                if 'cold_is_best' in convergence:
+                    print(f"  > Démarrage à froid : {convergence['cold_is_best']:.2f}% "
+                          f"(génération {convergence['cold_gens_to_best']}/{generations}) | "
+                          f"gain à chaud {convergence['warm_is_gain']:+.2f}%, "
+                          f"{convergence['warm_gens_saved']:+d} génération(s)")
+                print(f"  > Meilleurs Params : SMA_F={best_params['SMA_F']}, SMA_S={best_params['SMA_S']}, RSI_LO={best_params['RSI_LO']}")
+
+                # Enregistrement des résultats de cette fenêtre
+                window_result = {
+                    'window': window['window'],
+                    'train_period': f"{window['train_start'].date()} à {window['train_end'].date()}",
+                    'test_period': f"{window['test_start'].date()} à {window['test_end'].date()}",
+                    'profit_pct': result['profit_pct'],
+                    'drawdown': result['max_drawdown'],
+                    'trades': result['total_trades'],
+                    'win_rate': result.get('win_rate', 0),
+                    **convergence
+                }
+                wfa_results.append(window_result)
+                
+                print(f"  > Résultat : Profit {result['profit_pct']:.2f}% | Trades : {result['total_trades']} | WR : {result.get('win_rate', 0):.1f}%")
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            if watchdog is not None:
+                watchdog.stop()
+        # Analyse terminée : son point de reprise n'a plus d'usage
+        remove_checkpoint(checkpoint)
+
+        run_metrics = telemetry.delta(run_snapshot)
+        if watchdog is not None:
+            run_metrics['memory'] = watchdog.report()
+        telemetry.emit('wfa_run', windows=len(wfa_results), workers=min(workers, max(len(runnable), 1)),
+                       seed=seed, elapsed=time.perf_counter() - run_start,
+                       peak_rss_mb=peak_rss_mb(), **run_metrics)
+        telemetry.write_prometheus()
             
         self._print_summary(wfa_results)
         return wfa_results
 
+    @staticmethod
+    def _window_checkpoint(checkpoint, window):
+        """Point de reprise de l'AG d'une fenêtre, à côté de celui de l'analyse."""
+        checkpoint = Path(checkpoint)
+        return checkpoint.with_name(f"{checkpoint.stem}.w{window['window']}{checkpoint.suffix}")
+
+    def _checkpoint_signature(self, full_data, windows, population_size, generations,
+                              warm_start, immigrant_rate):
+        """Réglages qu'un point de reprise du WFA doit partager avec l'analyse qui le relit."""
+        return {
+            'data': data_fingerprint(full_data),
+            'windows': [(w['window'], str(w['train_start']), str(w['test_end']), w['skip_reason'])
+                        for w in windows],
+            'population': population_size,
+            'generations': generations,
+            'warm_start': warm_start,
+            'immigrant_rate': Config.WFA_IMMIGRANT_RATE if immigrant_rate is None else immigrant_rate,
+            'cold_baseline': Config.WFA_COLD_BASELINE,
+            'trade_ledger': Config.TRADE_LEDGER_ENABLED,
+            'engine': Config.get_backtest_engine(),
+            'commission': Config.get_commission(),
+            'initial_cash': Config.INITIAL_CASH,
+        }
+
     def _print_summary(self, results):
         """
         Affiche un rapport récapitulatif de l'analyse Walk-Forward dans la console.
@@ -207,4 +529,14 @@ class WalkForwardAnalyzer:
         print(f"Profit Cumulé Total (Somme)    : {total_profit:.2f}%")
         print(f"Taux de Fenêtres Gagnantes     : {win_rate:.2f}%")
         print(f"Total Trades (Toutes fenêtres) : {total_trades}")
+        if all('is_best' in r for r in results):
+            avg_is = np.mean([r['is_best'] for r in results])
+            avg_to_best = np.mean([r['gens_to_best'] for r in results])
+            print(f"Meilleur Profit IS Moyen       : {avg_is:.2f}%")
+            print(f"Génération du Meilleur (Moy.)  : {avg_to_best:.1f}")
+        compared = [r for r in results if 'warm_is_gain' in r]
+        if compared:
+            # Fenêtres démarrées à chaud comparées à un démarrage à froid (Config.WFA_COLD_BASELINE)
+            print(f"Gain IS à Chaud vs Froid (Moy.): {np.mean([r['warm_is_gain'] for r in compared]):+.2f}%")
+            print(f"Générations Gagnées (Moy.)     : {np.mean([r['warm_gens_saved'] for r in compared]):+.1f}")
         print("="*70)
\ No newline at end of file
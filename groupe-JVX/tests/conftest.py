@@ -0,0 +1,15 @@
+"""
+Configuration commune des tests.
+Les tests importent les modules du projet (`from src...`) depuis la racine de groupe-JVX,
+quel que soit le répertoire depuis lequel pytest est lancé.
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Jeux de données fournis avec le dépôt
+DATA_DIR = ROOT / "data"
+BUNDLED_TICKERS = ('BTC-USD', 'ETH-USD', 'SPY')
@@ -0,0 +1,320 @@
+"""
+Tests hors ligne du chargement concurrent des données.
+La source simulée (SimulatedFetcher sur FileFetcher) injecte latence et échecs :
+nouvelles tentatives espacées exponentiellement, délai maximal par requête,
+rafraîchissement incrémental (recouvrement contrôlé), contention du verrou fichier
+(dont plusieurs processus cassant le même verrou abandonné) et deux chargeurs (processus) concurrents sur le même actif.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import pandas as pd
+import pytest
+from conftest import DATA_DIR, ROOT
+from src.bulk_loader import BulkLoader
+from src.config import Config
+from src.data_fetchers import FileFetcher, SimulatedFetcher
+from src.data_manager import DataManager
+from src.file_lock import FileLock, LockTimeout
+
+# Barres retirées du cache avant un rafraîchissement
+MISSING_BARS = 10
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    """Répertoire des CSV sources (l'historique complet des actifs fournis)."""
+    source = tmp_path / 'source'
+    source.mkdir()
+    for ticker in ('BTC-USD', 'SPY'):
+        shutil.copy(DATA_DIR / f'{ticker}_1d.csv', source)
+    return source
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Répertoire des caches du DataManager (Config.DATA_DIR) propre au test."""
+    cache = tmp_path / 'cache'
+    cache.mkdir()
+    monkeypatch.setattr(Config, 'DATA_DIR', str(cache))
+    return cache
+
+
+def _truncated_cache(source_dir, cache_dir, ticker: str):
+    """Cache CSV de l'actif sans ses MISSING_BARS dernières barres (lignes d'origine)."""
+    lines = (source_dir / f'{ticker}_1d.csv').read_bytes().splitlines(keepends=True)
+    (cache_dir / f'{ticker}_1d.csv').write_bytes(b''.join(lines[:-MISSING_BARS]))
+
+
+def _read(path) -> pd.DataFrame:
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+def test_retry_with_exponential_backoff(source_dir, cache_dir, monkeypatch):
+    delays = []
+    delay = BulkLoader._delay
+
+    def recorded(self, attempt):
+        delays.append(delay(self, attempt))
+        return delays[-1]
+
+    monkeypatch.setattr(BulkLoader, '_delay', recorded)
+    fetcher = SimulatedFetcher(FileFetcher(source_dir), failures={'BTC-USD': 2})
+    loader = BulkLoader(fetcher, interval='1d', retries=3, backoff=0.02, timeout=10, seed=0)
+    report = loader.load(['BTC-USD', 'SPY'], verbose=False)
+
+    assert report['BTC-USD']['status'] == 'downloaded' and report['BTC-USD']['attempts'] == 3
+    assert report['SPY']['status'] == 'downloaded' and report['SPY']['attempts'] == 1
+    # Attente doublée à chaque tentative, gigue de 50 à 100 %
+    assert len(delays) == 2
+    assert 0.01 <= delays[0] <= 0.02 and 0.02 <= delays[1] <= 0.04
+    assert fetcher.attempts == {'BTC-USD': 3, 'SPY': 1}
+    pd.testing.assert_frame_equal(_read(cache_dir / 'BTC-USD_1d.csv'), _read(source_dir / 'BTC-USD_1d.csv'))
+
+
+def test_retries_exhausted_do_not_stop_other_tickers(source_dir, cache_dir):
+    fetcher = SimulatedFetcher(FileFetcher(source_dir), failures={'BTC-USD': 10})
+    report = BulkLoader(fetcher, interval='1d', retries=2, backoff=0.001, timeout=10).load(
+        ['BTC-USD', 'SPY'], verbose=False)
+
+    assert report['BTC-USD']['status'] == 'failed' and report['BTC-USD']['attempts'] == 3
+    assert report['BTC-USD']['error'].startswith('FetchError')
+    assert report['SPY']['status'] == 'downloaded'
+    assert not (cache_dir / 'BTC-USD_1d.csv').exists()
+
+
+def test_request_timeout(source_dir, cache_dir):
+    fetcher = SimulatedFetcher(FileFetcher(source_dir), latency=0.5)
+    report = BulkLoader(fetcher, interval='1d', retries=1, backoff=0.001, timeout=0.05).load(
+        ['SPY'], verbose=False)
+    assert report['SPY']['status'] == 'failed' and report['SPY']['attempts'] == 2
+    assert report['SPY']['error'].startswith('FetchTimeout')
+
+
+def test_refresh_appends_missing_bars(source_dir, cache_dir):
+    _truncated_cache(source_dir, cache_dir, 'SPY')
+    kept = (cache_dir / 'SPY_1d.csv').read_bytes()
+    fetcher = SimulatedFetcher(FileFetcher(source_dir), failures={'SPY': 1})
+    report = BulkLoader(fetcher, interval='1d', retries=2, backoff=0.001, timeout=10).load(
+        ['SPY'], refresh=True, verbose=False)
+
+    assert report['SPY']['status'] == 'refreshed' and report['SPY']['rows'] == MISSING_BARS
+    assert report['SPY']['attempts'] == 2
+    refreshed = (cache_dir / 'SPY_1d.csv').read_bytes()
+    # Lignes plus anciennes que la dernière barre en cache conservées octet pour octet
+    assert refreshed.startswith(kept[:kept.rstrip(b'\n').rfind(b'\n') + 1])
+    pd.testing.assert_frame_equal(_read(cache_dir / 'SPY_1d.csv'), _read(source_dir / 'SPY_1d.csv'),
+                                  rtol=1e-12)
+    # Déjà à jour : aucune barre ajoutée
+    again = BulkLoader(FileFetcher(source_dir), interval='1d').load(['SPY'], refresh=True, verbose=False)
+    assert again['SPY']['status'] == 'refreshed' and again['SPY']['rows'] == 0
+
+
+def test_refresh_overlap_mismatch_is_not_retried(source_dir, cache_dir):
+    _truncated_cache(source_dir, cache_dir, 'SPY')
+    # Source révisée sur les barres de recouvrement
+    source = _read(source_dir / 'SPY_1d.csv')
+    source.iloc[-MISSING_BARS - 3, source.columns.get_loc('Close')] *= 1.01
+    source.to_csv(source_dir / 'SPY_1d.csv')
+    before = (cache_dir / 'SPY_1d.csv').read_bytes()
+
+    report = BulkLoader(FileFetcher(source_dir), interval='1d', retries=3, backoff=0.001).load(
+        ['SPY'], refresh=True, verbose=False)
+    assert report['SPY']['status'] == 'failed' and report['SPY']['attempts'] == 1
+    assert report['SPY']['error'].startswith('DataConsistencyError')
+    assert (cache_dir / 'SPY_1d.csv').read_bytes() == before
+
+
+def test_file_lock_contention(tmp_path):
+    path = tmp_path / 'SPY_1d.lock'
+    holder = FileLock(path)
+    other = FileLock(path, timeout=0.2, poll=0.01)
+    with holder:
+        with holder:  # réentrant pour le même objet et le même thread
+            pass
+        assert path.exists()
+        with pytest.raises(LockTimeout):
+            other.acquire()
+    with other:
+        assert other.locked
+    assert not path.exists()
+
+
+# Incréments d'un compteur partagé, chacun sous verrou (processus concurrents)
+_INCREMENT = """
+import sys, time
+from pathlib import Path
+from src.file_lock import FileLock
+counter, lock = Path(sys.argv[1]), FileLock(sys.argv[2], timeout=30, poll=0.001)
+for _ in range(int(sys.argv[3])):
+    with lock:
+        value = int(counter.read_text())
+        time.sleep(0.001)
+        counter.write_text(str(value + 1))
+"""
+
+
+def test_file_lock_serializes_processes(tmp_path):
+    counter = tmp_path / 'counter'
+    counter.write_text('0')
+    processes = [subprocess.Popen([sys.executable, '-c', _INCREMENT, str(counter),
+                                   str(tmp_path / 'counter.lock'), '25'], cwd=ROOT)
+                 for _ in range(4)]
+    assert all(p.wait(timeout=60) == 0 for p in processes)
+    assert counter.read_text() == '100'
+
+
+def test_stale_lock_is_broken(tmp_path):
+    path = tmp_path / 'SPY_1d.lock'
+    path.write_text('12345\n')
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    with FileLock(path, timeout=1, stale_after=30) as lock:
+        assert path.read_text().strip() == lock.token
+        assert lock.token.split()[0] == str(os.getpid())
+    assert sorted(p.name for p in tmp_path.iterdir()) == []
+
+
+def _stale_lock(path):
+    """Fichier de verrou abandonné par un processus interrompu."""
+    path.write_text('12345 abandoned\n')
+    old = time.time() - 60
+    os.utime(path, (old, old))
+
+
+def test_stale_lock_breakers_race(tmp_path, monkeypatch):
+    path = tmp_path / 'SPY_1d.lock'
+    _stale_lock(path)
+    first = FileLock(path, timeout=1, stale_after=30)
+    rename = os.rename
+    calls = []
+
+    def interleaved(src, dst):
+        # Le second casseur a vu le verrou abandonné ; le premier le casse et prend
+        # un nouveau verrou avant que le second ne le renomme
+        calls.append(dst)
+        if len(calls) == 1:
+            first.acquire()
+        rename(src, dst)
+
+    monkeypatch.setattr(os, 'rename', interleaved)
+    second = FileLock(path, timeout=0.3, poll=0.01, stale_after=30)
+    with pytest.raises(LockTimeout):
+        second.acquire()
+    monkeypatch.undo()
+
+    assert first.locked and not second.locked
+    assert path.read_text().strip() == first.token
+    first.release()
+    assert sorted(p.name for p in tmp_path.iterdir()) == []
+
+
+def test_release_keeps_lock_taken_over(tmp_path):
+    path = tmp_path / 'SPY_1d.lock'
+    lock = FileLock(path)
+    lock.acquire()
+    path.write_text('12345 other\n')
+    lock.release()
+    assert path.read_text() == '12345 other\n'
+
+
+def test_stale_lock_broken_by_many_waiters(tmp_path):
+    path = tmp_path / 'SPY_1d.lock'
+    _stale_lock(path)
+    state = {'inside': 0, 'most': 0, 'done': 0}
+    guard = threading.Lock()
+    start = threading.Barrier(6)
+
+    def worker():
+        lock = FileLock(path, timeout=30, poll=0.001, stale_after=30)
+        start.wait()
+        with lock:
+            with guard:
+                state['inside'] += 1
+                state['most'] = max(state['most'], state['inside'])
+            time.sleep(0.01)
+            with guard:
+                state['inside'] -= 1
+                state['done'] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert state['done'] == 6 and state['most'] == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == []
+
+
+def test_long_hold_is_not_taken_for_stale(tmp_path):
+    path = tmp_path / 'SPY_1d.lock'
+    holder = FileLock(path, stale_after=0.3)
+    with holder:
+        # Détenu bien au-delà de stale_after : le rafraîchissement de la date le protège
+        with pytest.raises(LockTimeout):
+            FileLock(path, timeout=1.0, poll=0.02, stale_after=0.3).acquire()
+        assert holder.locked and path.exists()
+    assert not path.exists()
+
+
+def test_concurrent_threads_refresh_same_ticker(source_dir, cache_dir):
+    _truncated_cache(source_dir, cache_dir, 'BTC-USD')
+    fetcher = SimulatedFetcher(FileFetcher(source_dir), latency=0.05, jitter=0.05, seed=1)
+    reports = []
+
+    def refresh():
+        reports.append(BulkLoader(fetcher, interval='1d', timeout=10).load(
+            ['BTC-USD'], refresh=True, verbose=False)['BTC-USD'])
+
+    threads = [threading.Thread(target=refresh) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Rafraîchissements sérialisés par le verrou : le second ne trouve plus rien à ajouter
+    assert sorted(r['rows'] for r in reports) == [0, MISSING_BARS]
+    assert all(r['status'] == 'refreshed' for r in reports)
+    pd.testing.assert_frame_equal(_read(cache_dir / 'BTC-USD_1d.csv'), _read(source_dir / 'BTC-USD_1d.csv'),
+                                  rtol=1e-12)
+    DataManager('BTC-USD', '1d').invalidate()
+
+
+# Chargeur d'un actif dans un processus séparé, même répertoire de cache
+_LOADER = """
+import json, sys
+from src.bulk_loader import BulkLoader
+from src.config import Config
+from src.data_fetchers import FileFetcher, SimulatedFetcher
+Config.DATA_DIR = sys.argv[1]
+fetcher = SimulatedFetcher(FileFetcher(sys.argv[2]), latency=0.05, jitter=0.1, failures={'BTC-USD': 1})
+report = BulkLoader(fetcher, interval='1d', backoff=0.01, timeout=10).load(
+    ['BTC-USD'], refresh=sys.argv[3] == 'refresh', force=True, verbose=False)
+print(json.dumps(report['BTC-USD']))
+"""
+
+
+@pytest.mark.parametrize('mode', ['download', 'refresh'])
+def test_concurrent_processes_same_ticker(source_dir, cache_dir, mode):
+    if mode == 'refresh':
+        _truncated_cache(source_dir, cache_dir, 'BTC-USD')
+    processes = [subprocess.Popen([sys.executable, '-c', _LOADER, str(cache_dir), str(source_dir), mode],
+                                  cwd=ROOT, stdout=subprocess.PIPE, text=True)
+                 for _ in range(2)]
+    reports = []
+    for process in processes:
+        out, _ = process.communicate(timeout=60)
+        assert process.returncode == 0
+        reports.append(json.loads(out.strip().splitlines()[-1]))
+
+    assert all(r['status'] == ('refreshed' if mode == 'refresh' else 'downloaded') for r in reports)
+    if mode == 'refresh':
+        assert sorted(r['rows'] for r in reports) == [0, MISSING_BARS]
+    pd.testing.assert_frame_equal(_read(cache_dir / 'BTC-USD_1d.csv'), _read(source_dir / 'BTC-USD_1d.csv'),
+                                  rtol=1e-12)
+    # Ni fichier temporaire ni verrou laissés derrière
+    assert sorted(p.name for p in cache_dir.iterdir() if p.is_file()) == ['BTC-USD_1d.csv']
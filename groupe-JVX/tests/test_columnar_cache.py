@@ -0,0 +1,197 @@
+"""
+Tests du cache binaire par colonnes.
+Aller-retour des données, lecture du format d'origine, réécriture pendant qu'une
+ancienne version est encore projetée en mémoire (y compris le refus de suppression
+de Windows), contrôle de la somme de contrôle, et test d'acceptation du démarrage
+à froid (temps et mémoire résidente) sur les CSV fournis et une série synthétique
+de plusieurs millions de barres.
+"""
+import json
+import shutil
+import subprocess
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import BUNDLED_TICKERS, DATA_DIR, ROOT
+from src import columnar_cache
+from src.columnar_cache import (CURRENT_FILE, FLOAT_BLOCK_FILE, ColumnarCacheError, read_columnar,
+                                read_meta, write_columnar)
+from src.data_manager import DataManager
+from src.synthetic_data import synthetic_ohlcv
+
+# Barres de la série synthétique du test de démarrage à froid
+COLD_START_BARS = 3_000_000
+# Mémoire résidente tolérée après chargement, en part de la taille des données (mmap paresseux)
+COLD_START_RSS_RATIO = 0.25
+
+
+def _frame(bars: int = 500, seed: int = 0) -> pd.DataFrame:
+    """Données OHLCV synthétiques avec une colonne entière (fichier de colonne séparé)."""
+    df = synthetic_ohlcv(bars, seed=seed)
+    df['Trades'] = np.arange(bars, dtype=np.int64) * (seed + 1)
+    return df
+
+
+def _versions(path):
+    """Sous-répertoires de version présents dans le cache."""
+    return sorted(p.name for p in path.iterdir() if p.is_dir())
+
+
+def test_round_trip(tmp_path):
+    df = _frame()
+    path = tmp_path / 'SYN_1d'
+    meta = write_columnar(df, path, 'SYN', '1d')
+    loaded = read_columnar(path)
+    pd.testing.assert_frame_equal(loaded, df, check_freq=False)
+    assert read_meta(path) == meta
+    assert meta['rows'] == len(df) and meta['ticker'] == 'SYN'
+    assert len(_versions(path)) == 1
+
+
+def test_legacy_layout_is_read_then_replaced(tmp_path):
+    df = _frame()
+    path = tmp_path / 'SYN_1d'
+    write_columnar(df, path, 'SYN', '1d')
+    # Format d'origine : fichiers à la racine, sans CURRENT
+    version = path / _versions(path)[0]
+    for child in version.iterdir():
+        shutil.move(str(child), path / child.name)
+    version.rmdir()
+    (path / CURRENT_FILE).unlink()
+    pd.testing.assert_frame_equal(read_columnar(path), df, check_freq=False)
+
+    new = _frame(seed=1)
+    write_columnar(new, path, 'SYN', '1d')
+    pd.testing.assert_frame_equal(read_columnar(path), new, check_freq=False)
+    assert sorted(p.name for p in path.iterdir() if p.is_file()) == [CURRENT_FILE]
+
+
+def test_rewrite_while_previous_version_is_mapped(tmp_path):
+    path = tmp_path / 'SYN_1d'
+    first = _frame()
+    write_columnar(first, path, 'SYN', '1d')
+    mapped = read_columnar(path)
+
+    second = _frame(seed=1)
+    write_columnar(second, path, 'SYN', '1d')
+    # L'ancienne projection reste lisible, la lecture suivante voit la nouvelle version
+    pd.testing.assert_frame_equal(mapped, first, check_freq=False)
+    pd.testing.assert_frame_equal(read_columnar(path), second, check_freq=False)
+    assert len(_versions(path)) == 1
+
+
+def test_mapped_version_that_cannot_be_removed_is_kept(tmp_path, monkeypatch):
+    path = tmp_path / 'SYN_1d'
+    write_columnar(_frame(), path, 'SYN', '1d')
+
+    def refuse(target, *args, **kwargs):
+        # Windows : un fichier projeté en mémoire ne peut pas être supprimé
+        raise PermissionError(f"mapped: {target}")
+
+    monkeypatch.setattr(columnar_cache.shutil, 'rmtree', refuse)
+    second = _frame(seed=1)
+    write_columnar(second, path, 'SYN', '1d')
+    pd.testing.assert_frame_equal(read_columnar(path), second, check_freq=False)
+    assert len(_versions(path)) == 2
+
+    monkeypatch.undo()
+    third = _frame(seed=2)
+    write_columnar(third, path, 'SYN', '1d')
+    pd.testing.assert_frame_equal(read_columnar(path), third, check_freq=False)
+    assert len(_versions(path)) == 1
+
+
+def test_failed_write_verification_keeps_current_version(tmp_path, monkeypatch):
+    path = tmp_path / 'SYN_1d'
+    first = _frame()
+    write_columnar(first, path, 'SYN', '1d')
+
+    def corrupted(directory, meta):
+        raise ColumnarCacheError(f"Checksum mismatch in columnar cache {directory}")
+
+    monkeypatch.setattr(columnar_cache, '_verify_version', corrupted)
+    with pytest.raises(ColumnarCacheError):
+        write_columnar(_frame(seed=1), path, 'SYN', '1d')
+    pd.testing.assert_frame_equal(read_columnar(path), first, check_freq=False)
+    assert len(_versions(path)) == 1
+
+
+def test_verify_flag_detects_corruption(tmp_path):
+    path = tmp_path / 'SYN_1d'
+    write_columnar(_frame(), path, 'SYN', '1d')
+    block = path / _versions(path)[0] / FLOAT_BLOCK_FILE
+    raw = bytearray(block.read_bytes())
+    raw[-8:] = np.float64(-1.0).tobytes()
+    block.write_bytes(bytes(raw))
+
+    # Par défaut, pas de relecture complète (chargement paresseux)
+    assert read_columnar(path)['Trades'].iloc[-1] == len(_frame()) - 1
+    with pytest.raises(ColumnarCacheError):
+        read_columnar(path, verify=True)
+
+
+def test_data_manager_sees_new_version(tmp_path):
+    shutil.copy(DATA_DIR / 'SPY_1d.csv', tmp_path)
+    dm = DataManager('SPY', '1d', data_dir=tmp_path)
+    dm.invalidate()
+    data = dm.get_full_data()
+    assert (tmp_path / 'SPY_1d' / CURRENT_FILE).exists()
+
+    dm._write_columnar(data.iloc[:100])
+    assert len(dm.get_full_data()) == 100
+    assert len(_versions(tmp_path / 'SPY_1d')) == 1
+    dm.invalidate()
+
+
+# Chargement à froid mesuré dans un interpréteur neuf : temps et mémoire résidente
+# ajoutée par le chargement (imports exclus), cache binaire ou CSV (pandas)
+_COLD_START = """
+import json, sys, time
+import pandas as pd
+from src.columnar_cache import read_columnar
+from src.telemetry import current_rss_mb
+path, mode = sys.argv[1], sys.argv[2]
+rss = current_rss_mb()
+start = time.perf_counter()
+df = read_columnar(path) if mode == 'npy' else pd.read_csv(path, index_col=0, parse_dates=True)
+last = float(df['Close'].iloc[-1])
+print(json.dumps({'load_s': time.perf_counter() - start, 'rss_mb': current_rss_mb() - rss, 'rows': len(df),
+                  'data_mb': (df.index.nbytes + df.memory_usage(index=False).sum()) / 2**20}))
+"""
+
+
+def _cold_start(path, mode: str = 'npy') -> dict:
+    """Mesure le chargement à froid de `path` (cache binaire ou CSV) dans un nouveau processus."""
+    result = subprocess.run([sys.executable, '-c', _COLD_START, str(path), mode],
+                            cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('ticker', BUNDLED_TICKERS)
+def test_cold_start_bundled(tmp_path, ticker):
+    csv = shutil.copy(DATA_DIR / f'{ticker}_1d.csv', tmp_path)
+    dm = DataManager(ticker, '1d', data_dir=tmp_path)
+    dm.invalidate()
+    rows = len(dm.get_full_data())
+    dm.invalidate()
+
+    measure = _cold_start(tmp_path / f'{ticker}_1d')
+    baseline = _cold_start(csv, 'csv')
+    print(f"{ticker}: {measure} (CSV : {baseline})")
+    assert measure['rows'] == baseline['rows'] == rows
+    assert measure['load_s'] < baseline['load_s']
+
+
+@pytest.mark.skipif(sys.platform != 'linux', reason="mémoire résidente lue dans /proc")
+def test_cold_start_multi_million_bars(tmp_path):
+    path = tmp_path / 'SYN_1m'
+    df = synthetic_ohlcv(COLD_START_BARS, freq='min', drift=0.0, volatility=0.001)
+    write_columnar(df, path, 'SYN', '1m')
+
+    measure = _cold_start(path)
+    print(f"synthetic: {measure}")
+    assert measure['rows'] == COLD_START_BARS
+    assert measure['load_s'] < 1.0
+    assert measure['rss_mb'] < COLD_START_RSS_RATIO * measure['data_mb']
@@ -0,0 +1,80 @@
+"""
+Tests des évaluations en erreur.
+Une exception pendant l'évaluation (erreur passagère : mémoire, interruption) rend
+ERROR_FITNESS, distincte de la fitness « sans trade » : elle n'est ni mise en cache
+ni conservée dans la base des évaluations, et la télémétrie la compte en erreur.
+"""
+import pandas as pd
+import pytest
+from conftest import DATA_DIR
+from src import ga_core
+from src.eval_store import EvaluationStore
+from src.fitness_cache import FitnessCache, canonical_params
+from src.strategy_genes import decode_chromosome
+from src.telemetry import ERROR_FITNESS, FALLBACK_FITNESS, classify_failures
+
+GENOME = [10, 30, 14, 70, 30, 0.05, 0.1]
+
+
+@pytest.fixture
+def data():
+    return pd.read_csv(DATA_DIR / 'SPY_1d.csv', index_col=0, parse_dates=True).iloc[-400:]
+
+
+def _out_of_memory(*args, **kwargs):
+    raise MemoryError("simulated")
+
+
+def test_eval_genome_error_is_not_stored(tmp_path, data, monkeypatch):
+    store = EvaluationStore(str(tmp_path / 'evals.db'))
+    monkeypatch.setattr(ga_core, 'run_backtest', _out_of_memory)
+    assert ga_core.eval_genome(GENOME, data, engine='vector', store=store) == ERROR_FITNESS
+    monkeypatch.undo()
+
+    context = store.context(data, 'vector')
+    params = canonical_params(decode_chromosome(GENOME))
+    store.record(context, [(params, ERROR_FITNESS, 0.1), (params, FALLBACK_FITNESS, 0.1)])
+    store.flush()
+    assert len(store.evaluations()) == 1
+    store.close()
+
+
+def test_batch_error_is_not_cached(data, monkeypatch):
+    monkeypatch.setattr(ga_core, 'batch_fitness', _out_of_memory)
+    monkeypatch.setattr(ga_core, 'run_backtest', _out_of_memory)
+    cache = FitnessCache(maxsize=16)
+    monkeypatch.setattr(ga_core, 'get_fitness_cache', lambda: cache)
+    ga = ga_core.GAEcosystem(data, engine='vector', workers=1)
+    fitnesses = ga._evaluate_cached([GENOME, GENOME[:4] + [35, 0.05, 0.1]])
+    assert fitnesses == [ERROR_FITNESS] * 2
+    assert classify_failures(fitnesses) == (0, 2)
+    assert len(cache) == 0
+
+    cache.put(('key',), FALLBACK_FITNESS)
+    cache.put(('error',), ERROR_FITNESS)
+    assert len(cache) == 1 and cache.get(('error',)) is None
+
+
+def test_failed_batch_is_evaluated_genome_by_genome(data, monkeypatch):
+    genomes = [GENOME, [5, 50, 10, 75, 35, 0.03, 0.2], [8, 40, 21, 65, 40, 0.1, 0.3]]
+    expected = ga_core.eval_population(genomes, data, engine='vector')
+    run_backtest = ga_core.run_backtest
+
+    def failing_genome(params, *args, **kwargs):
+        # Le premier génome fait échouer toute simulation qui le contient
+        if params['SMA_F'] == GENOME[0]:
+            raise ValueError("bad genome")
+        return run_backtest(params, *args, **kwargs)
+
+    def failing_batch(population, *args, **kwargs):
+        raise ValueError("bad genome in batch")
+
+    monkeypatch.setattr(ga_core, 'batch_fitness', failing_batch)
+    monkeypatch.setattr(ga_core, 'run_backtest', failing_genome)
+    telemetry = ga_core.get_telemetry()
+    before = telemetry.snapshot()
+    fitnesses = ga_core.eval_population(genomes, data, engine='vector')
+    assert fitnesses[0] == ERROR_FITNESS
+    assert fitnesses[1:] == pytest.approx(expected[1:])
+    assert classify_failures(fitnesses)[1] == 1
+    assert telemetry.delta(before)['counters']['batch_error'] == 1
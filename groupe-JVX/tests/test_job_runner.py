@@ -0,0 +1,31 @@
+"""
+Tests des jobs du dashboard.
+La graine de l'actif fait partie de la clé du cache de résultats : deux exécutions
+d'un même job avec la même graine doivent rendre le même résultat.
+"""
+import queue
+import shutil
+import threading
+from conftest import DATA_DIR
+from src.config import AssetConfig
+from src.job_runner import _job_main
+
+
+def _run(kind: str, asset: AssetConfig, **options):
+    """Exécute un job dans le processus courant et renvoie son résultat."""
+    messages = queue.Queue()
+    _job_main(kind, asset, options, messages, threading.Event())
+    last = None
+    while not messages.empty():
+        last = messages.get()
+    assert last[0] == 'result', last
+    return last[1]
+
+
+def test_ga_job_is_reproducible(tmp_path):
+    shutil.copy(DATA_DIR / 'SPY_1d.csv', tmp_path)
+    asset = AssetConfig('SPY', '1d', data_dir=str(tmp_path), engine='vector', population=12,
+                        generations=3, seed=7)
+    first, second = _run('ga', asset), _run('ga', asset)
+    assert first['best_params'] == second['best_params']
+    assert first['convergence']['max'] == second['convergence']['max']
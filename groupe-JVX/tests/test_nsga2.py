@@ -0,0 +1,113 @@
+"""
+Tests de la sélection NSGA-II vectorisée.
+select_nsga2 (et l'opérateur sel_nsga2) doit choisir exactement les mêmes individus,
+dans le même ordre, que tools.selNSGA2 de DEAP : populations aléatoires (graine fixe)
+avec ex aequo, doublons, objectifs infinis, -0.0 et NaN (confiés à DEAP).
+"""
+import subprocess
+import sys
+import numpy as np
+import pytest
+from deap import tools
+from conftest import ROOT
+from src.deap_types import creator
+from src.nsga2 import deap_select_nsga2, sel_nsga2, select_nsga2, sort_nondominated
+from src import array_population
+
+# Populations aléatoires comparées par cas
+N_TRIALS = 150
+
+
+def _random_values(rng: np.random.Generator, nan: bool = False) -> np.ndarray:
+    """
+    Tire une matrice (N, 2) de fitness (profit, drawdown) difficile pour le tri :
+    valeurs discrétisées (ex aequo), lignes dupliquées, ±inf (backtests en erreur),
+    -0.0 et, si demandé, quelques NaN sur l'un des objectifs.
+    """
+    n = int(rng.integers(1, 60))
+    values = np.round(rng.normal([0.0, 20.0], [5.0, 5.0], size=(n, 2)), int(rng.integers(0, 2)))
+    if n > 1:
+        dup = rng.integers(0, n, size=n // 3)
+        values[dup] = values[rng.integers(0, n, size=len(dup))]
+    mask = rng.random(values.shape) < 0.08
+    values[mask] = rng.choice([np.inf, -np.inf, -0.0, 0.0], size=int(mask.sum()))
+    if nan:
+        # NaN sur un seul objectif : sur les deux, la dominance devient cyclique et
+        # tools.sortNondominated ne termine pas
+        column = int(rng.integers(0, 2))
+        values[rng.random(n) < 0.1, column] = np.nan
+        values[int(rng.integers(0, n)), column] = np.nan
+    return values
+
+
+def _individuals(values: np.ndarray) -> list:
+    """Individus DEAP portant les fitness de `values`."""
+    individuals = []
+    for row in values.tolist():
+        ind = creator.Individual()
+        ind.fitness.values = row
+        individuals.append(ind)
+    return individuals
+
+
+@pytest.mark.parametrize('nan', [False, True])
+def test_select_matches_deap(nan):
+    rng = np.random.default_rng(7 + nan)
+    for _ in range(N_TRIALS):
+        values = _random_values(rng, nan)
+        k = int(rng.integers(0, len(values) + 1))
+        expected = deap_select_nsga2(values, k)
+        np.testing.assert_array_equal(select_nsga2(values, k), expected)
+        np.testing.assert_array_equal(array_population.select_nsga2(values, k, fast=True), expected)
+
+
+def test_sel_nsga2_operator_matches_deap():
+    rng = np.random.default_rng(11)
+    for _ in range(N_TRIALS):
+        values = _random_values(rng, nan=bool(rng.random() < 0.2))
+        individuals = _individuals(values)
+        k = int(rng.integers(0, len(values) + 1))
+        chosen = sel_nsga2(individuals, k)
+        expected = tools.selNSGA2(individuals, k)
+        assert [id(ind) for ind in chosen] == [id(ind) for ind in expected]
+
+
+def test_sort_nondominated_matches_deap_fronts():
+    rng = np.random.default_rng(3)
+    for _ in range(N_TRIALS):
+        values = _random_values(rng)
+        individuals = _individuals(values)
+        for i, ind in enumerate(individuals):
+            ind.index = i
+        k = int(rng.integers(1, len(values) + 1))
+        wvalues = np.array([ind.fitness.wvalues for ind in individuals])
+        fronts = sort_nondominated(wvalues, k)
+        expected = tools.sortNondominated(individuals, k)
+        assert [f.tolist() for f in fronts] == [[ind.index for ind in f] for f in expected]
+
+
+def test_custom_weights():
+    rng = np.random.default_rng(5)
+    for weights in [(1.0, 1.0), (-1.0, -1.0), (2.0, -0.5)]:
+        values = _random_values(rng)
+        k = len(values) // 2
+        np.testing.assert_array_equal(select_nsga2(values, k, weights),
+                                      deap_select_nsga2(values, k, weights))
+
+
+def test_import_without_ga_core():
+    # Interpréteur neuf : les types DEAP ne doivent pas dépendre d'un import préalable de ga_core
+    code = (
+        "import numpy as np\n"
+        "from src.nsga2 import select_nsga2, deap_select_nsga2\n"
+        "from src import array_population\n"
+        "values = np.array([[1.0, 2.0], [3.0, 1.0], [0.0, 5.0], [3.0, 1.0]])\n"
+        "assert select_nsga2(values, 2).tolist() == deap_select_nsga2(values, 2).tolist()\n"
+        "from src.config import Config\n"
+        "pop = array_population.random_population(4, Config.GENE_BOUNDS)\n"
+        "assert len(array_population.to_individuals(pop)) == 4\n"
+        "import sys\n"
+        "assert 'src.ga_core' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,91 @@
+"""
+Tests du journal de trades sur l'historique complet.
+Sur une fenêtre dont le début du trading tombe pendant une position de la stratégie
+continue (ou sur son ordre d'entrée), le journal ne répond pas : la fitness est celle
+d'un backtest lancé à neuf sur la tranche. La validation Out-Of-Sample
+(run_simple_backtest) ne lit jamais le journal par défaut.
+"""
+import numpy as np
+import pytest
+from conftest import BUNDLED_TICKERS
+from test_vector_parity import _load, _random_genome
+from src.backtest_runner import run_backtest, run_simple_backtest
+from src.config import Config
+from src.strategy_genes import decode_chromosome
+from src.trade_ledger import _warmup_bars, clear_trade_ledgers, get_trade_ledger
+
+# Génomes tirés par actif et longueur des fenêtres glissantes
+N_GENOMES = 6
+WINDOW_BARS = 300
+
+
+@pytest.fixture(autouse=True)
+def _fresh_ledgers():
+    clear_trade_ledgers()
+    yield
+    clear_trade_ledgers()
+
+
+def _ledgers(ticker: str, seed: int = 0):
+    """Historique de l'actif et journaux de génomes aléatoires qui tradent."""
+    df = _load(ticker)
+    rng = np.random.default_rng(seed)
+    ledgers = []
+    while len(ledgers) < N_GENOMES:
+        params = decode_chromosome(_random_genome(rng))
+        try:
+            ledger = get_trade_ledger(params, df)
+        except Exception:
+            continue  # RSI indéfini sur l'historique : pas de journal
+        if len(ledger.trade_pnl) > 2:
+            ledgers.append((params, ledger))
+    return df, ledgers
+
+
+@pytest.mark.parametrize("ticker", BUNDLED_TICKERS)
+def test_straddling_windows_match_fresh_backtest(ticker):
+    df, ledgers = _ledgers(ticker)
+    straddling = 0
+    for params, ledger in ledgers:
+        warmup = _warmup_bars(params)
+        # Fenêtres glissantes, et fenêtres dont le trading commence pendant chaque trade
+        firsts = list(range(0, len(df) - WINDOW_BARS, 37))
+        firsts += [int(o) - warmup + 1 for o, c in zip(ledger.trade_open, ledger.trade_close) if c > o + 1]
+        if ledger.open_trade_bar is not None:
+            firsts.append(ledger.open_trade_bar - warmup)
+        for first in firsts:
+            if first < 0 or first + WINDOW_BARS > len(df):
+                continue
+            window = df.iloc[first:first + WINDOW_BARS]
+            if not ledger.straddles(first + warmup):
+                continue
+            straddling += 1
+            assert ledger.fitness(window) is None
+            assert ledger.summary(window) is None
+            fresh = run_backtest(params, window, engine='vector', use_ledger=False)
+            assert run_backtest(params, window, engine='vector', use_ledger=True, history=df) == fresh
+    assert straddling > N_GENOMES
+
+
+def test_window_without_carried_position_is_answered():
+    df, ledgers = _ledgers('SPY')
+    answered = 0
+    for params, ledger in ledgers:
+        warmup = _warmup_bars(params)
+        for first in range(0, len(df) - WINDOW_BARS, 37):
+            window = df.iloc[first:first + WINDOW_BARS]
+            if not ledger.straddles(first + warmup):
+                assert ledger.fitness(window) is not None
+                answered += 1
+    assert answered > 0
+
+
+def test_oos_summary_does_not_use_ledger(monkeypatch):
+    monkeypatch.setattr(Config, 'TRADE_LEDGER_ENABLED', True)
+    df, ledgers = _ledgers('BTC-USD')
+    params, ledger = ledgers[0]
+    window = df.iloc[len(df) // 2:len(df) // 2 + WINDOW_BARS]
+    trading_start = window.index[_warmup_bars(params) + 10].date()
+    result = run_simple_backtest(params, window, verbose=False, trading_start_date=trading_start, history=df)
+    monkeypatch.setattr(Config, 'TRADE_LEDGER_ENABLED', False)
+    assert result == run_simple_backtest(params, window, verbose=False, trading_start_date=trading_start)
@@ -0,0 +1,29 @@
+"""
+Tests de l'optimisation d'un univers d'actifs.
+Les actifs sont traités par des processus de travail démons, qui ne peuvent pas
+créer de pool : l'AG (et les fenêtres de la WFA) doivent y rester séquentiels,
+même quand Config.GA_WORKERS demande plusieurs processus.
+"""
+import multiprocessing as mp
+import pytest
+from conftest import DATA_DIR
+from src.config import AssetConfig, Config
+from src.universe import UniverseRunner
+
+TICKERS = ('BTC-USD', 'ETH-USD')
+
+
+@pytest.mark.skipif('fork' not in mp.get_all_start_methods(),
+                    reason="Config modifiée par le test transmise aux processus par fork")
+@pytest.mark.parametrize('mode', ['simple', 'wfa'])
+def test_pool_with_parallel_ga_config(tmp_path, monkeypatch, mode):
+    monkeypatch.setattr(Config, 'GA_WORKERS', 2)
+    assets = [AssetConfig(ticker, data_dir=str(DATA_DIR), engine='vector', population=6,
+                          generations=1, seed=i)
+              for i, ticker in enumerate(TICKERS)]
+    runner = UniverseRunner(assets, mode=mode, workers=2, start_method='fork')
+    assert runner.workers == 2
+
+    table = runner.run(output=str(tmp_path / 'universe.csv'), verbose=False)
+    assert table['ticker'].tolist() == list(TICKERS)
+    assert table['status'].tolist() == ['ok', 'ok'], table.get('error')
@@ -0,0 +1,88 @@
+"""
+Tests de parité du moteur vectorisé.
+Le moteur 'vector' (run_backtest et batch_fitness) doit rendre le même couple
+(profit, drawdown) que Backtrader sur des génomes aléatoires (graine fixe) et des
+tranches aléatoires des CSV fournis (BTC, ETH, SPY).
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import DATA_DIR, BUNDLED_TICKERS
+from src.backtest_runner import run_backtest
+from src.config import Config
+from src.strategy_genes import decode_chromosome
+from src.vector_backtest import batch_fitness
+
+# Génomes et tranches tirés par actif (Backtrader est lent : quelques dizaines de backtests)
+N_GENOMES = 8
+# Écart toléré entre les deux moteurs (arrondis de l'ordre des opérations)
+TOLERANCE = dict(rel=1e-9, abs=1e-9)
+
+
+def _load(ticker: str) -> pd.DataFrame:
+    """Lit le CSV fourni de l'actif (format du cache de DataManager)."""
+    return pd.read_csv(DATA_DIR / f"{ticker}_1d.csv", index_col=0, parse_dates=True)
+
+
+def _random_genome(rng: np.random.Generator) -> list:
+    """
+    Tire un chromosome dans Config.GENE_BOUNDS, élargies comme après des mutations
+    (SMA_F peut dépasser SMA_S, SL/TP très serrés ou très larges).
+    """
+    genome = []
+    for name, (low, high) in Config.GENE_BOUNDS.items():
+        if isinstance(low, int):
+            genome.append(int(rng.integers(max(low - 3, 2), high * 2 + 1)))
+        else:
+            genome.append(float(rng.uniform(0.005, high * 1.5)))
+    return genome
+
+
+def _cases(ticker: str, seed: int):
+    """Génomes aléatoires et tranches aléatoires (au moins 100 barres) de l'actif."""
+    df = _load(ticker)
+    rng = np.random.default_rng(seed)
+    cases = []
+    for _ in range(N_GENOMES):
+        length = int(rng.integers(150, len(df)))
+        start = int(rng.integers(0, len(df) - length + 1))
+        cases.append((decode_chromosome(_random_genome(rng)), df.iloc[start:start + length]))
+    return cases
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("ticker", BUNDLED_TICKERS)
+def test_run_backtest_vector_matches_backtrader(ticker, seed):
+    for params, data in _cases(ticker, seed):
+        expected = run_backtest(params, data, engine='backtrader')
+        assert run_backtest(params, data, engine='vector') == pytest.approx(expected, **TOLERANCE), params
+
+
+@pytest.mark.parametrize("ticker", BUNDLED_TICKERS)
+def test_batch_fitness_matches_backtrader(ticker):
+    df = _load(ticker)
+    rng = np.random.default_rng(42)
+    genomes = [decode_chromosome(_random_genome(rng)) for _ in range(N_GENOMES)]
+    data = df.iloc[len(df) // 3:]
+    batch = batch_fitness(np.array([list(p.values()) for p in genomes], dtype=np.float64), data)
+    for params, fitness in zip(genomes, batch.tolist()):
+        expected = run_backtest(params, data, engine='backtrader')
+        assert tuple(fitness) == pytest.approx(expected, **TOLERANCE), params
+
+
+@pytest.mark.parametrize("ticker", BUNDLED_TICKERS)
+def test_no_trade_and_short_data(ticker):
+    df = _load(ticker)
+    # RSI_LO nul : aucune entrée possible, les deux moteurs renvoient la fitness « sans trade »
+    params = decode_chromosome([10, 30, 14, 70, 0, 0.05, 0.1])
+    assert run_backtest(params, df, engine='vector') == run_backtest(params, df, engine='backtrader') == (-100.0, 100.0)
+    # Moins de 100 barres : backtest refusé par les deux moteurs
+    short = df.iloc[:99]
+    assert run_backtest(params, short, engine='vector') == run_backtest(params, short, engine='backtrader') == (-100.0, 100.0)
+    assert batch_fitness(np.array([list(params.values())]), short).tolist() == [[-100.0, 100.0]]
+
+
+def test_unknown_engine_is_rejected():
+    params = decode_chromosome([10, 30, 14, 70, 30, 0.05, 0.1])
+    with pytest.raises(ValueError):
+        run_backtest(params, _load('SPY'), engine='numpy')